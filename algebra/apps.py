@@ -1,6 +1,54 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class AlgebraConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'algebra'
+
+    def ready(self):
+        # Opcional: importar SymPy y compilar expresiones frecuentes en segundo
+        # plano para que la primera petición de cada worker no pague ese coste.
+        if getattr(settings, 'ALGEBRA_PRECALENTAR', False):
+            from .logic import simbolico
+            simbolico.precalentar_en_segundo_plano()
+        # Los trabajadores de los tres motores salen de un servidor de procesos
+        # (forkserver), seguro dentro de servidores WSGI con hilos
+        if any(getattr(settings, nombre, 0) for nombre in (
+                'ALGEBRA_PROCESOS_MODULAR', 'ALGEBRA_PROCESOS_GAUSS', 'ALGEBRA_PROCESOS_PARSEO')):
+            from .logic import paralelo
+            paralelo.preparar()
+        # Procesos para el motor multimodular de determinantes e inversas grandes
+        procesos = getattr(settings, 'ALGEBRA_PROCESOS_MODULAR', 0)
+        if procesos:
+            from .logic import modular
+            modular.PROCESOS = int(procesos)
+        # Procesos para repartir las filas de Gauss-Jordan (sistemas grandes, sin pasos)
+        procesos = getattr(settings, 'ALGEBRA_PROCESOS_GAUSS', 0)
+        if procesos:
+            from .logic import paralelo
+            paralelo.PROCESOS = int(procesos)
+        # Procesos para convertir las celdas con expresiones de pegados grandes
+        procesos = getattr(settings, 'ALGEBRA_PROCESOS_PARSEO', 0)
+        if procesos:
+            from .logic import archivos
+            archivos.PROCESOS = int(procesos)
+        # Vigencia en caché de la factorización de (I − A) del endpoint de escenarios
+        segundos = getattr(settings, 'ALGEBRA_LEONTIEF_CACHE_SEGUNDOS', None)
+        if segundos is not None:
+            from .logic import leontief
+            leontief.CACHE_SEGUNDOS = int(segundos)
+        # Perfilado por petición y conteo de operaciones del núcleo de fracciones
+        from .logic import perfil, utilidades
+        perfil.ACTIVO = bool(getattr(settings, 'ALGEBRA_PERFIL', True))
+        utilidades.configurar_conteo(getattr(settings, 'ALGEBRA_PERFIL_CONTAR', False))
+        # Límites del control de admisión
+        limites = getattr(settings, 'ALGEBRA_ADMISION', None)
+        if limites:
+            from .logic import admision
+            admision.configurar(limites)
+        # Límites de las matrices en disco (subidas grandes en coma flotante)
+        limites = getattr(settings, 'ALGEBRA_DISCO', None)
+        if limites:
+            from .logic import disco
+            disco.configurar(limites)
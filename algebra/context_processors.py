@@ -0,0 +1,46 @@
+"""Variables de plantilla para la caché de páginas y fragmentos."""
+import hashlib
+import os
+
+from django.conf import settings
+
+_version = None
+
+
+def _archivos_version():
+    """Plantillas de templates/ y módulos .py de la app: lo que decide el HTML."""
+    for directorio in settings.TEMPLATES[0].get("DIRS", []):
+        for raiz, _, archivos in os.walk(directorio):
+            for nombre in archivos:
+                yield os.path.join(raiz, nombre)
+    for raiz, _, archivos in os.walk(os.path.dirname(os.path.abspath(__file__))):
+        for nombre in archivos:
+            if nombre.endswith(".py"):
+                yield os.path.join(raiz, nombre)
+
+
+def version_paginas():
+    """Huella (hex corto) del contenido de las plantillas y del código de la app.
+
+    Se calcula una vez por proceso: un despliegue que cambie plantillas o sólo
+    código cambia la versión y con ella las claves de caché. No depende de las
+    fechas de los archivos, que un despliegue puede conservar.
+    """
+    global _version
+    if _version is None:
+        huella = hashlib.sha256()
+        for ruta in sorted(_archivos_version()):
+            huella.update(ruta.encode())
+            with open(ruta, "rb") as f:
+                huella.update(hashlib.sha256(f.read()).digest())
+        _version = huella.hexdigest()[:16]
+    return _version
+
+
+def cache_paginas(request):
+    """Segundos de caché de fragmentos (settings.ALGEBRA_CACHE_PAGINAS; 0 la
+    desactiva) y versión de plantillas y código para las claves."""
+    return {
+        "cache_paginas": getattr(settings, "ALGEBRA_CACHE_PAGINAS", 0),
+        "version_paginas": version_paginas(),
+    }
@@ -0,0 +1,265 @@
+"""Estáticos para producción: huellas, variantes comprimidas y servicio
+
+Descripción:
+- AlmacenamientoEstatico (STORAGES["staticfiles"] sin DEBUG) es el
+  ManifestStaticFilesStorage de Django (nombres con huella del contenido,
+  p. ej. app.3f2a9c1b7d4e.js, y staticfiles.json) que además, en collectstatic:
+    * minifica los .js propios (algebra/*.js) antes de calcular la huella si
+      settings.ALGEBRA_MINIFICAR_JS es True;
+    * escribe junto a cada archivo de texto una variante .gz y, si el paquete
+      brotli está instalado, otra .br.
+- indexar(raiz) recorre STATIC_ROOT una vez y prepara lo que necesita
+  EstaticosMiddleware (algebra/middleware.py) para servir cada archivo desde
+  Python: tipo, variantes por codificación, ETag y si es inmutable (nombre con
+  huella: caché de un año).
+"""
+import gzip
+import json
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # opcional: sin brotli solo se generan variantes .gz
+    brotli = None
+
+
+# Archivos que vale la pena comprimir (las imágenes ya lo están)
+EXTENSIONES_COMPRIMIBLES = (".js", ".css", ".svg", ".html", ".json", ".txt", ".xml", ".map")
+
+# Por debajo de este tamaño la compresión no compensa
+TAMANO_MINIMO = 512
+
+# Una variante se guarda solo si ahorra al menos este porcentaje
+AHORRO_MINIMO = 0.05
+
+
+# ----------------------- Minificación de JavaScript -----------------------
+
+# Tras estos caracteres o palabras una "/" abre una expresión regular, no divide
+_ANTES_DE_REGEX = set("(,=:[!&|?{};+-*%<>~^")
+_PALABRAS_ANTES_DE_REGEX = {
+    "return", "typeof", "case", "do", "else", "in", "of", "new", "delete",
+    "void", "throw", "instanceof", "yield", "await",
+}
+_PALABRA_FINAL = re.compile(r"[A-Za-z_$][\w$]*$")
+_ESPACIOS = re.compile(r"[ \t]+")
+
+
+def _regex_permitida(salida):
+    texto = "".join(salida[-40:]).rstrip()
+    if not texto:
+        return True
+    if texto[-1] in _ANTES_DE_REGEX:
+        return True
+    m = _PALABRA_FINAL.search(texto)
+    return bool(m) and m.group(0) in _PALABRAS_ANTES_DE_REGEX
+
+
+def _copiar_cadena(codigo, i, salida):
+    """Copia la cadena '...' o "..." que empieza en i; devuelve el índice final."""
+    comilla = codigo[i]
+    j = i + 1
+    while j < len(codigo) and codigo[j] != comilla:
+        j += 2 if codigo[j] == "\\" else 1
+    salida.append(codigo[i:j + 1])
+    return j + 1
+
+
+def _copiar_regex(codigo, i, salida):
+    j = i + 1
+    en_clase = False
+    while j < len(codigo):
+        c = codigo[j]
+        if c == "\\":
+            j += 2
+            continue
+        if c == "\n":
+            break
+        if c == "[":
+            en_clase = True
+        elif c == "]":
+            en_clase = False
+        elif c == "/" and not en_clase:
+            break
+        j += 1
+    salida.append(codigo[i:j + 1])
+    return j + 1
+
+
+def _minificar(codigo, i, salida, hasta_llave):
+    """Copia el código desde i quitando comentarios y sangría. Con hasta_llave
+    se detiene en la "}" que cierra una interpolación ${...} de plantilla."""
+    profundidad = 0
+    n = len(codigo)
+    while i < n:
+        c = codigo[i]
+        if c in "'\"":
+            i = _copiar_cadena(codigo, i, salida)
+        elif c == "`":
+            salida.append(c)
+            i += 1
+            while i < n and codigo[i] != "`":
+                if codigo[i] == "\\":
+                    salida.append(codigo[i:i + 2])
+                    i += 2
+                elif codigo.startswith("${", i):
+                    salida.append("${")
+                    i = _minificar(codigo, i + 2, salida, True)
+                else:
+                    salida.append(codigo[i])
+                    i += 1
+            salida.append("`")
+            i += 1
+        elif codigo.startswith("//", i):
+            fin = codigo.find("\n", i)
+            i = n if fin == -1 else fin
+        elif codigo.startswith("/*", i):
+            fin = codigo.find("*/", i + 2)
+            fin = n if fin == -1 else fin + 2
+            # Un comentario con saltos de línea puede separar sentencias (ASI)
+            salida.append("\n" if "\n" in codigo[i:fin] else " ")
+            i = fin
+        elif c == "/" and _regex_permitida(salida):
+            i = _copiar_regex(codigo, i, salida)
+        else:
+            if hasta_llave:
+                if c == "{":
+                    profundidad += 1
+                elif c == "}":
+                    if profundidad == 0:
+                        salida.append("}")
+                        return i + 1
+                    profundidad -= 1
+            salida.append(c)
+            i += 1
+    return i
+
+
+def minificar_js(codigo):
+    """Minificación conservadora: quita comentarios, sangría, espacios repetidos
+    y líneas vacías. Conserva los saltos de línea entre sentencias para no
+    depender de la inserción automática de punto y coma."""
+    salida = []
+    _minificar(codigo, 0, salida, False)
+    lineas = []
+    for linea in "".join(salida).split("\n"):
+        linea = linea.strip()
+        if linea:
+            lineas.append(linea)
+    # Los espacios repetidos solo se colapsan en líneas sin literales
+    return "\n".join(_colapsar_espacios(linea) for linea in lineas) + "\n"
+
+
+def _colapsar_espacios(linea):
+    if "'" in linea or '"' in linea or "`" in linea or "/" in linea:
+        return linea
+    return _ESPACIOS.sub(" ", linea)
+
+
+# ----------------------- Compresión -----------------------
+
+def comprimir(ruta):
+    """Escribe ruta.gz (y ruta.br con brotli) si reducen el tamaño. Devuelve
+    las rutas creadas."""
+    if not ruta.endswith(EXTENSIONES_COMPRIMIBLES):
+        return []
+    with open(ruta, "rb") as f:
+        datos = f.read()
+    if len(datos) < TAMANO_MINIMO:
+        return []
+    creadas = []
+    limite = len(datos) * (1 - AHORRO_MINIMO)
+    # mtime=0: la variante es idéntica en cada collectstatic
+    variantes = [(".gz", gzip.compress(datos, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variantes.append((".br", brotli.compress(datos)))
+    for sufijo, comprimido in variantes:
+        if len(comprimido) <= limite:
+            with open(ruta + sufijo, "wb") as f:
+                f.write(comprimido)
+            creadas.append(ruta + sufijo)
+    return creadas
+
+
+class AlmacenamientoEstatico(ManifestStaticFilesStorage):
+    """Manifest con huellas + minificación opcional + variantes .gz/.br."""
+
+    def _minificables(self, paths):
+        return [
+            nombre for nombre in paths
+            if nombre.startswith("algebra/") and nombre.endswith(".js") and not nombre.endswith(".min.js")
+        ]
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            yield from super().post_process(paths, dry_run, **options)
+            return
+        if getattr(settings, "ALGEBRA_MINIFICAR_JS", False):
+            for nombre in self._minificables(paths):
+                ruta = self.path(nombre)
+                with open(ruta, encoding="utf-8") as f:
+                    minificado = minificar_js(f.read())
+                with open(ruta, "w", encoding="utf-8") as f:
+                    f.write(minificado)
+                # La huella se calcula sobre la copia minificada
+                paths[nombre] = (self, nombre)
+        nombres = set()
+        for original, con_huella, procesado in super().post_process(paths, dry_run, **options):
+            nombres.add(original)
+            if con_huella:
+                nombres.add(con_huella)
+            yield original, con_huella, procesado
+        for nombre in sorted(nombres):
+            if self.exists(nombre):
+                comprimir(self.path(nombre))
+
+
+# ----------------------- Índice para servir -----------------------
+
+_CODIFICACIONES = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _variante(ruta):
+    st = os.stat(ruta)
+    return {"ruta": ruta, "tamano": st.st_size, "etag": f'"{int(st.st_mtime):x}-{st.st_size:x}"', "mtime": st.st_mtime}
+
+
+def indexar(raiz):
+    """{ruta relativa con "/": info} de los archivos de STATIC_ROOT."""
+    inmutables = set()
+    manifiesto = os.path.join(raiz, "staticfiles.json")
+    if os.path.exists(manifiesto):
+        with open(manifiesto, encoding="utf-8") as f:
+            inmutables = set(json.load(f).get("paths", {}).values())
+    archivos = {}
+    for directorio, _, nombres in os.walk(raiz):
+        for nombre in nombres:
+            if nombre.endswith((".gz", ".br")) and nombre[:-3] in nombres:
+                continue
+            ruta = os.path.join(directorio, nombre)
+            relativa = os.path.relpath(ruta, raiz).replace(os.sep, "/")
+            tipo, _ = mimetypes.guess_type(nombre)
+            if tipo is None:
+                tipo = "application/octet-stream"
+            elif tipo.startswith("text/") or tipo in ("application/javascript", "application/json"):
+                tipo += "; charset=utf-8"
+            variantes = {None: _variante(ruta)}
+            for codificacion, sufijo in _CODIFICACIONES:
+                if os.path.exists(ruta + sufijo):
+                    variantes[codificacion] = _variante(ruta + sufijo)
+            archivos[relativa] = {"tipo": tipo, "inmutable": relativa in inmutables, "variantes": variantes}
+    return archivos
+
+
+def elegir_codificacion(archivo, aceptadas):
+    """La mejor variante de `archivo` para la cabecera Accept-Encoding dada."""
+    tokens = {t.split(";")[0].strip() for t in (aceptadas or "").lower().split(",")}
+    for codificacion, _ in _CODIFICACIONES:
+        if codificacion in tokens and codificacion in archivo["variantes"]:
+            return codificacion
+    return None
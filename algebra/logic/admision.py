@@ -0,0 +1,302 @@
+"""Control de admisión: estimar el coste de una petición antes de ejecutarla
+
+Descripción:
+- estimar_matricial(operacion, n, m, k, bits) estima, en operaciones de
+  fracción, el cálculo y el registro/render de pasos a partir de las
+  dimensiones, el exponente (potencia) y el tamaño en bits de los coeficientes.
+- admitir(...) decide con los LIMITES:
+    costo del cálculo > costo_maximo                 -> rechazar (ErrorAdmision),
+                                                        o pasar a coma flotante
+                                                        si la operación la tiene
+    con pasos y costo total > costo_maximo_pasos     -> degradar: sin pasos
+    costo final > costo_directo                      -> encolar: esperar un turno
+                                                        entre concurrencia_pesada
+  y devuelve dict {'pasos', 'flotante', 'aviso', 'costo'}.
+- admitir_expresion(texto) rechaza expresiones simbólicas con demasiados nodos
+  o exponentes demasiado grandes antes de llamar a SymPy. Los exponentes
+  constantes se pliegan (x**(10**6), 9**9**9) y las potencias anidadas
+  multiplican el suyo ((x**100)**100 cuenta como x**10000).
+- Turnos: AdmisionMiddleware abre un registro por petición con abrir() y
+  libera al terminar (cerrar()) los turnos que se hayan tomado. Fuera de una
+  petición (tests, comandos) no se encola.
+"""
+import ast
+import math
+import re
+import threading
+from contextvars import ContextVar
+
+
+# Límites por proceso. Se pueden sobrescribir parcialmente con el dict
+# settings.ALGEBRA_ADMISION (ver algebra/apps.py).
+LIMITES = {
+    "celdas_maximas": 250_000,        # entradas de cada matriz leída
+    "costo_directo": 5_000_000,       # hasta aquí se ejecuta sin turno
+    "costo_maximo": 200_000_000,      # cálculo exacto más caro que se acepta
+    "costo_maximo_pasos": 50_000_000, # cálculo + pasos; si se supera, sin pasos
+    "concurrencia_pesada": 2,         # cálculos por encima de costo_directo a la vez
+    "espera_cola": 30,                # segundos esperando turno antes de rechazar
+    "nodos_expresion": 2_000,         # nodos del árbol de una expresión simbólica
+    "exponente_expresion": 1_000,     # |exponente| entero literal más grande
+}
+
+# Cada entrada de un paso se copia, se formatea como texto y se pinta en la
+# plantilla: bastante más caro que una operación de fracción.
+FACTOR_PASOS = 20
+
+# Iteraciones que se suponen para los modos en coma flotante
+ITERACIONES_FLOTANTE = 200
+
+
+class ErrorAdmision(ValueError):
+    """La petición supera los límites de coste configurados."""
+    pass
+
+
+def _escala_bits(bits):
+    # Las operaciones con enteros grandes cuestan más que con palabras de 64 bits
+    return max(1.0, bits / 64.0)
+
+
+def escala_potencia(n, e, bits):
+    """Factor de coste de los productos de A^e por el tamaño de sus entradas."""
+    return _escala_bits(e * (max(bits, 1) + math.log2(max(n, 1))))
+
+
+def estimar_matricial(operacion, n, m=None, k=None, bits=0):
+    """(costo del cálculo, costo de los pasos) de `operacion` sobre una matriz n×m.
+
+    `k` es el número de columnas del segundo factor (multiplicación), el
+    exponente (potencia) o los productos n×n equivalentes del plan
+    (compuestas, ver compuestas.productos_equivalentes).
+    """
+    m = n if m is None else m
+    if operacion in ("suma", "escalar", "transposicion"):
+        calculo = n * m
+        pasos = n * m
+    elif operacion == "multiplicacion":
+        k = m if k is None else k
+        calculo = n * m * k
+        pasos = n * m * k
+    elif operacion == "inversa":
+        # [A | I]: n² pasos de n×2n entradas
+        calculo = 2 * n ** 3
+        pasos = 2 * n ** 4
+    elif operacion == "cramer":
+        calculo = (n + 1) * n ** 3
+        pasos = (n + 1) * n ** 4
+    elif operacion == "potencia":
+        e = abs(k or 0)
+        productos = 2 * max(e.bit_length(), 1)
+        # A^e tiene entradas de unos e·(bits + log2 n) bits y los últimos
+        # cuadrados operan con enteros de ese tamaño: se escala por el
+        # resultado, no por la entrada
+        escala = escala_potencia(n, e, bits)
+        return n ** 3 * productos * escala, productos * n * n * escala
+    elif operacion == "compuestas":
+        calculo = max(k or 1, 1) * n ** 3
+        pasos = max(k or 1, 1) * n ** 4
+    else:
+        # Eliminación: gauss, gauss_jordan, homogeneo, determinante, leontief
+        calculo = n * n * m
+        pasos = n * n * n * m
+    escala = _escala_bits(bits)
+    return calculo * escala, pasos * escala
+
+
+def _costo_flotante(operacion, n, m):
+    # Leontief: m = n + columnas de Y; cada iteración cuesta n² por columna
+    if operacion == "leontief":
+        return n * n * max(m - n, 1) * ITERACIONES_FLOTANTE
+    return None
+
+
+# ----------------------- Turnos -----------------------
+
+_turnos = ContextVar("turnos_admision", default=None)
+_semaforo = None
+_cerrojo = threading.Lock()
+
+
+def _semaforo_pesado():
+    global _semaforo
+    if _semaforo is None:
+        with _cerrojo:
+            if _semaforo is None:
+                _semaforo = threading.BoundedSemaphore(max(1, int(LIMITES["concurrencia_pesada"])))
+    return _semaforo
+
+
+def configurar(limites):
+    """Sobrescribe LIMITES (p. ej. desde settings) y rehace el semáforo."""
+    global _semaforo
+    LIMITES.update(limites or {})
+    with _cerrojo:
+        _semaforo = None
+
+
+def abrir():
+    return _turnos.set([])
+
+
+def cerrar(ficha):
+    tomados = _turnos.get()
+    _turnos.reset(ficha)
+    for semaforo in tomados or ():
+        semaforo.release()
+
+
+def esperar_turno():
+    """Espera un turno de cálculo pesado para la petición actual (se libera al
+    terminar la petición). Sin petición abierta no hace nada."""
+    tomados = _turnos.get()
+    if tomados is None or tomados:
+        return
+    semaforo = _semaforo_pesado()
+    if not semaforo.acquire(timeout=LIMITES["espera_cola"]):
+        raise ErrorAdmision("El servidor está ocupado con otros cálculos grandes. Inténtalo de nuevo en unos minutos.")
+    tomados.append(semaforo)
+
+
+# ----------------------- Decisión -----------------------
+
+def validar_dimensiones(filas, columnas):
+    """Rechaza una matriz filas×columnas con más entradas de las permitidas.
+
+    Los lectores de archivos la llaman con las dimensiones de la cabecera,
+    antes de reservar la matriz."""
+    if filas * columnas > LIMITES["celdas_maximas"]:
+        raise ErrorAdmision(
+            f"La matriz tiene {filas}×{columnas} entradas; el máximo es {LIMITES['celdas_maximas']}."
+        )
+
+
+def validar_leidas(celdas):
+    """Rechaza una lectura en curso en cuanto lleva más entradas de las
+    permitidas (los lectores sin cabecera la llaman fila a fila)."""
+    if celdas > LIMITES["celdas_maximas"]:
+        raise ErrorAdmision(f"La matriz supera el máximo de {LIMITES['celdas_maximas']} entradas.")
+
+
+def validar_celdas(M):
+    """Rechaza matrices con más entradas de las permitidas."""
+    if M:
+        validar_dimensiones(len(M), len(M[0]))
+
+
+def admitir_costo(costo, descripcion="La operación"):
+    """Admisión de un cálculo cuyo coste ya se estimó fuera (p. ej. los motores
+    en coma flotante de disco.py): rechaza o toma turno si es pesado."""
+    if costo > LIMITES["costo_maximo"]:
+        raise ErrorAdmision(f"{descripcion} es demasiado costosa para este servidor. Reduce el tamaño de la matriz.")
+    if costo > LIMITES["costo_directo"]:
+        esperar_turno()
+
+
+def admitir(operacion, n, m=None, k=None, pasos=False, bits=0):
+    """Decide si la operación se ejecuta, con qué modo, y toma turno si es pesada."""
+    m = n if m is None else m
+    calculo, costo_pasos = estimar_matricial(operacion, n, m, k, bits)
+    decision = {"pasos": pasos, "flotante": False, "aviso": None, "costo": calculo}
+    if calculo > LIMITES["costo_maximo"]:
+        flotante = _costo_flotante(operacion, n, m)
+        if flotante is None or flotante > LIMITES["costo_maximo"]:
+            raise ErrorAdmision(
+                f"La operación sobre una matriz {n}×{m} es demasiado costosa para calcularla "
+                "en exacto en este servidor. Reduce el tamaño de la matriz."
+            )
+        decision.update(pasos=False, flotante=True, costo=flotante,
+                        aviso="El cálculo exacto es demasiado costoso: se resolvió en coma flotante y sin pasos.")
+    elif pasos and calculo + costo_pasos * FACTOR_PASOS > LIMITES["costo_maximo_pasos"]:
+        decision.update(pasos=False,
+                        aviso="Hay demasiados pasos para mostrarlos: se muestra solo el resultado.")
+    else:
+        decision["costo"] = calculo + (costo_pasos * FACTOR_PASOS if pasos else 0)
+    if decision["costo"] > LIMITES["costo_directo"]:
+        esperar_turno()
+    return decision
+
+
+_EXPONENTE = re.compile(r"(?:\*\*|\^)\s*[({]?\s*[+-]?\s*(\d+)")
+# Exponente agrupado que a su vez contiene operaciones: x^{2*5000}, x**(10**6)
+_EXPONENTE_COMPUESTO = re.compile(r"(?:\*\*|\^)\s*[({][^)}]*(?:\*|\^)")
+_TOKEN = re.compile(r"\d+(?:\.\d*)?|[A-Za-z_]\w*|\*\*|\S")
+
+_OPERACIONES = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+    ast.Pow: lambda a, b: abs(a) ** b,
+}
+
+
+def _plegar(a, b, operacion):
+    # Aritmética en coma flotante: 9**9**9 se desborda a inf al instante en
+    # lugar de construir un entero enorme
+    try:
+        v = _OPERACIONES[type(operacion)](a, b)
+    except OverflowError:
+        return math.inf
+    except ZeroDivisionError:
+        return None
+    return math.inf if math.isnan(v) else v
+
+
+def _medir_nodo(nodo):
+    """(valor, exponente) de un subárbol: `valor` es su valor numérico si es
+    constante (None si depende de variables) y `exponente` el mayor exponente
+    efectivo que contiene; las potencias anidadas multiplican exponentes."""
+    if isinstance(nodo, ast.Constant) and isinstance(nodo.value, (int, float)) \
+            and not isinstance(nodo.value, bool):
+        try:
+            return float(nodo.value), 0
+        except OverflowError:
+            return math.inf, 0
+    if isinstance(nodo, ast.UnaryOp) and isinstance(nodo.op, (ast.USub, ast.UAdd)):
+        valor, exponente = _medir_nodo(nodo.operand)
+        return (-valor if valor is not None and isinstance(nodo.op, ast.USub) else valor), exponente
+    if isinstance(nodo, ast.BinOp) and type(nodo.op) in _OPERACIONES:
+        a, ea = _medir_nodo(nodo.left)
+        b, eb = _medir_nodo(nodo.right)
+        valor = _plegar(a, b, nodo.op) if a is not None and b is not None else None
+        if isinstance(nodo.op, ast.Pow) and b is not None:
+            # (x^j)^k = x^{jk}; un exponente no entero también cuenta por su módulo
+            return valor, max(abs(b) * max(ea, 1), eb)
+        return valor, max(ea, eb)
+    exponente = 0
+    for hijo in ast.iter_child_nodes(nodo):
+        exponente = max(exponente, _medir_nodo(hijo)[1])
+    return None, exponente
+
+
+def _medir_arbol(arbol):
+    nodos = sum(1 for _ in ast.walk(arbol))
+    return nodos, _medir_nodo(arbol)[1]
+
+
+def medir_expresion(texto):
+    """(nodos, mayor |exponente| literal) de una expresión; sin parsear con
+    SymPy. Si no es sintaxis de Python (LaTeX a medias) se cuentan tokens."""
+    limpio = (texto or "").replace("^", "**")
+    try:
+        return _medir_arbol(ast.parse(limpio, mode="eval"))
+    except (SyntaxError, ValueError, RecursionError):
+        exponentes = [int(d) for d in _EXPONENTE.findall(texto or "") if len(d) < 20]
+        if _EXPONENTE_COMPUESTO.search(limpio):
+            # Sin árbol no se puede plegar el exponente: se trata como ilimitado
+            exponentes.append(math.inf)
+        return len(_TOKEN.findall(texto or "")), max(exponentes, default=0)
+
+
+def admitir_expresion(texto):
+    if len(texto or "") > LIMITES["nodos_expresion"] * 4:
+        raise ErrorAdmision("La expresión es demasiado larga.")
+    nodos, exponente = medir_expresion(texto)
+    if nodos > LIMITES["nodos_expresion"]:
+        raise ErrorAdmision(f"La expresión es demasiado grande ({nodos} nodos; máximo {LIMITES['nodos_expresion']}).")
+    if exponente > LIMITES["exponente_expresion"]:
+        raise ErrorAdmision(
+            f"El exponente {exponente:.0f} es demasiado grande (máximo {LIMITES['exponente_expresion']})."
+        )
+    return nodos
@@ -0,0 +1,353 @@
+"""Importación y exportación de matrices en archivos (CSV, XLSX, MatrixMarket)
+
+Descripción:
+- Lectores en streaming que devuelven matrices de fracciones [n, d] listas para
+  operaciones.py. Los números simples (enteros, decimales, notación científica
+  y a/b) se convierten directamente; sólo las celdas con expresiones pasan por
+  crear_fraccion_desde_cadena. Las celdas repetidas se convierten una sola vez.
+- Exportación de resultados y tablas de pasos: líneas CSV y MatrixMarket (el
+  resultado se formatea antes de empezar la descarga, los pasos en streaming)
+  y libro XLSX en modo write_only.
+- convertir_celdas: conversión deduplicada de los textos de un pegado grande;
+  las expresiones distintas se reparten entre procesos si hay muchas.
+- openpyxl sólo se importa al leer o escribir XLSX.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, localcontext
+from itertools import chain
+
+from . import admision
+from . import utilidades as u
+from .paralelo import contexto_procesos
+
+# Procesos para convertir celdas con expresiones (None o 0: secuencial). Se
+# puede fijar desde settings.ALGEBRA_PROCESOS_PARSEO (ver apps.py).
+PROCESOS = None
+
+# Expresiones distintas a partir de las cuales compensa repartirlas
+UMBRAL_PARALELO = 500
+
+
+class ErrorArchivo(ValueError):
+    """Error de formato o contenido en un archivo importado."""
+
+
+def _texto(linea):
+    if isinstance(linea, bytes):
+        linea = linea.decode("utf-8-sig")
+    return linea.strip().lstrip("\ufeff")
+
+
+def _separar(linea):
+    for sep in (",", ";", "\t"):
+        if sep in linea:
+            return [t.strip() for t in linea.split(sep)]
+    return linea.split()
+
+
+def _fraccion(valor, fila, columna, cache):
+    """Celda → [n, d]; `cache` guarda las conversiones de texto ya hechas."""
+    if isinstance(valor, bool) or valor is None or valor == "":
+        raise ErrorArchivo(f"Fila {fila}, columna {columna}: celda vacía o no numérica.")
+    if isinstance(valor, int):
+        return [valor, 1]
+    if isinstance(valor, float):
+        valor = repr(valor)
+    texto = str(valor).strip()
+    hecho = cache.get(texto)
+    if hecho is None:
+        try:
+            n, d = u.fraccion_desde_numero_simple(texto) or u.crear_fraccion_desde_cadena(texto)
+            hecho = (n, d)
+        except Exception:
+            raise ErrorArchivo(f"Fila {fila}, columna {columna}: valor inválido '{texto}'.")
+        cache[texto] = hecho
+    return list(hecho)
+
+
+def _convertir_trozo(textos):
+    salida = []
+    for texto in textos:
+        try:
+            salida.append(u.crear_fraccion_desde_cadena(texto))
+        except Exception as e:
+            salida.append(e)
+    return salida
+
+
+def convertir_celdas(textos, procesos=None):
+    """Convierte cada texto distinto una sola vez.
+
+    Devuelve {texto: [n, d] o la excepción que produjo}; el llamador decide
+    en qué orden relanzar los errores. Los números simples se resuelven aquí
+    mismo; las expresiones se reparten entre `procesos` si superan
+    UMBRAL_PARALELO.
+    """
+    valores = {}
+    expresiones = []
+    for texto in textos:
+        if texto in valores:
+            continue
+        try:
+            simple = u.fraccion_desde_numero_simple(texto.strip())
+        except ValueError as e:
+            simple = e
+        valores[texto] = simple
+        if simple is None:
+            expresiones.append(texto)
+    procesos = procesos if procesos is not None else PROCESOS
+    if procesos and procesos > 1 and len(expresiones) >= UMBRAL_PARALELO:
+        trozos = [expresiones[i::procesos] for i in range(procesos)]
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto_procesos()) as ex:
+            partes = list(ex.map(_convertir_trozo, trozos))
+        for trozo, parte in zip(trozos, partes):
+            valores.update(zip(trozo, parte))
+    else:
+        valores.update(zip(expresiones, _convertir_trozo(expresiones)))
+    return valores
+
+
+def valor_celda(valores, texto):
+    """[n, d] de `texto` (copia nueva) o relanza su error de conversión."""
+    v = valores[texto]
+    if isinstance(v, Exception):
+        raise v
+    return [v[0], v[1]]
+
+
+def _matriz_desde_filas(filas):
+    """Convierte filas de celdas (texto o números) en una matriz rectangular."""
+    M = []
+    cache = {}
+    ancho = None
+    for celdas in filas:
+        if ancho is None:
+            ancho = len(celdas)
+        elif len(celdas) != ancho:
+            raise ErrorArchivo("Todas las filas deben tener la misma cantidad de columnas.")
+        i = len(M) + 1
+        admision.validar_leidas(i * ancho)
+        M.append([_fraccion(v, i, j + 1, cache) for j, v in enumerate(celdas)])
+    if not M:
+        raise ErrorArchivo("La matriz no puede ser vacía.")
+    return M
+
+
+def leer_filas(filas):
+    """Matriz desde filas ya separadas (listas de números o textos, p. ej. JSON)."""
+    if not isinstance(filas, list) or not all(isinstance(f, list) for f in filas):
+        raise ErrorArchivo("La matriz debe ser una lista de filas.")
+    return _matriz_desde_filas(filas)
+
+
+def _filas_csv(flujo):
+    for linea in flujo:
+        linea = _texto(linea)
+        if linea and not linea.startswith("#"):
+            yield _separar(linea)
+
+
+def leer_csv(flujo):
+    """Matriz desde líneas CSV (coma, punto y coma, tabulador o espacios)."""
+    return _matriz_desde_filas(_filas_csv(flujo))
+
+
+def _filas_xlsx(flujo):
+    try:
+        import openpyxl
+    except ImportError:
+        raise ErrorArchivo("Leer archivos XLSX requiere el paquete openpyxl.")
+    libro = openpyxl.load_workbook(flujo, read_only=True, data_only=True)
+    try:
+        for celdas in libro.worksheets[0].iter_rows(values_only=True):
+            celdas = list(celdas)
+            while celdas and celdas[-1] in (None, ""):
+                celdas.pop()
+            if celdas:
+                yield celdas
+    finally:
+        libro.close()
+
+
+def leer_xlsx(flujo):
+    """Matriz desde la primera hoja de un libro XLSX (se ignoran filas vacías)."""
+    return _matriz_desde_filas(_filas_xlsx(flujo))
+
+
+def entradas_matrix_market(flujo):
+    """Lee la cabecera de un MatrixMarket y devuelve (filas, columnas, simetria, entradas).
+
+    `entradas` es un iterador de (i, j, texto) con índices desde 0; en los
+    archivos 'pattern' el texto es None. Las matrices simétricas sólo traen un
+    triángulo: el llamador debe reflejar las entradas fuera de la diagonal.
+    """
+    lineas = iter(flujo)
+    cabecera = _texto(next(lineas, b"")).lower().split()
+    if len(cabecera) < 5 or cabecera[0] != "%%matrixmarket" or cabecera[1] != "matrix":
+        raise ErrorArchivo("Cabecera MatrixMarket inválida.")
+    formato, campo, simetria = cabecera[2:5]
+    if formato not in ("array", "coordinate") or campo not in ("real", "integer", "pattern") \
+            or simetria not in ("general", "symmetric", "skew-symmetric"):
+        raise ErrorArchivo(f"MatrixMarket no soportado: {' '.join(cabecera[2:5])}.")
+    tamano = None
+    for linea in lineas:
+        linea = _texto(linea)
+        if linea and not linea.startswith("%"):
+            tamano = linea.split()
+            break
+    try:
+        filas, columnas = int(tamano[0]), int(tamano[1])
+    except (TypeError, IndexError, ValueError):
+        raise ErrorArchivo("Falta la línea de tamaño en el MatrixMarket.")
+
+    def entradas():
+        k = 0
+        for linea in lineas:
+            linea = _texto(linea)
+            if not linea or linea.startswith("%"):
+                continue
+            tokens = linea.split()
+            if formato == "array":
+                # orden por columnas; las simétricas sólo traen el triángulo inferior
+                j, i = divmod(k, filas) if simetria == "general" else _triangulo(k, filas, simetria)
+                texto = tokens[0]
+            else:
+                try:
+                    i, j = int(tokens[0]) - 1, int(tokens[1]) - 1
+                except (IndexError, ValueError):
+                    raise ErrorArchivo(f"Entrada {k + 1}: índices inválidos.")
+                texto = None if campo == "pattern" else (tokens[2] if len(tokens) > 2 else "")
+            if not (0 <= i < filas and 0 <= j < columnas):
+                raise ErrorArchivo(f"Entrada {k + 1}: índice fuera de rango.")
+            yield i, j, texto
+            k += 1
+
+    return filas, columnas, simetria, entradas()
+
+
+def _triangulo(k, n, simetria):
+    """(j, i) de la k-ésima entrada del triángulo inferior por columnas."""
+    diagonal = simetria != "skew-symmetric"
+    j = 0
+    while True:
+        alto = n - j if diagonal else n - j - 1
+        if k < alto:
+            return j, j + k + (0 if diagonal else 1)
+        k -= alto
+        j += 1
+
+
+def leer_matrix_market(flujo):
+    """Matriz densa de fracciones desde un archivo MatrixMarket."""
+    filas, columnas, simetria, entradas = entradas_matrix_market(flujo)
+    if filas < 1 or columnas < 1:
+        raise ErrorArchivo("La matriz no puede ser vacía.")
+    # Antes de reservar la matriz densa que pide la cabecera
+    admision.validar_dimensiones(filas, columnas)
+    M = [[[0, 1] for _ in range(columnas)] for _ in range(filas)]
+    cache = {}
+    for i, j, texto in entradas:
+        v = [1, 1] if texto is None else _fraccion(texto, i + 1, j + 1, cache)
+        M[i][j] = v
+        if simetria != "general" and i != j:
+            M[j][i] = list(v) if simetria == "symmetric" else u.negativo_fraccion(v)
+    return M
+
+
+def leer_archivo(nombre, flujo):
+    """Elige el lector por la extensión del nombre de archivo."""
+    ext = os.path.splitext(nombre or "")[1].lower()
+    if ext == ".xlsx":
+        return leer_xlsx(flujo)
+    if ext in (".mtx", ".mm"):
+        return leer_matrix_market(flujo)
+    if ext in (".csv", ".txt", ".tsv", ""):
+        return leer_csv(flujo)
+    raise ErrorArchivo(f"Formato de archivo no soportado: {ext}.")
+
+
+# --- Exportación ---------------------------------------------------------------
+
+def _celda_csv(texto):
+    if any(c in texto for c in ',"\n'):
+        return '"' + texto.replace('"', '""') + '"'
+    return texto
+
+
+def _fila_csv(fila, text_fn):
+    return ",".join(_celda_csv(x if isinstance(x, str) else text_fn(x)) for x in fila) + "\n"
+
+
+def _lineas_pasos_csv(pasos, text_fn):
+    for k, paso in enumerate(pasos or [], start=1):
+        yield "\n# Paso " + str(k) + ": " + paso.get("operacion", "").replace("\n", " ") + "\n"
+        for fila in paso.get("matriz") or []:
+            yield _fila_csv(fila, text_fn)
+
+
+def lineas_csv(M, pasos=None, text_fn=u.texto_fraccion):
+    """Líneas del CSV del resultado y, si hay, la tabla de pasos a continuación.
+
+    El resultado se formatea al llamar (un error de formato se lanza antes de
+    empezar la descarga); los pasos se generan mientras se envían.
+    """
+    resultado = [_fila_csv(fila, text_fn) for fila in M]
+    return chain(resultado, _lineas_pasos_csv(pasos, text_fn))
+
+
+def _texto_real(n, d):
+    """n/d como real de MatrixMarket. Fuera del rango de float (el cociente
+    desborda o se anularía) se escribe en notación científica con 17 cifras."""
+    try:
+        x = n / d
+    except OverflowError:
+        x = None
+    if x is not None and (x != 0.0 or n == 0):
+        return repr(x)
+    with localcontext() as contexto:
+        contexto.prec = 17
+        return str(Decimal(n) / Decimal(d))
+
+
+def lineas_matrix_market(M):
+    """Líneas de un MatrixMarket 'array' (integer si todas las entradas son
+    enteras), formateadas al llamar para que los errores no corten la descarga."""
+    enteros = all(x[1] == 1 for fila in M for x in fila)
+    lineas = [
+        "%%MatrixMarket matrix array " + ("integer" if enteros else "real") + " general\n",
+        f"{len(M)} {len(M[0]) if M else 0}\n",
+    ]
+    for j in range(len(M[0]) if M else 0):
+        for fila in M:
+            n, d = fila[j]
+            lineas.append((str(n) if enteros else _texto_real(n, d)) + "\n")
+    return lineas
+
+
+def escribir_xlsx(destino, M, pasos=None, text_fn=u.texto_fraccion):
+    """Escribe el resultado (y una hoja con los pasos) en un libro XLSX.
+
+    Las entradas enteras se guardan como números y las fraccionarias como
+    texto para no perder exactitud.
+    """
+    try:
+        import openpyxl
+    except ImportError:
+        raise ErrorArchivo("Exportar a XLSX requiere el paquete openpyxl.")
+
+    def celdas(fila):
+        return [x if isinstance(x, str) else (x[0] if x[1] == 1 else text_fn(x)) for x in fila]
+
+    libro = openpyxl.Workbook(write_only=True)
+    hoja = libro.create_sheet("Resultado")
+    for fila in M:
+        hoja.append(celdas(fila))
+    if pasos:
+        hoja = libro.create_sheet("Pasos")
+        for k, paso in enumerate(pasos, start=1):
+            hoja.append([f"Paso {k}", paso.get("operacion", "")])
+            for fila in paso.get("matriz") or []:
+                hoja.append(celdas(fila))
+            hoja.append([])
+    libro.save(destino)
@@ -0,0 +1,234 @@
+"""Compilador ligero de expresiones f(x)
+
+Descripción:
+- Convierte el texto (ya normalizado a sintaxis de Python, con '**' para
+  potencia) en una función `f(x)` nativa sin pasar por SymPy.
+- Se apoya en el módulo `ast`: la expresión se analiza, se valida contra una
+  lista blanca de nodos, nombres y funciones, y se compila a un `lambda x: ...`
+  que sólo ve las funciones de `math` permitidas.
+- Cubre la gramática habitual: números, x, + - * / **, signos unarios,
+  funciones de math y los alias ln, sen, tg, ctg, lg, log10, log2, y las
+  constantes e, E y pi.
+
+Si la expresión usa algo fuera de esa gramática se lanza
+`ExpresionNoSoportada`; quien llama decide si recurrir a SymPy.
+"""
+import ast
+import math
+from fractions import Fraction
+from functools import lru_cache
+
+
+class ExpresionNoSoportada(ValueError):
+    """La expresión no pertenece a la gramática que compila este módulo."""
+    pass
+
+
+def _pot(base, exponente):
+    """Potencia real: evita que Python devuelva un complejo con base negativa."""
+    resultado = base ** exponente
+    if isinstance(resultado, complex):
+        raise ValueError("math domain error")
+    return resultado
+
+
+def _pot_racional(base, p, q):
+    """base**(p/q) con q impar como raíz real con signo (igual que la
+    reescritura copysign(|x|**(1/q), x)**p del camino con SymPy)."""
+    raiz = math.copysign(abs(base) ** (1.0 / q), base)
+    return raiz if p == 1 else raiz ** p
+
+
+def _cot(v):
+    return 1.0 / math.tan(v)
+
+
+def _sec(v):
+    return 1.0 / math.cos(v)
+
+
+def _csc(v):
+    return 1.0 / math.sin(v)
+
+
+def _log(v, base=None):
+    return math.log(v) if base is None else math.log(v, base)
+
+
+# nombre -> (función, aridades admitidas)
+_FUNCIONES = {
+    'sin': (math.sin, (1,)),
+    'sen': (math.sin, (1,)),
+    'cos': (math.cos, (1,)),
+    'tan': (math.tan, (1,)),
+    'tg': (math.tan, (1,)),
+    'cot': (_cot, (1,)),
+    'ctg': (_cot, (1,)),
+    'sec': (_sec, (1,)),
+    'csc': (_csc, (1,)),
+    'asin': (math.asin, (1,)),
+    'acos': (math.acos, (1,)),
+    'atan': (math.atan, (1,)),
+    'sinh': (math.sinh, (1,)),
+    'cosh': (math.cosh, (1,)),
+    'tanh': (math.tanh, (1,)),
+    'asinh': (math.asinh, (1,)),
+    'acosh': (math.acosh, (1,)),
+    'atanh': (math.atanh, (1,)),
+    'exp': (math.exp, (1,)),
+    'sqrt': (math.sqrt, (1,)),
+    'log': (_log, (1, 2)),
+    'ln': (math.log, (1,)),
+    'lg': (math.log10, (1,)),
+    'log10': (math.log10, (1,)),
+    'log2': (math.log2, (1,)),
+    'abs': (abs, (1,)),
+    'Abs': (abs, (1,)),
+}
+
+_CONSTANTES = {
+    'e': math.e,
+    'E': math.e,
+    'pi': math.pi,
+}
+
+_OPERADORES = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow)
+
+
+def _exponente_racional(nodo):
+    """Si `nodo` es una constante formada sólo por enteros y + - * /,
+    devuelve su valor exacto como Fraction; en otro caso None."""
+    if isinstance(nodo, ast.Constant):
+        if isinstance(nodo.value, int) and not isinstance(nodo.value, bool):
+            return Fraction(nodo.value)
+        return None
+    if isinstance(nodo, ast.UnaryOp) and isinstance(nodo.op, (ast.USub, ast.UAdd)):
+        v = _exponente_racional(nodo.operand)
+        if v is None:
+            return None
+        return -v if isinstance(nodo.op, ast.USub) else v
+    if isinstance(nodo, ast.BinOp) and isinstance(nodo.op, (ast.Add, ast.Sub, ast.Mult, ast.Div)):
+        a = _exponente_racional(nodo.left)
+        b = _exponente_racional(nodo.right)
+        if a is None or b is None:
+            return None
+        if isinstance(nodo.op, ast.Add):
+            return a + b
+        if isinstance(nodo.op, ast.Sub):
+            return a - b
+        if isinstance(nodo.op, ast.Mult):
+            return a * b
+        if b == 0:
+            return None
+        return a / b
+    return None
+
+
+class _Traductor(ast.NodeTransformer):
+    """Valida el árbol y lo reescribe a llamadas seguras."""
+
+    def generic_visit(self, nodo):
+        raise ExpresionNoSoportada(f"Construcción no soportada: {type(nodo).__name__}")
+
+    def visit_Expression(self, nodo):
+        return ast.Expression(body=self.visit(nodo.body))
+
+    def visit_Constant(self, nodo):
+        v = nodo.value
+        if isinstance(v, bool) or not isinstance(v, (int, float)):
+            raise ExpresionNoSoportada(f"Literal no soportado: {v!r}")
+        try:
+            return ast.Constant(value=float(v))
+        except OverflowError:
+            raise ExpresionNoSoportada("Literal numérico demasiado grande")
+
+    def visit_Name(self, nodo):
+        if nodo.id == 'x':
+            return ast.Name(id='x', ctx=ast.Load())
+        if nodo.id in _CONSTANTES:
+            return ast.Constant(value=_CONSTANTES[nodo.id])
+        raise ExpresionNoSoportada(f"Nombre no soportado: {nodo.id}")
+
+    def visit_UnaryOp(self, nodo):
+        if not isinstance(nodo.op, (ast.USub, ast.UAdd)):
+            raise ExpresionNoSoportada("Operador unario no soportado")
+        return ast.UnaryOp(op=nodo.op, operand=self.visit(nodo.operand))
+
+    def visit_BinOp(self, nodo):
+        if not isinstance(nodo.op, _OPERADORES):
+            raise ExpresionNoSoportada("Operador no soportado")
+        if isinstance(nodo.op, ast.Pow):
+            base = self.visit(nodo.left)
+            racional = _exponente_racional(nodo.right)
+            if racional is not None and racional.denominator % 2 == 1 and racional.denominator != 1:
+                return ast.Call(
+                    func=ast.Name(id='_pot_racional', ctx=ast.Load()),
+                    args=[base, ast.Constant(value=racional.numerator), ast.Constant(value=racional.denominator)],
+                    keywords=[],
+                )
+            return ast.Call(
+                func=ast.Name(id='_pot', ctx=ast.Load()),
+                args=[base, self.visit(nodo.right)],
+                keywords=[],
+            )
+        return ast.BinOp(left=self.visit(nodo.left), op=nodo.op, right=self.visit(nodo.right))
+
+    def visit_Call(self, nodo):
+        if not isinstance(nodo.func, ast.Name) or nodo.func.id not in _FUNCIONES:
+            raise ExpresionNoSoportada("Función no soportada")
+        if nodo.keywords:
+            raise ExpresionNoSoportada("Argumentos con nombre no soportados")
+        _fn, aridades = _FUNCIONES[nodo.func.id]
+        if len(nodo.args) not in aridades:
+            raise ExpresionNoSoportada(f"Número de argumentos inválido para {nodo.func.id}")
+        return ast.Call(
+            func=ast.Name(id='_fn_' + nodo.func.id, ctx=ast.Load()),
+            args=[self.visit(a) for a in nodo.args],
+            keywords=[],
+        )
+
+
+_ENTORNO = {'__builtins__': {}, '_pot': _pot, '_pot_racional': _pot_racional}
+_ENTORNO.update({'_fn_' + k: fn for k, (fn, _a) in _FUNCIONES.items()})
+
+
+@lru_cache(maxsize=256)
+def compilar_funcion(texto):
+    """Compila `texto` (sintaxis de Python, variable x) a una función f(x).
+
+    Devuelve un callable que recibe un float y devuelve un número. Lanza
+    ExpresionNoSoportada si el texto no se puede compilar con esta gramática.
+    """
+    if not texto or not texto.strip():
+        raise ExpresionNoSoportada("La expresión está vacía.")
+    try:
+        arbol = ast.parse(texto.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ExpresionNoSoportada(f"Sintaxis no soportada: {e}")
+    cuerpo = _Traductor().visit(arbol).body
+    funcion = ast.Expression(body=ast.Lambda(
+        args=ast.arguments(posonlyargs=[], args=[ast.arg(arg='x')], vararg=None,
+                           kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=[]),
+        body=cuerpo,
+    ))
+    ast.fix_missing_locations(funcion)
+    codigo = compile(funcion, '<funcion>', 'eval')
+    return eval(codigo, _ENTORNO)
+
+
+def evaluar_constante(texto):
+    """Valor float de una expresión numérica (sin x) con la misma gramática.
+
+    Las potencias se evalúan en coma flotante, así que entradas como
+    '9**9**9' fallan al instante en lugar de construir enteros enormes.
+    """
+    try:
+        arbol = ast.parse((texto or '').strip(), mode='eval')
+    except SyntaxError as e:
+        raise ExpresionNoSoportada(f"Sintaxis no soportada: {e}")
+    if any(isinstance(n, ast.Name) and n.id == 'x' for n in ast.walk(arbol)):
+        raise ExpresionNoSoportada("Se esperaba un número, no una expresión en x.")
+    try:
+        return float(compilar_funcion(texto)(0.0))
+    except OverflowError:
+        raise ValueError("El número es demasiado grande.")
@@ -0,0 +1,457 @@
+"""Plan optimizado para la secuencia de operaciones compuestas
+
+Descripción:
+- La secuencia del formulario (transpose, scale, mulb, sumb, sumbesc, lincomb,
+  inverse, sumi, checkli y las variantes *other sobre la matriz que no es la
+  fuente) se traduce a un DAG de expresiones sobre las hojas A y B. Los nodos
+  son tuplas inmutables: dos subexpresiones iguales son el mismo nodo y se
+  calculan una sola vez (subexpresiones comunes).
+- Al construir cada nodo se aplican reescrituras algebraicas:
+    (Xᵀ)ᵀ = X              c(dX) = (cd)X           1·X = X
+    (cX)ᵀ = c·Xᵀ           (cX)(dY) = cd(XY)       (cX)^{-1} = (1/c)X^{-1}
+    (X^{-1})^{-1} = X      (se comprueba |X| ≠ 0 en lugar de invertir dos veces)
+    (XY)^{-1} = Y^{-1}X^{-1} y (Xᵀ)^{-1} = (X^{-1})ᵀ si esas inversas ya están en el plan
+    aX + bY en un solo recorrido (sumb, sumbesc, lincomb y escalas previas)
+    (X^j)^k = X^{jk}       (cX)^k = c^k X^k        (Xᵀ)^k = (X^k)ᵀ      X^1 = X
+- Sólo se ejecutan los nodos alcanzables desde el resultado, y sólo esos
+  generan pasos. Las dimensiones se validan al construir el plan, con los
+  mismos mensajes que operaciones.py, aunque la operación se elimine después.
+  Igual con las inversas pedidas (inverse, inverseother, potencias negativas):
+  cada una deja una verificación ("invertible", X); si su nodo no se ejecuta,
+  se comprueba |X| ≠ 0 para dar el mismo error que la secuencia literal.
+- Los nodos se evalúan en orden topológico, sin recursión, y la secuencia
+  admite hasta MAXIMO_OPERACIONES operaciones.
+"""
+from . import admision
+from . import operaciones as op
+from . import perfil
+from .utilidades import (
+    texto_fraccion, crear_fraccion_desde_cadena, multiplicar_fracciones,
+    dividir_fracciones, sumar_fracciones, sumar_producto, es_cero, copiar_matriz,
+    potencia_fraccion, bits_matriz,
+)
+
+# Largo máximo de la etiqueta de un nodo en los pasos (si no, se usa "M")
+_LARGO_ETIQUETA = 40
+
+# Operaciones que puede tener una secuencia
+MAXIMO_OPERACIONES = 1000
+
+
+def _uno(c):
+    return c[0] == c[1]
+
+
+class Plan:
+    """DAG de la secuencia: nodos, reescrituras aplicadas y verificaciones."""
+
+    def __init__(self, hojas):
+        self.hojas = hojas            # {"A": matriz, "B": matriz}
+        self.nodos = set()            # nodos construidos (para saber qué inversas hay)
+        self.formas = {}
+        self.reescrituras = []
+        # ("invertible", X, nodo que la cubre o None) o ("li", X, None), en orden
+        self.verificaciones = []
+        self.raiz = None
+        self.pedidas = 0
+        self.ejecutadas = 0
+
+    def _nodo(self, nodo):
+        if nodo not in self.formas:
+            self.formas[nodo] = self._forma_nueva(nodo)
+        self.nodos.add(nodo)
+        return nodo
+
+    def _reescribir(self, regla):
+        if regla not in self.reescrituras:
+            self.reescrituras.append(regla)
+
+    def _forma_nueva(self, nodo):
+        # Los operandos ya están construidos: su forma está en self.formas
+        tipo = nodo[0]
+        if tipo == "hoja":
+            M = self.hojas[nodo[1]]
+            return (len(M), len(M[0]))
+        if tipo == "t":
+            m, n = self.formas[nodo[1]]
+            return (n, m)
+        if tipo == "mul":
+            return (self.formas[nodo[1]][0], self.formas[nodo[2]][1])
+        if tipo == "comb":
+            return self.formas[nodo[2]]
+        # esc, inv, masI, pot: misma forma que su operando
+        return self.formas[nodo[-1]]
+
+    def forma(self, nodo):
+        return self.formas[nodo]
+
+    def _cuadrada(self, x):
+        m, n = self.forma(x)
+        return m == n
+
+    # --- Constructores con reescrituras ---
+
+    def hoja(self, nombre):
+        M = self.hojas.get(nombre)
+        if not M:
+            raise ValueError(f"No hay matriz {nombre}.")
+        return self._nodo(("hoja", nombre))
+
+    def transpuesta(self, x):
+        if x[0] == "t":
+            self._reescribir("(Xᵀ)ᵀ = X")
+            return x[1]
+        if x[0] == "esc":
+            self._reescribir("(cX)ᵀ = c·Xᵀ")
+            return self.escalar(x[1], self.transpuesta(x[2]))
+        return self._nodo(("t", x))
+
+    def escalar(self, c, x):
+        c = tuple(c)
+        if _uno(c):
+            self._reescribir("1·X = X")
+            return x
+        if x[0] == "esc":
+            self._reescribir("c(dX) = (cd)X")
+            return self.escalar(multiplicar_fracciones(c, x[1]), x[2])
+        if x[0] == "comb":
+            self._reescribir("c(aX + bY) = (ca)X + (cb)Y")
+            return self._nodo(("comb", tuple(multiplicar_fracciones(c, x[1])), x[2],
+                               tuple(multiplicar_fracciones(c, x[3])), x[4]))
+        return self._nodo(("esc", c, x))
+
+    def producto(self, x, y):
+        if self.forma(x)[1] != self.forma(y)[0]:
+            raise ValueError("Para multiplicar, el número de columnas de A debe ser igual al número de filas de B.")
+        if x[0] == "esc" or y[0] == "esc":
+            self._reescribir("(cX)(dY) = cd(XY)")
+            c = (1, 1)
+            if x[0] == "esc":
+                c, x = x[1], x[2]
+            if y[0] == "esc":
+                c, y = multiplicar_fracciones(c, y[1]), y[2]
+            return self.escalar(c, self.producto(x, y))
+        return self._nodo(("mul", x, y))
+
+    def combinacion(self, a, x, b, y):
+        if self.forma(x) != self.forma(y):
+            raise ValueError("Para sumar, ambas matrices deben tener las mismas dimensiones.")
+        a, b = tuple(a), tuple(b)
+        if x[0] == "esc":
+            self._reescribir("a(cX) + bY = (ac)X + bY")
+            a, x = tuple(multiplicar_fracciones(a, x[1])), x[2]
+        if y[0] == "esc":
+            self._reescribir("a(cX) + bY = (ac)X + bY")
+            b, y = tuple(multiplicar_fracciones(b, y[1])), y[2]
+        if x == y:
+            self._reescribir("aX + bX = (a + b)X")
+            return self.escalar(sumar_fracciones(a, b), x)
+        return self._nodo(("comb", a, x, b, y))
+
+    def inversa(self, x):
+        if not self._cuadrada(x):
+            raise ValueError("A no es cuadrada.")
+        if x[0] == "inv":
+            self._reescribir("(X^{-1})^{-1} = X")
+            self.verificaciones.append(("invertible", x[1], None))
+            return x[1]
+        if x[0] == "esc" and not es_cero(x[1]):
+            self._reescribir("(cX)^{-1} = (1/c)X^{-1}")
+            return self.escalar(dividir_fracciones([1, 1], x[1]), self.inversa(x[2]))
+        if x[0] == "t" and ("inv", x[1]) in self.nodos:
+            self._reescribir("(Xᵀ)^{-1} = (X^{-1})ᵀ")
+            return self.transpuesta(("inv", x[1]))
+        if x[0] == "mul" and self._cuadrada(x[1]) \
+                and (("inv", x[1]) in self.nodos or ("inv", x[2]) in self.nodos):
+            self._reescribir("(XY)^{-1} = Y^{-1}X^{-1}")
+            return self.producto(self.inversa(x[2]), self.inversa(x[1]))
+        nodo = self._nodo(("inv", x))
+        self.verificaciones.append(("invertible", x, nodo))
+        return nodo
+
+    def potencia(self, k, x):
+        if not self._cuadrada(x):
+            raise ValueError("La matriz debe ser cuadrada para calcular A^k.")
+        # Antes de reescribir: (X^j)^k y c^k no deben crecer sin tope
+        if abs(k) > op.EXPONENTE_MAXIMO_POTENCIA:
+            raise ValueError(f"El exponente debe estar entre −{op.EXPONENTE_MAXIMO_POTENCIA} y {op.EXPONENTE_MAXIMO_POTENCIA}.")
+        if k == 1:
+            self._reescribir("X^1 = X")
+            return x
+        if x[0] == "pot":
+            self._reescribir("(X^j)^k = X^{jk}")
+            if x[1] < 0 <= x[1] * k:
+                # el resultado ya no invierte X, pero la secuencia pedida sí
+                self.verificaciones.append(("invertible", x[2], None))
+            return self.potencia(x[1] * k, x[2])
+        if x[0] == "esc" and (k > 0 or not es_cero(x[1])):
+            self._reescribir("(cX)^k = c^k X^k")
+            return self.escalar(potencia_fraccion(x[1], k), self.potencia(k, x[2]))
+        if x[0] == "t":
+            self._reescribir("(Xᵀ)^k = (X^k)ᵀ")
+            return self.transpuesta(self.potencia(k, x[1]))
+        nodo = self._nodo(("pot", k, x))
+        if k < 0:
+            self.verificaciones.append(("invertible", x, nodo))
+        return nodo
+
+    def mas_identidad(self, x):
+        if not self._cuadrada(x):
+            raise ValueError("Para sumar con I, la matriz debe ser cuadrada (n×n).")
+        return self._nodo(("masI", x))
+
+    def verificar_li(self, x):
+        self.verificaciones.append(("li", x, None))
+
+
+def _hijos(nodo):
+    tipo = nodo[0]
+    if tipo == "hoja":
+        return ()
+    if tipo == "mul":
+        return (nodo[1], nodo[2])
+    if tipo == "comb":
+        return (nodo[2], nodo[4])
+    if tipo in ("esc", "pot"):
+        return (nodo[2],)
+    return (nodo[1],)  # t, inv, masI
+
+
+def orden_topologico(raiz, hechos=()):
+    """Nodos alcanzables desde raiz que no están en `hechos`, cada operando
+    antes que el nodo que lo usa (el orden de una evaluación recursiva de
+    izquierda a derecha), sin recursión."""
+    vistos = set(hechos)
+    orden = []
+    pila = [(raiz, False)]
+    while pila:
+        nodo, listo = pila.pop()
+        if listo:
+            orden.append(nodo)
+            continue
+        if nodo in vistos:
+            continue
+        vistos.add(nodo)
+        pila.append((nodo, True))
+        for hijo in reversed(_hijos(nodo)):
+            if hijo not in vistos:
+                pila.append((hijo, False))
+    return orden
+
+
+def _productos_nodo(nodo, n, bits):
+    tipo = nodo[0]
+    if tipo == "mul":
+        return 1
+    if tipo == "inv":
+        return 2
+    if tipo == "pot":
+        e = abs(nodo[1])
+        # Cuadrados y productos sobre entradas de unos e·(bits + log2 n) bits,
+        # relativos a la escala de la entrada que ya aplica la admisión
+        escala = admision.escala_potencia(n, e, bits) / admision.escala_potencia(n, 1, bits)
+        return 2 * max(e.bit_length(), 1) * escala + (2 if nodo[1] < 0 else 0)
+    return 0  # t, esc, comb, masI: recorridos de n² entradas
+
+
+def productos_equivalentes(plan):
+    """Coste del plan en productos n×n (para la admisión): cuenta los nodos
+    que se evaluarán, con sus exponentes e inversas, y una eliminación por
+    cada verificación."""
+    bits = max(bits_matriz(M) for M in plan.hojas.values() if M)
+    vistos = set()
+    total = len(plan.verificaciones)
+    for raiz in [plan.raiz] + [x for _clase, x, _cubierta in plan.verificaciones]:
+        for nodo in orden_topologico(raiz, vistos):
+            vistos.add(nodo)
+            total += _productos_nodo(nodo, plan.forma(nodo)[0], bits)
+    return max(total, 1)
+
+
+def _escalar_texto(params, clave):
+    return crear_fraccion_desde_cadena((params.get(clave) or "0").strip())
+
+
+def _exponente_texto(params):
+    try:
+        return int(str(params.get("k") or "").strip())
+    except ValueError:
+        raise ValueError("El exponente k debe ser un entero.")
+
+
+def construir_plan(secuencia, A, B, fuente="A"):
+    """Traduce la secuencia del formulario a un Plan con su nodo raíz."""
+    plan = Plan({"A": A, "B": B})
+    nodo_a = plan.hoja("A") if A else None
+    nodo_b = plan.hoja("B") if B else None
+    otra = "B" if fuente == "A" else "A"
+    M = nodo_b if fuente == "B" else nodo_a
+    if M is None:
+        raise ValueError("La matriz fuente seleccionada está vacía.")
+    var = {"A": nodo_a, "B": nodo_b}
+
+    def requerir(nombre, mensaje):
+        if var[nombre] is None:
+            raise ValueError(mensaje)
+        return var[nombre]
+
+    if len(secuencia or []) > MAXIMO_OPERACIONES:
+        raise ValueError(f"La secuencia tiene demasiadas operaciones (máximo {MAXIMO_OPERACIONES}).")
+    for paso in (secuencia or []):
+        tipo = (paso.get("type") or "").lower()
+        params = paso.get("params") or {}
+        if tipo == "transpose":
+            M = plan.transpuesta(M)
+        elif tipo == "scale":
+            M = plan.escalar(_escalar_texto(params, "c"), M)
+        elif tipo == "mulb":
+            M = plan.producto(M, requerir("B", "No hay matriz B para multiplicar (M·B)."))
+        elif tipo == "sumb":
+            M = plan.combinacion((1, 1), M, (1, 1), requerir("B", "No hay matriz B para sumar (M+B)."))
+        elif tipo == "sumbesc":
+            nodo = requerir("B", "No hay matriz B para sumar (M + b·B).")
+            M = plan.combinacion((1, 1), M, _escalar_texto(params, "b"), nodo)
+        elif tipo in ("lincomb", "combinacion", "abcomb"):
+            if var["A"] is None or var["B"] is None:
+                raise ValueError("Se requieren A y B para a·A + b·B.")
+            M = plan.combinacion(_escalar_texto(params, "a"), var["A"], _escalar_texto(params, "b"), var["B"])
+        elif tipo == "inverse":
+            M = plan.inversa(M)
+        elif tipo == "scaleother":
+            c = _escalar_texto(params, "c")
+            var[otra] = plan.escalar(c, requerir(otra, f"No hay matriz {otra} para escalar."))
+        elif tipo == "transposeother":
+            var[otra] = plan.transpuesta(requerir(otra, f"No hay matriz {otra} para transponer."))
+        elif tipo == "inverseother":
+            var[otra] = plan.inversa(requerir(otra, f"No hay matriz {otra} para invertir."))
+        elif tipo == "power":
+            M = plan.potencia(_exponente_texto(params), M)
+        elif tipo == "sumi":
+            M = plan.mas_identidad(M)
+        elif tipo == "checkli":
+            plan.verificar_li(M)
+        else:
+            # Tipos desconocidos se ignoran
+            continue
+        plan.pedidas += 1
+    plan.raiz = M
+    return plan
+
+
+def _etiquetar(nodo, etiquetas, text_fn, largo):
+    """Etiqueta de `nodo` a partir de las de sus operandos; None si supera `largo`."""
+    hijos = [etiquetas[h] for h in _hijos(nodo)]
+    if None in hijos:
+        return None
+    tipo = nodo[0]
+    if tipo == "hoja":
+        texto = nodo[1]
+    elif tipo == "t":
+        texto = f"({hijos[0]})ᵀ"
+    elif tipo == "esc":
+        texto = f"{text_fn(list(nodo[1]))}·({hijos[0]})"
+    elif tipo == "mul":
+        texto = f"({hijos[0]})·({hijos[1]})"
+    elif tipo == "comb":
+        texto = f"{text_fn(list(nodo[1]))}·({hijos[0]}) + {text_fn(list(nodo[3]))}·({hijos[1]})"
+    elif tipo == "inv":
+        texto = f"({hijos[0]})^{{-1}}"
+    elif tipo == "masI":
+        texto = f"({hijos[0]}) + I"
+    elif tipo == "pot":
+        texto = f"({hijos[0]})^{nodo[1]}"
+    else:
+        texto = "M"
+    return texto if largo is None or len(texto) <= largo else None
+
+
+def etiqueta(nodo, text_fn=texto_fraccion):
+    """Texto legible de un nodo (p. ej. '2·(A·B)ᵀ')."""
+    etiquetas = {}
+    for n in orden_topologico(nodo):
+        etiquetas[n] = _etiquetar(n, etiquetas, text_fn, None)
+    return etiquetas[nodo]
+
+
+@perfil.medir("calculo")
+def ejecutar_plan(plan, registrar_pasos=False, text_fn=texto_fraccion):
+    """Evalúa el plan (cada nodo una vez). Retorna M o (M, pasos)."""
+    memo = {}
+    etiquetas = {}
+    pasos = []
+
+    def nombre(nodo):
+        return etiquetas.get(nodo) or "M"
+
+    def anotar(nodo, sub):
+        for s in sub or []:
+            pasos.append({"operacion": f"{nombre(nodo)}: {s.get('operacion')}", "matriz": s.get("matriz"), "tipo": s.get("tipo", "simple")})
+
+    def calcular(nodo):
+        tipo = nodo[0]
+        if tipo == "hoja":
+            R = plan.hojas[nodo[1]]
+        elif tipo == "t":
+            R = op.transponer_matriz(memo[nodo[1]], registrar_pasos=registrar_pasos, text_fn=text_fn)
+        elif tipo == "esc":
+            R = op.multiplicar_escalar_matriz(list(nodo[1]), memo[nodo[2]], registrar_pasos=registrar_pasos, text_fn=text_fn)
+        elif tipo == "mul":
+            R = op.multiplicar_matrices(memo[nodo[1]], memo[nodo[2]], registrar_pasos=registrar_pasos, text_fn=text_fn)
+        elif tipo == "comb":
+            a, X, b, Y = list(nodo[1]), memo[nodo[2]], list(nodo[3]), memo[nodo[4]]
+            if _uno(a):
+                R = [[sumar_producto(x, b, y) for x, y in zip(fx, fy)] for fx, fy in zip(X, Y)]
+            else:
+                R = [[sumar_producto(multiplicar_fracciones(a, x), b, y) for x, y in zip(fx, fy)] for fx, fy in zip(X, Y)]
+            if registrar_pasos:
+                R = (R, [{"operacion": f"Sumamos {text_fn(a)}·X + {text_fn(b)}·Y en un solo recorrido", "matriz": copiar_matriz(R)}])
+        elif tipo == "inv":
+            info = op.inversa_matriz(memo[nodo[1]], registrar_pasos=registrar_pasos, text_fn=text_fn)
+            sub = None
+            if isinstance(info, tuple):
+                info, sub = info
+            if not info.get("invertible"):
+                raise ValueError(info.get("razon", "La matriz no es invertible."))
+            R = (info.get("inversa"), sub) if registrar_pasos else info.get("inversa")
+        elif tipo == "masI":
+            R = copiar_matriz(memo[nodo[1]])
+            for i in range(len(R)):
+                R[i][i] = sumar_fracciones(R[i][i], [1, 1])
+            if registrar_pasos:
+                R = (R, [{"operacion": "Sumamos la identidad: M ← M + I", "matriz": copiar_matriz(R)}])
+        elif tipo == "pot":
+            R = op.potencia_matriz(memo[nodo[2]], nodo[1], registrar_pasos=registrar_pasos, text_fn=text_fn)
+        else:
+            raise ValueError(f"Nodo desconocido: {tipo}")
+        if isinstance(R, tuple):
+            R, sub = R
+            anotar(nodo, sub)
+        return R
+
+    def valor(nodo):
+        # Operandos antes que cada operación: ningún nodo se calcula dos veces
+        for n in orden_topologico(nodo, memo):
+            etiquetas[n] = _etiquetar(n, etiquetas, text_fn, _LARGO_ETIQUETA)
+            memo[n] = calcular(n)
+        return memo[nodo]
+
+    # Las inversas que sí se ejecutan validan por sí mismas
+    alcanzables = set(orden_topologico(plan.raiz))
+    for clase, nodo, cubierta in plan.verificaciones:
+        if clase == "invertible":
+            if cubierta in alcanzables or ("inv", nodo) in alcanzables:
+                continue
+            if es_cero(op.determinante_matriz(valor(nodo))):
+                raise ValueError(f"{nombre(nodo)} no es invertible (|X| = 0).")
+        elif registrar_pasos:
+            # Su único efecto es el paso informativo: sin pasos no se evalúa
+            try:
+                info = op.gauss_jordan_homogeneo_info(valor(nodo), registrar_pasos=False, text_fn=text_fn)
+            except Exception:
+                raise ValueError("No se pudo verificar independencia lineal para la matriz dada.")
+            es_li = bool(info.get("analisis", {}).get("independencia", False))
+            detalle = "Vectores columna LI (independientes)" if es_li else "Vectores columna LD (dependientes)"
+            pasos.append({"operacion": f"Verificación de independencia lineal: {detalle}", "matriz": info.get("matriz")})
+    M = valor(plan.raiz)
+    plan.ejecutadas = sum(1 for nodo in memo if nodo[0] != "hoja")
+    return (M, pasos) if registrar_pasos else M
@@ -26,13 +26,16 @@ Notas
 -----
 - Acepta alias: ln->log, sen->sin, tg->tan, ctg->cot, lg->log10, e->E, pi->pi
 - Si el usuario introduce una ecuación lhs = rhs, se normaliza como (lhs)-(rhs)
-- Requiere sympy instalado (está listado en requirements.txt)
+- Requiere sympy instalado (está listado en requirements.txt); se importa
+  bajo demanda a través de simbolico.py
 """
 from __future__ import annotations
 
 import math
 from typing import Callable, Dict, Any
 
+from . import simbolico
+
 class ErrorDerivada(ValueError):
     """Excepción para errores de parseo/derivación/evaluación."""
     pass
@@ -68,7 +71,7 @@ def _normalizar_texto_funcion(s: str) -> str:
 
 def _parse_sympy_expr(texto: str):
     try:
-        import sympy as sp
+        sp = simbolico.sympy()
     except Exception as e:
         raise ErrorDerivada(f"Sympy no disponible para derivar: {e}")
 
@@ -129,7 +132,7 @@ def _parse_sympy_expr(texto: str):
 def crear_evaluador(texto_funcion: str) -> Callable[[float], float]:
     """Devuelve un evaluador numérico para f(x). Usa math como backend."""
     try:
-        import sympy as sp
+        sp = simbolico.sympy()
     except Exception as e:
         raise ErrorDerivada(f"Sympy no disponible: {e}")
     x, expr = _parse_sympy_expr(texto_funcion)
@@ -168,7 +171,7 @@ def derivar_funcion(texto_funcion: str, orden: int = 1, simplificar: bool = True
         raise ErrorDerivada("El orden de la derivada debe ser un entero no negativo.")
 
     try:
-        import sympy as sp
+        sp = simbolico.sympy()
     except Exception as e:
         raise ErrorDerivada(f"Sympy no disponible: {e}")
 
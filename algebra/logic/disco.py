@@ -0,0 +1,448 @@
+"""Matrices de punto flotante en disco (memoria mapeada) para entradas muy grandes
+
+Descripción:
+- Una matriz 2000×2000 como listas de fracciones [n, d] ocupa gigabytes; aquí se
+  guarda como doubles (8 bytes) por filas en un archivo temporal mapeado con
+  mmap. En memoria sólo viven las filas que se están operando.
+- Lectores en streaming para archivos subidos: CSV, .npy y MatrixMarket.
+- Motores de punto flotante que trabajan directamente sobre el archivo:
+  eliminación de Gauss (con pivoteo parcial), determinante y multiplicación.
+- Si NumPy está instalado se usa np.memmap por bloques de filas; si no, se
+  trabaja fila a fila con array('d') de la biblioteca estándar.
+- LIMITES acota las entradas de cada matriz antes de reservar el archivo
+  (la cabecera de un .mtx o .npy no puede pedir gigabytes) y el lado de las
+  matrices que aceptan los motores O(n³), bastante menor sin NumPy.
+  costo(...) estima el trabajo de una operación para el control de admisión.
+
+Estos motores son numéricos (no exactos): los resultados llevan el error de
+redondeo propio de la aritmética en coma flotante.
+"""
+import ast
+import math
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+
+from .archivos import ErrorArchivo, _texto, _separar, entradas_matrix_market
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+_DOUBLE = struct.Struct("d")
+_TAM = _DOUBLE.size
+
+# Filas por bloque en las operaciones con NumPy (acota la memoria temporal)
+BLOQUE_FILAS = 256
+
+# Tipos de .npy admitidos → código de array
+_TIPOS_NPY = {"f8": "d", "f4": "f", "i8": "q", "i4": "i", "i2": "h", "i1": "b", "u1": "B"}
+
+# Límites por proceso. Se pueden sobrescribir parcialmente con el dict
+# settings.ALGEBRA_DISCO (ver algebra/apps.py).
+LIMITES = {
+    "celdas_maximas": 4_000_000,    # entradas de cada matriz (2000×2000: 32 MB)
+    "dimension_numpy": 2000,        # lado máximo en los motores O(n³) con NumPy
+    "dimension_python": 300,        # ídem sin NumPy (fila a fila en Python)
+}
+
+# Una operación de coma flotante cuesta mucho menos que una de fracción (la
+# unidad de admision.py): en Python puro, unas 10 veces menos; con NumPy,
+# vectorizada, del orden de mil.
+_FACTOR_PYTHON = 0.1
+_FACTOR_NUMPY = 0.001
+
+
+class ErrorArchivoMatriz(ErrorArchivo):
+    """Error de formato o contenido en un archivo de matriz."""
+
+
+def configurar(limites):
+    """Sobrescribe LIMITES (p. ej. desde settings)."""
+    LIMITES.update(limites or {})
+
+
+def validar_tamano(filas, columnas):
+    """Rechaza dimensiones fuera de rango antes de reservar el archivo."""
+    if filas < 1 or columnas < 1:
+        raise ErrorArchivoMatriz("La matriz no puede ser vacía.")
+    if filas * columnas > LIMITES["celdas_maximas"]:
+        raise ErrorArchivoMatriz(
+            f"La matriz tiene {filas}×{columnas} entradas; el máximo es {LIMITES['celdas_maximas']}."
+        )
+
+
+def dimension_maxima():
+    """Lado máximo que aceptan determinante, Gauss y multiplicación."""
+    return LIMITES["dimension_numpy"] if np is not None else LIMITES["dimension_python"]
+
+
+def _validar_dimension(*lados):
+    maximo = dimension_maxima()
+    if max(lados) > maximo:
+        detalle = "" if np is not None else " (sin NumPy instalado en el servidor)"
+        raise ErrorArchivoMatriz(
+            f"La operación admite matrices de hasta {maximo} filas y columnas{detalle}."
+        )
+
+
+def costo(operacion, A, B=None):
+    """Trabajo estimado de `operacion`, en las unidades de admision.py."""
+    if operacion == "multiplicacion":
+        flops = A.filas * A.columnas * (B.columnas if B is not None else A.columnas)
+    else:
+        # Eliminación: determinante y gauss
+        flops = min(A.filas, A.columnas) * A.filas * A.columnas
+    return flops * (_FACTOR_NUMPY if np is not None else _FACTOR_PYTHON)
+
+
+class MatrizDisco:
+    """Matriz m×n de doubles guardada por filas en un archivo mapeado en memoria.
+
+    El archivo es temporal y se borra con cerrar() (o al salir de un bloque with).
+    """
+
+    def __init__(self, filas, columnas, ruta=None):
+        validar_tamano(filas, columnas)
+        self.filas = filas
+        self.columnas = columnas
+        tam = filas * columnas * _TAM
+        if ruta is None:
+            fd, ruta = tempfile.mkstemp(prefix="matriz_", suffix=".f64")
+            os.ftruncate(fd, tam)
+            os.close(fd)
+        self.ruta = ruta
+        self._archivo = open(ruta, "r+b")
+        if os.fstat(self._archivo.fileno()).st_size < tam:
+            self._archivo.truncate(tam)
+        self._mapa = mmap.mmap(self._archivo.fileno(), tam)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def valor(self, i, j):
+        return _DOUBLE.unpack_from(self._mapa, (i * self.columnas + j) * _TAM)[0]
+
+    def fijar(self, i, j, v):
+        _DOUBLE.pack_into(self._mapa, (i * self.columnas + j) * _TAM, v)
+
+    def leer_fila(self, i):
+        """Copia de la fila i como array('d')."""
+        a = (i * self.columnas) * _TAM
+        fila = array("d")
+        fila.frombytes(self._mapa[a:a + self.columnas * _TAM])
+        return fila
+
+    def escribir_fila(self, i, fila):
+        a = (i * self.columnas) * _TAM
+        self._mapa[a:a + self.columnas * _TAM] = fila.tobytes()
+
+    def vista(self, filas=None, columnas=None):
+        """Esquina superior izquierda como listas de float (para mostrar)."""
+        filas = min(self.filas, filas or self.filas)
+        columnas = min(self.columnas, columnas or self.columnas)
+        return [list(self.leer_fila(i)[:columnas]) for i in range(filas)]
+
+    def como_numpy(self):
+        return np.memmap(self.ruta, dtype=np.float64, mode="r+", shape=(self.filas, self.columnas))
+
+    def copia(self, columnas_extra=0):
+        """Copia en otro archivo temporal (con columnas de ceros añadidas)."""
+        C = MatrizDisco(self.filas, self.columnas + columnas_extra)
+        ceros = array("d", bytes(columnas_extra * _TAM))
+        for i in range(self.filas):
+            C.escribir_fila(i, self.leer_fila(i) + ceros)
+        return C
+
+    def cerrar(self):
+        if self._mapa is None:
+            return
+        self._mapa.close()
+        self._archivo.close()
+        self._mapa = None
+        try:
+            os.remove(self.ruta)
+        except OSError:
+            pass
+
+
+# --- Lectores en streaming ---------------------------------------------------
+
+def _a_flotante(token, fila):
+    try:
+        return float(token)
+    except ValueError:
+        if "/" in token:
+            num, _, den = token.partition("/")
+            try:
+                return float(num) / float(den)
+            except (ValueError, ZeroDivisionError):
+                pass
+    raise ErrorArchivoMatriz(f"Fila {fila}: valor no numérico '{token}'.")
+
+
+def leer_csv(flujo):
+    """Lee una matriz desde líneas CSV (coma, punto y coma, tabulador o espacios)."""
+    fd, ruta = tempfile.mkstemp(prefix="matriz_", suffix=".f64")
+    filas = 0
+    columnas = None
+    try:
+        with os.fdopen(fd, "wb") as salida:
+            for linea in flujo:
+                linea = _texto(linea)
+                if not linea or linea.startswith("#"):
+                    continue
+                tokens = _separar(linea)
+                if columnas is None:
+                    columnas = len(tokens)
+                elif len(tokens) != columnas:
+                    raise ErrorArchivoMatriz("Todas las filas deben tener la misma cantidad de columnas.")
+                filas += 1
+                validar_tamano(filas, columnas)
+                salida.write(array("d", [_a_flotante(t, filas) for t in tokens]).tobytes())
+        if not filas:
+            raise ErrorArchivoMatriz("La matriz no puede ser vacía.")
+        return MatrizDisco(filas, columnas, ruta)
+    except Exception:
+        os.remove(ruta)
+        raise
+
+
+def _leer_exacto(flujo, n):
+    datos = flujo.read(n)
+    if len(datos) != n:
+        raise ErrorArchivoMatriz("Archivo .npy truncado.")
+    return datos
+
+
+def leer_npy(flujo):
+    """Lee un .npy 1-D o 2-D (orden C) de floats o enteros."""
+    if _leer_exacto(flujo, 6) != b"\x93NUMPY":
+        raise ErrorArchivoMatriz("El archivo no es un .npy válido.")
+    version = _leer_exacto(flujo, 2)[0]
+    tam_cabecera = struct.unpack("<H" if version == 1 else "<I", _leer_exacto(flujo, 2 if version == 1 else 4))[0]
+    try:
+        cabecera = ast.literal_eval(_leer_exacto(flujo, tam_cabecera).decode("latin1"))
+        descr = cabecera["descr"]
+        forma = tuple(cabecera["shape"])
+        fortran = cabecera["fortran_order"]
+    except (ValueError, SyntaxError, KeyError, TypeError):
+        raise ErrorArchivoMatriz("Cabecera .npy inválida.")
+    codigo = _TIPOS_NPY.get(descr[1:]) if isinstance(descr, str) else None
+    if codigo is None:
+        raise ErrorArchivoMatriz(f"Tipo de dato .npy no soportado: {descr}.")
+    if fortran:
+        raise ErrorArchivoMatriz("Sólo se admiten .npy en orden C (fortran_order=False).")
+    if len(forma) == 1:
+        forma = (1, forma[0])
+    if len(forma) != 2:
+        raise ErrorArchivoMatriz("El .npy debe ser una matriz (1 o 2 dimensiones).")
+    filas, columnas = forma
+    invertir = descr[0] == (">" if struct.pack("=H", 1) == b"\x01\x00" else "<")
+    M = MatrizDisco(filas, columnas)
+    try:
+        tam = array(codigo).itemsize
+        for i in range(filas):
+            fila = array(codigo)
+            fila.frombytes(_leer_exacto(flujo, columnas * tam))
+            if invertir:
+                fila.byteswap()
+            M.escribir_fila(i, fila if codigo == "d" else array("d", fila))
+    except Exception:
+        M.cerrar()
+        raise
+    return M
+
+
+def leer_matrix_market(flujo):
+    """Lee un archivo MatrixMarket (array o coordinate; general o simétrica)."""
+    filas, columnas, simetria, entradas = entradas_matrix_market(flujo)
+    signo = -1.0 if simetria == "skew-symmetric" else 1.0
+    M = MatrizDisco(filas, columnas)
+    try:
+        for i, j, texto in entradas:
+            v = 1.0 if texto is None else _a_flotante(texto, i + 1)
+            M.fijar(i, j, v)
+            if simetria != "general" and i != j:
+                M.fijar(j, i, signo * v)
+    except Exception:
+        M.cerrar()
+        raise
+    return M
+
+
+def leer_archivo(nombre, flujo):
+    """Elige el lector por la extensión del nombre de archivo."""
+    ext = os.path.splitext(nombre or "")[1].lower()
+    if ext == ".npy":
+        return leer_npy(flujo)
+    if ext in (".mtx", ".mm"):
+        return leer_matrix_market(flujo)
+    if ext in (".csv", ".txt", ".tsv", ""):
+        return leer_csv(flujo)
+    raise ErrorArchivoMatriz(f"Formato de archivo no soportado: {ext}.")
+
+
+# --- Motores de punto flotante ------------------------------------------------
+
+def _maximo_abs(M):
+    return max(max(map(abs, M.leer_fila(i))) for i in range(M.filas))
+
+
+def _eliminar(M, ncols, tol):
+    """Eliminación hacia adelante con pivoteo parcial, en el propio archivo.
+
+    Devuelve (pivotes, signo) con pivotes = [(fila, columna, valor)].
+    """
+    if np is not None:
+        return _eliminar_numpy(M, ncols, tol)
+    m, n = M.filas, M.columnas
+    signo = 1
+    pivotes = []
+    r = 0
+    for k in range(ncols):
+        if r >= m:
+            break
+        mejor, p = 0.0, -1
+        for i in range(r, m):
+            v = abs(M.valor(i, k))
+            if v > mejor:
+                mejor, p = v, i
+        if p == -1 or mejor <= tol:
+            continue
+        fila_p = M.leer_fila(p)
+        if p != r:
+            M.escribir_fila(p, M.leer_fila(r))
+            M.escribir_fila(r, fila_p)
+            signo = -signo
+        piv = fila_p[k]
+        for i in range(r + 1, m):
+            a = M.valor(i, k)
+            if a != 0.0:
+                f = a / piv
+                fila = M.leer_fila(i)
+                for j in range(k + 1, n):
+                    fila[j] -= f * fila_p[j]
+                fila[k] = 0.0
+                M.escribir_fila(i, fila)
+        pivotes.append((r, k, piv))
+        r += 1
+    return pivotes, signo
+
+
+def _eliminar_numpy(M, ncols, tol):
+    A = M.como_numpy()
+    m = M.filas
+    signo = 1
+    pivotes = []
+    r = 0
+    for k in range(ncols):
+        if r >= m:
+            break
+        col = np.abs(A[r:, k])
+        p = r + int(np.argmax(col))
+        if col[p - r] <= tol:
+            continue
+        if p != r:
+            A[[r, p]] = A[[p, r]]
+            signo = -signo
+        fila_p = np.array(A[r, k:])
+        piv = float(fila_p[0])
+        for ini in range(r + 1, m, BLOQUE_FILAS):
+            bloque = A[ini:ini + BLOQUE_FILAS, k:]
+            bloque -= np.outer(bloque[:, 0] / piv, fila_p)
+        pivotes.append((r, k, piv))
+        r += 1
+    A.flush()
+    del A
+    return pivotes, signo
+
+
+def determinante_disco(M):
+    """Determinante en coma flotante de una MatrizDisco cuadrada (no la modifica).
+
+    Devuelve dict con det (puede desbordar a ±inf), signo y log10 de |det|.
+    """
+    if M.filas != M.columnas:
+        raise ErrorArchivoMatriz("A debe ser cuadrada para calcular |A|.")
+    _validar_dimension(M.filas)
+    with M.copia() as T:
+        pivotes, signo = _eliminar(T, T.columnas, 0.0)
+    if len(pivotes) < M.filas:
+        return {"det": 0.0, "signo": 0, "log10_abs": None}
+    log10_abs = 0.0
+    for _r, _k, piv in pivotes:
+        if piv < 0:
+            signo = -signo
+        log10_abs += math.log10(abs(piv))
+    det = signo * 10.0 ** log10_abs if log10_abs < 308 else signo * math.inf
+    return {"det": det, "signo": signo, "log10_abs": log10_abs}
+
+
+def gauss_disco(M, tol=None):
+    """Resuelve el sistema con matriz aumentada M = (A|b) en coma flotante.
+
+    Devuelve dict con solucion ('UNICA', 'INFINITAS', 'INCONSISTENTE'), rango,
+    pivotes (columnas) y x (sólo si la solución es única).
+    """
+    n = M.columnas - 1
+    if n < 1:
+        raise ErrorArchivoMatriz("La matriz aumentada necesita al menos una columna en A.")
+    _validar_dimension(M.filas, n)
+    if tol is None:
+        tol = max(M.filas, n) * 2.220446049250313e-16 * _maximo_abs(M)
+    with M.copia() as T:
+        pivotes, _signo = _eliminar(T, n, tol)
+        rango = len(pivotes)
+        inconsistente = any(abs(T.valor(i, n)) > tol for i in range(rango, T.filas))
+        info = {"rango": rango, "pivotes": [k for _r, k, _p in pivotes]}
+        if inconsistente:
+            info["solucion"] = "INCONSISTENTE"
+        elif rango < n:
+            info["solucion"] = "INFINITAS"
+        else:
+            x = [0.0] * n
+            for r, k, piv in reversed(pivotes):
+                fila = T.leer_fila(r)
+                s = fila[n]
+                for j in range(k + 1, n):
+                    s -= fila[j] * x[j]
+                x[k] = s / piv
+            info["solucion"] = "UNICA"
+            info["x"] = x
+    return info
+
+
+def multiplicar_disco(A, B):
+    """Producto A·B como nueva MatrizDisco (el llamador debe cerrarla)."""
+    if A.columnas != B.filas:
+        raise ErrorArchivoMatriz("Para multiplicar, columnas de A deben ser igual a filas de B.")
+    _validar_dimension(A.filas, A.columnas, B.columnas)
+    C = MatrizDisco(A.filas, B.columnas)
+    try:
+        if np is not None:
+            An, Bn, Cn = A.como_numpy(), B.como_numpy(), C.como_numpy()
+            for ini in range(0, A.filas, BLOQUE_FILAS):
+                Cn[ini:ini + BLOQUE_FILAS] = An[ini:ini + BLOQUE_FILAS] @ Bn
+            Cn.flush()
+            del An, Bn, Cn
+            return C
+        ceros = bytes(B.columnas * _TAM)
+        for i in range(A.filas):
+            acumulado = array("d", ceros)
+            for k, a in enumerate(A.leer_fila(i)):
+                if a != 0.0:
+                    fila_b = B.leer_fila(k)
+                    for j in range(B.columnas):
+                        acumulado[j] += a * fila_b[j]
+            C.escribir_fila(i, acumulado)
+    except Exception:
+        C.cerrar()
+        raise
+    return C
@@ -0,0 +1,147 @@
+"""Detección de estructura de matrices cuadradas (en un solo recorrido)
+
+Descripción:
+- analizar_estructura(A) recorre A una vez y devuelve un dict con:
+    diagonal, triangular_superior, triangular_inferior, identidad,
+    permutacion   -> lista p con A[i][p[i]] ≠ 0 el único no nulo de la fila i
+                     y de su columna (matriz monomial), o None
+    simetrica     -> A = Aᵀ (inversa y Cramer por barrido simétrico, sobre
+                     medio triángulo)
+    banda         -> (ancho inferior, ancho superior)
+    bloques       -> [(inicio, fin), ...] bloques diagonales contiguos (fin exclusivo)
+- El resultado (O(n) de memoria) se guarda en una caché LRU indexada por una
+  huella SHA-256 del contenido, de modo que analizar la misma matriz (p. ej.
+  inversa y determinante de A en compuestas) no repite el recorrido. La caché
+  no guarda copias de las matrices, y las de más de CELDAS_CACHE entradas no
+  pasan por ella.
+
+operaciones.py usa este análisis para atajos O(n) u O(n²) en determinante,
+inversa y Cramer, y para el barrido simétrico (n³/2 operaciones enteras en
+lugar de las 2n³ de Gauss-Jordan) en inversa y Cramer.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Análisis que se recuerdan
+TAM_CACHE = 64
+
+# Matrices más grandes se analizan sin caché: la huella costaría casi lo
+# mismo que el recorrido
+CELDAS_CACHE = 10_000
+
+_cache = OrderedDict()
+_cerrojo = threading.Lock()
+
+
+def _huella(A):
+    h = hashlib.sha256()
+    for fila in A:
+        h.update(",".join(f"{x[0]}/{x[1]}" for x in fila).encode())
+        h.update(b";")
+    return h.digest()
+
+
+def _analizar(A):
+    n = len(A)
+    inferior = 0
+    superior = 0
+    identidad = True
+    # última columna no nula de cada fila y última fila no nula de cada columna
+    fin_fila = list(range(n))
+    fin_columna = list(range(n))
+    columna_de = [-1] * n      # columna del único no nulo de cada fila
+    fila_de = [-1] * n         # fila del único no nulo de cada columna
+    monomial = True
+    simetrica = True
+    for i, fila in enumerate(A):
+        for j, x in enumerate(fila):
+            if i == j:
+                if x[0] != 1 or x[1] != 1:
+                    identidad = False
+            elif j < i and simetrica:
+                y = A[j][i]
+                if x[0] != y[0] or x[1] != y[1]:
+                    simetrica = False
+            if x[0] == 0:
+                continue
+            if i != j:
+                identidad = False
+                if i > j:
+                    inferior = max(inferior, i - j)
+                else:
+                    superior = max(superior, j - i)
+            if j > fin_fila[i]:
+                fin_fila[i] = j
+            if i > fin_columna[j]:
+                fin_columna[j] = i
+            if monomial:
+                if columna_de[i] != -1 or fila_de[j] != -1:
+                    monomial = False
+                else:
+                    columna_de[i] = j
+                    fila_de[j] = i
+    if monomial and -1 in columna_de:
+        monomial = False
+    # Bloques diagonales: el bloque termina en k cuando nada de las filas o
+    # columnas ≤ k alcanza más allá de k.
+    bloques = []
+    inicio = 0
+    alcance = 0
+    for k in range(n):
+        alcance = max(alcance, fin_fila[k], fin_columna[k])
+        if alcance == k:
+            bloques.append((inicio, k + 1))
+            inicio = k + 1
+    return {
+        "n": n,
+        "identidad": identidad,
+        "diagonal": inferior == 0 and superior == 0,
+        "triangular_superior": inferior == 0,
+        "triangular_inferior": superior == 0,
+        "permutacion": tuple(columna_de) if monomial else None,
+        "simetrica": simetrica,
+        "banda": (inferior, superior),
+        "bloques": tuple(bloques),
+    }
+
+
+def analizar_estructura(A):
+    """Estructura de la matriz cuadrada A (ver docstring del módulo)."""
+    if len(A) * len(A) > CELDAS_CACHE:
+        return _analizar(A)
+    clave = _huella(A)
+    with _cerrojo:
+        est = _cache.get(clave)
+        if est is not None:
+            _cache.move_to_end(clave)
+            return dict(est)
+    est = _analizar(A)
+    with _cerrojo:
+        _cache[clave] = est
+        if len(_cache) > TAM_CACHE:
+            _cache.popitem(last=False)
+    return dict(est)
+
+
+def vaciar_cache():
+    with _cerrojo:
+        _cache.clear()
+
+
+def signo_permutacion(p):
+    """+1 o −1 según la paridad de la permutación p (por ciclos, O(n))."""
+    visto = [False] * len(p)
+    signo = 1
+    for i in range(len(p)):
+        if visto[i]:
+            continue
+        largo = 0
+        j = i
+        while not visto[j]:
+            visto[j] = True
+            j = p[j]
+            largo += 1
+        if largo % 2 == 0:
+            signo = -signo
+    return signo
@@ -0,0 +1,219 @@
+"""Muestreo de funciones para las gráficas de los métodos numéricos
+
+Descripción:
+- `muestrear_funcion` parte de una malla uniforme gruesa y refina por rondas
+  los intervalos donde la curva se dobla, cambia de signo o sale del dominio,
+  sin superar un presupuesto fijo de evaluaciones de f.
+- Los polos (cambio de signo con valores muy grandes a ambos lados) se
+  separan con None para que Plotly corte la línea en lugar de unir +∞ con −∞.
+- `reducir_lttb` reduce la serie final con Largest-Triangle-Three-Buckets,
+  que conserva la forma visual con muchos menos puntos para enviar al cliente.
+"""
+import math
+
+# Valores por defecto pensados para la ventana de ~400 px de las plantillas
+PUNTOS_INICIALES = 65
+PRESUPUESTO = 300
+PUNTOS_SALIDA = 220
+# Score mínimo (en unidades normalizadas de la ventana) para seguir refinando
+UMBRAL_REFINAMIENTO = 1e-4
+# |y| por encima de FACTOR_POLO × escala visible a ambos lados de un cambio de signo ⇒ polo
+FACTOR_POLO = 4.0
+
+
+def _evaluar_seguro(f, x):
+    try:
+        y = float(f(x))
+    except Exception:
+        return None
+    if math.isnan(y) or math.isinf(y):
+        return None
+    return y
+
+
+def _escala_y(ys):
+    """Rango vertical robusto (percentiles 5–95) para que un polo no aplaste la escala."""
+    finitos = sorted(y for y in ys if y is not None)
+    if not finitos:
+        return 0.0, 1.0
+    k = len(finitos)
+    bajo = finitos[int(0.05 * (k - 1))]
+    alto = finitos[int(round(0.95 * (k - 1)))]
+    escala = alto - bajo
+    if escala <= 1e-12:
+        escala = max(abs(alto), 1.0)
+    return bajo, escala
+
+
+def _puntuaciones(xs, ys, ancho, escala):
+    """Score por intervalo [xs[i], xs[i+1]]: cuánto ganaría la gráfica al partirlo."""
+    n = len(xs)
+    scores = [0.0] * (n - 1)
+    for i in range(n - 1):
+        w = (xs[i + 1] - xs[i]) / ancho
+        ya = ys[i]
+        yb = ys[i + 1]
+        if ya is None and yb is None:
+            continue
+        if ya is None or yb is None:
+            # frontera del dominio: localizarla con precisión
+            scores[i] = 4.0 * w
+            continue
+        if (ya < 0.0 < yb) or (yb < 0.0 < ya):
+            # cruce por cero (raíz o polo)
+            scores[i] = 4.0 * w
+            continue
+        # curvatura: desvío de cada extremo respecto de la recta que une sus vecinos
+        dev = 0.0
+        for j in (i, i + 1):
+            if 0 < j < n - 1 and ys[j - 1] is not None and ys[j + 1] is not None:
+                x0, x1, x2 = xs[j - 1], xs[j], xs[j + 1]
+                t = (x1 - x0) / (x2 - x0)
+                lineal = ys[j - 1] + t * (ys[j + 1] - ys[j - 1])
+                dev = max(dev, abs(ys[j] - lineal) / escala)
+        scores[i] = w * min(dev, 10.0)
+    return scores
+
+
+def _separar_polos(xs, ys, escala, base):
+    """Inserta None entre dos puntos consecutivos que encierran un polo."""
+    limite = FACTOR_POLO * escala
+    centro = base + escala / 2.0
+    out_x = [xs[0]]
+    out_y = [ys[0]]
+    for i in range(1, len(xs)):
+        ya = ys[i - 1]
+        yb = ys[i]
+        if ya is not None and yb is not None and ya * yb < 0.0:
+            if abs(ya - centro) > limite and abs(yb - centro) > limite:
+                out_x.append((xs[i - 1] + xs[i]) / 2.0)
+                out_y.append(None)
+        out_x.append(xs[i])
+        out_y.append(yb)
+    return out_x, out_y
+
+
+def _lttb_segmento(xs, ys, n_out):
+    n = len(xs)
+    if n_out >= n or n_out < 3:
+        return list(xs), list(ys)
+    out_x = [xs[0]]
+    out_y = [ys[0]]
+    tam = (n - 2) / (n_out - 2)
+    a = 0
+    for k in range(n_out - 2):
+        ini = int(k * tam) + 1
+        fin = int((k + 1) * tam) + 1
+        # promedio del siguiente cubo (o el último punto)
+        sig_ini = fin
+        sig_fin = min(int((k + 2) * tam) + 1, n)
+        if sig_ini >= n - 1 or sig_fin <= sig_ini:
+            px, py = xs[n - 1], ys[n - 1]
+        else:
+            cuenta = sig_fin - sig_ini
+            px = sum(xs[sig_ini:sig_fin]) / cuenta
+            py = sum(ys[sig_ini:sig_fin]) / cuenta
+        ax, ay = xs[a], ys[a]
+        mejor = -1.0
+        elegido = ini
+        for j in range(ini, min(fin, n - 1)):
+            area = abs((ax - px) * (ys[j] - ay) - (ax - xs[j]) * (py - ay))
+            if area > mejor:
+                mejor = area
+                elegido = j
+        out_x.append(xs[elegido])
+        out_y.append(ys[elegido])
+        a = elegido
+    out_x.append(xs[n - 1])
+    out_y.append(ys[n - 1])
+    return out_x, out_y
+
+
+def reducir_lttb(xs, ys, n_out=PUNTOS_SALIDA):
+    """Reduce la serie a ~n_out puntos con LTTB respetando los cortes (None).
+
+    Cada tramo continuo recibe una cuota de puntos proporcional a su longitud.
+    """
+    if len(xs) <= n_out:
+        return list(xs), list(ys)
+    tramos = []
+    actual = []
+    for x, y in zip(xs, ys):
+        if y is None:
+            if actual:
+                tramos.append(actual)
+                actual = []
+            tramos.append(None)
+        else:
+            actual.append((x, y))
+    if actual:
+        tramos.append(actual)
+    total = sum(len(t) for t in tramos if t)
+    out_x = []
+    out_y = []
+    for t in tramos:
+        if t is None:
+            if out_y and out_y[-1] is not None:
+                out_x.append(out_x[-1])
+                out_y.append(None)
+            continue
+        cuota = max(2, int(round(n_out * len(t) / total))) if total else len(t)
+        tx, ty = _lttb_segmento([p[0] for p in t], [p[1] for p in t], cuota)
+        out_x.extend(tx)
+        out_y.extend(ty)
+    return out_x, out_y
+
+
+def _compactar(v):
+    # 8 cifras significativas bastan para la gráfica y acortan el JSON
+    return None if v is None else float(format(v, '.8g'))
+
+
+def muestrear_funcion(f, x1, x2, presupuesto=PRESUPUESTO, iniciales=PUNTOS_INICIALES, puntos_salida=PUNTOS_SALIDA):
+    """Muestrea f en [x1, x2] de forma adaptativa.
+
+    Retorna (xs, ys) listos para Plotly: ys contiene None donde f no está
+    definida o donde hay un polo. Nunca evalúa f más de `presupuesto` veces.
+    """
+    x1 = float(x1)
+    x2 = float(x2)
+    if x2 < x1:
+        x1, x2 = x2, x1
+    if x2 == x1:
+        x1 -= 1.0
+        x2 += 1.0
+    iniciales = max(3, min(iniciales, presupuesto))
+    ancho = x2 - x1
+    xs = [x1 + ancho * i / (iniciales - 1) for i in range(iniciales)]
+    ys = [_evaluar_seguro(f, x) for x in xs]
+    usados = iniciales
+    base, escala = _escala_y(ys)
+
+    while usados < presupuesto:
+        scores = _puntuaciones(xs, ys, ancho, escala)
+        candidatos = [i for i, s in enumerate(scores) if s > UMBRAL_REFINAMIENTO]
+        if not candidatos:
+            break
+        # refinar por rondas: como mucho la mitad del presupuesto restante cada vez
+        lote = max(1, min(len(candidatos), (presupuesto - usados + 1) // 2))
+        candidatos.sort(key=lambda i: scores[i], reverse=True)
+        elegidos = set(candidatos[:lote])
+        nx = []
+        ny = []
+        for i in range(len(xs)):
+            nx.append(xs[i])
+            ny.append(ys[i])
+            if i in elegidos:
+                xm = (xs[i] + xs[i + 1]) / 2.0
+                if xm == xs[i] or xm == xs[i + 1]:
+                    continue
+                nx.append(xm)
+                ny.append(_evaluar_seguro(f, xm))
+                usados += 1
+        if len(nx) == len(xs):
+            break
+        xs, ys = nx, ny
+
+    xs, ys = _separar_polos(xs, ys, escala, base)
+    xs, ys = reducir_lttb(xs, ys, puntos_salida)
+    return [_compactar(x) for x in xs], [_compactar(y) for y in ys]
@@ -0,0 +1,321 @@
+"""Modelo de Leontief: resolver (I − A) X = Y sin formar (I − A)^{-1}
+
+Descripción:
+- Modo exacto: factorización LU con fracciones de (I − A) (pivoteo por el
+  primer no nulo, P(I − A) = LU) y sustitución hacia adelante/atrás. La misma
+  factorización se reutiliza para todas las columnas de Y (escenarios de
+  demanda final) de una petición.
+- Modo iterativo (coma flotante) para economías grandes y productivas:
+    neumann       X_{k+1} = Y + A X_k         (serie I + A + A² + …)
+    gauss_seidel  x_i ← (y_i + Σ_{j≠i} a_ij x_j) / (1 − a_ii)
+  La convergencia se comprueba con las sumas por columnas de A: si todas son
+  < 1 (economía productiva), ||A||₁ = c < 1 garantiza convergencia. La cota
+  de error de Neumann es la de contracción,
+  ||X − X_k||₁ ≤ c/(1 − c)·||X_k − X_{k−1}||₁; para Gauss-Seidel, que no es
+  esa contracción, se usa el residuo R = Y − (I − A)X_k:
+  ||X − X_k||₁ ≤ ||(I − A)^{-1}||₁·||R||₁ ≤ ||R||₁/(1 − c).
+- Escenarios: resolver_escenarios resuelve k columnas de Y y los
+  multiplicadores de producción (sumas por columnas de (I − A)^{-1}, con un
+  solo sistema transpuesto (I − A)ᵀ m = 1) reutilizando una factorización que
+  el llamador puede guardar con clave_matriz(A).
+"""
+import hashlib
+
+from . import perfil
+from .utilidades import (
+    texto_fraccion, copiar_matriz, es_cero, sumar_fracciones,
+    dividir_fracciones, restar_fracciones, restar_producto, producto_punto,
+)
+
+
+# Segundos que se conserva en caché la factorización de (I − A) del endpoint de
+# escenarios. Se puede fijar desde settings.ALGEBRA_LEONTIEF_CACHE_SEGUNDOS.
+CACHE_SEGUNDOS = 3600
+
+
+class ErrorLeontief(ValueError):
+    """Error de validación o de convergencia en el modelo de Leontief."""
+    pass
+
+
+def matriz_tecnica(A):
+    """I − A."""
+    n = len(A)
+    return [
+        [restar_fracciones([1,1] if i == j else [0,1], A[i][j]) for j in range(n)]
+        for i in range(n)
+    ]
+
+
+def validar_datos(A, Y):
+    """Comprueba que A es n×n y que Y tiene n filas (una columna por escenario)."""
+    if not A or not Y:
+        raise ErrorLeontief("Debes ingresar la matriz A y el vector Y.")
+    n = len(A)
+    if any(len(f) != len(A[0]) for f in A):
+        raise ErrorLeontief("Todas las filas de A deben tener la misma cantidad de columnas.")
+    if n != len(A[0]):
+        raise ErrorLeontief("A debe ser cuadrada (n×n).")
+    if len(Y) != n:
+        raise ErrorLeontief("El tamaño de Y debe coincidir con n (filas de A).")
+    if any(len(f) != len(Y[0]) for f in Y):
+        raise ErrorLeontief("Todas las filas de Y deben tener la misma cantidad de columnas.")
+
+
+def sumas_columnas(A):
+    """Sumas por columnas de A (insumos por unidad producida de cada sector)."""
+    n = len(A)
+    sumas = []
+    for j in range(n):
+        s = [0,1]
+        for i in range(n):
+            s = sumar_fracciones(s, A[i][j])
+        sumas.append(s)
+    return sumas
+
+
+# ----------------------- Modo exacto -----------------------
+
+def factorizar(M, registrar_pasos=False, text_fn=texto_fraccion):
+    """Factorización P·M = L·U exacta.
+
+    Devuelve dict {'n', 'lu', 'perm', 'singular'} donde `lu` guarda L (debajo de
+    la diagonal, con 1 implícitos) y U (diagonal y encima), `perm[i]` es la fila
+    original en la posición i y `singular` la columna sin pivote (o None).
+    Con registrar_pasos devuelve (factorizacion, pasos).
+    """
+    n = len(M)
+    LU = copiar_matriz(M)
+    perm = list(range(n))
+    pasos = []
+    singular = None
+
+    def registrar(operacion):
+        if registrar_pasos:
+            pasos.append({"operacion": operacion, "matriz": copiar_matriz(LU), "tipo": "fila"})
+
+    for k in range(n):
+        piv_row = -1
+        for r in range(k, n):
+            if not es_cero(LU[r][k]):
+                piv_row = r
+                break
+        if piv_row == -1:
+            singular = k
+            registrar(f"Columna {k+1} sin pivote ⇒ (I − A) no es invertible")
+            break
+        if piv_row != k:
+            LU[k], LU[piv_row] = LU[piv_row], LU[k]
+            perm[k], perm[piv_row] = perm[piv_row], perm[k]
+            registrar(f"Intercambiamos F{k+1} ↔ F{piv_row+1}")
+        piv = LU[k][k]
+        for i in range(k + 1, n):
+            if es_cero(LU[i][k]):
+                continue
+            m = dividir_fracciones(LU[i][k], piv)
+            fila_i = LU[i]
+            fila_k = LU[k]
+            for j in range(k + 1, n):
+                fila_i[j] = restar_producto(fila_i[j], m, fila_k[j])
+            fila_i[k] = m  # multiplicador de L
+            registrar(f"F{i+1} → F{i+1} − ({text_fn(m)})·F{k+1}  (l{i+1}{k+1} = {text_fn(m)})")
+    factorizacion = {"n": n, "lu": LU, "perm": perm, "singular": singular}
+    return (factorizacion, pasos) if registrar_pasos else factorizacion
+
+
+def resolver_factorizado(F, y):
+    """x con (I − A) x = y usando la factorización F (y: lista de [n,d])."""
+    if F["singular"] is not None:
+        raise ErrorLeontief(f"(I − A) no es invertible: columna {F['singular']+1} sin pivote.")
+    n = F["n"]
+    LU = F["lu"]
+    # L z = P y
+    z = []
+    for i in range(n):
+        z.append(restar_fracciones(y[F["perm"][i]], producto_punto(LU[i][:i], z)))
+    # U x = z
+    x = [None] * n
+    for i in range(n - 1, -1, -1):
+        s = producto_punto(LU[i][i+1:], x[i+1:])
+        x[i] = dividir_fracciones(restar_fracciones(z[i], s), LU[i][i])
+    return x
+
+
+def resolver_transpuesto(F, y):
+    """x con (I − A)ᵀ x = y usando la misma factorización (Uᵀ w = y, Lᵀ v = w, x = Pᵀ v)."""
+    if F["singular"] is not None:
+        raise ErrorLeontief(f"(I − A) no es invertible: columna {F['singular']+1} sin pivote.")
+    n = F["n"]
+    LU = F["lu"]
+    w = []
+    for i in range(n):
+        col = [LU[k][i] for k in range(i)]
+        w.append(dividir_fracciones(restar_fracciones(y[i], producto_punto(col, w)), LU[i][i]))
+    v = [None] * n
+    for i in range(n - 1, -1, -1):
+        col = [LU[k][i] for k in range(i + 1, n)]
+        v[i] = restar_fracciones(w[i], producto_punto(col, v[i+1:]))
+    x = [None] * n
+    for i in range(n):
+        x[F["perm"][i]] = v[i]
+    return x
+
+
+def multiplicadores(F):
+    """Multiplicadores de producción: sumas por columnas de (I − A)^{-1}."""
+    return resolver_transpuesto(F, [[1,1]] * F["n"])
+
+
+def resolver_columnas(F, Y):
+    """X (n×k) resolviendo cada columna de Y con la misma factorización."""
+    n = F["n"]
+    k = len(Y[0])
+    columnas = [resolver_factorizado(F, [Y[i][j] for i in range(n)]) for j in range(k)]
+    return [[columnas[j][i] for j in range(k)] for i in range(n)]
+
+
+@perfil.medir("calculo")
+def resolver_leontief(A, Y, registrar_pasos=False, text_fn=texto_fraccion):
+    """X = (I − A)^{-1} Y exacto, por factorización (sin formar la inversa).
+
+    Retorna dict {'X', 'sumas_columnas', 'productiva'} y, con
+    registrar_pasos, (info, pasos).
+    """
+    validar_datos(A, Y)
+    IA = matriz_tecnica(A)
+    pasos = []
+    if registrar_pasos:
+        pasos.append({"operacion": "Formamos I − A", "matriz": copiar_matriz(IA), "tipo": "simple"})
+        F, pasos_lu = factorizar(IA, registrar_pasos=True, text_fn=text_fn)
+        pasos.extend(pasos_lu)
+    else:
+        F = factorizar(IA)
+    X = resolver_columnas(F, Y)
+    if registrar_pasos:
+        pasos.append({"operacion": "Sustitución hacia adelante (L·Z = P·Y) y hacia atrás (U·X = Z)", "matriz": copiar_matriz(X), "tipo": "simple"})
+    sumas = sumas_columnas(A)
+    info = {
+        "X": X,
+        "metodo": "exacto",
+        "sumas_columnas": sumas,
+        "productiva": all(s[0] < s[1] for s in sumas) and all(x[0] >= 0 for fila in A for x in fila),
+    }
+    return (info, pasos) if registrar_pasos else info
+
+
+def clave_matriz(A):
+    """Huella SHA-256 del contenido de A (para cachear su factorización)."""
+    h = hashlib.sha256()
+    h.update(f"{len(A)}x{len(A[0]) if A else 0};".encode())
+    for fila in A:
+        h.update(",".join(f"{x[0]}/{x[1]}" for x in fila).encode())
+        h.update(b";")
+    return h.hexdigest()
+
+
+@perfil.medir("calculo")
+def resolver_escenarios(A, Y, factorizacion=None):
+    """Todas las columnas de Y y los multiplicadores con una sola factorización.
+
+    `factorizacion` es la de un llamado anterior con la misma A (p. ej. desde
+    caché); si es None se factoriza I − A. Retorna dict {'X',
+    'multiplicadores', 'factorizacion', 'reutilizada'}.
+    """
+    if factorizacion is None:
+        validar_datos(A, Y)
+        factorizacion = factorizar(matriz_tecnica(A))
+        reutilizada = False
+    else:
+        if not Y or len(Y) != factorizacion["n"]:
+            raise ErrorLeontief("El tamaño de Y debe coincidir con n (filas de A).")
+        if any(len(f) != len(Y[0]) for f in Y):
+            raise ErrorLeontief("Todas las filas de Y deben tener la misma cantidad de columnas.")
+        reutilizada = True
+    return {
+        "X": resolver_columnas(factorizacion, Y),
+        "multiplicadores": multiplicadores(factorizacion),
+        "factorizacion": factorizacion,
+        "reutilizada": reutilizada,
+    }
+
+
+# ----------------------- Modo iterativo -----------------------
+
+def _a_flotantes(M):
+    return [[x[0] / x[1] for x in fila] for fila in M]
+
+
+def _residuo(Af, Yf, X):
+    """max por columnas de ||Y − (I − A)X||₁."""
+    n = len(Af)
+    peor = 0.0
+    for s in range(len(Yf[0])):
+        total = 0.0
+        for i in range(n):
+            fila_a = Af[i]
+            total += abs(Yf[i][s] - X[i][s] + sum(fila_a[j] * X[j][s] for j in range(n)))
+        peor = max(peor, total)
+    return peor
+
+
+@perfil.medir("calculo")
+def resolver_iterativo(A, Y, metodo="gauss_seidel", tol=1e-10, maxit=10000):
+    """X aproximada en coma flotante por serie de Neumann o Gauss-Seidel.
+
+    Exige sumas por columnas < 1 (convergencia garantizada). Retorna dict con
+    X (floats), iteraciones, convergio, cota_error (cota de ||X − X_k||₁ en
+    el peor escenario, ver docstring del módulo) y sumas_columnas.
+    """
+    validar_datos(A, Y)
+    if metodo not in ("neumann", "gauss_seidel"):
+        raise ErrorLeontief("Método iterativo no soportado.")
+    Af = _a_flotantes(A)
+    Yf = _a_flotantes(Y)
+    n = len(Af)
+    sumas = [sum(abs(Af[i][j]) for i in range(n)) for j in range(n)]
+    c = max(sumas)
+    if c >= 1:
+        raise ErrorLeontief(
+            f"La suma de la columna {sumas.index(c)+1} de A es {c:.6g} ≥ 1: la economía no es productiva "
+            "y la iteración no tiene convergencia garantizada. Usa el modo exacto."
+        )
+    k = len(Yf[0])
+    X = [fila[:] for fila in Yf]
+    convergio = False
+    cota = None
+    it = 0
+    while it < maxit:
+        it += 1
+        if metodo == "neumann":
+            nuevo = [[Yf[i][s] + sum(Af[i][j] * X[j][s] for j in range(n)) for s in range(k)] for i in range(n)]
+        else:
+            nuevo = [fila[:] for fila in X]
+            for i in range(n):
+                fila_a = Af[i]
+                diag = 1.0 - fila_a[i]
+                for s in range(k):
+                    suma = Yf[i][s]
+                    for j in range(n):
+                        if j != i:
+                            suma += fila_a[j] * nuevo[j][s]
+                    nuevo[i][s] = suma / diag
+        # ||X_k − X_{k−1}||₁ por columnas (el peor escenario)
+        paso = max(sum(abs(nuevo[i][s] - X[i][s]) for i in range(n)) for s in range(k))
+        escala = max(1.0, max(sum(abs(nuevo[i][s]) for i in range(n)) for s in range(k)))
+        X = nuevo
+        cota = c / (1.0 - c) * paso
+        if metodo == "gauss_seidel" and (cota <= tol * escala or it == maxit):
+            # Sólo cuando el paso ya es pequeño: el residuo cuesta una iteración
+            cota = _residuo(Af, Yf, X) / (1.0 - c)
+        if cota <= tol * escala:
+            convergio = True
+            break
+    return {
+        "X": X,
+        "metodo": metodo,
+        "iteraciones": it,
+        "convergio": convergio,
+        "cota_error": cota,
+        "sumas_columnas": sumas,
+        "productiva": True,
+    }
@@ -4,15 +4,31 @@ Descripción:
 - Para evaluar expresiones ingresadas por el
   usuario se emplea un evaluador controlado que sólo expone
   funciones del módulo math y un pequeño conjunto de funciones seguras.
+  La gramática habitual se compila directamente (ver compilador.py);
+  SymPy queda reservado para las entradas que ese compilador no cubre.
+
+- Sistemas lineales A x = b por métodos iterativos (Jacobi, Gauss-Seidel,
+  SOR y gradiente conjugado) sobre A almacenada en forma dispersa por filas.
 
 Importaciones:
 - math: proporciona funciones matemáticas (sin, cos, exp, log, etc.) y
   constantes (pi, e). Se usa para permitir que el usuario escriba
   expresiones usando esas funciones.
+- numpy (opcional): si está instalado, los productos A·x de Jacobi y del
+  gradiente conjugado se vectorizan.
 """
 import math
 from typing import Callable
 from .derivadas import derivar_funcion as _derivar_funcion
+from .compilador import compilar_funcion, ExpresionNoSoportada
+from . import simbolico
+from . import perfil
+from .archivos import entradas_matrix_market
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
 
 class ErrorBiseccion(ValueError):
     """Excepción específica para errores durante el proceso de bisección."""
@@ -66,10 +82,26 @@ def _crear_evaluador(texto_funcion):
             # el ErrorBiseccion correspondiente.
             pass
 
+    # Camino rápido: el compilador ligero cubre la gramática habitual sin
+    # importar SymPy. Sólo si la expresión queda fuera de esa gramática se
+    # recurre a sympify + lambdify.
+    try:
+        f_rapida = compilar_funcion(texto_normalizado)
+    except ExpresionNoSoportada:
+        f_rapida = None
+
+    if f_rapida is not None:
+        def evaluar(x):
+            try:
+                return float(f_rapida(x))
+            except Exception as e:
+                raise ErrorBiseccion(f"Error evaluando la función en x={x}: {e}")
+
+        return evaluar
+
     # Intentar usar sympy para parseo seguro y lambdify
-    # Si sympy no está disponible, se usa la estrategia anterior dentro de un entorno restringido.
     try:
-        import sympy as sp
+        sp = simbolico.sympy()
 
         # Parsear la expresión con sympy
         try:
@@ -177,38 +209,61 @@ def _crear_evaluador(texto_funcion):
         return evaluar
 
     except ImportError:
-        # Fallback: usar el evaluador basado en compile/eval en un entorno restringido.
-        try:
-            codigo = compile(texto_normalizado, '<biseccion>', 'eval')
-        except Exception as e:
-            raise ErrorBiseccion(f"Expresión inválida: {e}")
+        # Sin SymPy no hay alternativa para lo que el compilador ligero no cubre.
+        raise ErrorBiseccion(f"Expresión inválida o no soportada: {texto_funcion!r}")
 
-        # Exponer sólo las funciones y constantes del módulo math y un par de
-        # funciones seguras adicionales.
-        nombres_permitidos = {k: getattr(math, k) for k in dir(math) if not k.startswith('__')}
-        nombres_permitidos.update({'abs': abs, 'pow': pow})
 
-        def evaluar(x):
-            try:
-                contexto_local = {'x': x}
-                # Evaluar con __builtins__ deshabilitado y sólo los nombres
-                # permitidos en el globals/local.
-                val = eval(codigo, {'__builtins__': None}, {**nombres_permitidos, **contexto_local})
-                # Comprobaciones defensivas: None o secuenciales no están permitidos
-                if val is None:
-                    raise ErrorBiseccion(f"El evaluador devolvió None para x={x}. Expresión: {repr(texto_normalizado)}")
-                if hasattr(val, '__len__') and not isinstance(val, (str, bytes)):
-                    raise ErrorBiseccion(f"La evaluación devolvió un objeto secuencial en x={x} (esperado escalar). Expresión: {repr(texto_normalizado)}")
-                return float(val)
-            except ErrorBiseccion:
-                raise
-            except Exception as e:
-                raise ErrorBiseccion(f"Error evaluando la función en x={x}: {e}")
+# Umbrales del control de iteraciones de los métodos abiertos (Newton, secante)
+LIMITE_DIVERGENCIA = 1e12    # |x| relativo a los puntos iniciales
+VENTANA_CICLO = 8            # iterados previos contra los que se busca repetición
+ITER_CRECIMIENTO = 8         # pasos seguidos con |Δx| y |f| creciendo
+ITER_ESTANCAMIENTO = 25      # pasos seguidos sin mejorar el mejor |f|
 
-        return evaluar
 
+def _diagnosticar_iteracion(historial, x_next, fx, err, tol, escala, estado):
+    """Decide si un método abierto debe detenerse antes de agotar maxit.
+
+    - historial: iterados previos (el último es el x actual).
+    - estado: dict mutable que conserva contadores entre llamadas.
 
-def biseccion(texto_funcion, a, b, tol=1e-6, maxit=100):
+    Devuelve (motivo, mensaje) si se detecta divergencia, ciclo o residuo
+    estancado; None para continuar.
+    """
+    if not math.isfinite(x_next) or abs(x_next) > LIMITE_DIVERGENCIA * escala:
+        return 'divergencia', f"Advertencia: los iterados divergen (|x| ≈ {abs(x_next):.3g})."
+
+    # Ciclo: x_{n+1} repite (casi exactamente) un iterado anterior distinto del
+    # actual. El umbral es más fino que tol para no confundir una convergencia
+    # lenta alternante con un ciclo.
+    for xk in historial[-VENTANA_CICLO:-1]:
+        if abs(x_next - xk) <= min(tol, 1e-10 * max(1.0, abs(xk))):
+            return 'ciclo', f"Advertencia: los iterados entraron en un ciclo (x={x_next:.8g} se repite)."
+
+    afx = abs(fx)
+    if estado['err_prev'] is not None and err > estado['err_prev'] and afx > estado['f_prev']:
+        estado['crecimiento'] += 1
+    else:
+        estado['crecimiento'] = 0
+    estado['err_prev'] = err
+    estado['f_prev'] = afx
+    if estado['crecimiento'] >= ITER_CRECIMIENTO:
+        return 'divergencia', f"Advertencia: |Δx| y |f(x)| crecieron durante {ITER_CRECIMIENTO} iteraciones seguidas; el método diverge."
+
+    if afx < 0.999 * estado['mejor_f']:
+        estado['mejor_f'] = afx
+        estado['sin_mejora'] = 0
+    else:
+        estado['sin_mejora'] += 1
+        if estado['sin_mejora'] >= ITER_ESTANCAMIENTO:
+            return 'estancamiento', f"Advertencia: |f(x)| no mejora desde hace {ITER_ESTANCAMIENTO} iteraciones."
+    return None
+
+
+def _estado_diagnostico():
+    return {'err_prev': None, 'f_prev': math.inf, 'crecimiento': 0, 'mejor_f': math.inf, 'sin_mejora': 0}
+
+
+def biseccion(texto_funcion, a, b, tol=1e-6, maxit=100, evaluador=None):
     """Ejecuta el método de la bisección en el intervalo [a, b].
 
     Parámetros:
@@ -216,6 +271,8 @@ def biseccion(texto_funcion, a, b, tol=1e-6, maxit=100):
     - a, b: extremos del intervalo (números).
     - tol: tolerancia (positivo).
     - maxit: máximo de iteraciones.
+    - evaluador: f(x) ya compilada (opcional); si se omite se construye
+      con `_crear_evaluador(texto_funcion)`.
 
     Retorna un diccionario con las siguientes claves (en español):
       - 'iteraciones': lista de diccionarios por iteración
@@ -235,7 +292,7 @@ def biseccion(texto_funcion, a, b, tol=1e-6, maxit=100):
     if a >= b:
         raise ErrorBiseccion("Se requiere a < b como intervalo inicial.")
 
-    evaluar = _crear_evaluador(texto_funcion)
+    evaluar = evaluador or _crear_evaluador(texto_funcion)
 
     fa = evaluar(a)
     fb = evaluar(b)
@@ -309,10 +366,10 @@ def biseccion(texto_funcion, a, b, tol=1e-6, maxit=100):
     }
 
 
-def regula_falsi(texto_funcion, a, b, tol=1e-6, maxit=100):
+def regula_falsi(texto_funcion, a, b, tol=1e-6, maxit=100, evaluador=None):
     """Método de Regla Falsa (Regula Falsi).
 
-    Misma interfaz que `biseccion` pero la elección de c es por regla falsa:
+    Misma interfaz que `biseccion` (incluido `evaluador`) pero la elección de c es por regla falsa:
       c = (a*f(b) - b*f(a)) / (f(b) - f(a))
     Retorna el mismo diccionario que `biseccion`.
     """
@@ -324,7 +381,7 @@ def regula_falsi(texto_funcion, a, b, tol=1e-6, maxit=100):
     if a >= b:
         raise ErrorBiseccion("Se requiere a < b como intervalo inicial.")
 
-    evaluar = _crear_evaluador(texto_funcion)
+    evaluar = evaluador or _crear_evaluador(texto_funcion)
 
     fa = evaluar(a)
     fb = evaluar(b)
@@ -402,7 +459,7 @@ def regula_falsi(texto_funcion, a, b, tol=1e-6, maxit=100):
     }
 
 
-def newton_raphson(texto_funcion, x0, tol=1e-6, maxit=100):
+def newton_raphson(texto_funcion, x0, tol=1e-6, maxit=100, evaluador=None):
     """Método de Newton–Raphson para encontrar raíces a partir de una aproximación inicial x0.
 
     Retorna un diccionario con claves:
@@ -412,6 +469,12 @@ def newton_raphson(texto_funcion, x0, tol=1e-6, maxit=100):
       - 'raiz': float
       - 'estimacion_error': float (|x_{n+1} - x_n|)
       - 'f_en_raiz': float
+      - 'warnings': lista de advertencias
+      - 'detenido_por': None o 'derivada_nula' / 'divergencia' / 'ciclo' / 'estancamiento'
+      - 'evaluaciones_ahorradas': evaluaciones de f y f' evitadas al detenerse antes de maxit
+
+    Si se pasa `evaluador` (f ya compilada) se usa para f; f' siempre se
+    obtiene derivando simbólicamente.
     """
     if tol <= 0:
         raise ErrorBiseccion("La tolerancia debe ser un número positivo.")
@@ -421,7 +484,7 @@ def newton_raphson(texto_funcion, x0, tol=1e-6, maxit=100):
     # Evaluadores para f y f'
     try:
         info = _derivar_funcion(texto_funcion, orden=1, simplificar=True)
-        f = info['original']['evaluador']
+        f = evaluador or info['original']['evaluador']
         df = info['derivada']['evaluador']
     except Exception as e:
         raise ErrorBiseccion(f"No se pudo preparar f y su derivada: {e}")
@@ -432,6 +495,11 @@ def newton_raphson(texto_funcion, x0, tol=1e-6, maxit=100):
     maxit = min(int(maxit), 10000)
     last_err = None
     warnings = []
+    detenido_por = None
+    ahorradas = 0
+    historial = [x]
+    escala = max(1.0, abs(x))
+    estado = _estado_diagnostico()
 
     for i in range(1, maxit+1):
         fx = f(x)
@@ -447,6 +515,7 @@ def newton_raphson(texto_funcion, x0, tol=1e-6, maxit=100):
                 'err': None,
             })
             warnings.append(f"Advertencia: f'(x)≈0 en x={x:.8g}. El método se detuvo para evitar división por cero.")
+            detenido_por = 'derivada_nula'
             break
         x_next = x - fx/dfx
         err = abs(x_next - x)
@@ -459,10 +528,19 @@ def newton_raphson(texto_funcion, x0, tol=1e-6, maxit=100):
             'err': err,
         })
         last_err = err
-        x = x_next
         if err < tol or abs(fx) < tol:
+            x = x_next
             convergio = True
             break
+        diagnostico = _diagnosticar_iteracion(historial, x_next, fx, err, tol, escala, estado)
+        if diagnostico is not None:
+            detenido_por, mensaje = diagnostico
+            # Cada iteración evalúa f y f'
+            ahorradas = 2 * (maxit - i)
+            warnings.append(f"{mensaje} Proceso detenido en la iteración {i} ({ahorradas} evaluaciones ahorradas).")
+            break
+        x = x_next
+        historial.append(x)
 
     raiz = float(x)
     return {
@@ -472,11 +550,13 @@ def newton_raphson(texto_funcion, x0, tol=1e-6, maxit=100):
         'raiz': raiz,
         'estimacion_error': float(last_err if last_err is not None else 0.0),
         'f_en_raiz': f(raiz),
-        'warnings': warnings
+        'warnings': warnings,
+        'detenido_por': detenido_por,
+        'evaluaciones_ahorradas': ahorradas,
     }
 
 
-def secante(texto_funcion, x0, x1, tol=1e-6, maxit=100):
+def secante(texto_funcion, x0, x1, tol=1e-6, maxit=100, evaluador=None):
     """Método de la secante para encontrar una raíz de f(x).
 
     Parámetros:
@@ -484,17 +564,19 @@ def secante(texto_funcion, x0, x1, tol=1e-6, maxit=100):
       - x0, x1: valores iniciales.
       - tol: tolerancia para |x_{n+1} - x_n| o |f(x_n)|.
       - maxit: tope de iteraciones.
+      - evaluador: f(x) ya compilada (opcional).
 
     Retorna dict con:
       - 'iteraciones': lista de dicts con i, x_prev, x, f_prev, f, x_next, err
       - 'convergio', 'conteo_iter', 'raiz', 'estimacion_error', 'f_en_raiz', 'warnings'
+      - 'detenido_por', 'evaluaciones_ahorradas' (ver `newton_raphson`)
     """
     if tol <= 0:
         raise ErrorBiseccion("La tolerancia debe ser un número positivo.")
     if maxit <= 0:
         raise ErrorBiseccion("El número máximo de iteraciones debe ser mayor que 0.")
 
-    f = _crear_evaluador(texto_funcion)
+    f = evaluador or _crear_evaluador(texto_funcion)
 
     x_prev = float(x0)
     x = float(x1)
@@ -506,6 +588,11 @@ def secante(texto_funcion, x0, x1, tol=1e-6, maxit=100):
     maxit = min(int(maxit), 10000)
     last_err = None
     warnings = []
+    detenido_por = None
+    ahorradas = 0
+    historial = [x_prev, x]
+    escala = max(1.0, abs(x_prev), abs(x))
+    estado = _estado_diagnostico()
 
     for i in range(1, maxit + 1):
         denom = (f_curr - f_prev)
@@ -521,6 +608,7 @@ def secante(texto_funcion, x0, x1, tol=1e-6, maxit=100):
                 'err': None,
             })
             warnings.append("Advertencia: f(x_n) - f(x_{n-1}) ≈ 0. Proceso detenido para evitar división por cero.")
+            detenido_por = 'derivada_nula'
             break
 
         x_next = x - f_curr * ( (x - x_prev) / denom )
@@ -542,9 +630,18 @@ def secante(texto_funcion, x0, x1, tol=1e-6, maxit=100):
             x = x_next
             break
 
+        diagnostico = _diagnosticar_iteracion(historial, x_next, f_curr, err, tol, escala, estado)
+        if diagnostico is not None:
+            detenido_por, mensaje = diagnostico
+            # Cada iteración evalúa f una vez
+            ahorradas = maxit - i
+            warnings.append(f"{mensaje} Proceso detenido en la iteración {i} ({ahorradas} evaluaciones ahorradas).")
+            break
+
         # Actualizar para siguiente paso
         x_prev, x = x, x_next
         f_prev, f_curr = f_curr, f(x)
+        historial.append(x)
 
     raiz = float(x)
     return {
@@ -554,5 +651,255 @@ def secante(texto_funcion, x0, x1, tol=1e-6, maxit=100):
         'raiz': raiz,
         'estimacion_error': float(last_err if last_err is not None else 0.0),
         'f_en_raiz': f(raiz),
-        'warnings': warnings
+        'warnings': warnings,
+        'detenido_por': detenido_por,
+        'evaluaciones_ahorradas': ahorradas,
+    }
+
+
+# ----------------------- Sistemas lineales: métodos iterativos -----------------------
+
+class ErrorSistemaIterativo(ValueError):
+    """Error de datos o de configuración en los métodos iterativos para A x = b."""
+    pass
+
+
+METODOS_SISTEMA = ('jacobi', 'gauss_seidel', 'sor', 'gradiente_conjugado')
+PRECONDICIONADORES = ('ninguno', 'jacobi')
+COMPONENTES_TABLA = 6        # componentes de x que se guardan en cada fila de la tabla
+MAXIT_MAXIMO = 10000         # tope de iteraciones, pida lo que pida el formulario
+INCOGNITAS_MAXIMAS = 100000  # n máximo de un sistema leído desde archivo
+ENTRADAS_MAXIMAS = 2000000   # no nulos máximos de un sistema leído desde archivo
+
+
+def matriz_dispersa(A):
+    """A (lista de filas de números o fracciones [n, d]) en forma dispersa por filas.
+
+    Devuelve {'n', 'indices', 'valores', 'diagonal'}: para cada fila las
+    columnas y valores no nulos, y la diagonal aparte.
+    """
+    n = len(A)
+    if n == 0 or any(len(fila) != n for fila in A):
+        raise ErrorSistemaIterativo("A debe ser cuadrada (n×n).")
+    indices = []
+    valores = []
+    for fila in A:
+        cols = []
+        vals = []
+        for j, a in enumerate(fila):
+            v = a[0] / a[1] if isinstance(a, (list, tuple)) else float(a)
+            if v != 0.0:
+                cols.append(j)
+                vals.append(v)
+        indices.append(cols)
+        valores.append(vals)
+    return _completar_dispersa(n, indices, valores)
+
+
+def _completar_dispersa(n, indices, valores):
+    diagonal = [0.0] * n
+    for i in range(n):
+        for j, v in zip(indices[i], valores[i]):
+            if j == i:
+                diagonal[i] = v
+    A = {'n': n, 'indices': indices, 'valores': valores, 'diagonal': diagonal}
+    if np is not None:
+        A['np_filas'] = np.repeat(np.arange(n), [len(c) for c in indices])
+        A['np_columnas'] = np.fromiter((j for c in indices for j in c), dtype=np.int64)
+        A['np_valores'] = np.fromiter((v for vs in valores for v in vs), dtype=np.float64)
+    return A
+
+
+def sistema_desde_matrix_market(flujo):
+    """(A dispersa, b) desde un MatrixMarket n×(n+1) cuya última columna es b.
+
+    Se lee en streaming sin formar la matriz densa.
+    """
+    filas, columnas, simetria, entradas = entradas_matrix_market(flujo)
+    if columnas != filas + 1:
+        raise ErrorSistemaIterativo("El archivo debe ser n×(n+1): la última columna es b.")
+    if filas > INCOGNITAS_MAXIMAS:
+        raise ErrorSistemaIterativo(f"El sistema tiene {filas} incógnitas; el máximo es {INCOGNITAS_MAXIMAS}.")
+    por_fila = [dict() for _ in range(filas)]
+    b = [0.0] * filas
+    for k, (i, j, texto) in enumerate(entradas):
+        if k >= ENTRADAS_MAXIMAS:
+            raise ErrorSistemaIterativo(f"El archivo tiene más de {ENTRADAS_MAXIMAS} entradas.")
+        try:
+            v = 1.0 if texto is None else float(texto)
+        except ValueError:
+            raise ErrorSistemaIterativo(f"Fila {i + 1}, columna {j + 1}: valor inválido '{texto}'.")
+        if j == filas:
+            b[i] = v
+            continue
+        por_fila[i][j] = v
+        if simetria != 'general' and i != j:
+            por_fila[j][i] = v if simetria == 'symmetric' else -v
+    indices = [sorted(f) for f in por_fila]
+    valores = [[f[j] for j in cols] for f, cols in zip(por_fila, indices)]
+    return _completar_dispersa(filas, indices, valores), b
+
+
+def costo_iterativo(A, maxit):
+    """Operaciones estimadas de `maxit` iteraciones sobre A dispersa (para la admisión)."""
+    no_nulos = sum(len(cols) for cols in A['indices'])
+    return min(maxit, MAXIT_MAXIMO) * (no_nulos + 4 * A['n'])
+
+
+def _producto(A, x):
+    """A·x."""
+    if np is not None:
+        xv = np.asarray(x, dtype=np.float64)
+        return np.bincount(A['np_filas'], weights=A['np_valores'] * xv[A['np_columnas']], minlength=A['n']).tolist()
+    return [sum(v * x[j] for j, v in zip(cols, vals)) for cols, vals in zip(A['indices'], A['valores'])]
+
+
+def _norma(v):
+    return math.sqrt(sum(t * t for t in v))
+
+
+def diagonal_dominante(A):
+    """True si |a_ii| > Σ_{j≠i} |a_ij| en todas las filas."""
+    for i in range(A['n']):
+        fuera = sum(abs(v) for j, v in zip(A['indices'][i], A['valores'][i]) if j != i)
+        if abs(A['diagonal'][i]) <= fuera:
+            return False
+    return True
+
+
+def es_simetrica(A):
+    """True si A = Aᵀ (comparando las entradas no nulas)."""
+    filas = [dict(zip(c, v)) for c, v in zip(A['indices'], A['valores'])]
+    for i, f in enumerate(filas):
+        for j, v in f.items():
+            if filas[j].get(i) != v:
+                return False
+    return True
+
+
+@perfil.medir("calculo")
+def resolver_iterativo(A, b, metodo='jacobi', x0=None, tol=1e-8, maxit=1000,
+                       omega=1.0, precondicionador='ninguno'):
+    """Resuelve A x = b con un método iterativo.
+
+    Parámetros:
+    - A: matriz densa (filas de números o fracciones) o dispersa (matriz_dispersa).
+    - b: lista de n números o fracciones.
+    - metodo: 'jacobi', 'gauss_seidel', 'sor' (con `omega` en (0, 2)) o
+      'gradiente_conjugado' (A simétrica definida positiva).
+    - precondicionador: 'ninguno' o 'jacobi' (diagonal); se aplica al
+      gradiente conjugado, los demás métodos ya usan la diagonal.
+    - Criterio de parada: residuo relativo ||b − A x||₂ / ||b||₂ < tol.
+
+    Retorna un diccionario con:
+      - 'iteraciones': filas {'i', 'residuo', 'err' (||Δx||∞), 'x' (primeras componentes)}
+      - 'convergio', 'conteo_iter', 'x', 'residuo', 'metodo', 'warnings'
+    """
+    if metodo not in METODOS_SISTEMA:
+        raise ErrorSistemaIterativo("Método iterativo no soportado.")
+    if precondicionador not in PRECONDICIONADORES:
+        raise ErrorSistemaIterativo("Precondicionador no soportado.")
+    if tol <= 0:
+        raise ErrorSistemaIterativo("La tolerancia debe ser un número positivo.")
+    if maxit <= 0:
+        raise ErrorSistemaIterativo("El número máximo de iteraciones debe ser mayor que 0.")
+    if metodo == 'sor' and not (0.0 < omega < 2.0):
+        raise ErrorSistemaIterativo("Para SOR, ω debe estar en el intervalo (0, 2).")
+    if not isinstance(A, dict):
+        A = matriz_dispersa(A)
+    n = A['n']
+    b = [v[0] / v[1] if isinstance(v, (list, tuple)) else float(v) for v in b]
+    if len(b) != n:
+        raise ErrorSistemaIterativo("b debe tener tantas entradas como filas de A.")
+    x = [0.0] * n if x0 is None else [float(v) for v in x0]
+    if len(x) != n:
+        raise ErrorSistemaIterativo("x0 debe tener tantas entradas como incógnitas.")
+    diag = A['diagonal']
+    if metodo != 'gradiente_conjugado' or precondicionador == 'jacobi':
+        for i, d in enumerate(diag):
+            if d == 0.0:
+                raise ErrorSistemaIterativo(f"a{i+1}{i+1} = 0: el método necesita una diagonal sin ceros (reordena las ecuaciones).")
+
+    warnings = []
+    if metodo in ('jacobi', 'gauss_seidel', 'sor') and not diagonal_dominante(A):
+        warnings.append("A no es estrictamente diagonal dominante: la convergencia no está garantizada.")
+    if metodo == 'gradiente_conjugado' and not es_simetrica(A):
+        warnings.append("A no es simétrica: el gradiente conjugado puede no converger.")
+
+    norma_b = _norma(b) or 1.0
+    maxit = min(maxit, MAXIT_MAXIMO)
+    iteraciones = []
+    convergio = False
+
+    def registrar(i, r_rel, err):
+        iteraciones.append({'i': i, 'residuo': r_rel, 'err': err, 'x': x[:COMPONENTES_TABLA]})
+
+    r = [bi - ai for bi, ai in zip(b, _producto(A, x))]
+    r_rel = _norma(r) / norma_b
+    if r_rel < tol:
+        convergio = True
+    elif metodo == 'gradiente_conjugado':
+        z = [ri / d for ri, d in zip(r, diag)] if precondicionador == 'jacobi' else r[:]
+        p = z[:]
+        rz = sum(ri * zi for ri, zi in zip(r, z))
+        for i in range(1, maxit + 1):
+            q = _producto(A, p)
+            pq = sum(pi * qi for pi, qi in zip(p, q))
+            if pq <= 0.0:
+                warnings.append("pᵀAp ≤ 0: A no es definida positiva; proceso detenido.")
+                break
+            alfa = rz / pq
+            x = [xi + alfa * pi for xi, pi in zip(x, p)]
+            r = [ri - alfa * qi for ri, qi in zip(r, q)]
+            r_rel = _norma(r) / norma_b
+            registrar(i, r_rel, abs(alfa) * max(abs(pi) for pi in p))
+            if r_rel < tol:
+                convergio = True
+                break
+            if not math.isfinite(r_rel) or r_rel > LIMITE_DIVERGENCIA:
+                warnings.append(f"El residuo crece sin control: proceso detenido en la iteración {i}.")
+                break
+            z = [ri / d for ri, d in zip(r, diag)] if precondicionador == 'jacobi' else r
+            rz_nuevo = sum(ri * zi for ri, zi in zip(r, z))
+            beta = rz_nuevo / rz
+            rz = rz_nuevo
+            p = [zi + beta * pi for zi, pi in zip(z, p)]
+    else:
+        w = omega if metodo == 'sor' else 1.0
+        for i in range(1, maxit + 1):
+            if metodo == 'jacobi':
+                # x ← x + D^{-1}(b − A x), con el residuo de la iteración anterior
+                delta = [ri / d for ri, d in zip(r, diag)]
+                x = [xi + di for xi, di in zip(x, delta)]
+                err = max(abs(di) for di in delta)
+            else:
+                err = 0.0
+                for k in range(n):
+                    s = b[k]
+                    for j, v in zip(A['indices'][k], A['valores'][k]):
+                        if j != k:
+                            s -= v * x[j]
+                    nuevo = (1.0 - w) * x[k] + w * s / diag[k]
+                    err = max(err, abs(nuevo - x[k]))
+                    x[k] = nuevo
+            r = [bi - ai for bi, ai in zip(b, _producto(A, x))]
+            r_rel = _norma(r) / norma_b
+            registrar(i, r_rel, err)
+            if r_rel < tol:
+                convergio = True
+                break
+            if not math.isfinite(r_rel) or r_rel > LIMITE_DIVERGENCIA:
+                warnings.append(f"El residuo crece sin control (el método diverge): proceso detenido en la iteración {i}.")
+                break
+
+    # Residuo verdadero al final (el del gradiente conjugado es recursivo)
+    residuo = _norma([bi - ai for bi, ai in zip(b, _producto(A, x))]) / norma_b
+    return {
+        'iteraciones': iteraciones,
+        'convergio': convergio,
+        'conteo_iter': iteraciones[-1]['i'] if iteraciones else 0,
+        'x': x,
+        'residuo': residuo,
+        'metodo': metodo,
+        'warnings': warnings,
     }
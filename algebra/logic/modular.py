@@ -0,0 +1,320 @@
+"""Motor multimodular para determinantes e inversas exactas de matrices grandes
+
+Descripción:
+- Para matrices enteras grandes, la eliminación exacta arrastra numeradores
+  enormes. Aquí se trabaja módulo varios primos de 31 bits (aritmética con
+  enteros pequeños) y se reconstruye el resultado exacto con el Teorema Chino
+  del Resto (CRT).
+- Regla de parada: la cota de Hadamard H = Π ||fila_i||₂ acota |det(A)| y
+  cualquier menor de orden n−1; basta con que el producto de los primos
+  supere 2H para que el representante simétrico sea el valor exacto.
+- En la inversa se intenta además una salida temprana: con reconstrucción
+  racional de A⁻¹ mod M y comprobación exacta A·X = I.
+- Los residuos de cada primo son independientes; con `procesos` se reparten
+  entre procesos (concurrent.futures). Cada llamada crea un único
+  ProcessPoolExecutor y lo reutiliza en todos los lotes de primos.
+
+Trabaja sólo con matrices de int; operaciones.py escala las filas con
+fracciones a enteros antes de llamar a este módulo.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from .paralelo import contexto_procesos
+
+# Procesos para repartir los primos (None o 0: secuencial). Se puede fijar
+# desde settings.ALGEBRA_PROCESOS_MODULAR (ver apps.py).
+PROCESOS = None
+
+# Tamaño a partir del cual operaciones.py elige este motor
+UMBRAL_MODULAR = 30
+
+_BITS_PRIMO = 31
+
+
+def _es_primo(n):
+    """Miller-Rabin determinista para n < 3.3·10^24."""
+    if n < 2:
+        return False
+    pequenos = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    for p in pequenos:
+        if n % p == 0:
+            return n == p
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in pequenos:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+_primos_cache = []
+
+
+def primos(cantidad):
+    """Los `cantidad` primos más grandes por debajo de 2^31 (en orden descendente)."""
+    if len(_primos_cache) < cantidad:
+        candidato = _primos_cache[-1] - 2 if _primos_cache else (1 << _BITS_PRIMO) - 1
+        while len(_primos_cache) < cantidad:
+            if _es_primo(candidato):
+                _primos_cache.append(candidato)
+            candidato -= 2
+    return _primos_cache[:cantidad]
+
+
+def bits_hadamard(MI):
+    """log2 de la cota de Hadamard Π ||fila_i||₂ (redondeado hacia arriba)."""
+    total = 0.0
+    for fila in MI:
+        norma2 = sum(x * x for x in fila)
+        if norma2 == 0:
+            return 0
+        total += 0.5 * math.log2(norma2)
+    return int(math.ceil(total)) + 1
+
+
+def _det_mod(MI, p):
+    """det(MI) mod p por eliminación gaussiana en Z/pZ."""
+    M = [[x % p for x in fila] for fila in MI]
+    n = len(M)
+    det = 1
+    for k in range(n):
+        r = k
+        while r < n and M[r][k] == 0:
+            r += 1
+        if r == n:
+            return 0
+        if r != k:
+            M[k], M[r] = M[r], M[k]
+            det = -det
+        pk = M[k][k]
+        det = det * pk % p
+        inv = pow(pk, p - 2, p)
+        filak = M[k]
+        for i in range(k + 1, n):
+            filai = M[i]
+            f = filai[k] * inv % p
+            if f:
+                M[i] = [(a - f * b) % p for a, b in zip(filai, filak)]
+    return det % p
+
+
+def _inversa_mod(MI, p):
+    """(det mod p, adj(MI) mod p) por Gauss-Jordan en Z/pZ; adj es None si p | det."""
+    n = len(MI)
+    M = [[x % p for x in fila] + [1 if i == j else 0 for j in range(n)] for i, fila in enumerate(MI)]
+    det = 1
+    for k in range(n):
+        r = k
+        while r < n and M[r][k] == 0:
+            r += 1
+        if r == n:
+            return 0, None
+        if r != k:
+            M[k], M[r] = M[r], M[k]
+            det = -det
+        pk = M[k][k]
+        det = det * pk % p
+        inv = pow(pk, p - 2, p)
+        filak = [x * inv % p for x in M[k]]
+        M[k] = filak
+        for i in range(n):
+            if i != k:
+                filai = M[i]
+                f = filai[k]
+                if f:
+                    M[i] = [(a - f * b) % p for a, b in zip(filai, filak)]
+    det %= p
+    # adj = det · A^{-1}
+    return det, [[x * det % p for x in fila[n:]] for fila in M]
+
+
+def _residuos_det(MI, lista_primos):
+    return [_det_mod(MI, p) for p in lista_primos]
+
+
+def _residuos_inversa(MI, lista_primos):
+    return [_inversa_mod(MI, p) for p in lista_primos]
+
+
+def _ejecutor(procesos):
+    """ProcessPoolExecutor para `procesos` trabajadores, o un contexto vacío
+    (None) si el cálculo es secuencial."""
+    if not procesos or procesos <= 1:
+        return nullcontext()
+    return ProcessPoolExecutor(max_workers=procesos, mp_context=contexto_procesos())
+
+
+def _calcular(funcion, MI, lista_primos, procesos, ex=None):
+    """Aplica `funcion(MI, primos)` en un proceso o repartida en `procesos`.
+
+    `ex` es el ejecutor ya abierto por el llamador; sin él se crea uno sólo
+    para esta llamada.
+    """
+    if not procesos or procesos <= 1 or len(lista_primos) < 2:
+        return funcion(MI, lista_primos)
+    trozos = [lista_primos[i::procesos] for i in range(procesos)]
+    trozos = [t for t in trozos if t]
+    if ex is None:
+        with _ejecutor(len(trozos)) as propio:
+            partes = list(propio.map(funcion, [MI] * len(trozos), trozos))
+    else:
+        partes = list(ex.map(funcion, [MI] * len(trozos), trozos))
+    # deshacer el reparto intercalado
+    resultado = [None] * len(lista_primos)
+    for i, parte in enumerate(partes):
+        resultado[i::len(trozos)] = parte
+    return resultado
+
+
+def _crt(r1, m1, r2, m2):
+    """x ≡ r1 (mod m1), x ≡ r2 (mod m2) con m1, m2 coprimos ⇒ (x mod m1·m2)."""
+    t = (r2 - r1) * pow(m1, -1, m2) % m2
+    return r1 + m1 * t
+
+
+def _simetrico(x, m):
+    return x - m if x > m // 2 else x
+
+
+def reconstruccion_racional(a, m):
+    """Devuelve (n, d) con n/d ≡ a (mod m), |n|, d ≤ sqrt(m/2), o None si no existe."""
+    limite = math.isqrt(m // 2)
+    r0, r1 = m, a % m
+    s0, s1 = 0, 1
+    while r1 > limite:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        s0, s1 = s1, s0 - q * s1
+    if s1 == 0 or abs(s1) > limite:
+        return None
+    if s1 < 0:
+        r1, s1 = -r1, -s1
+    if math.gcd(r1, s1) != 1:
+        return None
+    return r1, s1
+
+
+def determinante_modular(MI, procesos=None):
+    """Determinante exacto (int) de una matriz entera cuadrada."""
+    n = len(MI)
+    if n == 0:
+        return 1
+    bits = bits_hadamard(MI)
+    if bits == 0:
+        return 0
+    cantidad = bits // (_BITS_PRIMO - 1) + 1
+    lista = primos(cantidad)
+    residuos = _calcular(_residuos_det, MI, lista, procesos if procesos is not None else PROCESOS)
+    x, m = 0, 1
+    for r, p in zip(residuos, lista):
+        x = _crt(x, m, r, p)
+        m *= p
+    return _simetrico(x, m)
+
+
+def _verificar_inversa(MI, X):
+    """True si MI · X = I exactamente (X con entradas (n, d))."""
+    n = len(MI)
+    comun = 1
+    for fila in X:
+        for _num, den in fila:
+            comun = comun * den // math.gcd(comun, den)
+    columnas = [[X[k][j][0] * (comun // X[k][j][1]) for k in range(n)] for j in range(n)]
+    for i in range(n):
+        fila = MI[i]
+        for j in range(n):
+            v = sum(a * b for a, b in zip(fila, columnas[j]))
+            if v != (comun if i == j else 0):
+                return False
+    return True
+
+
+def inversa_modular(MI, procesos=None):
+    """Inversa exacta de una matriz entera cuadrada.
+
+    Devuelve X con X[i][j] = (numerador, denominador) reducidos (denominador
+    positivo), o None si la matriz es singular.
+    """
+    n = len(MI)
+    procesos = procesos if procesos is not None else PROCESOS
+    bits = bits_hadamard(MI)
+    if bits == 0:
+        return None
+    necesarios = bits // (_BITS_PRIMO - 1) + 1
+    det_x, det_m = 0, 1
+    adj_x = [[0] * n for _ in range(n)]
+    adj_m = 1
+    usados = 0
+    siguiente_control = 2
+    lote = max(1, procesos or 1)
+    # Un solo ejecutor para todos los lotes: arrancar procesos cuesta más que un lote
+    with _ejecutor(procesos) as ex:
+        while True:
+            lista = primos(usados + lote)[usados:]
+            usados += lote
+            for p, (d, adj) in zip(lista, _calcular(_residuos_inversa, MI, lista, procesos, ex)):
+                det_x = _crt(det_x, det_m, d, p)
+                det_m *= p
+                if adj is None:
+                    # p divide al determinante: este primo no aporta a la adjunta
+                    continue
+                inv_m = pow(adj_m, -1, p)
+                for i in range(n):
+                    fila_x = adj_x[i]
+                    fila_r = adj[i]
+                    for j in range(n):
+                        t = (fila_r[j] - fila_x[j]) * inv_m % p
+                        fila_x[j] += adj_m * t
+                adj_m *= p
+
+            # Cota de Hadamard alcanzada: el resultado es exacto
+            if det_m.bit_length() > bits + 1 and adj_m.bit_length() > bits + 1:
+                det = _simetrico(det_x, det_m)
+                if det == 0:
+                    return None
+                X = []
+                for fila in adj_x:
+                    fila_out = []
+                    for v in fila:
+                        num = _simetrico(v, adj_m)
+                        g = math.gcd(num, det)
+                        if det < 0:
+                            g = -g
+                        fila_out.append((num // g, det // g))
+                    X.append(fila_out)
+                return X
+            if det_m.bit_length() > bits + 1 and _simetrico(det_x, det_m) == 0:
+                return None
+
+            # Salida temprana: reconstrucción racional de A^{-1} = adj/det mod M
+            if usados >= siguiente_control and usados < necesarios and adj_m > 1:
+                siguiente_control *= 2
+                det_r = det_x % adj_m
+                if math.gcd(det_r, adj_m) == 1:
+                    inv_det = pow(det_r, -1, adj_m)
+                    X = []
+                    for fila in adj_x:
+                        fila_out = []
+                        for v in fila:
+                            rr = reconstruccion_racional(v * inv_det % adj_m, adj_m)
+                            if rr is None:
+                                break
+                            fila_out.append(rr)
+                        else:
+                            X.append(fila_out)
+                            continue
+                        break
+                    if len(X) == n and _verificar_inversa(MI, X):
+                        return X
@@ -1,10 +1,73 @@
+import sys
+import threading
+import time
+from functools import wraps
+from math import comb, lcm, log2, log10
+from operator import mul
+
+from . import estructura
+from . import modular
+from . import paralelo
+from . import perfil
 from . import utilidades as u
 from .utilidades import (
     texto_fraccion, texto_numero, copiar_matriz, es_cero, es_uno, negativo_fraccion,
     dividir_fracciones, sumar_fracciones, restar_fracciones,
     multiplicar_fracciones, simplificar_fraccion,
+    sumar_producto, restar_producto, producto_punto,
 )
 
+# Totales por operación de las llamadas con diagnostico=True:
+# operacion -> {'llamadas', 'ms', 'mcd', 'simplificar_fraccion', 'asignaciones', 'bits_max'}
+ESTADISTICAS = {}
+_cerrojo_estadisticas = threading.Lock()
+
+
+def _diagnosticable(funcion):
+    """Añade el parámetro `diagnostico`. Con diagnostico=True la operación se
+    ejecuta contando mcd, simplificaciones, asignaciones y bits máximos (ver
+    utilidades.diagnosticar), el resultado se acumula en ESTADISTICAS y el dict
+    de información devuelto recibe la clave 'diagnostico'."""
+    nombre = funcion.__name__
+
+    @wraps(funcion)
+    def envoltura(*args, diagnostico=False, **kwargs):
+        if not diagnostico:
+            return funcion(*args, **kwargs)
+        t0 = time.perf_counter()
+        with u.diagnosticar() as c:
+            resultado = funcion(*args, **kwargs)
+        diag = {
+            "operacion": nombre,
+            "ms": (time.perf_counter() - t0) * 1000.0,
+            "mcd": c.get("mcd", 0),
+            "simplificar_fraccion": c.get("simplificar_fraccion", 0),
+            "asignaciones": c.get("asignaciones", 0),
+            "bits_entrada": u.bits_matriz(args[0]) if args and isinstance(args[0], list) else 0,
+            "bits_max": c.get("bits_max", 0),
+        }
+        with _cerrojo_estadisticas:
+            total = ESTADISTICAS.setdefault(nombre, {
+                "llamadas": 0, "ms": 0.0, "mcd": 0, "simplificar_fraccion": 0,
+                "asignaciones": 0, "bits_max": 0,
+            })
+            total["llamadas"] += 1
+            for clave in ("ms", "mcd", "simplificar_fraccion", "asignaciones"):
+                total[clave] += diag[clave]
+            total["bits_max"] = max(total["bits_max"], diag["bits_max"])
+        info = resultado[0] if isinstance(resultado, tuple) else resultado
+        if isinstance(info, dict):
+            info["diagnostico"] = diag
+        return resultado
+    return envoltura
+
+
+def estadisticas_operaciones():
+    """Copia de ESTADISTICAS."""
+    with _cerrojo_estadisticas:
+        return {k: dict(v) for k, v in ESTADISTICAS.items()}
+
+
 def copiar_matriz(M):
     return u.copiar_matriz(M)
 
@@ -24,20 +87,27 @@ def fila_sumar_multiplo(M, i, j, c):
     columnas = len(M[i])
     k = 0
     while k < columnas:
-        termino = multiplicar_fracciones(c, M[j][k])
-        M[i][k] = sumar_fracciones(M[i][k], termino)
+        M[i][k] = sumar_producto(M[i][k], c, M[j][k])
         k = k + 1
 
-def _gauss_jordan_detallado(M, text_fn=texto_fraccion):
+def _gauss_jordan_detallado(M, text_fn=texto_fraccion, registrar_pasos=True, procesos=None):
     """Aplica Gauss-Jordan (forma escalonada reducida) y devuelve
-    (R, pivotes, pasos) con todo el detalle."""
+    (R, pivotes, pasos) con todo el detalle.
+
+    Sin pasos, y con varios procesos (ver paralelo.py), las actualizaciones de
+    filas de cada pivote se reparten entre procesos; R y pivotes no cambian.
+    """
     R = copiar_matriz(M)
     m = len(R)
     n = len(R[0]) - 1
     pasos = []  # historial
+    if not registrar_pasos and paralelo.usar_paralelo(m, procesos):
+        R = paralelo.eliminar_paralelo(R, procesos or paralelo.PROCESOS)
+        return [R, _columnas_pivote(R), pasos]
 
     def registrar(operacion):
-        pasos.append({"operacion": operacion, "matriz": copiar_matriz(R)})
+        if registrar_pasos:
+            pasos.append({"operacion": operacion, "matriz": copiar_matriz(R)})
     fila_pivote = 0
     col = 0
     # Recorre columnas buscando pivotes y los normaliza
@@ -73,7 +143,12 @@ def _gauss_jordan_detallado(M, text_fn=texto_fraccion):
         col += 1
     # Estado final
     registrar("Matriz en forma escalonada reducida por filas")
-    # Identificar columnas pivote
+    return [R, _columnas_pivote(R), pasos]
+
+def _columnas_pivote(R):
+    """Columnas pivote de una matriz aumentada en forma escalonada reducida."""
+    m = len(R)
+    n = len(R[0]) - 1
     pivotes = []
     r = 0
     c = 0
@@ -90,15 +165,17 @@ def _gauss_jordan_detallado(M, text_fn=texto_fraccion):
                 pivotes.append(c)
                 r += 1
         c += 1
-    return [R, pivotes, pasos]
+    return pivotes
 
-def gauss_jordan(M, registrar_pasos=False, text_fn=texto_fraccion):
+@perfil.medir("calculo")
+def gauss_jordan(M, registrar_pasos=False, text_fn=texto_fraccion, procesos=None):
     """Envuelve Gauss-Jordan devolviendo sólo lo necesario para la vista.
 
     - Si registrar_pasos es True: retorna (R, pasos)
     - En caso contrario: retorna sólo R
+    - procesos: reparto de filas entre procesos (sólo sin pasos)
     """
-    R, _pivotes, pasos = _gauss_jordan_detallado(M, text_fn=text_fn)
+    R, _pivotes, pasos = _gauss_jordan_detallado(M, text_fn=text_fn, registrar_pasos=registrar_pasos, procesos=procesos)
     return (R, pasos) if registrar_pasos else R
 
 def eliminacion_gauss(M, text_fn=texto_fraccion):
@@ -162,6 +239,7 @@ def eliminacion_gauss(M, text_fn=texto_fraccion):
         c += 1
     return [R, pivotes, pasos]
 
+@perfil.medir("calculo")
 def gauss(M, registrar_pasos=False, text_fn=texto_fraccion):
     """
     Si registrar_pasos es True: retorna (R, pasos)
@@ -215,12 +293,7 @@ def analizar_solucion_gauss(R, pivotes):
                 break
             col += 1
         if piv_col != -1:
-            suma = [0,1]
-            j = piv_col + 1
-            while j < n:
-                if not es_cero(R[fila][j]):
-                    suma = sumar_fracciones(suma, multiplicar_fracciones(R[fila][j], solucion_particular[j]))
-                j += 1
+            suma = producto_punto(R[fila][piv_col + 1:n], solucion_particular[piv_col + 1:n])
             rhs = R[fila][n]
             resto = restar_fracciones(rhs, suma)
             piv = R[fila][piv_col]
@@ -369,6 +442,8 @@ def construir_expresiones_parametricas(R, pivotes, text_fn=texto_fraccion):
         r += 1
     return {"expresiones": expresiones, "libres": libres}
 
+@perfil.medir("calculo")
+@_diagnosticable
 def gauss_info(M, registrar_pasos=False, text_fn=texto_fraccion):
     """Devuelve toda la información necesaria para la vista de Gauss:
     {
@@ -428,10 +503,12 @@ def gauss_info(M, registrar_pasos=False, text_fn=texto_fraccion):
         info["pasos"] = pasos
     return info
 
-def gauss_jordan_info(M, registrar_pasos=False, text_fn=texto_fraccion):
+@perfil.medir("calculo")
+@_diagnosticable
+def gauss_jordan_info(M, registrar_pasos=False, text_fn=texto_fraccion, procesos=None):
     """Devuelve información extendida para la vista Gauss-Jordan, incluyendo
     expresiones paramétricas cuando hay variables libres."""
-    R, pivotes, pasos = _gauss_jordan_detallado(M, text_fn=text_fn)
+    R, pivotes, pasos = _gauss_jordan_detallado(M, text_fn=text_fn, registrar_pasos=registrar_pasos, procesos=procesos)
     base = analizar_solucion(R, pivotes)
     analisis = {
         "solucion": base["solucion"],
@@ -486,6 +563,8 @@ def gauss_jordan_info(M, registrar_pasos=False, text_fn=texto_fraccion):
         info["pasos"] = pasos
     return info
 
+@perfil.medir("calculo")
+@_diagnosticable
 def gauss_jordan_homogeneo_info(A, registrar_pasos=False, text_fn=texto_fraccion):
     """Analiza el sistema homogéneo A x = 0.
     Estrategia general:
@@ -548,6 +627,301 @@ def gauss_jordan_homogeneo_info(A, registrar_pasos=False, text_fn=texto_fraccion
         out["pasos"] = info["pasos"]
     return out
 
+# ----------------------- Núcleo entero -----------------------
+#
+# La mayoría de las matrices que se pegan en los formularios son enteras. Sin
+# pasos que mostrar, las operaciones trabajan sobre int de Python (precisión
+# arbitraria, sin desbordamiento) y sólo construyen fracciones al final, cuando
+# de verdad hay una división.
+
+def _es_entera(M):
+    """True si todas las entradas [n,d] tienen d == 1."""
+    for fila in M:
+        for x in fila:
+            if x[1] != 1:
+                return False
+    return True
+
+def _filas_a_enteros(M):
+    """Escala cada fila por el mcm de sus denominadores.
+
+    Devuelve (MI, escalas) con MI[i][j] = M[i][j] · escalas[i] entero.
+    """
+    MI = []
+    escalas = []
+    for fila in M:
+        e = lcm(*(x[1] for x in fila))
+        escalas.append(e)
+        MI.append([x[0] * (e // x[1]) for x in fila])
+    return MI, escalas
+
+def _usar_modular(n):
+    """El motor multimodular (modular.py) sólo compensa frente a Bareiss cuando
+    puede repartir los primos entre varios procesos; en un único proceso la
+    eliminación módulo p en Python puro es más lenta que Bareiss sobre int."""
+    return n >= modular.UMBRAL_MODULAR and (modular.PROCESOS or 0) > 1
+
+def _determinante_bareiss(MI):
+    """Determinante de una matriz entera n×n por eliminación de Bareiss.
+
+    Todas las divisiones son exactas, así que no aparecen fracciones.
+    """
+    M = [fila[:] for fila in MI]
+    n = len(M)
+    signo = 1
+    previo = 1
+    for k in range(n - 1):
+        if M[k][k] == 0:
+            r = k + 1
+            while r < n and M[r][k] == 0:
+                r += 1
+            if r == n:
+                return 0
+            M[k], M[r] = M[r], M[k]
+            signo = -signo
+        pk = M[k][k]
+        filak = M[k]
+        for i in range(k + 1, n):
+            filai = M[i]
+            mik = filai[k]
+            for j in range(k + 1, n):
+                filai[j] = (pk * filai[j] - mik * filak[j]) // previo
+        previo = pk
+    return signo * M[n - 1][n - 1]
+
+def _inversa_bareiss(MI):
+    """Gauss-Jordan sin fracciones (Bareiss) sobre [MI | I] con MI entera.
+
+    Devuelve (d, R, None) con MI^{-1} = R / d, o (None, None, col) si la
+    columna `col` no tiene pivote (MI singular).
+    """
+    n = len(MI)
+    M = [fila[:] + [1 if i == j else 0 for j in range(n)] for i, fila in enumerate(MI)]
+    ancho = 2 * n
+    previo = 1
+    for k in range(n):
+        if M[k][k] == 0:
+            r = k + 1
+            while r < n and M[r][k] == 0:
+                r += 1
+            if r == n:
+                return None, None, k
+            M[k], M[r] = M[r], M[k]
+        pk = M[k][k]
+        filak = M[k]
+        for i in range(n):
+            if i == k:
+                continue
+            filai = M[i]
+            mik = filai[k]
+            for j in range(ancho):
+                if j != k:
+                    filai[j] = (pk * filai[j] - mik * filak[j]) // previo
+            filai[k] = 0
+        previo = pk
+    # Ahora el bloque izquierdo es previo·I y el derecho previo·MI^{-1}
+    return previo, [fila[n:] for fila in M], None
+
+# ----------------------- Atajos por estructura -----------------------
+
+# La eliminación en banda se usa si (ancho inferior + superior) ≤ n // _DIVISOR_BANDA
+_DIVISOR_BANDA = 4
+
+def _subbloque(A, s, e):
+    return [fila[s:e] for fila in A[s:e]]
+
+def _producto_diagonal(A):
+    det = [1,1]
+    for i in range(len(A)):
+        det = multiplicar_fracciones(det, A[i][i])
+        if det[0] == 0:
+            break
+    return det
+
+def _determinante_banda(A, inferior, superior):
+    """Eliminación con pivoteo limitada a la banda: O(n·p·(p+q))."""
+    n = len(A)
+    M = copiar_matriz(A)
+    ancho = inferior + superior  # los intercambios ensanchan la banda superior
+    det = [1,1]
+    signo = 1
+    for k in range(n):
+        ultima = min(n, k + inferior + 1)
+        piv_row = -1
+        for r in range(k, ultima):
+            if not es_cero(M[r][k]):
+                piv_row = r
+                break
+        if piv_row == -1:
+            return [0,1]
+        if piv_row != k:
+            fila_intercambiar(M, k, piv_row)
+            signo = -signo
+        piv = M[k][k]
+        det = multiplicar_fracciones(det, piv)
+        hasta = min(n, k + ancho + 1)
+        for i in range(k + 1, ultima):
+            if not es_cero(M[i][k]):
+                factor = dividir_fracciones(M[i][k], piv)
+                for j in range(k, hasta):
+                    M[i][j] = restar_producto(M[i][j], factor, M[k][j])
+    return negativo_fraccion(det) if signo == -1 else det
+
+def _determinante_estructurado(A, est):
+    """|A| aprovechando la estructura, o None si no hay atajo."""
+    n = est["n"]
+    if est["triangular_superior"] or est["triangular_inferior"]:
+        return _producto_diagonal(A)
+    p = est["permutacion"]
+    if p is not None:
+        det = [estructura.signo_permutacion(p), 1]
+        for i in range(n):
+            det = multiplicar_fracciones(det, A[i][p[i]])
+        return det
+    if len(est["bloques"]) > 1:
+        det = [1,1]
+        for s, e in est["bloques"]:
+            det = multiplicar_fracciones(det, determinante_matriz(_subbloque(A, s, e)))
+            if det[0] == 0:
+                break
+        return det
+    inferior, superior = est["banda"]
+    if inferior + superior <= n // _DIVISOR_BANDA:
+        return _determinante_banda(A, inferior, superior)
+    return None
+
+def _inversa_triangular_inferior(L):
+    """L^{-1} por sustitución hacia adelante, columna a columna."""
+    n = len(L)
+    X = [[[0,1] for _ in range(n)] for _ in range(n)]
+    for c in range(n):
+        x = [[0,1]] * n
+        x[c] = dividir_fracciones([1,1], L[c][c])
+        for i in range(c + 1, n):
+            s = producto_punto(L[i][c:i], x[c:i])
+            x[i] = dividir_fracciones(negativo_fraccion(s), L[i][i])
+        for i in range(c, n):
+            X[i][c] = x[i]
+    return X
+
+def _barrido_simetrico(B):
+    """Barrido (sweep) sin fracciones de una matriz entera simétrica B.
+
+    Cada paso barre un índice k con pivote no nulo y actualiza sólo el
+    triángulo inferior: S_ij ← (p_k·S_ij − S_ik·S_kj) / p_{k−1}, con divisiones
+    exactas como en Bareiss. Al barrer todos, B^{-1} = −S / p.
+    Devuelve (p, S) con S triangular inferior, (0, None) si B es singular o
+    None si no queda pivote diagonal y B podría ser invertible (haría falta
+    un pivote 2×2).
+    """
+    n = len(B)
+    S = [fila[:i + 1] for i, fila in enumerate(B)]
+    barrido = [False] * n
+    previo = 1
+    for _ in range(n):
+        k = next((k for k in range(n) if not barrido[k] and S[k][k] != 0), None)
+        if k is None:
+            resto = [i for i in range(n) if not barrido[i]]
+            if any(S[i][j] != 0 for i in resto for j in resto if j <= i):
+                return None
+            return 0, None
+        pk = S[k][k]
+        col = [S[k][i] if i <= k else S[i][k] for i in range(n)]
+        for i in range(n):
+            if i == k:
+                continue
+            ci = col[i]
+            fila = S[i]
+            for j in range(i + 1):
+                if j != k:
+                    fila[j] = (pk * fila[j] - ci * col[j]) // previo
+        S[k][k] = -previo
+        barrido[k] = True
+        previo = pk
+    return previo, S
+
+def _inversa_simetrica(A):
+    """info de A^{-1} para A simétrica por barrido sobre medio triángulo, o
+    None si hace falta pivotear fuera de la diagonal. Con L el mcm de los
+    denominadores, B = L·A sigue siendo simétrica y A^{-1} = L·B^{-1}."""
+    n = len(A)
+    L = lcm(*(x[1] for fila in A for x in fila))
+    res = _barrido_simetrico([[x[0] * (L // x[1]) for x in fila] for fila in A])
+    if res is None:
+        return None
+    d, S = res
+    if d == 0:
+        return {"invertible": False, "inversa": None, "metodo": "simetrica", "razon": "|A| = 0"}
+    inv = [[None] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1):
+            inv[i][j] = simplificar_fraccion(-S[i][j] * L, d)
+            inv[j][i] = inv[i][j]
+    return {"invertible": True, "inversa": inv, "metodo": "simetrica"}
+
+def _inversa_estructurada(A, est):
+    """info de la inversa aprovechando la estructura, o None si no hay atajo."""
+    n = est["n"]
+    if est["triangular_superior"] or est["triangular_inferior"]:
+        metodo = "diagonal" if est["diagonal"] else "triangular"
+        for i in range(n):
+            if es_cero(A[i][i]):
+                return {"invertible": False, "inversa": None, "metodo": metodo, "razon": f"a{i+1}{i+1} = 0 en la diagonal"}
+        if est["diagonal"]:
+            inv = [[dividir_fracciones([1,1], A[i][i]) if i == j else [0,1] for j in range(n)] for i in range(n)]
+        elif est["triangular_inferior"]:
+            inv = _inversa_triangular_inferior(A)
+        else:
+            # U^{-1} = ((U^T)^{-1})^T, con U^T triangular inferior
+            inv = transponer_matriz(_inversa_triangular_inferior(transponer_matriz(A)))
+        return {"invertible": True, "inversa": inv, "metodo": metodo}
+    p = est["permutacion"]
+    if p is not None:
+        # A = P·D ⇒ A^{-1}[p(i)][i] = 1 / A[i][p(i)]
+        inv = [[[0,1] for _ in range(n)] for _ in range(n)]
+        for i in range(n):
+            inv[p[i]][i] = dividir_fracciones([1,1], A[i][p[i]])
+        return {"invertible": True, "inversa": inv, "metodo": "permutacion"}
+    if len(est["bloques"]) > 1:
+        inv = [[[0,1] for _ in range(n)] for _ in range(n)]
+        for k, (s, e) in enumerate(est["bloques"]):
+            info = inversa_matriz(_subbloque(A, s, e))
+            if not info["invertible"]:
+                return {"invertible": False, "inversa": None, "metodo": "bloques", "razon": f"El bloque {k+1} no es invertible ({info['razon']})"}
+            for i, fila in enumerate(info["inversa"]):
+                inv[s + i][s:e] = fila
+        return {"invertible": True, "inversa": inv, "metodo": "bloques"}
+    if est["simetrica"]:
+        return _inversa_simetrica(A)
+    return None
+
+def _resolver_estructurado(A, b, est):
+    """x con A x = b si A es triangular, monomial o simétrica (|A| ≠ 0), o None."""
+    n = est["n"]
+    p = est["permutacion"]
+    if p is not None:
+        x = [None] * n
+        for i in range(n):
+            x[p[i]] = dividir_fracciones(b[i], A[i][p[i]])
+        return x
+    if est["triangular_inferior"]:
+        orden = range(n)
+    elif est["triangular_superior"]:
+        orden = range(n - 1, -1, -1)
+    elif est["simetrica"]:
+        # x = A^{-1} b: un barrido en lugar de n determinantes
+        info = _inversa_simetrica(A)
+        if info is None or not info["invertible"]:
+            return None
+        return [producto_punto(fila, b) for fila in info["inversa"]]
+    else:
+        return None
+    x = [[0,1]] * n
+    for i in orden:
+        s = producto_punto(A[i], x)
+        x[i] = dividir_fracciones(restar_fracciones(b[i], s), A[i][i])
+    return x
+
 # ----------------------- Operaciones con matrices -----------------------
 
 def _validar_dimensiones_iguales(A, B):
@@ -560,11 +934,14 @@ def _validar_dimensiones_iguales(A, B):
     if mA != mB or nA != nB:
         raise ValueError("Para sumar, ambas matrices deben tener las mismas dimensiones.")
 
+@perfil.medir("calculo")
 def sumar_matrices(A, B):
     """Suma dos matrices A y B (sin columna aumentada), elemento a elemento.
     Devuelve la matriz resultado C. Usa aritmética de fracciones del módulo utilidades.
     """
     _validar_dimensiones_iguales(A, B)
+    if _es_entera(A) and _es_entera(B):
+        return [[[a[0] + b[0], 1] for a, b in zip(fa, fb)] for fa, fb in zip(A, B)]
     m = len(A)
     n = len(A[0])
     C = []
@@ -588,12 +965,104 @@ def _validar_dimensiones_multiplicacion(A, B):
     if pA != pB:
         raise ValueError("Para multiplicar, el número de columnas de A debe ser igual al número de filas de B.")
 
+# Producto exacto sin pasos: se trabaja con enteros escalando cada fila de A por
+# el mcm de sus denominadores y cada columna de B por el de los suyos, de modo
+# que cada entrada de C se simplifica una única vez al final.
+_BLOQUE_PRODUCTO = 64
+_UMBRAL_STRASSEN = 128   # tamaño a partir del cual se usa Strassen
+_HOJA_STRASSEN = 64      # tamaño en el que la recursión vuelve al producto por bloques
+
+
+def _producto_enteros_bloques(A, BT):
+    """A (m×p) por B (p×n) con B dada como transpuesta BT (n×p), por bloques de columnas."""
+    m = len(A)
+    n = len(BT)
+    C = [[0] * n for _ in range(m)]
+    for j0 in range(0, n, _BLOQUE_PRODUCTO):
+        bloque = BT[j0:j0 + _BLOQUE_PRODUCTO]
+        for i in range(m):
+            fila = A[i]
+            filaC = C[i]
+            for dj, col in enumerate(bloque):
+                filaC[j0 + dj] = sum(map(mul, fila, col))
+    return C
+
+
+def _sumar_enteros(X, Y):
+    return [[a + b for a, b in zip(fx, fy)] for fx, fy in zip(X, Y)]
+
+
+def _restar_enteros(X, Y):
+    return [[a - b for a, b in zip(fx, fy)] for fx, fy in zip(X, Y)]
+
+
+def _strassen_enteros(A, B):
+    """Producto de matrices enteras cuadradas n×n (Strassen, 7 productos por nivel).
+
+    Con n <= _HOJA_STRASSEN se usa el producto por bloques.
+    """
+    n = len(A)
+    if n <= _HOJA_STRASSEN:
+        return _producto_enteros_bloques(A, [list(c) for c in zip(*B)])
+    if n % 2:
+        # Rellenar con una fila/columna de ceros para poder partir en mitades
+        A = [fila + [0] for fila in A] + [[0] * (n + 1)]
+        B = [fila + [0] for fila in B] + [[0] * (n + 1)]
+        C = _strassen_enteros(A, B)
+        return [fila[:n] for fila in C[:n]]
+    h = n // 2
+    A11 = [f[:h] for f in A[:h]]; A12 = [f[h:] for f in A[:h]]
+    A21 = [f[:h] for f in A[h:]]; A22 = [f[h:] for f in A[h:]]
+    B11 = [f[:h] for f in B[:h]]; B12 = [f[h:] for f in B[:h]]
+    B21 = [f[:h] for f in B[h:]]; B22 = [f[h:] for f in B[h:]]
+    M1 = _strassen_enteros(_sumar_enteros(A11, A22), _sumar_enteros(B11, B22))
+    M2 = _strassen_enteros(_sumar_enteros(A21, A22), B11)
+    M3 = _strassen_enteros(A11, _restar_enteros(B12, B22))
+    M4 = _strassen_enteros(A22, _restar_enteros(B21, B11))
+    M5 = _strassen_enteros(_sumar_enteros(A11, A12), B22)
+    M6 = _strassen_enteros(_restar_enteros(A21, A11), _sumar_enteros(B11, B12))
+    M7 = _strassen_enteros(_restar_enteros(A12, A22), _sumar_enteros(B21, B22))
+    C11 = _sumar_enteros(_restar_enteros(_sumar_enteros(M1, M4), M5), M7)
+    C12 = _sumar_enteros(M3, M5)
+    C21 = _sumar_enteros(M2, M4)
+    C22 = _sumar_enteros(_sumar_enteros(_restar_enteros(M1, M2), M3), M6)
+    return [f1 + f2 for f1, f2 in zip(C11, C12)] + [f1 + f2 for f1, f2 in zip(C21, C22)]
+
+
+def _multiplicar_matrices_rapido(A, B):
+    """A·B exacto sin registrar pasos. Devuelve C con fracciones [n,d] simplificadas."""
+    m = len(A)
+    p = len(A[0])
+    n = len(B[0])
+    # Escalas: mcm de denominadores por fila de A y por columna de B
+    escalaA = [lcm(*(x[1] for x in fila)) for fila in A]
+    escalaB = [lcm(*(B[k][j][1] for k in range(p))) for j in range(n)]
+    AE = [[x[0] * (e // x[1]) for x in fila] for fila, e in zip(A, escalaA)]
+    BE = [[B[k][j][0] * (escalaB[j] // B[k][j][1]) for j in range(n)] for k in range(p)]
+    if m == p == n and n >= _UMBRAL_STRASSEN:
+        CE = _strassen_enteros(AE, BE)
+    else:
+        CE = _producto_enteros_bloques(AE, [list(c) for c in zip(*BE)])
+    C = []
+    for i in range(m):
+        ea = escalaA[i]
+        filaCE = CE[i]
+        if ea == 1:
+            C.append([[v, 1] if eb == 1 else simplificar_fraccion(v, eb) for v, eb in zip(filaCE, escalaB)])
+        else:
+            C.append([simplificar_fraccion(v, ea * eb) for v, eb in zip(filaCE, escalaB)])
+    return C
+
+
+@perfil.medir("calculo")
 def multiplicar_matrices(A, B, registrar_pasos=False, text_fn=texto_fraccion):
     """Multiplica A (m×p) por B (p×n) devolviendo C (m×n).
 
-    - Siempre calcula pasos del procedimiento (combinación lineal de columnas).
-    - Si registrar_pasos es True: retorna (C, pasos).
-    - Si es False (por defecto): retorna sólo C (compat con vistas Django).
+    - Si registrar_pasos es True: retorna (C, pasos) con el procedimiento
+      (combinación lineal de columnas).
+    - Si es False (por defecto): retorna sólo C (compat con vistas Django) y
+      no genera pasos; usa el producto entero escalado (ver
+      _multiplicar_matrices_rapido).
     """
     _validar_dimensiones_multiplicacion(A, B)
     m = len(A)
@@ -605,6 +1074,8 @@ def multiplicar_matrices(A, B, registrar_pasos=False, text_fn=texto_fraccion):
         if len(B[i]) != n:
             raise ValueError("La matriz B tiene filas con distinta cantidad de columnas.")
         i += 1
+    if not registrar_pasos:
+        return _multiplicar_matrices_rapido(A, B)
     # Inicializar C con ceros (fracción [0,1])
     C = []
     i = 0
@@ -647,8 +1118,7 @@ def multiplicar_matrices(A, B, registrar_pasos=False, text_fn=texto_fraccion):
                 # Aplicamos coef * columna k de A
                 i = 0
                 while i < m:
-                    termino = multiplicar_fracciones(coef, A[i][k])
-                    C[i][j] = sumar_fracciones(C[i][j], termino)
+                    C[i][j] = sumar_producto(C[i][j], coef, A[i][k])
                     i += 1
                 pasos.append({
                     "operacion": f"Columna {j+1} (paso {paso_col_idx}): añadimos {text_fn(coef)} × (columna A{ k+1 })",
@@ -675,6 +1145,7 @@ def multiplicar_matrices(A, B, registrar_pasos=False, text_fn=texto_fraccion):
 
     return (C, pasos) if registrar_pasos else C
 
+@perfil.medir("calculo")
 def multiplicar_escalar_matriz(c, A, registrar_pasos=False, text_fn=texto_fraccion):
     """Devuelve c·A, escalando cada entrada de A por el escalar c (fracción [n,d])."""
     if A is None or len(A) == 0:
@@ -686,6 +1157,16 @@ def multiplicar_escalar_matriz(c, A, registrar_pasos=False, text_fn=texto_fracci
         if len(A[i]) != n:
             raise ValueError("La matriz A no es rectangular.")
         i += 1
+    if c[1] == 1 and _es_entera(A):
+        C = [[[c[0] * x[0], 1] for x in fila] for fila in A]
+        pasos = []
+        if registrar_pasos:
+            pasos.append({
+                "operacion": f"Escalamos cada entrada por {text_fn(c)}",
+                "matriz": copiar_matriz(C),
+                "tipo": "simple"
+            })
+        return (C, pasos) if registrar_pasos else C
     C = []
     i = 0
     while i < m:
@@ -705,6 +1186,7 @@ def multiplicar_escalar_matriz(c, A, registrar_pasos=False, text_fn=texto_fracci
         })
     return (C, pasos) if registrar_pasos else C
 
+@perfil.medir("calculo")
 def multiplicar_matriz_vector_simbolico(A, v_simbolico, registrar_pasos=False, text_fn=texto_fraccion):
     """Multiplica A (m×n) por un vector simbólico v=[s1,..,sn]^T, devolviendo un vector columna de strings.
 
@@ -756,6 +1238,7 @@ def multiplicar_matriz_vector_simbolico(A, v_simbolico, registrar_pasos=False, t
 
 # ----------------------- Transposición -----------------------
 
+@perfil.medir("calculo")
 def transponer_matriz(A, registrar_pasos=False, text_fn=texto_fraccion):
     """Devuelve la transpuesta A^T intercambiando filas por columnas.
 
@@ -807,6 +1290,8 @@ def _identidad(n):
         i += 1
     return I
 
+@perfil.medir("calculo")
+@_diagnosticable
 def inversa_matriz(A, registrar_pasos=False, text_fn=texto_fraccion):
     """Calcula la inversa de A si existe.
 
@@ -817,7 +1302,8 @@ def inversa_matriz(A, registrar_pasos=False, text_fn=texto_fraccion):
     info = {
       'invertible': bool,
       'inversa': matriz | None,
-      'metodo': '2x2' | 'gauss' | '1x1',
+      'metodo': '2x2' | 'gauss' | '1x1' | 'modular' | 'diagonal' | 'triangular'
+                | 'permutacion' | 'bloques',
       'razon': str opcional (cuando no es invertible)
     }
     """
@@ -907,6 +1393,27 @@ def inversa_matriz(A, registrar_pasos=False, text_fn=texto_fraccion):
         info = {"invertible": True, "inversa": inv, "metodo": "2x2"}
         return (info, pasos) if registrar_pasos else info
 
+    # Caso n≥3 sin pasos: atajos por estructura (diagonal, triangular,
+    # permutación, bloques, barrido simétrico) y, si no hay, Gauss-Jordan sin
+    # fracciones sobre enteros. Con D = diag(escalas), DA es entera y
+    # A^{-1} = (DA)^{-1}·D.
+    if not registrar_pasos:
+        info = _inversa_estructurada(A, estructura.analizar_estructura(A))
+        if info is not None:
+            return info
+        MI, escalas = _filas_a_enteros(A)
+        if _usar_modular(n):
+            X = modular.inversa_modular(MI)
+            if X is None:
+                return {"invertible": False, "inversa": None, "metodo": "modular", "razon": "|A| = 0"}
+            inv = [[simplificar_fraccion(x[0] * e, x[1]) for x, e in zip(fila, escalas)] for fila in X]
+            return {"invertible": True, "inversa": inv, "metodo": "modular"}
+        d, R, col_sin_pivote = _inversa_bareiss(MI)
+        if d is None:
+            return {"invertible": False, "inversa": None, "metodo": "gauss", "razon": f"Columna {col_sin_pivote+1} sin pivote"}
+        inv = [[simplificar_fraccion(x * e, d) for x, e in zip(fila, escalas)] for fila in R]
+        return {"invertible": True, "inversa": inv, "metodo": "gauss"}
+
     # Caso n≥3: Gauss-Jordan sobre [A | I]
     # Construir matriz aumentada con I a la derecha
     ancho = n * 2 # duplica el tamaño de la matriz
@@ -995,30 +1502,180 @@ def inversa_matriz(A, registrar_pasos=False, text_fn=texto_fraccion):
 
 # ----------------------- Determinante -----------------------
 
-def _es_triangular_superior(M):
-    n = len(M)
-    i = 1
-    while i < n:
-        j = 0
-        while j < i:
-            if not es_cero(M[i][j]):
-                return False
-            j += 1
-        i += 1
-    return True
+# ----------------------- Potencia -----------------------
 
-def _es_triangular_inferior(M):
-    n = len(M)
-    i = 0
-    while i < n:
-        j = i+1
-        while j < n:
-            if not es_cero(M[i][j]):
-                return False
-            j += 1
-        i += 1
-    return True
+# Mayor |k| aceptado en A^k (las entradas crecen linealmente en bits con k)
+EXPONENTE_MAXIMO_POTENCIA = 10000
+
+def bits_por_factor(A):
+    """Cota de log2 de lo que cada factor aporta a las entradas de A^k.
+
+    Con L el mcm de los denominadores, A = B/L con B entera, así que
+    A^k = B^k / L^k y cada entrada de B^k está acotada por (n·max|b|)^k.
+    """
+    L = 1
+    for fila in A:
+        for x in fila:
+            L = lcm(L, x[1])
+    mayor = max((abs(x[0]) * (L // x[1]) for fila in A for x in fila), default=0)
+    return max(log2(len(A) * mayor) if mayor else 0.0, log2(L))
+
+def validar_tamano_potencia(A, k):
+    """Rechaza A^k, antes de calcularla, si sus entradas no se podrían
+    convertir a texto (límite sys.get_int_max_str_digits())."""
+    limite = sys.get_int_max_str_digits()
+    if not limite or k == 0:
+        return
+    digitos = abs(k) * bits_por_factor(A) * log10(2)
+    if digitos > limite:
+        raise ValueError(
+            f"A^{k} tendría entradas de hasta unos {int(digitos)} dígitos y el máximo que se puede "
+            f"mostrar es {limite}. Reduce k o los coeficientes de A."
+        )
+
+def _potencia_entrada(a, k):
+    # a es irreducible con d > 0, así que n^k/d^k también lo es
+    return [a[0] ** k, a[1] ** k]
+
+def _potencia_monomial(A, p, k):
+    """A^k para A monomial (A[i][p[i]] único no nulo de su fila), por ciclos de p."""
+    n = len(A)
+    R = [[[0,1] for _ in range(n)] for _ in range(n)]
+    visto = [False] * n
+    for inicio in range(n):
+        if visto[inicio]:
+            continue
+        ciclo = []
+        j = inicio
+        while not visto[j]:
+            visto[j] = True
+            ciclo.append(j)
+            j = p[j]
+        largo = len(ciclo)
+        valores = [A[i][p[i]] for i in ciclo]
+        vuelta = [1,1]
+        for v in valores:
+            vuelta = multiplicar_fracciones(vuelta, v)
+        q, r = divmod(k, largo)
+        vuelta = _potencia_entrada(vuelta, q)
+        for s, i in enumerate(ciclo):
+            v = vuelta
+            for t in range(r):
+                v = multiplicar_fracciones(v, valores[(s + t) % largo])
+            R[i][ciclo[(s + r) % largo]] = v
+    return R
+
+def _productos_binaria(k):
+    return k.bit_length() - 1 + bin(k).count("1") - 1
+
+def _potencia_estructurada(A, k, est):
+    """A^k (k ≥ 1) aprovechando la estructura, o None si no hay atajo."""
+    n = est["n"]
+    if est["diagonal"]:
+        return [[_potencia_entrada(A[i][i], k) if i == j else [0,1] for j in range(n)] for i in range(n)]
+    p = est["permutacion"]
+    if p is not None:
+        return _potencia_monomial(A, p, k)
+    if len(est["bloques"]) > 1:
+        R = [[[0,1] for _ in range(n)] for _ in range(n)]
+        for s, e in est["bloques"]:
+            for i, fila in enumerate(potencia_matriz(_subbloque(A, s, e), k)):
+                R[s + i][s:e] = fila
+        return R
+    if (est["triangular_superior"] or est["triangular_inferior"]) \
+            and all(A[i][i] == A[0][0] for i in range(n)) and n - 2 < _productos_binaria(k):
+        # A = λI + N con N nilpotente (N^n = 0): A^k = Σ_{j<n} C(k,j) λ^{k−j} N^j
+        lam = A[0][0]
+        N = copiar_matriz(A)
+        for i in range(n):
+            N[i][i] = [0,1]
+        R = [[_potencia_entrada(lam, k) if i == j else [0,1] for j in range(n)] for i in range(n)]
+        Nj = N
+        for j in range(1, min(k, n - 1) + 1):
+            if j > 1:
+                Nj = multiplicar_matrices(Nj, N)
+            coef = multiplicar_fracciones([comb(k, j), 1], _potencia_entrada(lam, k - j))
+            if coef[0] == 0:
+                continue
+            for i in range(n):
+                for c in range(n):
+                    if Nj[i][c][0] != 0:
+                        R[i][c] = sumar_producto(R[i][c], coef, Nj[i][c])
+        return R
+    return None
+
+@perfil.medir("calculo")
+def potencia_matriz(A, k, registrar_pasos=False, text_fn=texto_fraccion):
+    """A^k por exponenciación binaria: O(log k) productos en lugar de k − 1.
+
+    - k = 0: identidad; k < 0: (A^{-1})^{|k|} si A es invertible.
+    - Sin pasos, por estructura (ver estructura.py): diagonal (potencia de cada
+      entrada), monomial (por ciclos), bloques diagonales (cada bloque) y
+      λI + N con N nilpotente (binomio de Newton, si usa menos productos).
+    - Con pasos sólo se registran los cuadrados A^{2^j} y los productos del
+      acumulado, no el detalle de cada multiplicación.
+    - Antes de multiplicar se comprueba que las entradas de A^k se puedan
+      mostrar (validar_tamano_potencia).
+
+    Retorna:
+      - Si registrar_pasos: (A^k, pasos)
+      - Si no: A^k
+    """
+    if A is None or len(A) == 0:
+        raise ValueError("La matriz A no puede ser vacía.")
+    n = len(A)
+    if any(len(fila) != n for fila in A):
+        raise ValueError("La matriz debe ser cuadrada para calcular A^k.")
+    if abs(k) > EXPONENTE_MAXIMO_POTENCIA:
+        raise ValueError(f"El exponente debe estar entre −{EXPONENTE_MAXIMO_POTENCIA} y {EXPONENTE_MAXIMO_POTENCIA}.")
+    pasos = []
+    if k == 0:
+        R = _identidad(n)
+        if registrar_pasos:
+            pasos.append({"operacion": "A^0 = I", "matriz": copiar_matriz(R), "tipo": "simple"})
+        return (R, pasos) if registrar_pasos else R
+    base = "A"
+    if k < 0:
+        info = inversa_matriz(A)
+        if not info["invertible"]:
+            raise ValueError(f"A no es invertible ({info.get('razon', '|A| = 0')}); A^{k} no existe.")
+        A = info["inversa"]
+        k = -k
+        base = "A^{-1}"
+        if registrar_pasos:
+            pasos.append({"operacion": f"k < 0: calculamos (A^{{-1}})^{k}", "matriz": copiar_matriz(A), "tipo": "simple"})
+    validar_tamano_potencia(A, k)
+    if not registrar_pasos and k > 1:
+        R = _potencia_estructurada(A, k, estructura.analizar_estructura(A))
+        if R is not None:
+            return R
+    R = None
+    acumulado = 0
+    P = A
+    potencia = 1
+    e = k
+    while True:
+        if e & 1:
+            R = copiar_matriz(P) if R is None else multiplicar_matrices(R, P)
+            if registrar_pasos and acumulado:
+                pasos.append({
+                    "operacion": f"Acumulamos: {base}^{acumulado} · {base}^{potencia} = {base}^{acumulado + potencia}",
+                    "matriz": copiar_matriz(R), "tipo": "simple"
+                })
+            acumulado += potencia
+        e >>= 1
+        if not e:
+            break
+        P = multiplicar_matrices(P, P)
+        potencia *= 2
+        if registrar_pasos:
+            pasos.append({
+                "operacion": f"Elevamos al cuadrado: {base}^{potencia} = ({base}^{potencia // 2})²",
+                "matriz": copiar_matriz(P), "tipo": "simple"
+            })
+    return (R, pasos) if registrar_pasos else R
 
+@perfil.medir("calculo")
 def determinante_matriz(A, registrar_pasos=False, text_fn=texto_fraccion):
     """Calcula |A| (determinante) usando aritmética exacta.
 
@@ -1026,8 +1683,11 @@ def determinante_matriz(A, registrar_pasos=False, text_fn=texto_fraccion):
       - 1x1: |A| = a11
       - 2x2: |A| = ad − bc
       - Triangular: producto de la diagonal
+      - Sin pasos, por estructura (ver estructura.py): permutación con signo,
+        producto de bloques diagonales o eliminación en banda
       - General: reducción por filas a triangular superior sin escalar filas.
         El determinante es el producto de los pivotes, con signo por los intercambios.
+        Sin pasos se usa Bareiss sobre la matriz escalada a enteros.
 
     Retorna:
       - Si registrar_pasos: (det, pasos)
@@ -1062,8 +1722,9 @@ def determinante_matriz(A, registrar_pasos=False, text_fn=texto_fraccion):
             pasos.append({"operacion": f"|A| = ad − bc = {text_fn(ad)} − {text_fn(bc)} = {text_fn(det)}", "matriz": copiar_matriz(A), "tipo": "simple"})
         return (det, pasos) if registrar_pasos else det
 
+    est = estructura.analizar_estructura(A)
     # Atajo: triangular
-    if _es_triangular_superior(A) or _es_triangular_inferior(A):
+    if est["triangular_superior"] or est["triangular_inferior"]:
         det = [1,1]
         i = 0
         while i < n:
@@ -1073,6 +1734,23 @@ def determinante_matriz(A, registrar_pasos=False, text_fn=texto_fraccion):
             pasos.append({"operacion": f"A es triangular ⇒ |A| es el producto de la diagonal = {text_fn(det)}", "matriz": copiar_matriz(A), "tipo": "simple"})
         return (det, pasos) if registrar_pasos else det
 
+    # General sin pasos: atajos por estructura (permutación, bloques, banda) o
+    # Bareiss sobre enteros. Escalando cada fila por el mcm de sus
+    # denominadores, |A| = |DA| / Π escalas.
+    if not registrar_pasos:
+        det = _determinante_estructurado(A, est)
+        if det is not None:
+            return det
+        MI, escalas = _filas_a_enteros(A)
+        if _usar_modular(n):
+            det_entero = modular.determinante_modular(MI)
+        else:
+            det_entero = _determinante_bareiss(MI)
+        divisor = 1
+        for e in escalas:
+            divisor *= e
+        return simplificar_fraccion(det_entero, divisor)
+
     # General: eliminación a triangular superior sin normalizar filas
     M = copiar_matriz(A)
     det = [1,1]
@@ -1111,8 +1789,7 @@ def determinante_matriz(A, registrar_pasos=False, text_fn=texto_fraccion):
                 # F_i = F_i − factor * F_k
                 j = k
                 while j < n:
-                    prod = multiplicar_fracciones(factor, M[k][j])
-                    M[i][j] = restar_fracciones(M[i][j], prod)
+                    M[i][j] = restar_producto(M[i][j], factor, M[k][j])
                     j += 1
             i += 1
         k += 1
@@ -1132,6 +1809,8 @@ def _reemplazar_columna(M, col_idx, columna):
         i += 1
     return R
 
+@perfil.medir("calculo")
+@_diagnosticable
 def cramer_resolver(A, b, registrar_pasos=False, text_fn=texto_fraccion):
     """Resuelve Ax=b por la regla de Cramer.
 
@@ -1168,6 +1847,15 @@ def cramer_resolver(A, b, registrar_pasos=False, text_fn=texto_fraccion):
         info = {"invertible": False, "detA": detA, "x": None, "componentes": {}, "mensaje": "|A| = 0 ⇒ A no es invertible."}
         return (info, pasos) if registrar_pasos else info
 
+    # Sin pasos, si A es triangular o monomial se resuelve por sustitución (si
+    # es simétrica, con su inversa por barrido) y |A_i(b)| = x_i·|A|
+    # (de x_i = |A_i(b)| / |A|)
+    if not registrar_pasos:
+        x = _resolver_estructurado(A, [fila[0] for fila in b], estructura.analizar_estructura(A))
+        if x is not None:
+            componentes = {f"A{i+1}b": multiplicar_fracciones(xi, detA) for i, xi in enumerate(x)}
+            return {"invertible": True, "detA": detA, "x": x, "componentes": componentes}
+
     # Para cada i, construir Ai(b), calcular |Ai(b)| y xi
     componentes = {}
     x = []
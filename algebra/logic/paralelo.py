@@ -0,0 +1,170 @@
+"""Gauss-Jordan exacto con las actualizaciones de filas repartidas entre procesos
+
+Descripción:
+- En cada paso de pivote, las filas distintas de la fila pivote se actualizan
+  de forma independiente (F_r → F_r − c·F_p). Aquí las filas se reparten en
+  bloques entre procesos trabajadores que las conservan durante toda la
+  eliminación; el coordinador sólo envía la fila pivote normalizada.
+- Los intercambios de filas no mueven datos: se lleva una permutación lógica
+  `orden` (posición → fila física).
+- La aritmética es la misma que la de operaciones.py (fila_escalar y
+  fila_sumar_multiplo), así que R y pivotes son idénticos a los secuenciales.
+
+Las fracciones son enteros de Python de tamaño arbitrario, por lo que no caben
+en búferes compartidos de ancho fijo; las filas viajan por tuberías
+(multiprocessing.Pipe) y cada paso sólo envía una fila.
+
+Los trabajadores se crean con el método "forkserver" (o "spawn" si no está
+disponible), nunca con "fork": dentro de un servidor WSGI con hilos, fork
+copia los cerrojos que tengan tomados otros hilos y el hijo puede quedarse
+bloqueado. contexto_procesos() es el contexto que usan también modular.py y
+archivos.py; preparar() (llamado desde apps.py) deja precargados en el
+servidor de procesos los módulos de cálculo para que cada trabajador nuevo no
+tenga que importarlos.
+"""
+import multiprocessing
+
+from .utilidades import es_cero, es_uno, dividir_fracciones, negativo_fraccion
+
+# Procesos para repartir las filas (None o 0: secuencial). Se puede fijar
+# desde settings.ALGEBRA_PROCESOS_GAUSS (ver apps.py).
+PROCESOS = None
+
+# Filas a partir de las cuales compensa repartir el trabajo
+UMBRAL_PARALELO = 100
+
+
+def usar_paralelo(m, procesos=None):
+    """True si una matriz de m filas debe eliminarse repartida entre procesos."""
+    if procesos is None:
+        procesos = PROCESOS if m >= UMBRAL_PARALELO else None
+    return (procesos or 0) > 1 and m > 1
+
+
+def _no_nulas(filas, col):
+    return [i for i, fila in filas.items() if not es_cero(fila[col])]
+
+
+def _trabajador(conexion, filas):
+    """Bucle de un trabajador: `filas` es un dict {fila física: fila}."""
+    # Import diferido: evita un ciclo operaciones ↔ paralelo
+    from .operaciones import fila_escalar, fila_sumar_multiplo
+    while True:
+        orden, datos = conexion.recv()
+        if orden == "no_nulas":
+            conexion.send(_no_nulas(filas, datos))
+        elif orden == "normalizar":
+            fid, col = datos
+            fila = filas[fid]
+            piv = fila[col]
+            if not es_uno(piv):
+                fila_escalar([fila], 0, dividir_fracciones([1, 1], piv))
+            conexion.send(fila)
+        elif orden == "eliminar":
+            fid, col, fila_p, siguiente = datos
+            par = [None, fila_p]
+            for i, fila in filas.items():
+                if i != fid and not es_cero(fila[col]):
+                    par[0] = fila
+                    fila_sumar_multiplo(par, 0, 1, negativo_fraccion(fila[col]))
+            conexion.send(_no_nulas(filas, siguiente) if siguiente is not None else None)
+        elif orden == "filas":
+            conexion.send(filas)
+            return
+
+
+# Módulos que el servidor de procesos importa una sola vez
+MODULOS_PRECARGA = ["algebra.logic.operaciones", "algebra.logic.archivos"]
+
+
+def contexto_procesos():
+    """Contexto de multiprocessing seguro con hilos: forkserver, o spawn."""
+    metodos = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in metodos else "spawn")
+
+
+def preparar():
+    """Precarga los módulos de cálculo en el servidor de procesos (forkserver).
+
+    El servidor se arranca de forma perezosa con el primer trabajador; como
+    lo lanza un proceso nuevo (fork + exec), es seguro aunque haya hilos.
+    """
+    ctx = contexto_procesos()
+    if ctx.get_start_method() == "forkserver":
+        ctx.set_forkserver_preload(MODULOS_PRECARGA)
+
+
+def eliminar_paralelo(R, procesos):
+    """Forma escalonada reducida de R (que se modifica) repartiendo las filas.
+
+    Devuelve R con las filas en el mismo orden que la eliminación secuencial.
+    """
+    m = len(R)
+    n = len(R[0]) - 1
+    procesos = min(procesos, m)
+    ctx = contexto_procesos()
+    dueno = [i % procesos for i in range(m)]
+    conexiones = []
+    trabajadores = []
+    try:
+        for k in range(procesos):
+            propio, remoto = ctx.Pipe()
+            bloque = {i: R[i] for i in range(k, m, procesos)}
+            p = ctx.Process(target=_trabajador, args=(remoto, bloque), daemon=True)
+            p.start()
+            remoto.close()
+            conexiones.append(propio)
+            trabajadores.append(p)
+
+        def difundir(orden, datos):
+            for c in conexiones:
+                c.send((orden, datos))
+            no_nulas = set()
+            for c in conexiones:
+                parte = c.recv()
+                if parte:
+                    no_nulas.update(parte)
+            return no_nulas
+
+        orden = list(range(m))
+        fila_pivote = 0
+        col = 0
+        no_nulas = difundir("no_nulas", 0) if n > 0 else set()
+        while col < n and fila_pivote < m:
+            pivote_en = -1
+            r = fila_pivote
+            while r < m:
+                if orden[r] in no_nulas:
+                    pivote_en = r
+                    break
+                r += 1
+            if pivote_en == -1:
+                col += 1
+                if col < n:
+                    no_nulas = difundir("no_nulas", col)
+                continue
+            if pivote_en != fila_pivote:
+                orden[fila_pivote], orden[pivote_en] = orden[pivote_en], orden[fila_pivote]
+            fid = orden[fila_pivote]
+            c = conexiones[dueno[fid]]
+            c.send(("normalizar", (fid, col)))
+            fila_p = c.recv()
+            siguiente = col + 1 if col + 1 < n else None
+            no_nulas = difundir("eliminar", (fid, col, fila_p, siguiente))
+            fila_pivote += 1
+            col += 1
+
+        for c in conexiones:
+            c.send(("filas", None))
+        fisicas = {}
+        for c in conexiones:
+            fisicas.update(c.recv())
+        for p in trabajadores:
+            p.join()
+    finally:
+        for c in conexiones:
+            c.close()
+        for p in trabajadores:
+            if p.is_alive():
+                p.terminate()
+    return [fisicas[i] for i in orden]
@@ -0,0 +1,226 @@
+"""Perfilado por petición: tiempos por fase, contadores y tamaños de matrices
+
+Descripción:
+- PerfilMiddleware (algebra/middleware.py) abre un Perfil al empezar cada
+  petición y lo cierra al terminar; mientras está abierto:
+    fase(nombre)        context manager que acumula el tiempo del bloque
+    medir(nombre)       decorador equivalente para funciones (views y logic)
+    contar(nombre, n)   suma n al contador `nombre`
+    registrar_tamano()  anota el tamaño (filas×columnas) de una matriz
+  Las llamadas anidadas a una fase ya abierta (p. ej. determinante_matriz
+  dentro de inversa_matriz) no se vuelven a medir, así los tiempos no se
+  cuentan dos veces.
+- Con el conteo del núcleo de fracciones activo (utilidades.configurar_conteo)
+  las llamadas a mcd/simplificar_fraccion, las asignaciones y bits_max se
+  cuentan en el mismo diccionario de contadores del perfil.
+- Sin perfil abierto (tests, comandos, ACTIVO = False) decoradores y fases
+  cuestan una lectura de ContextVar.
+- Los perfiles cerrados se acumulan por vista en un agregado del proceso que
+  texto_prometheus() expone en el formato de texto de Prometheus.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from . import utilidades as u
+
+
+# Se puede fijar desde settings.ALGEBRA_PERFIL (ver algebra/apps.py)
+ACTIVO = True
+
+# Tamaños de matrices que se guardan por petición
+MAXIMO_TAMANOS = 20
+
+_actual = ContextVar("perfil", default=None)
+
+
+class Perfil:
+    """Mediciones de una petición."""
+    __slots__ = ("fases", "contadores", "tamanos", "abiertas")
+
+    def __init__(self):
+        self.fases = {}        # nombre -> [segundos, veces]
+        self.contadores = {}   # nombre -> entero
+        self.tamanos = []      # [(nombre, "n×m"), ...]
+        self.abiertas = set()
+
+    def agregar_fase(self, nombre, segundos):
+        fase = self.fases.get(nombre)
+        if fase is None:
+            self.fases[nombre] = [segundos, 1]
+        else:
+            fase[0] += segundos
+            fase[1] += 1
+
+    def resumen(self):
+        return {
+            "fases": {k: {"ms": v[0] * 1000.0, "veces": v[1]} for k, v in self.fases.items()},
+            "contadores": dict(self.contadores),
+            "tamanos": list(self.tamanos),
+        }
+
+
+def iniciar():
+    """Abre un perfil para el contexto actual. Devuelve (perfil, fichas)."""
+    p = Perfil()
+    return p, (_actual.set(p), u.contadores.set(p.contadores))
+
+
+def terminar(fichas):
+    _actual.reset(fichas[0])
+    u.contadores.reset(fichas[1])
+
+
+def actual():
+    """Perfil abierto o None."""
+    return _actual.get()
+
+
+@contextmanager
+def fase(nombre):
+    p = _actual.get()
+    if p is None or nombre in p.abiertas:
+        yield
+        return
+    p.abiertas.add(nombre)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        p.agregar_fase(nombre, time.perf_counter() - t0)
+        p.abiertas.discard(nombre)
+
+
+def _tamano(M):
+    if isinstance(M, list) and M and isinstance(M[0], list):
+        return f"{len(M)}×{len(M[0])}"
+    return None
+
+
+def registrar_tamano(nombre, M):
+    p = _actual.get()
+    if p is None or len(p.tamanos) >= MAXIMO_TAMANOS:
+        return
+    tam = _tamano(M)
+    if tam is not None:
+        p.tamanos.append((nombre, tam))
+
+
+def contar(nombre, n=1):
+    p = _actual.get()
+    if p is not None:
+        p.contadores[nombre] = p.contadores.get(nombre, 0) + n
+
+
+def medir(nombre):
+    """Decorador: mide la función como fase `nombre`. Si es la llamada externa
+    de la fase, anota además el tamaño de la primera matriz de los argumentos."""
+    def decorador(funcion):
+        etiqueta = funcion.__name__
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            p = _actual.get()
+            if p is None or nombre in p.abiertas:
+                return funcion(*args, **kwargs)
+            for a in args:
+                if isinstance(a, list):
+                    registrar_tamano(etiqueta, a)
+                    break
+            p.abiertas.add(nombre)
+            t0 = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                p.agregar_fase(nombre, time.perf_counter() - t0)
+                p.abiertas.discard(nombre)
+        return envoltura
+    return decorador
+
+
+def server_timing(p, total):
+    """Valor de la cabecera Server-Timing (milisegundos)."""
+    partes = [f"{k};dur={v[0] * 1000.0:.3f}" for k, v in p.fases.items()]
+    partes.extend(f'{k};desc="{v}"' for k, v in p.contadores.items())
+    partes.append(f"total;dur={total * 1000.0:.3f}")
+    return ", ".join(partes)
+
+
+# ----------------------- Agregado del proceso -----------------------
+
+_cerrojo = threading.Lock()
+_peticiones = {}   # vista -> [peticiones, segundos]
+_fases = {}        # (vista, fase) -> [veces, segundos]
+_contadores = {}   # (vista, contador) -> total
+
+
+def acumular(vista, p, total):
+    with _cerrojo:
+        agg = _peticiones.setdefault(vista, [0, 0.0])
+        agg[0] += 1
+        agg[1] += total
+        for nombre, (segundos, veces) in p.fases.items():
+            agg = _fases.setdefault((vista, nombre), [0, 0.0])
+            agg[0] += veces
+            agg[1] += segundos
+        for nombre, n in p.contadores.items():
+            if nombre == "bits_max":
+                _contadores[(vista, nombre)] = max(_contadores.get((vista, nombre), 0), n)
+            else:
+                _contadores[(vista, nombre)] = _contadores.get((vista, nombre), 0) + n
+
+
+def reiniciar_metricas():
+    with _cerrojo:
+        _peticiones.clear()
+        _fases.clear()
+        _contadores.clear()
+
+
+def _etiqueta(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def texto_prometheus():
+    """Métricas acumuladas en el formato de texto de Prometheus (0.0.4)."""
+    with _cerrojo:
+        peticiones = sorted(_peticiones.items())
+        fases = sorted(_fases.items())
+        contadores = sorted(_contadores.items())
+    lineas = [
+        "# HELP algebra_peticiones_total Peticiones perfiladas por vista.",
+        "# TYPE algebra_peticiones_total counter",
+    ]
+    lineas.extend(f'algebra_peticiones_total{{vista="{_etiqueta(v)}"}} {a[0]}' for v, a in peticiones)
+    lineas += [
+        "# HELP algebra_peticion_segundos_total Tiempo total de las peticiones por vista.",
+        "# TYPE algebra_peticion_segundos_total counter",
+    ]
+    lineas.extend(f'algebra_peticion_segundos_total{{vista="{_etiqueta(v)}"}} {a[1]:.6f}' for v, a in peticiones)
+    lineas += [
+        "# HELP algebra_fase_segundos_total Tiempo por fase (parseo, calculo, formato, plantilla).",
+        "# TYPE algebra_fase_segundos_total counter",
+    ]
+    lineas.extend(
+        f'algebra_fase_segundos_total{{vista="{_etiqueta(v)}",fase="{_etiqueta(f)}"}} {a[1]:.6f}'
+        for (v, f), a in fases
+    )
+    lineas += [
+        "# HELP algebra_operaciones_total Contadores del núcleo de fracciones.",
+        "# TYPE algebra_operaciones_total counter",
+    ]
+    lineas.extend(
+        f'algebra_operaciones_total{{vista="{_etiqueta(v)}",operacion="{_etiqueta(c)}"}} {n}'
+        for (v, c), n in contadores if c != "bits_max"
+    )
+    lineas += [
+        "# HELP algebra_bits_max Mayor longitud en bits de numeradores/denominadores.",
+        "# TYPE algebra_bits_max gauge",
+    ]
+    lineas.extend(
+        f'algebra_bits_max{{vista="{_etiqueta(v)}"}} {n}'
+        for (v, c), n in contadores if c == "bits_max"
+    )
+    return "\n".join(lineas) + "\n"
@@ -0,0 +1,104 @@
+"""Acceso diferido a SymPy
+
+Descripción:
+- Importar SymPy cuesta varios segundos en un proceso recién creado. Este
+  módulo lo carga sólo la primera vez que algo lo necesita, de modo que
+  importar las vistas o ejecutar comandos de manage.py no paga ese coste.
+- `sympy()` devuelve el módulo (importándolo una única vez, con cerrojo).
+- Los atributos del módulo se resuelven contra SymPy bajo demanda:
+  `simbolico.sympify(...)`, `simbolico.oo`, etc.
+- `precalentar()` importa SymPy y compila expresiones frecuentes para que
+  sus cachés internas queden listas; `precalentar_en_segundo_plano()` lo
+  hace en un hilo demonio (y de nuevo en cada proceso hijo tras fork).
+"""
+import importlib
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+_modulo = None
+_cerrojo = threading.Lock()
+
+# Expresiones típicas de los formularios de métodos numéricos y derivadas
+EXPRESIONES_FRECUENTES = (
+    'x**2 - 2',
+    'x**3 - x - 1',
+    'sin(x) - x/2',
+    'cos(x) - x',
+    'exp(-x) - x',
+    'log(x) - 1',
+)
+
+
+def sympy():
+    """Devuelve el módulo sympy, importándolo la primera vez."""
+    global _modulo
+    if _modulo is None:
+        with _cerrojo:
+            if _modulo is None:
+                _modulo = importlib.import_module('sympy')
+    return _modulo
+
+
+def cargado():
+    """True si SymPy ya fue importado en este proceso."""
+    return _modulo is not None
+
+
+def __getattr__(nombre):
+    if nombre.startswith('__'):
+        raise AttributeError(nombre)
+    return getattr(sympy(), nombre)
+
+
+def precalentar(expresiones=EXPRESIONES_FRECUENTES):
+    """Importa SymPy y ejercita parseo, derivación, lambdify y límites."""
+    from .derivadas import derivar_funcion
+    from .compilador import compilar_funcion
+
+    sp = sympy()
+    for texto in expresiones:
+        try:
+            compilar_funcion(texto)
+            derivar_funcion(texto, orden=1, simplificar=True)
+        except Exception:
+            logger.debug("Precalentamiento: no se pudo preparar %r", texto, exc_info=True)
+    try:
+        x = sp.symbols('x')
+        sp.limit(sp.sin(x) / x, x, 0)
+    except Exception:
+        logger.debug("Precalentamiento: fallo al calcular límite de prueba", exc_info=True)
+
+
+def _lanzar_hilo():
+    hilo = threading.Thread(target=precalentar, name='precalentar-sympy', daemon=True)
+    hilo.start()
+    return hilo
+
+
+def _al_fork_hijo():
+    # El cerrojo pudo quedar tomado por el hilo del padre en el momento del fork.
+    # Si el padre ya terminó de importar SymPy, el hijo lo hereda listo.
+    global _cerrojo
+    _cerrojo = threading.Lock()
+    if not cargado():
+        _lanzar_hilo()
+
+
+_registrado_fork = False
+
+
+def precalentar_en_segundo_plano():
+    """Lanza `precalentar` en un hilo demonio.
+
+    Los hilos no sobreviven a fork(); si el servidor carga la aplicación en el
+    proceso maestro antes de crear los workers (p. ej. gunicorn --preload),
+    cada hijo vuelve a lanzar el precalentamiento.
+    """
+    global _registrado_fork
+    if not _registrado_fork and hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_al_fork_hijo)
+        _registrado_fork = True
+    return _lanzar_hilo()
@@ -1,4 +1,94 @@
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from math import gcd as _gcd
+
+# Números que no necesitan el evaluador de expresiones: enteros y decimales con
+# signo (con exponente opcional) y fracciones a/b.
+_NUMERO_SIMPLE = re.compile(r"([+-]?)(\d*)(?:\.(\d*))?(?:[eE]([+-]?\d+))?")
+_FRACCION_SIMPLE = re.compile(r"([+-]?\d+)/([+-]?\d+)")
+
+# Límite del exponente en notación científica (evita enteros gigantes: 1e999999)
+EXPONENTE_MAXIMO = 1000
+
+# Contadores opcionales del núcleo de fracciones (perfil.py y los diagnósticos
+# de operaciones.py):
+#   mcd, simplificar_fraccion   llamadas
+#   asignaciones                fracciones [n, d] nuevas (resultados y copias)
+#   bits_max                    mayor longitud en bits de numerador/denominador
+# Se cuentan en el diccionario de `contadores` del contexto actual. Con
+# CONTAR = False cada llamada paga solo la comprobación del indicador; se activa
+# con configurar_conteo() (settings.ALGEBRA_PERFIL_CONTAR) o mientras haya un
+# bloque diagnosticar() abierto.
+CONTAR = False
+contadores = ContextVar("contadores_fracciones", default=None)
+_conteo_configurado = False
+_diagnosticos_abiertos = 0
+_cerrojo_conteo = threading.Lock()
+
+
+def _contar(nombre, n=1):
+    c = contadores.get()
+    if c is not None:
+        c[nombre] = c.get(nombre, 0) + n
+
+
+def _contar_fraccion(numerador, denominador):
+    c = contadores.get()
+    if c is None:
+        return
+    c["simplificar_fraccion"] = c.get("simplificar_fraccion", 0) + 1
+    c["asignaciones"] = c.get("asignaciones", 0) + 1
+    bits = max(int(numerador).bit_length(), int(denominador).bit_length())
+    if bits > c.get("bits_max", 0):
+        c["bits_max"] = bits
+
+
+def configurar_conteo(activo):
+    """Activa o desactiva el conteo permanente (fuera de diagnosticar())."""
+    global CONTAR, _conteo_configurado
+    with _cerrojo_conteo:
+        _conteo_configurado = bool(activo)
+        CONTAR = _conteo_configurado or _diagnosticos_abiertos > 0
+
+
+@contextmanager
+def diagnosticar():
+    """Cuenta las operaciones del bloque en un diccionario nuevo (el que se
+    entrega) y al salir las suma a los contadores del contexto exterior."""
+    global CONTAR, _diagnosticos_abiertos
+    exterior = contadores.get()
+    propios = {}
+    ficha = contadores.set(propios)
+    with _cerrojo_conteo:
+        _diagnosticos_abiertos += 1
+        CONTAR = True
+    try:
+        yield propios
+    finally:
+        with _cerrojo_conteo:
+            _diagnosticos_abiertos -= 1
+            CONTAR = _conteo_configurado or _diagnosticos_abiertos > 0
+        contadores.reset(ficha)
+        if exterior is not None:
+            for nombre, n in propios.items():
+                if nombre == "bits_max":
+                    exterior[nombre] = max(exterior.get(nombre, 0), n)
+                else:
+                    exterior[nombre] = exterior.get(nombre, 0) + n
+
+
+def bits_matriz(M):
+    """Mayor longitud en bits de numeradores y denominadores de M."""
+    return max((max(abs(x[0]).bit_length(), x[1].bit_length()) for fila in M for x in fila), default=0)
+
+
 def mcd(a, b):
+    if CONTAR:
+        _contar("mcd")
+    if type(a) is int and type(b) is int:
+        return _gcd(a, b)
     a = a if a >= 0 else -a
     b = b if b >= 0 else -b
     while b != 0:
@@ -16,6 +106,8 @@ def simplificar_fraccion(numerador, denominador):
     divisor = mcd(numerador, denominador)
     num_s = numerador // divisor
     den_s = denominador // divisor
+    if CONTAR:
+        _contar_fraccion(num_s, den_s)
     return [num_s, den_s]
 
 def crear_fraccion_desde_entero(texto):
@@ -38,22 +130,36 @@ def crear_fraccion_desde_decimal(texto):
     parte_decimal = partes[1]
     if parte_entera == "":
         parte_entera = "0"
-    decimales = 0
-    indice = 0
-    while indice < len(parte_decimal):
-        if parte_decimal[indice].isdigit():
-            decimales = decimales + 1
-        indice = indice + 1
-    base = 1
-    j = 0
-    while j < decimales:
-        base = base * 10
-        j = j + 1
+    base = 10 ** len(parte_decimal)
     numero_sin_punto = int(parte_entera + parte_decimal)
     if negativo:
         numero_sin_punto = -numero_sin_punto
     return simplificar_fraccion(numero_sin_punto, base)
 
+def fraccion_desde_numero_simple(texto):
+    """[n, d] si `texto` es un entero, decimal, notación científica o a/b; si no, None."""
+    m = _NUMERO_SIMPLE.fullmatch(texto)
+    if m:
+        signo, entera, decimal, exponente = m.groups()
+        decimal = decimal or ""
+        if not entera and not decimal:
+            return None
+        potencia = -len(decimal)
+        if exponente:
+            if len(exponente) > 6 or abs(int(exponente)) > EXPONENTE_MAXIMO:
+                raise ValueError(f"Exponente demasiado grande en '{texto}'.")
+            potencia += int(exponente)
+        numerador = int(entera + decimal)
+        if signo == "-":
+            numerador = -numerador
+        if potencia >= 0:
+            return [numerador * 10 ** potencia, 1]
+        return simplificar_fraccion(numerador, 10 ** -potencia)
+    m = _FRACCION_SIMPLE.fullmatch(texto)
+    if m:
+        return simplificar_fraccion(int(m.group(1)), int(m.group(2)))
+    return None
+
 def crear_fraccion_desde_cadena(fraccion_texto):
     """Convierte texto a fracción [n,d].
 
@@ -66,6 +172,11 @@ def crear_fraccion_desde_cadena(fraccion_texto):
     """
     texto = fraccion_texto.strip()
 
+    # Números simples (incluidos negativos y 1e-3): sin pasar por el evaluador
+    simple = fraccion_desde_numero_simple(texto)
+    if simple is not None:
+        return simple
+
     # ¿Es una expresión más allá de los casos simples?
     has_ops = any(c in texto for c in ["+", "-", "*", "×", "/", "÷", "^", "(", ")", "√"]) or "sqrt" in texto
     if has_ops:
@@ -118,6 +229,56 @@ def dividir_fracciones(a, b):
     denominador = a_d * b_n
     return simplificar_fraccion(numerador, denominador)
 
+# ---------------------------------------------------------------
+#  Acumulación sin normalizar
+#
+#  Un acumulador es un par [n, d] con d > 0 que NO se simplifica en cada
+#  paso: los términos se combinan sobre un denominador común y sólo al
+#  final se llama una vez a simplificar_fraccion. El resultado normalizado
+#  es idéntico al de encadenar sumar_fracciones/multiplicar_fracciones.
+# ---------------------------------------------------------------
+
+def acumular_producto(acc, a, b):
+    """acc += a·b sin simplificar. Modifica y devuelve `acc`."""
+    t_n = a[0] * b[0]
+    if t_n == 0:
+        return acc
+    t_d = a[1] * b[1]
+    acc_d = acc[1]
+    if acc_d % t_d == 0:
+        # el denominador del término ya divide al acumulado: no crece
+        acc[0] = acc[0] + t_n * (acc_d // t_d)
+    elif t_d % acc_d == 0:
+        acc[0] = acc[0] * (t_d // acc_d) + t_n
+        acc[1] = t_d
+    else:
+        acc[0] = acc[0] * t_d + t_n * acc_d
+        acc[1] = acc_d * t_d
+    return acc
+
+def producto_punto(fila, columna):
+    """Σ fila[k]·columna[k] con una única simplificación al final."""
+    acc = [0, 1]
+    k = 0
+    while k < len(fila):
+        acumular_producto(acc, fila[k], columna[k])
+        k = k + 1
+    return simplificar_fraccion(acc[0], acc[1])
+
+def sumar_producto(a, c, b):
+    """a + c·b normalizado con una sola simplificación (en lugar de dos)."""
+    if c[0] == 0 or b[0] == 0:
+        return [a[0], a[1]]
+    t_n = c[0] * b[0]
+    t_d = c[1] * b[1]
+    if a[1] == t_d:
+        return simplificar_fraccion(a[0] + t_n, t_d)
+    return simplificar_fraccion(a[0] * t_d + t_n * a[1], a[1] * t_d)
+
+def restar_producto(a, c, b):
+    """a − c·b normalizado con una sola simplificación."""
+    return sumar_producto(a, [-c[0], c[1]], b)
+
 def negativo_fraccion(a):
     return [-a[0], a[1]]
 
@@ -179,6 +340,8 @@ def copiar_matriz(M):
     if filas == 0:
         return R
     columnas = len(M[0])
+    if CONTAR:
+        _contar("asignaciones", filas * columnas)
     i = 0
     while i < filas:
         fila = []
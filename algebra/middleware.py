@@ -0,0 +1,135 @@
+"""Middleware de perfilado (algebra/logic/perfil.py), de turnos del control
+de admisión (algebra/logic/admision.py) y de archivos estáticos
+(algebra/estaticos.py)."""
+import os
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponseNotModified
+from django.template.loader import render_to_string
+from django.utils.http import http_date
+
+from . import estaticos
+from .logic import admision
+from .logic import perfil
+
+
+class PerfilMiddleware:
+    """Abre un perfil por petición y publica sus mediciones.
+
+    - Cabecera Server-Timing con la duración de cada fase y los contadores
+      (sólo con ALGEBRA_PERFIL_CABECERA, por defecto igual a DEBUG).
+    - Agregado del proceso para /metricas/ (Prometheus).
+    - Con DEBUG, panel al final de las páginas HTML.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not perfil.ACTIVO:
+            return self.get_response(request)
+        p, fichas = perfil.iniciar()
+        t0 = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            perfil.terminar(fichas)
+        total = time.perf_counter() - t0
+        match = getattr(request, "resolver_match", None)
+        vista = match.url_name if match is not None and match.url_name else "otra"
+        perfil.acumular(vista, p, total)
+        if getattr(settings, "ALGEBRA_PERFIL_CABECERA", settings.DEBUG):
+            response["Server-Timing"] = perfil.server_timing(p, total)
+        if settings.DEBUG and vista != "metricas":
+            self._insertar_panel(response, vista, p, total)
+        return response
+
+    def _insertar_panel(self, response, vista, p, total):
+        if response.streaming or "text/html" not in response.get("Content-Type", ""):
+            return
+        contenido = response.content
+        i = contenido.rfind(b"</body>")
+        if i == -1:
+            return
+        resumen = p.resumen()
+        panel = render_to_string("algebra/_perfil.html", {
+            "vista": vista,
+            "total": total * 1000.0,
+            "fases": sorted(resumen["fases"].items()),
+            "contadores": sorted(resumen["contadores"].items()),
+            "tamanos": resumen["tamanos"],
+        }).encode(response.charset)
+        response.content = contenido[:i] + panel + contenido[i:]
+        if response.has_header("Content-Length"):
+            response["Content-Length"] = str(len(response.content))
+
+
+class AdmisionMiddleware:
+    """Libera al terminar cada petición los turnos de cálculo pesado que haya
+    tomado el control de admisión."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        ficha = admision.abrir()
+        try:
+            return self.get_response(request)
+        finally:
+            admision.cerrar(ficha)
+
+
+class EstaticosMiddleware:
+    """Sirve STATIC_ROOT desde Python, al estilo de WhiteNoise.
+
+    - Variante .br o .gz según Accept-Encoding (Vary: Accept-Encoding).
+    - Nombres con huella (staticfiles.json): Cache-Control de un año e
+      immutable; el resto, ALGEBRA_ESTATICOS_MAX_AGE segundos.
+    - ETag/Last-Modified y 304 para peticiones condicionales.
+    Se desactiva (MiddlewareNotUsed) sin ALGEBRA_SERVIR_ESTATICOS o si
+    STATIC_ROOT no existe (falta collectstatic).
+    """
+
+    UN_ANO = 365 * 24 * 3600
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        raiz = settings.STATIC_ROOT
+        if not getattr(settings, "ALGEBRA_SERVIR_ESTATICOS", False) or not raiz or not os.path.isdir(raiz):
+            raise MiddlewareNotUsed
+        prefijo = "/" + settings.STATIC_URL.lstrip("/")
+        self.prefijo = prefijo if prefijo.endswith("/") else prefijo + "/"
+        self.max_age = int(getattr(settings, "ALGEBRA_ESTATICOS_MAX_AGE", 60))
+        self.archivos = estaticos.indexar(raiz)
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD") and request.path_info.startswith(self.prefijo):
+            archivo = self.archivos.get(request.path_info[len(self.prefijo):])
+            if archivo is not None:
+                return self._servir(request, archivo)
+        return self.get_response(request)
+
+    def _servir(self, request, archivo):
+        codificacion = estaticos.elegir_codificacion(archivo, request.META.get("HTTP_ACCEPT_ENCODING"))
+        variante = archivo["variantes"][codificacion]
+        if archivo["inmutable"]:
+            cache_control = f"public, max-age={self.UN_ANO}, immutable"
+        else:
+            cache_control = f"public, max-age={self.max_age}"
+        if request.META.get("HTTP_IF_NONE_MATCH") == variante["etag"]:
+            resp = HttpResponseNotModified()
+        else:
+            resp = FileResponse(open(variante["ruta"], "rb"), content_type=archivo["tipo"])
+            if resp.has_header("Content-Disposition"):
+                del resp["Content-Disposition"]
+            resp["Content-Length"] = str(variante["tamano"])
+            resp["Last-Modified"] = http_date(variante["mtime"])
+            if codificacion:
+                resp["Content-Encoding"] = codificacion
+        resp["ETag"] = variante["etag"]
+        resp["Cache-Control"] = cache_control
+        if len(archivo["variantes"]) > 1:
+            resp["Vary"] = "Accept-Encoding"
+        return resp
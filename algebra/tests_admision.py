@@ -0,0 +1,164 @@
+import threading
+import unittest
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from algebra.logic import admision
+
+
+def _texto(n, m=None):
+    m = n if m is None else m
+    return "\n".join(" ".join(str((i * m + j) % 7 + (i == j)) for j in range(m)) for i in range(n))
+
+
+class TestEstimacion(unittest.TestCase):
+
+    def test_pequena_se_admite_tal_cual(self):
+        d = admision.admitir("inversa", 4, pasos=True)
+        self.assertTrue(d["pasos"])
+        self.assertIsNone(d["aviso"])
+
+    def test_muchos_pasos_se_degradan(self):
+        d = admision.admitir("inversa", 60, pasos=True)
+        self.assertFalse(d["pasos"])
+        self.assertIn("pasos", d["aviso"])
+
+    def test_demasiado_costosa_se_rechaza(self):
+        with self.assertRaises(admision.ErrorAdmision):
+            admision.admitir("inversa", 1000)
+
+    def test_leontief_grande_pasa_a_flotante(self):
+        d = admision.admitir("leontief", 700, 701)
+        self.assertTrue(d["flotante"])
+        self.assertFalse(d["pasos"])
+
+    def test_bits_encarecen(self):
+        chico = admision.estimar_matricial("determinante", 10)[0]
+        grande = admision.estimar_matricial("determinante", 10, bits=640)[0]
+        self.assertEqual(grande, 10 * chico)
+
+    def test_potencia_escala_con_el_resultado(self):
+        # 30×30 de dígitos 1–9 con k = 10000: entradas de ~90000 bits
+        self.assertGreater(admision.estimar_matricial("potencia", 30, k=10000, bits=4)[0],
+                           admision.LIMITES["costo_maximo"])
+        self.assertGreater(admision.estimar_matricial("potencia", 20, k=10000, bits=4)[0],
+                           admision.LIMITES["costo_directo"])
+        with self.assertRaises(admision.ErrorAdmision):
+            admision.admitir("potencia", 30, k=10000, bits=4)
+        admision.admitir("potencia", 3, k=50, bits=4, pasos=True)
+
+    def test_expresiones(self):
+        self.assertEqual(admision.medir_expresion("x**2 + 1")[1], 2)
+        self.assertEqual(admision.medir_expresion("x^(-30)")[1], 30)
+        self.assertEqual(admision.medir_expresion(r"\frac{1}{x}^{12}")[1], 12)
+        admision.admitir_expresion("sin(x)**3")
+        with self.assertRaises(admision.ErrorAdmision):
+            admision.admitir_expresion("x**10000")
+        with self.assertRaises(admision.ErrorAdmision):
+            admision.admitir_expresion("+".join(["x"] * 3000))
+
+    def test_exponentes_plegados(self):
+        for texto in ("9**9**9", "x**(10**6)", "x^(2*5000)", "(x+1)**(100*100)", "(x**100)**100",
+                      "x**10**400", r"x^{(2*5000)"):
+            with self.assertRaises(admision.ErrorAdmision, msg=texto):
+                admision.admitir_expresion(texto)
+        self.assertEqual(admision.medir_expresion("x**(2*3) + (x**2)**3")[1], 6)
+        admision.admitir_expresion("x**(1/2) + 2**10")
+        admision.admitir_expresion("exp(x)**x / 0**-1")
+
+    def test_lecturas_sin_cabecera(self):
+        from algebra.logic import archivos
+        with mock.patch.dict(admision.LIMITES, {"celdas_maximas": 4}):
+            archivos.leer_csv(["1 2", "3 4"])
+            with self.assertRaisesRegex(admision.ErrorAdmision, "máximo de 4"):
+                archivos.leer_csv(["1 2", "3 4", "5 6"] + ["x"] * 1000)
+
+
+class TestTurnos(unittest.TestCase):
+
+    def test_sin_peticion_no_encola(self):
+        with mock.patch.dict(admision.LIMITES, {"costo_directo": 0}):
+            admision.admitir("inversa", 5)
+
+    def test_cola_llena_rechaza(self):
+        admision.configurar({"concurrencia_pesada": 1, "espera_cola": 0.05, "costo_directo": 0})
+        try:
+            ocupado = threading.Event()
+            liberar = threading.Event()
+
+            def otra_peticion():
+                ficha = admision.abrir()
+                admision.admitir("inversa", 5)
+                ocupado.set()
+                liberar.wait(5)
+                admision.cerrar(ficha)
+
+            hilo = threading.Thread(target=otra_peticion)
+            hilo.start()
+            ocupado.wait(5)
+            ficha = admision.abrir()
+            try:
+                with self.assertRaises(admision.ErrorAdmision):
+                    admision.admitir("inversa", 5)
+            finally:
+                admision.cerrar(ficha)
+            liberar.set()
+            hilo.join()
+            # Con el turno liberado vuelve a admitirse
+            ficha = admision.abrir()
+            try:
+                admision.admitir("inversa", 5)
+            finally:
+                admision.cerrar(ficha)
+        finally:
+            admision.configurar({"concurrencia_pesada": 2, "espera_cola": 30, "costo_directo": 5_000_000})
+
+
+class TestVistas(SimpleTestCase):
+
+    def test_inversa_sin_pasos_con_aviso(self):
+        with mock.patch.dict(admision.LIMITES, {"costo_maximo_pasos": 1000}):
+            resp = self.client.post(reverse("inversa"), {"matrizA": _texto(6), "show_steps": "on"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.context["resultado"])
+        self.assertNotIn("pasos", resp.context)
+        self.assertIn("pasos", resp.context["message"])
+
+    def test_matriz_demasiado_grande(self):
+        with mock.patch.dict(admision.LIMITES, {"celdas_maximas": 10}):
+            resp = self.client.post(reverse("determinante"), {"matrizA": _texto(4)})
+        self.assertIn("máximo", resp.context["error"])
+
+    def test_potencia_que_no_se_puede_mostrar(self):
+        resp = self.client.post(reverse("potencia"), {"matrizA": "3", "exponente": "10000"})
+        self.assertIn("dígitos", resp.context["error"])
+        self.assertNotIn("set_int_max_str_digits", resp.context["error"])
+
+    def test_derivada_con_exponente_enorme(self):
+        resp = self.client.post(reverse("derivadas"), {"expr": "x**10000"})
+        self.assertIn("exponente", resp.context["error"])
+        self.assertNotIn("derivada", resp.context)
+
+    def test_raices_con_admision(self):
+        resp = self.client.post(reverse("biseccion"), {"function": "x**(10**6) - 2", "a": "0", "b": "2"})
+        self.assertIn("exponente", resp.context["error"])
+        with mock.patch.dict(admision.LIMITES, {"costo_maximo": 10}):
+            resp = self.client.post(reverse("newton_raphson"), {"function": "x^2 - 2", "x0": "1"})
+        self.assertIn("demasiado costosa", resp.context["error"])
+
+    def test_compuestas_cuenta_potencias(self):
+        from algebra.logic import compuestas
+        A = [[[1, 1], [1, 1]], [[0, 1], [1, 1]]]
+        plan = compuestas.construir_plan([{"type": "power", "params": {"k": "10000"}}], A, None)
+        self.assertGreater(compuestas.productos_equivalentes(plan), 100)
+        plan = compuestas.construir_plan([{"type": "inverse"}, {"type": "transpose"}], A, None)
+        self.assertEqual(compuestas.productos_equivalentes(plan), 3)
+        with self.assertRaisesRegex(ValueError, "exponente"):
+            compuestas.construir_plan([{"type": "scale", "params": {"c": "3"}}]
+                                      + [{"type": "power", "params": {"k": "1000"}}] * 3, A, None)
+        seq = '[{"type": "power", "params": {"k": "5000"}}]'
+        with mock.patch.dict(admision.LIMITES, {"costo_maximo": 1000}):
+            resp = self.client.post(reverse("compuestas"), {"matrizA": _texto(3), "sequence_json": seq})
+        self.assertIn("demasiado costosa", resp.context["error"])
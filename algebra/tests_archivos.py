@@ -0,0 +1,122 @@
+import io
+import unittest
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from algebra import views
+from algebra.logic import admision, archivos
+from algebra.logic import utilidades as u
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+
+class TestImportacion(unittest.TestCase):
+
+    def test_csv_numeros_y_expresiones(self):
+        M = archivos.leer_csv(io.BytesIO(b"1, -2.5, 3/4\n1e2; 0.1; sqrt(4)\n"))
+        self.assertEqual(M, [[[1, 1], [-5, 2], [3, 4]], [[100, 1], [1, 10], [2, 1]]])
+        with self.assertRaisesRegex(archivos.ErrorArchivo, "Fila 2, columna 1"):
+            archivos.leer_csv(["1 2", "abc 3"])
+
+    def test_celdas_repetidas_se_convierten_una_vez(self):
+        with mock.patch.object(u, "crear_fraccion_desde_cadena", wraps=u.crear_fraccion_desde_cadena) as crear:
+            M = archivos.leer_csv(["2*3 2*3 7", "2*3 1 7"])
+        self.assertEqual(crear.call_count, 1)
+        self.assertEqual(M[1][0], [6, 1])
+
+    def test_matrix_market_antisimetrica(self):
+        texto = b"%%MatrixMarket matrix coordinate integer skew-symmetric\n2 2 1\n2 1 3\n"
+        self.assertEqual(archivos.leer_archivo("a.mtx", io.BytesIO(texto)), [[[0, 1], [-3, 1]], [[3, 1], [0, 1]]])
+
+    def test_matrix_market_cabecera_enorme(self):
+        # Se rechaza por la cabecera, sin reservar la matriz densa
+        texto = b"%%MatrixMarket matrix coordinate real general\n100000 100000 1\n1 1 1\n"
+        with self.assertRaisesRegex(admision.ErrorAdmision, "el máximo es"):
+            archivos.leer_matrix_market(io.BytesIO(texto))
+
+
+class TestConversionCeldas(unittest.TestCase):
+
+    def test_paralelo_igual_que_secuencial(self):
+        texto = "\n".join(" ".join(f"sqrt({i * 4 + j})/2 -{j}" for j in range(4)) for i in range(6))
+        secuencial = views._parse_matriz_simple(texto)
+        with mock.patch.object(archivos, "UMBRAL_PARALELO", 2), mock.patch.object(archivos, "PROCESOS", 2):
+            self.assertEqual(views._parse_matriz_simple(texto), secuencial)
+
+    def test_mismos_errores_y_orden(self):
+        with self.assertRaisesRegex(ValueError, "misma cantidad de columnas"):
+            views._parse_matriz_simple("1 2\n3")
+        # la celda inválida de la fila 1 se informa antes que la falta de '|'
+        with self.assertRaisesRegex(Exception, "abc"):
+            views._parse_matriz_aumentada("abc 1 | 2\n1 2 3")
+        with self.assertRaisesRegex(ValueError, "Cada fila debe contener"):
+            views._parse_matriz_aumentada("1 1 | 2\n1 2 3")
+        with self.assertRaisesRegex(ValueError, "una sola columna"):
+            views._parse_matriz_aumentada("1 | 2 3")
+
+    def test_celdas_repetidas_son_independientes(self):
+        M = views._parse_matriz_simple("1/2 1/2")
+        self.assertIsNot(M[0][0], M[0][1])
+
+
+class TestExportacion(unittest.TestCase):
+
+    def test_csv_con_pasos(self):
+        M = [[[1, 2], [3, 1]]]
+        pasos = [{"operacion": "F1 → 2·F1", "matriz": [[[1, 1], [6, 1]]]}]
+        self.assertEqual("".join(archivos.lineas_csv(M, pasos)), "1/2,3\n\n# Paso 1: F1 → 2·F1\n1,6\n")
+
+    def test_matrix_market_ida_y_vuelta(self):
+        M = [[[1, 1], [2, 1]], [[3, 1], [-4, 1]]]
+        texto = "".join(archivos.lineas_matrix_market(M))
+        self.assertEqual(archivos.leer_matrix_market(texto.splitlines()), M)
+
+    def test_matrix_market_fuera_del_rango_de_float(self):
+        texto = "".join(archivos.lineas_matrix_market([[[10 ** 400, 3], [1, 10 ** 400]]]))
+        self.assertEqual(texto.splitlines()[2:], ["3.3333333333333333E+399", "1E-400"])
+        self.assertEqual("".join(archivos.lineas_matrix_market([[[1, 3]]])).splitlines()[2], repr(1 / 3))
+
+    @unittest.skipUnless(openpyxl, "openpyxl no está instalado")
+    def test_xlsx_ida_y_vuelta(self):
+        M = [[[1, 1], [1, 3]], [[-2, 1], [5, 4]]]
+        destino = io.BytesIO()
+        archivos.escribir_xlsx(destino, M, [{"operacion": "inicio", "matriz": M}])
+        destino.seek(0)
+        self.assertEqual(archivos.leer_xlsx(destino), M)
+
+
+class TestVistasArchivos(SimpleTestCase):
+
+    def test_suma_desde_archivo_y_descarga(self):
+        datos = {
+            "matrizA_archivo": SimpleUploadedFile("a.csv", b"1,2\n3,4\n"),
+            "matrizB": "1 1\n1 1",
+            "exportar": "csv",
+        }
+        resp = self.client.post(reverse("suma"), datos)
+        self.assertEqual(resp["Content-Disposition"], 'attachment; filename="suma.csv"')
+        self.assertEqual(b"".join(resp.streaming_content), b"2,3\n4,5\n")
+
+    def test_error_de_formato_antes_de_la_descarga(self):
+        # 10^400 no cabe en un float: el formato decimal falla al exportar
+        datos = {"matrizA": "1" + "0" * 400, "matrizB": "0", "result_format": "dec", "exportar": "csv"}
+        resp = self.client.post(reverse("suma"), datos)
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(resp.has_header("Content-Disposition"))
+        self.assertTrue(resp.context["error"])
+
+    def test_gauss_jordan_aumentada_desde_archivo(self):
+        archivo = SimpleUploadedFile("s.mtx", b"%%MatrixMarket matrix array integer general\n2 3\n1\n1\n1\n-1\n3\n1\n")
+        resp = self.client.post(reverse("gauss_jordan"), {"matrizAug_archivo": archivo})
+        self.assertEqual(resp.context["analisis"]["solucion"], "UNICA")
+        self.assertEqual(resp.context["resultado"], [["1", "0", "2"], ["0", "1", "1"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
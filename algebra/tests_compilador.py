@@ -0,0 +1,48 @@
+import unittest
+import math
+
+from algebra.logic import metodos
+from algebra.logic.compilador import compilar_funcion, ExpresionNoSoportada
+
+
+class TestCompilador(unittest.TestCase):
+
+    def test_gramatica_basica(self):
+        f = compilar_funcion('x**3 - 2*x + 1/2')
+        self.assertAlmostEqual(f(2.0), 8 - 4 + 0.5)
+
+    def test_alias(self):
+        f = compilar_funcion('ln(x) + sen(x) + tg(x) + lg(x)')
+        x = 1.3
+        esperado = math.log(x) + math.sin(x) + math.tan(x) + math.log10(x)
+        self.assertAlmostEqual(f(x), esperado)
+
+    def test_raiz_impar_real(self):
+        # Igual que la reescritura de SymPy: x^(1/3) es real para x < 0
+        f = compilar_funcion('(x)**(1/(3))')
+        self.assertAlmostEqual(f(-8.0), -2.0)
+        g = compilar_funcion('x**(2/3)')
+        self.assertAlmostEqual(g(-8.0), 4.0)
+
+    def test_base_negativa_no_devuelve_complejo(self):
+        f = compilar_funcion('x**0.5')
+        with self.assertRaises(ValueError):
+            f(-4.0)
+
+    def test_rechaza_construcciones_inseguras(self):
+        for texto in ('__import__("os")', 'x.real', '[x]', 'y + 1', 'x if x else 1', 'sin(x, 2)'):
+            with self.assertRaises(ExpresionNoSoportada):
+                compilar_funcion(texto)
+
+    def test_evaluador_usa_camino_rapido(self):
+        f = metodos._crear_evaluador('x^2 = 4')
+        self.assertAlmostEqual(f(3.0), 5.0)
+
+    def test_evaluador_recurre_a_sympy(self):
+        # Sintaxis fuera de la gramática ligera (factorial) la resuelve SymPy
+        f = metodos._crear_evaluador('factorial(3) + x')
+        self.assertAlmostEqual(f(1.0), 7.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
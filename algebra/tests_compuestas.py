@@ -0,0 +1,130 @@
+import unittest
+from unittest import mock
+
+from algebra.logic import compuestas
+from algebra.logic import operaciones as op
+from algebra.tests_operaciones import _matriz_aleatoria
+
+
+def _referencia(seq, A, B, fuente="A"):
+    """Ejecución literal de la secuencia, paso a paso."""
+    M = B if fuente == "B" else A
+    otra = "B" if fuente == "A" else "A"
+    var = {"A": A, "B": B}
+    f = lambda p, k: [int(p[k]), 1]
+    for paso in seq:
+        t, p = paso["type"], paso.get("params", {})
+        if t == "transpose":
+            M = op.transponer_matriz(M)
+        elif t == "scale":
+            M = op.multiplicar_escalar_matriz(f(p, "c"), M)
+        elif t == "mulb":
+            M = op.multiplicar_matrices(M, var["B"])
+        elif t == "sumb":
+            M = op.sumar_matrices(M, var["B"])
+        elif t == "lincomb":
+            M = op.sumar_matrices(op.multiplicar_escalar_matriz(f(p, "a"), var["A"]),
+                                  op.multiplicar_escalar_matriz(f(p, "b"), var["B"]))
+        elif t == "inverse":
+            M = op.inversa_matriz(M)["inversa"]
+        elif t == "scaleother":
+            var[otra] = op.multiplicar_escalar_matriz(f(p, "c"), var[otra])
+        elif t == "inverseother":
+            var[otra] = op.inversa_matriz(var[otra])["inversa"]
+    return M
+
+
+A = _matriz_aleatoria(3, 3, 11)
+B = _matriz_aleatoria(3, 3, 12)
+
+
+class TestPlan(unittest.TestCase):
+
+    def _comprobar(self, seq, fuente="A"):
+        plan = compuestas.construir_plan(seq, A, B, fuente=fuente)
+        self.assertEqual(compuestas.ejecutar_plan(plan), _referencia(seq, A, B, fuente))
+        return plan
+
+    def test_secuencias_equivalentes(self):
+        secuencias = [
+            [{"type": "transpose"}, {"type": "scale", "params": {"c": "2"}}, {"type": "mulb"}, {"type": "inverse"}],
+            [{"type": "scaleother", "params": {"c": "3"}}, {"type": "scale", "params": {"c": "2"}}, {"type": "mulb"}, {"type": "sumb"}],
+            [{"type": "inverseother"}, {"type": "lincomb", "params": {"a": "2", "b": "-1"}}, {"type": "transpose"}],
+            [{"type": "inverse"}, {"type": "transpose"}, {"type": "inverse"}],
+        ]
+        for seq in secuencias:
+            self._comprobar(seq)
+            self._comprobar(seq, fuente="B")
+
+    def test_cadenas_redundantes_no_se_ejecutan(self):
+        plan = self._comprobar([{"type": "transpose"}, {"type": "transpose"}])
+        self.assertEqual(plan.ejecutadas, 0)
+        # 2A·3B: un producto y un escalado en lugar de dos escalados y un producto
+        plan = self._comprobar([{"type": "scale", "params": {"c": "2"}}, {"type": "scaleother", "params": {"c": "3"}}, {"type": "mulb"}])
+        self.assertEqual(plan.ejecutadas, 2)
+        self.assertIn("(cX)(dY) = cd(XY)", plan.reescrituras)
+        # lo anterior a lincomb se descarta
+        plan = self._comprobar([{"type": "inverse"}, {"type": "mulb"}, {"type": "lincomb", "params": {"a": "1", "b": "2"}}])
+        self.assertEqual(plan.ejecutadas, 1)
+
+    def test_doble_inversa_comprueba_determinante(self):
+        plan = compuestas.construir_plan([{"type": "inverse"}, {"type": "inverse"}], A, B)
+        with mock.patch.object(op, "inversa_matriz", wraps=op.inversa_matriz) as inv:
+            self.assertEqual(compuestas.ejecutar_plan(plan), A)
+        inv.assert_not_called()
+        S = [[[1, 1], [2, 1]], [[2, 1], [4, 1]]]
+        plan = compuestas.construir_plan([{"type": "inverse"}, {"type": "inverse"}], S, None)
+        with self.assertRaises(ValueError):
+            compuestas.ejecutar_plan(plan)
+
+    def test_inversas_descartadas_se_validan(self):
+        S = [[[1, 1], [2, 1]], [[2, 1], [4, 1]]]
+        # B⁻¹ no se usa en el resultado, pero la secuencia literal fallaría
+        plan = compuestas.construir_plan([{"type": "inverseother"}], A, S)
+        with self.assertRaisesRegex(ValueError, "no es invertible"):
+            compuestas.ejecutar_plan(plan)
+        plan = compuestas.construir_plan([{"type": "inverse"}, {"type": "lincomb", "params": {"a": "1", "b": "1"}}], S, S)
+        with self.assertRaisesRegex(ValueError, "no es invertible"):
+            compuestas.ejecutar_plan(plan)
+        plan = compuestas.construir_plan([{"type": "power", "params": {"k": "-2"}}, {"type": "lincomb", "params": {"a": "1", "b": "1"}}], S, S)
+        with self.assertRaisesRegex(ValueError, "no es invertible"):
+            compuestas.ejecutar_plan(plan)
+        # Si la inversa se ejecuta, no se calcula además el determinante
+        plan = compuestas.construir_plan([{"type": "inverse"}], A, B)
+        with mock.patch.object(op, "determinante_matriz", wraps=op.determinante_matriz) as det:
+            compuestas.ejecutar_plan(plan)
+        self.assertFalse(any(c.args and c.args[0] is A for c in det.call_args_list))
+
+    def test_secuencias_largas(self):
+        seq = [{"type": "sumi"}] * 900
+        plan = compuestas.construir_plan(seq, A, B)
+        M = compuestas.ejecutar_plan(plan)
+        self.assertEqual(M[0][0], op.sumar_fracciones(A[0][0], [900, 1]))
+        M, pasos = compuestas.ejecutar_plan(compuestas.construir_plan(seq[:50], A, B), registrar_pasos=True)
+        self.assertEqual(len(pasos), 50)
+        with self.assertRaisesRegex(ValueError, "demasiadas operaciones"):
+            compuestas.construir_plan([{"type": "sumi"}] * (compuestas.MAXIMO_OPERACIONES + 1), A, B)
+
+    def test_dimensiones_se_validan_aunque_se_descarten(self):
+        R = _matriz_aleatoria(2, 3, 13)
+        with self.assertRaises(ValueError):
+            compuestas.construir_plan([{"type": "mulb"}, {"type": "lincomb", "params": {"a": "1", "b": "1"}}], R, R)
+
+    def test_potencia(self):
+        seq = [{"type": "scale", "params": {"c": "2"}}, {"type": "power", "params": {"k": "3"}}, {"type": "power", "params": {"k": "2"}}]
+        plan = compuestas.construir_plan(seq, A, B)
+        self.assertEqual(compuestas.ejecutar_plan(plan), op.multiplicar_escalar_matriz([64, 1], op.potencia_matriz(A, 6)))
+        self.assertEqual(plan.ejecutadas, 2)
+        with self.assertRaises(ValueError):
+            compuestas.construir_plan([{"type": "power", "params": {"k": "x"}}], A, B)
+
+    def test_pasos_solo_de_lo_ejecutado(self):
+        plan = compuestas.construir_plan([{"type": "transpose"}, {"type": "transpose"}, {"type": "mulb"}], A, B)
+        M, pasos = compuestas.ejecutar_plan(plan, registrar_pasos=True)
+        self.assertEqual(M, op.multiplicar_matrices(A, B))
+        self.assertTrue(pasos)
+        self.assertTrue(all(p["operacion"].startswith("(A)·(B)") for p in pasos))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import io
+import struct
+import unittest
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from algebra.logic import admision, disco
+
+
+def _npy(filas, descr="<f8", codigo="<d"):
+    cabecera = repr({"descr": descr, "fortran_order": False, "shape": (len(filas), len(filas[0]))}).encode()
+    cabecera += b" " * (-(len(cabecera) + 11) % 64) + b"\n"
+    datos = b"".join(struct.pack(codigo, v) for fila in filas for v in fila)
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(cabecera)) + cabecera + datos
+
+
+class TestLectores(unittest.TestCase):
+
+    def test_csv(self):
+        with disco.leer_csv(io.BytesIO(b"1, 2, 3\n\n4;5;6\n")) as M:
+            self.assertEqual(M.vista(), [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+        with self.assertRaisesRegex(disco.ErrorArchivoMatriz, "Fila 2"):
+            disco.leer_csv(io.BytesIO(b"1 2\n3 x\n"))
+
+    def test_npy(self):
+        with disco.leer_npy(io.BytesIO(_npy([[1, 2], [3, 4]]))) as M:
+            self.assertEqual(M.vista(), [[1.0, 2.0], [3.0, 4.0]])
+        with disco.leer_npy(io.BytesIO(_npy([[5, -6]], descr=">i4", codigo=">i"))) as M:
+            self.assertEqual(M.vista(), [[5.0, -6.0]])
+
+    def test_matrix_market(self):
+        texto = b"%%MatrixMarket matrix coordinate real symmetric\n% comentario\n3 3 3\n1 1 2\n3 1 -1\n2 2 4\n"
+        with disco.leer_archivo("a.mtx", io.BytesIO(texto)) as M:
+            self.assertEqual(M.vista(), [[2.0, 0.0, -1.0], [0.0, 4.0, 0.0], [-1.0, 0.0, 0.0]])
+        texto = b"%%MatrixMarket matrix array real general\n2 2\n1\n2\n3\n4\n"
+        with disco.leer_matrix_market(io.BytesIO(texto)) as M:
+            self.assertEqual(M.vista(), [[1.0, 3.0], [2.0, 4.0]])
+
+
+class TestLimites(unittest.TestCase):
+
+    def test_cabecera_enorme(self):
+        # La cabecera pide 10^10 entradas: se rechaza antes de crear el archivo
+        texto = b"%%MatrixMarket matrix coordinate real general\n100000 100000 1\n1 1 1\n"
+        with self.assertRaisesRegex(disco.ErrorArchivoMatriz, "el máximo es"):
+            disco.leer_matrix_market(io.BytesIO(texto))
+        cabecera = _npy([[1.0]]).replace(b"(1, 1)", b"(99999, 99999)")
+        with self.assertRaisesRegex(disco.ErrorArchivoMatriz, "el máximo es"):
+            disco.leer_npy(io.BytesIO(cabecera))
+
+    def test_csv_demasiado_grande(self):
+        with mock.patch.dict(disco.LIMITES, celdas_maximas=4):
+            with self.assertRaisesRegex(disco.ErrorArchivoMatriz, "el máximo es 4"):
+                disco.leer_csv(["1 2", "3 4", "5 6"])
+
+    def test_dimension_motores(self):
+        with mock.patch.dict(disco.LIMITES, dimension_numpy=2, dimension_python=2):
+            with disco.leer_csv(["1 2 3", "4 5 6", "7 8 10"]) as M:
+                with self.assertRaisesRegex(disco.ErrorArchivoMatriz, "hasta 2 filas"):
+                    disco.determinante_disco(M)
+                with self.assertRaisesRegex(disco.ErrorArchivoMatriz, "hasta 2 filas"):
+                    disco.multiplicar_disco(M, M)
+
+
+class TestMotores(unittest.TestCase):
+
+    def test_determinante(self):
+        with disco.leer_csv(["0 2 1", "1 1 1", "2 0 5"]) as M:
+            info = disco.determinante_disco(M)
+            self.assertAlmostEqual(info["det"], -8.0)
+            self.assertEqual(M.vista()[0], [0.0, 2.0, 1.0])  # no se modifica
+        with disco.leer_csv(["1 2", "2 4"]) as M:
+            self.assertEqual(disco.determinante_disco(M)["signo"], 0)
+
+    def test_gauss(self):
+        with disco.leer_csv(["2 1 5", "1 -1 1"]) as M:
+            info = disco.gauss_disco(M)
+        self.assertEqual(info["solucion"], "UNICA")
+        self.assertAlmostEqual(info["x"][0], 2.0)
+        self.assertAlmostEqual(info["x"][1], 1.0)
+        with disco.leer_csv(["1 1 1", "2 2 3"]) as M:
+            self.assertEqual(disco.gauss_disco(M)["solucion"], "INCONSISTENTE")
+        with disco.leer_csv(["1 1 1", "2 2 2"]) as M:
+            self.assertEqual(disco.gauss_disco(M)["solucion"], "INFINITAS")
+
+    def test_multiplicacion(self):
+        with disco.leer_csv(["1 2", "3 4", "5 6"]) as A, disco.leer_csv(["1 0 2", "0 1 -1"]) as B:
+            with disco.multiplicar_disco(A, B) as C:
+                self.assertEqual(C.vista(), [[1.0, 2.0, 0.0], [3.0, 4.0, 2.0], [5.0, 6.0, 4.0]])
+
+
+class TestVistaArchivo(SimpleTestCase):
+
+    def test_subida(self):
+        archivo = SimpleUploadedFile("a.csv", b"4,3\n6,3\n")
+        resp = self.client.post(reverse("matriz_archivo"), {"operacion": "determinante", "archivoA": archivo})
+        self.assertEqual(resp.context["det_str"], "-6")
+        self.assertEqual(resp.context["dims"]["A"], "2×2")
+        resp = self.client.post(reverse("matriz_archivo"), {"operacion": "multiplicacion", "archivoA": SimpleUploadedFile("a.csv", b"1 2\n")})
+        self.assertEqual(resp.context["error"], "Sube un archivo para la matriz B.")
+
+    def test_admision(self):
+        archivo = SimpleUploadedFile("a.csv", b"4,3\n6,3\n")
+        with mock.patch.dict(admision.LIMITES, costo_maximo=0):
+            resp = self.client.post(reverse("matriz_archivo"), {"operacion": "determinante", "archivoA": archivo})
+        self.assertIn("demasiado costosa", resp.context["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from algebra import estaticos
+from algebra.middleware import EstaticosMiddleware
+
+
+class TestMinificar(SimpleTestCase):
+
+    def test_quita_comentarios_y_sangria(self):
+        codigo = "function f(a) {\n    // comentario\n    return a /* x */ + 1;\n}\n\n"
+        self.assertEqual(estaticos.minificar_js(codigo), "function f(a) {\nreturn a + 1;\n}\n")
+
+    def test_respeta_cadenas_regex_y_plantillas(self):
+        codigo = (
+            "const u = 'http://x.org/*no*/';\n"
+            "const r = /\\/\\/[/*]/g.test(u);\n"
+            "const d = total / 2 / n; // mitad\n"
+            "const t = `a ${ {b: '//'}.b } // c`;\n"
+        )
+        self.assertEqual(estaticos.minificar_js(codigo), codigo.replace(" // mitad", ""))
+
+
+_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "algebra.estaticos.AlmacenamientoEstatico"},
+}
+
+
+class TestCollectstatic(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.raiz = tempfile.mkdtemp()
+        with override_settings(STATIC_ROOT=cls.raiz, STORAGES=_STORAGES, ALGEBRA_MINIFICAR_JS=True):
+            call_command("collectstatic", interactive=False, verbosity=0)
+        with open(os.path.join(cls.raiz, "staticfiles.json"), encoding="utf-8") as f:
+            cls.manifiesto = json.load(f)["paths"]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.raiz, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_huella_minificado_y_gzip(self):
+        con_huella = self.manifiesto["algebra/app.js"]
+        self.assertRegex(con_huella, r"^algebra/app\.[0-9a-f]{12}\.js$")
+        ruta = os.path.join(self.raiz, con_huella)
+        with open(ruta, "rb") as f:
+            contenido = f.read()
+        self.assertLess(len(contenido), os.path.getsize("static/algebra/app.js"))
+        with open(ruta + ".gz", "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()), contenido)
+        # Las imágenes no se comprimen
+        self.assertFalse(os.path.exists(os.path.join(self.raiz, self.manifiesto["algebra/KiwiSolveLogo.png"]) + ".gz"))
+
+    def _middleware(self):
+        with override_settings(STATIC_ROOT=self.raiz, ALGEBRA_SERVIR_ESTATICOS=True):
+            return EstaticosMiddleware(lambda request: HttpResponse("vista"))
+
+    def test_servir_con_huella_y_gzip(self):
+        mw = self._middleware()
+        url = "/static/" + self.manifiesto["algebra/styles.css"]
+        resp = mw(RequestFactory().get(url, HTTP_ACCEPT_ENCODING="gzip, deflate"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertIn("immutable", resp["Cache-Control"])
+        self.assertEqual(resp["Vary"], "Accept-Encoding")
+        self.assertTrue(resp["Content-Type"].startswith("text/css"))
+        cuerpo = b"".join(resp.streaming_content)
+        self.assertIn(b"perfil-panel", gzip.decompress(cuerpo))
+        resp = mw(RequestFactory().get(url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=resp["ETag"]))
+        self.assertEqual(resp.status_code, 304)
+
+    def test_sin_huella_y_resto_de_rutas(self):
+        mw = self._middleware()
+        resp = mw(RequestFactory().get("/static/algebra/app.js"))
+        self.assertNotIn("immutable", resp["Cache-Control"])
+        self.assertFalse(resp.has_header("Content-Encoding"))
+        self.assertEqual(mw(RequestFactory().get("/inversa/")).content, b"vista")
+        self.assertEqual(mw(RequestFactory().get("/static/no-existe.js")).content, b"vista")
@@ -0,0 +1,117 @@
+import unittest
+from unittest import mock
+
+from algebra.logic import estructura
+from algebra.logic import operaciones as op
+from algebra.tests_operaciones import _matriz_aleatoria
+
+
+def _f(filas):
+    return [[[x, 1] if isinstance(x, int) else list(x) for x in fila] for fila in filas]
+
+
+class TestAnalisis(unittest.TestCase):
+
+    def test_clasificacion(self):
+        est = estructura.analizar_estructura(_f([[0, 2, 0], [0, 0, -1], [3, 0, 0]]))
+        self.assertEqual(est["permutacion"], (1, 2, 0))
+        self.assertFalse(est["triangular_superior"])
+        est = estructura.analizar_estructura(_f([[1, 2, 0, 0], [2, 1, 0, 0], [0, 0, 5, 1], [0, 0, 1, 4]]))
+        self.assertEqual(est["bloques"], ((0, 2), (2, 4)))
+        self.assertEqual(est["banda"], (1, 1))
+        est = estructura.analizar_estructura(_f([[1, 0], [0, 1]]))
+        self.assertTrue(est["identidad"] and est["diagonal"])
+        self.assertTrue(est["simetrica"])
+        self.assertTrue(estructura.analizar_estructura(_f([[1, (1, 2)], [(1, 2), 0]]))["simetrica"])
+        self.assertFalse(estructura.analizar_estructura(_f([[1, 2], [(2, 3), 0]]))["simetrica"])
+
+    def test_cache_por_contenido(self):
+        A = _f([[1, 2], [3, 4]])
+        estructura.vaciar_cache()
+        with mock.patch.object(estructura, "_analizar", wraps=estructura._analizar) as analizar:
+            estructura.analizar_estructura(A)
+            estructura.analizar_estructura(op.copiar_matriz(A))
+            self.assertEqual(analizar.call_count, 1)
+            # Las matrices grandes no pasan por la caché
+            with mock.patch.object(estructura, "CELDAS_CACHE", 3):
+                estructura.analizar_estructura(A)
+                estructura.analizar_estructura(A)
+            self.assertEqual(analizar.call_count, 3)
+
+    def test_signo_permutacion(self):
+        self.assertEqual(estructura.signo_permutacion((1, 2, 0)), 1)
+        self.assertEqual(estructura.signo_permutacion((1, 0, 2)), -1)
+
+
+class TestAtajos(unittest.TestCase):
+
+    def _comprobar(self, A, metodo=None):
+        det_pasos, _ = op.determinante_matriz(A, registrar_pasos=True)
+        self.assertEqual(op.determinante_matriz(A), det_pasos)
+        info = op.inversa_matriz(A)
+        esperado, _ = op.inversa_matriz(A, registrar_pasos=True)
+        self.assertEqual(info["invertible"], esperado["invertible"])
+        self.assertEqual(info["inversa"], esperado["inversa"])
+        if metodo:
+            self.assertEqual(info["metodo"], metodo)
+
+    def test_triangular_y_permutacion(self):
+        U = _matriz_aleatoria(5, 5, 30)
+        for i in range(5):
+            U[i][i] = [i + 2, 3]
+            for j in range(i):
+                U[i][j] = [0, 1]
+        self._comprobar(U, "triangular")
+        self._comprobar(op.transponer_matriz(U), "triangular")
+        self._comprobar(_f([[0, 0, (1, 2)], [-3, 0, 0], [0, 7, 0]]), "permutacion")
+
+    def test_bloques_y_banda(self):
+        A = _f([[2, 1, 0, 0, 0], [1, 3, 0, 0, 0], [0, 0, 1, 2, 1], [0, 0, 0, 1, 4], [0, 0, 2, 0, 1]])
+        self._comprobar(A, "bloques")
+        n = 12
+        T = [[[0, 1] for _ in range(n)] for _ in range(n)]
+        for i in range(n):
+            T[i][i] = [0, 1] if i == 0 else [2, 1]
+            if i + 1 < n:
+                T[i][i + 1] = [-1, 1]
+                T[i + 1][i] = [1, 3]
+        # pivote nulo en (1,1): la eliminación en banda debe intercambiar filas
+        with mock.patch.object(op, "_determinante_bareiss") as bareiss:
+            self.assertEqual(op.determinante_matriz(T), op.determinante_matriz(T, registrar_pasos=True)[0])
+        bareiss.assert_not_called()
+
+    def test_singular_por_diagonal(self):
+        info = op.inversa_matriz(_f([[1, 5, 2], [0, 0, 1], [0, 0, 3]]))
+        self.assertFalse(info["invertible"])
+        self.assertIn("a22 = 0", info["razon"])
+
+    def test_simetrica(self):
+        A = _matriz_aleatoria(6, 6, 31)
+        for i in range(6):
+            for j in range(i):
+                A[j][i] = list(A[i][j])
+        A[0][0] = [0, 1]  # el barrido elige otro pivote
+        with mock.patch.object(op, "_inversa_bareiss") as bareiss:
+            self._comprobar(A, "simetrica")
+        bareiss.assert_not_called()
+        # Fila 3 = 2·fila 1 (y columna 3 = 2·columna 1): singular
+        S = _f([[1, 2, 2], [2, 5, 4], [2, 4, 4]])
+        self._comprobar(S, "simetrica")
+        # Sin pivote diagonal no nulo: se resuelve por el camino general
+        self._comprobar(_f([[0, 1, 1], [1, 0, 1], [1, 1, 0]]), "gauss")
+        b = _f([[1], [2], [3], [4], [5], [6]])
+        with mock.patch.object(op, "_determinante_bareiss", wraps=op._determinante_bareiss) as det:
+            info = op.cramer_resolver(A, b)
+        self.assertEqual(det.call_count, 1)
+        self.assertEqual(info, op.cramer_resolver(A, b, registrar_pasos=True)[0])
+
+    def test_cramer_triangular(self):
+        A = _f([[2, 1, -1], [0, 3, 2], [0, 0, 4]])
+        b = _f([[3], [1], [8]])
+        info = op.cramer_resolver(A, b)
+        esperado, _ = op.cramer_resolver(A, b, registrar_pasos=True)
+        self.assertEqual(info, esperado)
+
+
+if __name__ == "__main__":
+    unittest.main()
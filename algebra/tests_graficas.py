@@ -0,0 +1,49 @@
+import unittest
+
+from algebra.logic.compilador import compilar_funcion
+from algebra.logic.graficas import muestrear_funcion, reducir_lttb
+
+
+def _contador(f):
+    llamadas = [0]
+
+    def g(x):
+        llamadas[0] += 1
+        return f(x)
+    return g, llamadas
+
+
+class TestMuestreoAdaptativo(unittest.TestCase):
+
+    def test_respeta_presupuesto_y_orden(self):
+        g, llamadas = _contador(compilar_funcion('sin(50*x)'))
+        xs, ys = muestrear_funcion(g, -1, 1, presupuesto=150, puntos_salida=120)
+        self.assertLessEqual(llamadas[0], 150)
+        self.assertLessEqual(len(xs), 121)
+        self.assertEqual(xs, sorted(xs))
+
+    def test_funcion_suave_usa_pocas_evaluaciones(self):
+        g, llamadas = _contador(compilar_funcion('2*x + 1'))
+        muestrear_funcion(g, -10, 10)
+        self.assertLess(llamadas[0], 100)
+
+    def test_corta_la_linea_en_polos(self):
+        xs, ys = muestrear_funcion(compilar_funcion('tan(x)'), -5, 5)
+        # polos en ±pi/2 y ±3pi/2
+        self.assertEqual(ys.count(None), 4)
+
+    def test_fuera_del_dominio_es_none(self):
+        xs, ys = muestrear_funcion(compilar_funcion('sqrt(x)'), -2, 2)
+        self.assertIsNone(ys[0])
+        self.assertAlmostEqual(ys[-1], 2 ** 0.5)
+
+    def test_lttb_conserva_extremos(self):
+        xs = [i / 100 for i in range(1001)]
+        ys = [x * x for x in xs]
+        rx, ry = reducir_lttb(xs, ys, 50)
+        self.assertEqual(len(rx), 50)
+        self.assertEqual((rx[0], rx[-1]), (xs[0], xs[-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import json
+import unittest
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from algebra.logic import leontief
+from algebra.logic import operaciones as op
+
+
+def _f(filas):
+    return [[[x, 1] if isinstance(x, int) else list(x) for x in fila] for fila in filas]
+
+
+# Economía de 3 sectores con sumas por columnas < 1
+A = _f([[(1, 5), (1, 10), (1, 4)], [(3, 10), (1, 5), (1, 10)], [(1, 10), (2, 5), (1, 5)]])
+Y = _f([[10, 1], [20, 0], [30, 2]])
+
+
+def _por_inversa(A, Y):
+    info = op.inversa_matriz(leontief.matriz_tecnica(A))
+    return op.multiplicar_matrices(info["inversa"], Y)
+
+
+class TestExacto(unittest.TestCase):
+
+    def test_coincide_con_inversa(self):
+        info = leontief.resolver_leontief(A, Y)
+        self.assertEqual(info["X"], _por_inversa(A, Y))
+        self.assertTrue(info["productiva"])
+
+    def test_pivoteo_y_pasos(self):
+        # (I − A) con cero en la esquina: obliga a intercambiar filas
+        B = _f([[1, 2], [-1, 1]])
+        info, pasos = leontief.resolver_leontief(B, _f([[1], [2]]), registrar_pasos=True)
+        self.assertEqual(info["X"], _por_inversa(B, _f([[1], [2]])))
+        self.assertTrue(any("Intercambiamos" in p["operacion"] for p in pasos))
+        self.assertFalse(info["productiva"])
+
+    def test_singular(self):
+        with self.assertRaises(leontief.ErrorLeontief):
+            leontief.resolver_leontief(_f([[1, 0], [0, 0]]), _f([[1], [1]]))
+
+    def test_validacion(self):
+        with self.assertRaises(leontief.ErrorLeontief):
+            leontief.resolver_leontief(A, _f([[1], [2]]))
+
+
+class TestEscenarios(unittest.TestCase):
+
+    def test_multiplicadores_son_sumas_de_la_inversa(self):
+        # B obliga a intercambiar filas en la factorización
+        B = _f([[1, 2], [-1, 1]])
+        for M in (A, B):
+            IA = leontief.matriz_tecnica(M)
+            inv = op.inversa_matriz(IA)["inversa"]
+            self.assertEqual(leontief.multiplicadores(leontief.factorizar(IA)), leontief.sumas_columnas(inv))
+
+    def test_reutiliza_factorizacion(self):
+        primero = leontief.resolver_escenarios(A, Y)
+        segundo = leontief.resolver_escenarios(None, Y, factorizacion=primero["factorizacion"])
+        self.assertTrue(segundo["reutilizada"])
+        self.assertEqual(segundo["X"], primero["X"])
+        self.assertEqual(leontief.clave_matriz(A), leontief.clave_matriz(op.copiar_matriz(A)))
+
+
+class TestEndpointEscenarios(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def _post(self, datos):
+        return self.client.post(reverse("leontief_escenarios"), json.dumps(datos), content_type="application/json")
+
+    def test_factoriza_una_vez_y_usa_la_clave(self):
+        resp = self._post({"A": [["0.2", "0.1"], ["0.3", "0.2"]], "Y": [[10, 5], [20, 1]]})
+        datos = resp.json()
+        self.assertEqual(datos["X"], [["1000/61", "410/61"], ["1900/61", "230/61"]])
+        self.assertEqual(datos["escenarios"], 2)
+        self.assertEqual(datos["multiplicadores"], ["110/61", "90/61"])
+        self.assertFalse(datos["reutilizada"])
+        resp = self._post({"clave": datos["clave"], "Y": [[1], [0]]})
+        self.assertTrue(resp.json()["reutilizada"])
+        self.assertEqual(resp.json()["X"], [["80/61"], ["30/61"]])
+
+    def test_errores(self):
+        resp = self._post({"clave": "desconocida", "Y": [[1]]})
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("envía la matriz A", resp.json()["error"])
+        self.assertEqual(self.client.get(reverse("leontief_escenarios")).status_code, 405)
+
+
+class TestIterativo(unittest.TestCase):
+
+    def test_metodos_convergen(self):
+        exacto = leontief.resolver_leontief(A, Y)["X"]
+        for metodo in ("neumann", "gauss_seidel"):
+            info = leontief.resolver_iterativo(A, Y, metodo=metodo, tol=1e-12)
+            self.assertTrue(info["convergio"], metodo)
+            for fila_x, fila_e in zip(info["X"], exacto):
+                for x, e in zip(fila_x, fila_e):
+                    self.assertAlmostEqual(x, e[0] / e[1], places=8)
+
+    def test_cota_de_error(self):
+        exacto = leontief.resolver_leontief(A, Y)["X"]
+        for metodo in ("neumann", "gauss_seidel"):
+            for maxit in (3, 10000):
+                info = leontief.resolver_iterativo(A, Y, metodo=metodo, maxit=maxit)
+                error = max(
+                    sum(abs(info["X"][i][s] - exacto[i][s][0] / exacto[i][s][1]) for i in range(len(A)))
+                    for s in range(len(Y[0]))
+                )
+                self.assertLessEqual(error, info["cota_error"] * (1 + 1e-9) + 1e-12, (metodo, maxit))
+
+    def test_gauss_seidel_menos_iteraciones(self):
+        gs = leontief.resolver_iterativo(A, Y, metodo="gauss_seidel")
+        ne = leontief.resolver_iterativo(A, Y, metodo="neumann")
+        self.assertLess(gs["iteraciones"], ne["iteraciones"])
+
+    def test_rechaza_no_productiva(self):
+        with self.assertRaises(leontief.ErrorLeontief):
+            leontief.resolver_iterativo(_f([[1, 0], [0, 0]]), _f([[1], [1]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import random
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+from algebra.logic import modular
+from algebra.logic import operaciones as op
+from algebra.logic.utilidades import simplificar_fraccion
+
+
+def _entera(n, semilla, cota=50):
+    rnd = random.Random(semilla)
+    return [[rnd.randint(-cota, cota) for _ in range(n)] for _ in range(n)]
+
+
+class TestModular(unittest.TestCase):
+
+    def test_determinante_igual_a_bareiss(self):
+        for n in (1, 4, 9):
+            MI = _entera(n, n)
+            self.assertEqual(modular.determinante_modular(MI), op._determinante_bareiss(MI))
+
+    def test_inversa_igual_a_bareiss(self):
+        MI = _entera(7, 11)
+        d, R, _ = op._inversa_bareiss(MI)
+        X = modular.inversa_modular(MI)
+        self.assertEqual([[list(x) for x in fila] for fila in X], [[simplificar_fraccion(v, d) for v in fila] for fila in R])
+
+    def test_singular(self):
+        MI = _entera(5, 3)
+        MI[4] = [2 * x - y for x, y in zip(MI[0], MI[1])]
+        self.assertEqual(modular.determinante_modular(MI), 0)
+        self.assertIsNone(modular.inversa_modular(MI))
+
+    def test_reconstruccion_racional(self):
+        m = modular.primos(1)[0] * modular.primos(2)[1]
+        a = -7 * pow(12, -1, m) % m
+        self.assertEqual(modular.reconstruccion_racional(a, m), (-7, 12))
+
+    def test_seleccion_automatica(self):
+        rnd = random.Random(4)
+        n = modular.UMBRAL_MODULAR
+        A = [[simplificar_fraccion(rnd.randint(-9, 9), rnd.randint(1, 3)) for _ in range(n)] for _ in range(n)]
+        esperado_det = op.determinante_matriz(A)
+        esperado_inv = op.inversa_matriz(A)
+        # Con varios procesos configurados se elige el motor modular; el reparto
+        # entre procesos se sustituye aquí por el cálculo secuencial.
+        with mock.patch.object(modular, 'PROCESOS', 2), \
+                mock.patch.object(modular, '_calcular', lambda f, MI, primos, *_: f(MI, primos)):
+            self.assertEqual(op.determinante_matriz(A), esperado_det)
+            info = op.inversa_matriz(A)
+        self.assertEqual(info['metodo'], 'modular')
+        self.assertEqual(info['inversa'], esperado_inv['inversa'])
+
+    def test_varios_procesos(self):
+        # Coeficientes grandes: hacen falta varios lotes de primos
+        MI = _entera(6, 13, cota=10 ** 6)
+        d, R, _ = op._inversa_bareiss(MI)
+        esperada = [[simplificar_fraccion(v, d) for v in fila] for fila in R]
+        ejecutores = []
+
+        def contar(*args, **kwargs):
+            ex = ProcessPoolExecutor(*args, **kwargs)
+            ejecutores.append(ex)
+            return ex
+
+        with mock.patch.object(modular, 'ProcessPoolExecutor', side_effect=contar):
+            X = modular.inversa_modular(MI, procesos=2)
+        self.assertEqual([[list(x) for x in fila] for fila in X], esperada)
+        # Todos los lotes de primos comparten el mismo ejecutor
+        self.assertEqual(len(ejecutores), 1)
+        self.assertEqual(modular.determinante_modular(MI, procesos=2), op._determinante_bareiss(MI))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from algebra.logic import metodos
+
+
+class TestNewtonRaphson(unittest.TestCase):
+
+    def test_convergencia_normal(self):
+        res = metodos.newton_raphson('x**2 - 2', 1, tol=1e-10, maxit=50)
+        self.assertTrue(res['convergio'])
+        self.assertAlmostEqual(res['raiz'], 2 ** 0.5, places=9)
+        self.assertIsNone(res['detenido_por'])
+        self.assertEqual(res['evaluaciones_ahorradas'], 0)
+
+    def test_detecta_ciclo(self):
+        # Desde x0=0 Newton alterna 0 -> 1 -> 0 ... para x^3 - 2x + 2
+        res = metodos.newton_raphson('x^3 - 2*x + 2', 0, maxit=1000)
+        self.assertFalse(res['convergio'])
+        self.assertEqual(res['detenido_por'], 'ciclo')
+        self.assertLess(res['conteo_iter'], 10)
+        self.assertEqual(res['evaluaciones_ahorradas'], 2 * (1000 - res['conteo_iter']))
+        self.assertIn('ciclo', res['warnings'][0])
+
+    def test_detecta_estancamiento(self):
+        # x^2 + 1 no tiene raíces reales: los iterados vagan sin mejorar |f|
+        res = metodos.newton_raphson('x^2 + 1', 0.5, maxit=5000)
+        self.assertFalse(res['convergio'])
+        self.assertEqual(res['detenido_por'], 'estancamiento')
+        self.assertLess(res['conteo_iter'], 100)
+
+
+class TestSecanteDiagnostico(unittest.TestCase):
+
+    def test_detecta_divergencia(self):
+        res = metodos.secante('atan(x)', 2, 3, maxit=1000)
+        self.assertFalse(res['convergio'])
+        self.assertEqual(res['detenido_por'], 'divergencia')
+        self.assertEqual(res['evaluaciones_ahorradas'], 1000 - res['conteo_iter'])
+
+    def test_convergencia_sin_diagnostico(self):
+        res = metodos.secante('x^2 - 2', 1, 2, tol=1e-10)
+        self.assertTrue(res['convergio'])
+        self.assertIsNone(res['detenido_por'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import random
+import unittest
+from unittest import mock
+from fractions import Fraction
+
+from algebra.logic import operaciones as op
+from algebra.logic import utilidades as u
+from algebra.logic.utilidades import simplificar_fraccion
+
+
+def _matriz_aleatoria(m, n, semilla, max_den=6):
+    rnd = random.Random(semilla)
+    return [[simplificar_fraccion(rnd.randint(-9, 9), rnd.randint(1, max_den)) for _ in range(n)] for _ in range(m)]
+
+
+def _producto_referencia(A, B):
+    return [
+        [[v.numerator, v.denominator] for v in (
+            sum((Fraction(*A[i][k]) * Fraction(*B[k][j]) for k in range(len(B))), Fraction(0))
+            for j in range(len(B[0]))
+        )]
+        for i in range(len(A))
+    ]
+
+
+class TestMultiplicacion(unittest.TestCase):
+
+    def test_camino_rapido_igual_al_detallado(self):
+        A = _matriz_aleatoria(4, 6, 1)
+        B = _matriz_aleatoria(6, 3, 2)
+        C_pasos, pasos = op.multiplicar_matrices(A, B, registrar_pasos=True)
+        self.assertTrue(pasos)
+        self.assertEqual(op.multiplicar_matrices(A, B), C_pasos)
+        self.assertEqual(C_pasos, _producto_referencia(A, B))
+
+    def test_strassen_exacto(self):
+        n = op._UMBRAL_STRASSEN + 1  # tamaño impar: fuerza el relleno
+        A = _matriz_aleatoria(n, n, 3, max_den=3)
+        B = _matriz_aleatoria(n, n, 4, max_den=3)
+        C = op.multiplicar_matrices(A, B)
+        # comparar algunas filas contra la referencia con Fraction
+        for i in (0, n // 2, n - 1):
+            self.assertEqual(C[i], _producto_referencia([A[i]], B)[0])
+
+
+class TestAcumulacionDiferida(unittest.TestCase):
+
+    def test_identica_a_la_encadenada(self):
+        fila = _matriz_aleatoria(1, 15, 5)[0]
+        col = _matriz_aleatoria(1, 15, 6)[0]
+        encadenada = [0, 1]
+        for a, b in zip(fila, col):
+            encadenada = u.sumar_fracciones(encadenada, u.multiplicar_fracciones(a, b))
+        self.assertEqual(u.producto_punto(fila, col), encadenada)
+        a, c, b = fila[:3]
+        self.assertEqual(u.sumar_producto(a, c, b), u.sumar_fracciones(a, u.multiplicar_fracciones(c, b)))
+        self.assertEqual(u.restar_producto(a, c, b), u.restar_fracciones(a, u.multiplicar_fracciones(c, b)))
+
+    def test_una_simplificacion_por_producto_punto(self):
+        fila = _matriz_aleatoria(1, 10, 7)[0]
+        with mock.patch.object(u, 'mcd', wraps=u.mcd) as contado:
+            u.producto_punto(fila, fila)
+        self.assertEqual(contado.call_count, 1)
+
+
+class TestCaminoEntero(unittest.TestCase):
+
+    def test_determinante_e_inversa_igual_que_con_pasos(self):
+        for semilla, max_den in ((8, 1), (9, 4)):
+            A = _matriz_aleatoria(6, 6, semilla, max_den=max_den)
+            det_pasos, _ = op.determinante_matriz(A, registrar_pasos=True)
+            self.assertEqual(op.determinante_matriz(A), det_pasos)
+            inv_pasos, _ = op.inversa_matriz(A, registrar_pasos=True)
+            self.assertEqual(op.inversa_matriz(A), inv_pasos)
+
+    def test_inversa_singular(self):
+        A = [[[1, 1], [2, 1], [3, 1]], [[2, 1], [4, 1], [6, 1]], [[0, 1], [1, 1], [5, 1]]]
+        info = op.inversa_matriz(A)
+        self.assertFalse(info['invertible'])
+        self.assertEqual(info, op.inversa_matriz(A, registrar_pasos=True)[0])
+        self.assertEqual(op.determinante_matriz(A), [0, 1])
+
+    def test_suma_y_escalar_enteras(self):
+        A = [[[1, 1], [-2, 1]], [[3, 1], [4, 1]]]
+        self.assertEqual(op.sumar_matrices(A, A), [[[2, 1], [-4, 1]], [[6, 1], [8, 1]]])
+        self.assertEqual(op.multiplicar_escalar_matriz([-3, 1], A), [[[-3, 1], [6, 1]], [[-9, 1], [-12, 1]]])
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+class TestPotencia(unittest.TestCase):
+
+    def _ingenua(self, A, k):
+        R = op._identidad(len(A))
+        for _ in range(k):
+            R = op.multiplicar_matrices(R, A)
+        return R
+
+    def test_binaria_y_atajos_igual_a_productos_repetidos(self):
+        f = lambda filas: [[[x, 1] if isinstance(x, int) else x for x in fila] for fila in filas]
+        casos = [
+            _matriz_aleatoria(3, 3, 5),
+            f([[2, 0, 0], [0, [1, 3], 0], [0, 0, -1]]),          # diagonal
+            f([[0, 2, 0], [0, 0, [1, 2]], [-3, 0, 0]]),          # monomial
+            f([[2, 1, 5], [0, 2, 3], [0, 0, 2]]),                # λI + N
+            f([[1, 2, 0, 0], [3, 4, 0, 0], [0, 0, 2, 1], [0, 0, 0, 2]]),  # bloques
+        ]
+        for A in casos:
+            for k in (1, 2, 7, 50):
+                esperado = self._ingenua(A, k)
+                self.assertEqual(op.potencia_matriz(A, k), esperado)
+                self.assertEqual(op.potencia_matriz(A, k, registrar_pasos=True)[0], esperado)
+
+    def test_pasos_solo_de_cuadrados_y_acumulados(self):
+        A = _matriz_aleatoria(3, 3, 6)
+        with mock.patch.object(op, "multiplicar_matrices", wraps=op.multiplicar_matrices) as mul:
+            _, pasos = op.potencia_matriz(A, 50, registrar_pasos=True)
+        # 50 = 110010₂: 5 cuadrados y 2 productos del acumulado
+        self.assertEqual(mul.call_count, 7)
+        self.assertEqual(len(pasos), 7)
+
+    def test_exponentes_cero_y_negativo(self):
+        A = _matriz_aleatoria(3, 3, 7)
+        self.assertEqual(op.potencia_matriz(A, 0), op._identidad(3))
+        inv = op.inversa_matriz(A)["inversa"]
+        self.assertEqual(op.potencia_matriz(A, -3), self._ingenua(inv, 3))
+        with self.assertRaises(ValueError):
+            op.potencia_matriz([[[1, 1], [2, 1]], [[2, 1], [4, 1]]], -1)
+
+    def test_resultado_que_no_se_puede_mostrar(self):
+        # 3^10000 tiene 4772 dígitos: se rechaza antes de calcular
+        with mock.patch.object(op, "_potencia_entrada", wraps=op._potencia_entrada) as entrada:
+            with self.assertRaisesRegex(ValueError, "dígitos"):
+                op.potencia_matriz([[[3, 1]]], 10000)
+        entrada.assert_not_called()
+        with self.assertRaisesRegex(ValueError, "dígitos"):
+            op.potencia_matriz([[[1, 3]]], -10000)
+        # 2^10000 (3011 dígitos) y la matriz de Jordan 2×2 sí caben
+        self.assertEqual(op.potencia_matriz([[[2, 1]]], 10000), [[[2 ** 10000, 1]]])
+        J = [[[1, 1], [1, 1]], [[0, 1], [1, 1]]]
+        self.assertEqual(op.potencia_matriz(J, 10000)[0][1], [10000, 1])
+
+
+class TestDiagnostico(unittest.TestCase):
+
+    def test_sin_diagnostico_no_hay_clave(self):
+        self.assertNotIn("diagnostico", op.inversa_matriz(_matriz_aleatoria(4, 4, 8)))
+
+    def test_inversa_con_diagnostico(self):
+        A = _matriz_aleatoria(6, 6, 9)
+        info = op.inversa_matriz(A, diagnostico=True)
+        self.assertEqual(info["inversa"], op.inversa_matriz(A)["inversa"])
+        diag = info["diagnostico"]
+        self.assertEqual(diag["operacion"], "inversa_matriz")
+        self.assertGreater(diag["simplificar_fraccion"], 0)
+        self.assertGreaterEqual(diag["mcd"], diag["simplificar_fraccion"])
+        self.assertGreaterEqual(diag["asignaciones"], diag["simplificar_fraccion"])
+        self.assertGreaterEqual(diag["bits_max"], u.bits_matriz(info["inversa"]))
+        self.assertGreater(op.estadisticas_operaciones()["inversa_matriz"]["llamadas"], 0)
+
+    def test_con_pasos_diagnostico_en_info(self):
+        info, pasos = op.inversa_matriz(_matriz_aleatoria(3, 3, 10), registrar_pasos=True, diagnostico=True)
+        self.assertIn("diagnostico", info)
+        self.assertTrue(pasos)
+        self.assertIn("diagnostico", op.gauss_jordan_info(_matriz_aleatoria(3, 4, 10), diagnostico=True))
+
+    def test_conteo_se_restablece(self):
+        anterior = u.CONTAR
+        op.cramer_resolver(_matriz_aleatoria(3, 3, 11), [[[1, 1]], [[2, 1]], [[3, 1]]], diagnostico=True)
+        self.assertEqual(u.CONTAR, anterior)
@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from algebra import views
+
+
+@override_settings(ALGEBRA_CACHE_PAGINAS=60)
+class TestPaginasCacheadas(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_etag_y_304(self):
+        resp = self.client.get(reverse("index"))
+        self.assertEqual(resp.status_code, 200)
+        etag = resp["ETag"]
+        self.assertFalse(resp.has_header("Last-Modified"))
+        resp = self.client.get(reverse("index"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.content, b"")
+        resp = self.client.get(reverse("index"), HTTP_IF_NONE_MATCH='"otra-version"')
+        self.assertEqual(resp.status_code, 200)
+
+    def test_version_cambia_con_el_codigo(self):
+        from algebra import context_processors
+        self.client.get(reverse("index"))
+        anterior = context_processors.version_paginas()
+        # Un despliegue que sólo cambia código (mismas plantillas y fechas)
+        # no debe servir el HTML guardado con la versión anterior
+        with mock.patch.object(context_processors, "_version", anterior + "-nueva"), \
+                mock.patch.object(views, "render", wraps=views.render) as render:
+            self.client.get(reverse("index"))
+        render.assert_called()
+        ruta = views.__file__
+        with mock.patch.object(context_processors, "_version", None), \
+                mock.patch.object(context_processors, "_archivos_version", return_value=[ruta]):
+            solo_views = context_processors.version_paginas()
+        self.assertNotEqual(solo_views, anterior)
+
+    def test_repetidas_no_renderizan(self):
+        primera = self.client.get(reverse("metodos_cerrados"))
+        with mock.patch.object(views, "_render", wraps=views._render) as render:
+            segunda = self.client.get(reverse("metodos_cerrados"))
+        render.assert_not_called()
+        self.assertEqual(primera.content, segunda.content)
+        self.assertContains(segunda, "Regla Falsa")
+
+    def test_cabecera_marca_la_pagina_actual(self):
+        self.client.get(reverse("metodos_abiertos"))
+        resp = self.client.get(reverse("index"))
+        self.assertContains(resp, 'menu-item active')
+        self.assertNotContains(resp, 'submenu-link current')
+
+    @override_settings(ALGEBRA_CACHE_PAGINAS=0)
+    def test_desactivada(self):
+        resp = self.client.get(reverse("index"))
+        self.assertFalse(resp.has_header("ETag"))
@@ -0,0 +1,42 @@
+import unittest
+
+from algebra.logic import operaciones as op
+from algebra.logic import paralelo
+from algebra.tests_operaciones import _matriz_aleatoria
+
+
+class TestGaussJordanParalelo(unittest.TestCase):
+
+    def test_igual_que_secuencial(self):
+        A = _matriz_aleatoria(9, 7, 21, max_den=4)
+        # fila dependiente y columna nula para forzar intercambios y saltos
+        A[3] = [op.sumar_fracciones(x, y) for x, y in zip(A[0], A[1])]
+        for fila in A:
+            fila[2] = [0, 1]
+        R_sec, piv_sec, _ = op._gauss_jordan_detallado(A)
+        R_par, piv_par, pasos = op._gauss_jordan_detallado(A, registrar_pasos=False, procesos=3)
+        self.assertEqual(R_par, R_sec)
+        self.assertEqual(piv_par, piv_sec)
+        self.assertEqual(pasos, [])
+
+    def test_info_con_procesos(self):
+        A = _matriz_aleatoria(5, 6, 22)
+        self.assertEqual(op.gauss_jordan_info(A, procesos=2), op.gauss_jordan_info(A))
+
+    def test_seleccion(self):
+        self.assertFalse(paralelo.usar_paralelo(200))
+        self.assertTrue(paralelo.usar_paralelo(5, procesos=2))
+        paralelo.PROCESOS = 4
+        try:
+            self.assertFalse(paralelo.usar_paralelo(paralelo.UMBRAL_PARALELO - 1))
+            self.assertTrue(paralelo.usar_paralelo(paralelo.UMBRAL_PARALELO))
+        finally:
+            paralelo.PROCESOS = None
+
+    def test_sin_fork(self):
+        # fork copiaría los cerrojos de los otros hilos del servidor
+        self.assertIn(paralelo.contexto_procesos().get_start_method(), ("forkserver", "spawn"))
+
+
+if __name__ == '__main__':
+    unittest.main()
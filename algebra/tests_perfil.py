@@ -0,0 +1,85 @@
+import unittest
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from algebra.logic import perfil
+from algebra.logic import utilidades as u
+from algebra.logic import operaciones as op
+
+
+class TestPerfil(unittest.TestCase):
+
+    def test_sin_perfil_no_mide(self):
+        self.assertIsNone(perfil.actual())
+        self.assertEqual(op.transponer_matriz([[[1, 1], [2, 1]]]), [[[1, 1]], [[2, 1]]])
+
+    def test_fases_anidadas_no_se_duplican(self):
+        p, fichas = perfil.iniciar()
+        try:
+            op.inversa_matriz([[[2, 1], [1, 1]], [[1, 1], [1, 1]]])
+        finally:
+            perfil.terminar(fichas)
+        self.assertEqual(p.fases["calculo"][1], 1)
+        self.assertEqual(p.tamanos, [("inversa_matriz", "2×2")])
+
+    def test_contadores_del_nucleo(self):
+        anterior = u.CONTAR
+        u.configurar_conteo(True)
+        p, fichas = perfil.iniciar()
+        try:
+            u.sumar_fracciones([1, 2], [1, 3])
+        finally:
+            perfil.terminar(fichas)
+            u.configurar_conteo(anterior)
+        self.assertEqual(p.contadores["simplificar_fraccion"], 1)
+        self.assertEqual(p.contadores["mcd"], 1)
+
+    def test_texto_prometheus(self):
+        perfil.reiniciar_metricas()
+        p = perfil.Perfil()
+        p.agregar_fase("calculo", 0.5)
+        p.contadores["mcd"] = 7
+        perfil.acumular("inversa", p, 1.0)
+        texto = perfil.texto_prometheus()
+        self.assertIn('algebra_peticiones_total{vista="inversa"} 1', texto)
+        self.assertIn('algebra_fase_segundos_total{vista="inversa",fase="calculo"} 0.500000', texto)
+        self.assertIn('algebra_operaciones_total{vista="inversa",operacion="mcd"} 7', texto)
+
+
+class TestPerfilMiddleware(SimpleTestCase):
+
+    @override_settings(ALGEBRA_PERFIL_CABECERA=True)
+    def test_server_timing(self):
+        resp = self.client.post(reverse("determinante"), {"matrizA": "1 2\n3 4"})
+        self.assertEqual(resp.status_code, 200)
+        cabecera = resp["Server-Timing"]
+        for fase in ("parseo", "calculo", "plantilla", "total"):
+            self.assertIn(fase + ";dur=", cabecera)
+
+    @override_settings(ALGEBRA_PERFIL_CABECERA=False)
+    def test_sin_server_timing_por_defecto(self):
+        resp = self.client.post(reverse("determinante"), {"matrizA": "1 2\n3 4"})
+        self.assertFalse(resp.has_header("Server-Timing"))
+
+    @override_settings(DEBUG=True)
+    def test_panel_en_debug(self):
+        resp = self.client.get(reverse("index"))
+        self.assertContains(resp, "perfil-panel")
+
+    def test_sin_panel_en_produccion(self):
+        resp = self.client.get(reverse("index"))
+        self.assertNotContains(resp, "perfil-panel")
+
+    def test_endpoint_metricas(self):
+        self.client.get(reverse("index"))
+        resp = self.client.get(reverse("metricas"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp["Content-Type"].startswith("text/plain"))
+        self.assertIn('algebra_peticiones_total{vista="index"}', resp.content.decode())
+
+    def test_metricas_restringidas(self):
+        resp = self.client.get(reverse("metricas"), REMOTE_ADDR="203.0.113.5")
+        self.assertEqual(resp.status_code, 404)
+        with override_settings(ALGEBRA_METRICAS_IPS=[]):
+            self.assertEqual(self.client.get(reverse("metricas")).status_code, 404)
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from django.conf import settings
+
+from algebra.logic import simbolico
+
+
+class TestSimbolico(unittest.TestCase):
+
+    def test_vistas_no_importan_sympy(self):
+        # Importar las vistas (y por tanto cada comando de manage.py) no debe cargar SymPy
+        codigo = (
+            "import sys, django; django.setup(); import algebra.views, algebra.urls; "
+            "print('sympy' in sys.modules)"
+        )
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='config.settings')
+        salida = subprocess.run(
+            [sys.executable, '-c', codigo], cwd=str(settings.BASE_DIR), env=env,
+            capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(salida.stdout.strip(), 'False')
+
+    def test_fachada_resuelve_atributos(self):
+        x = simbolico.symbols('x')
+        self.assertEqual(simbolico.limit(simbolico.sin(x) / x, x, 0), 1)
+        self.assertTrue(simbolico.cargado())
+
+    def test_precalentar(self):
+        simbolico.precalentar(('x**2 - 2',))
+        self.assertTrue(simbolico.cargado())
+
+
+if __name__ == '__main__':
+    unittest.main()
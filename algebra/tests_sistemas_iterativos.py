@@ -0,0 +1,100 @@
+import io
+import unittest
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from algebra import views
+from algebra.logic import admision, metodos
+
+
+# Sistema simétrico, diagonal dominante, con solución x = (1, 2, -1)
+A = [[4, -1, 0], [-1, 4, -1], [0, -1, 3]]
+X = [1.0, 2.0, -1.0]
+B = [sum(a * x for a, x in zip(fila, X)) for fila in A]
+
+
+class TestMetodosIterativos(unittest.TestCase):
+
+    def test_todos_los_metodos_convergen(self):
+        for metodo in metodos.METODOS_SISTEMA:
+            for pre in metodos.PRECONDICIONADORES:
+                res = metodos.resolver_iterativo(A, B, metodo=metodo, tol=1e-12, omega=1.1, precondicionador=pre)
+                self.assertTrue(res['convergio'], (metodo, pre))
+                self.assertLess(res['residuo'], 1e-11)
+                for xi, esperado in zip(res['x'], X):
+                    self.assertAlmostEqual(xi, esperado, places=9)
+                self.assertEqual(res['conteo_iter'], len(res['iteraciones']))
+
+    def test_gauss_seidel_y_cg_usan_menos_iteraciones(self):
+        it = {m: metodos.resolver_iterativo(A, B, metodo=m, tol=1e-10)['conteo_iter']
+              for m in ('jacobi', 'gauss_seidel', 'gradiente_conjugado')}
+        self.assertLess(it['gauss_seidel'], it['jacobi'])
+        self.assertLessEqual(it['gradiente_conjugado'], 3)  # n pasos en aritmética exacta
+
+    def test_fracciones_y_advertencias(self):
+        D = [[[1, 1], [2, 1]], [[3, 1], [1, 1]]]
+        res = metodos.resolver_iterativo(D, [[1, 1], [1, 1]], metodo='jacobi', maxit=50)
+        self.assertFalse(res['convergio'])
+        self.assertTrue(res['warnings'])
+        with self.assertRaises(metodos.ErrorSistemaIterativo):
+            metodos.resolver_iterativo([[0, 1], [1, 0]], [1, 1], metodo='gauss_seidel')
+        with self.assertRaises(metodos.ErrorSistemaIterativo):
+            metodos.resolver_iterativo(A, B, metodo='sor', omega=2.5)
+
+    def test_matrix_market_disperso(self):
+        texto = (
+            "%%MatrixMarket matrix coordinate real symmetric\n"
+            "3 4 6\n"
+            "1 1 4\n2 1 -1\n2 2 4\n3 2 -1\n3 3 3\n"
+        )
+        # b va en la columna 4; en un archivo simétrico sólo se refleja A
+        texto = texto.replace("3 4 6", "3 4 9") + "1 4 2\n2 4 8\n3 4 -5\n"
+        Ad, b = metodos.sistema_desde_matrix_market(io.StringIO(texto))
+        self.assertEqual(Ad['diagonal'], [4.0, 4.0, 3.0])
+        self.assertEqual(b, B)
+        res = metodos.resolver_iterativo(Ad, b, metodo='gradiente_conjugado', tol=1e-12)
+        self.assertAlmostEqual(res['x'][1], 2.0, places=9)
+
+
+class TestVistaSistemasIterativos(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    @mock.patch.object(views, '_FILAS_PAGINA', 5)
+    def test_tabla_paginada(self):
+        url = reverse('sistemas_iterativos')
+        resp = self.client.post(url, {'matrizAug': '4 -1 0 | 2\n-1 4 -1 | 8\n0 -1 3 | -5', 'metodo': 'jacobi', 'tol': '1e-14'})
+        self.assertIsNone(resp.context.get('error'))
+        self.assertTrue(resp.context['convergio'])
+        pagina = resp.context['pagina']
+        self.assertGreater(pagina.paginator.num_pages, 1)
+        resp = self.client.get(url, {'registro': resp.context['registro'], 'pagina': 2})
+        self.assertEqual(resp.context['iteraciones'][0]['i'], 6)
+        self.assertEqual(resp.context['solucion'][0]['valor'], '1')
+
+    def test_campos_numericos_sin_eval(self):
+        url = reverse('sistemas_iterativos')
+        datos = {'matrizAug': '4 -1 | 2\n-1 4 | 8', 'metodo': 'jacobi'}
+        resp = self.client.post(url, dict(datos, tol='2^-20'))
+        self.assertIsNone(resp.context.get('error'))
+        # Una torre de potencias falla al instante en lugar de colgar el proceso
+        resp = self.client.post(url, dict(datos, tol='9**9**9'))
+        self.assertIn('demasiado grande', resp.context['error'])
+        resp = self.client.post(url, dict(datos, tol='__import__("os")'))
+        self.assertTrue(resp.context['error'])
+
+    def test_admision(self):
+        url = reverse('sistemas_iterativos')
+        with mock.patch.dict(admision.LIMITES, costo_maximo=0):
+            resp = self.client.post(url, {'matrizAug': '4 -1 | 2\n-1 4 | 8', 'metodo': 'jacobi'})
+        self.assertIn('demasiado costosa', resp.context['error'])
+        A = metodos.matriz_dispersa([[4, -1], [-1, 4]])
+        self.assertEqual(metodos.costo_iterativo(A, 10**9), metodos.MAXIT_MAXIMO * (4 + 8))
+        with mock.patch.object(metodos, 'INCOGNITAS_MAXIMAS', 2):
+            with self.assertRaisesRegex(metodos.ErrorSistemaIterativo, 'el máximo es 2'):
+                metodos.sistema_desde_matrix_market(io.StringIO(
+                    "%%MatrixMarket matrix coordinate real general\n3 4 1\n1 1 1\n"))
@@ -0,0 +1,32 @@
+import unittest
+from unittest import mock
+
+from algebra.logic import utilidades as u
+
+
+class TestNumerosSimples(unittest.TestCase):
+
+    def test_camino_rapido(self):
+        casos = {
+            "-3": [-3, 1], "+7": [7, 1], "-2.50": [-5, 2], ".5": [1, 2], "5.": [5, 1],
+            "1e-3": [1, 1000], "2.5E2": [250, 1], "-3/4": [-3, 4], "3/-6": [-1, 2],
+        }
+        with mock.patch.object(u, "_evaluar_expresion_a_fraccion") as evaluador:
+            for texto, esperado in casos.items():
+                self.assertEqual(u.crear_fraccion_desde_cadena(texto), esperado, texto)
+        evaluador.assert_not_called()
+
+    def test_expresiones_usan_el_evaluador(self):
+        self.assertIsNone(u.fraccion_desde_numero_simple("2*3"))
+        self.assertEqual(u.crear_fraccion_desde_cadena("-3/4 + 2^3"), [29, 4])
+
+    def test_exponente_acotado(self):
+        with self.assertRaisesRegex(ValueError, "Exponente demasiado grande"):
+            u.crear_fraccion_desde_cadena("1e999999999")
+
+    def test_decimal(self):
+        self.assertEqual(u.crear_fraccion_desde_decimal("-0.125"), [-1, 8])
+
+
+if __name__ == "__main__":
+    unittest.main()
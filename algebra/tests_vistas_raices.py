@@ -0,0 +1,38 @@
+import json
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from algebra import views
+
+
+class TestVistasRaices(SimpleTestCase):
+
+    def test_biseccion_compila_una_vez(self):
+        with mock.patch.object(views, '_crear_evaluador', wraps=views._crear_evaluador) as crear:
+            resp = self.client.post(reverse('biseccion'), {'function': 'x^2 - 2', 'a': '0', 'b': '2', 'tol': '1e-6', 'maxit': '50'})
+        # el evaluador se comparte entre algoritmo, tabla y gráfica
+        self.assertEqual(crear.call_count, 1)
+        self.assertTrue(resp.context['convergio'])
+        self.assertEqual(resp.context['iteraciones'][0]['c'], '1.000000')
+        plot = json.loads(resp.context['plot'])
+        self.assertEqual((plot['a'], plot['fb']), (0.0, 2.0))
+
+    def test_entradas_invalidas(self):
+        resp = self.client.post(reverse('biseccion'), {'function': 'x', 'a': '−½', 'b': 'abc'})
+        self.assertIn('a y b deben ser números', resp.context['error'])
+        self.assertEqual(resp.context['a_input'], '−½')
+
+    def test_regula_falsi_fila_directa(self):
+        resp = self.client.post(reverse('regula_falsi'), {'function': 'x - 1', 'a': '1', 'b': '3'})
+        fila = resp.context['iteraciones'][0]
+        self.assertEqual((fila['i'], fila['c'], fila['actualizacion']), (0, '1.000000', 'resultado directo'))
+
+    def test_secante_formatea_y_conserva_entradas(self):
+        resp = self.client.post(reverse('secante'), {'function': 'x^2 - 2', 'x0': '1', 'x1': '2', 'tol': 'abc'})
+        self.assertEqual(resp.context['error'], 'Tolerancia inválida; debe ser un número positivo.')
+        self.assertEqual(resp.context['x1_input'], '2')
+        resp = self.client.post(reverse('secante'), {'function': 'x^2 - 2', 'x0': '1', 'x1': '2'})
+        self.assertEqual(resp.context['raiz'], format(2 ** 0.5, '.8f'))
+        self.assertEqual(resp.context['iteraciones'][0]['x_prev'], '1.00000000')
@@ -9,12 +9,15 @@ urlpatterns = [
     path("transposicion/", views.transposicion, name="transposicion"),
     path("compuestas/", views.compuestas, name="compuestas"),
     path("inversa/", views.inversa, name="inversa"),
+    path("potencia/", views.potencia, name="potencia"),
     path("determinante/", views.determinante, name="determinante"),
     path("cramer/", views.cramer, name="cramer"),
     path("leontief/", views.leontief, name="leontief"),
+    path("leontief/escenarios/", views.leontief_escenarios, name="leontief_escenarios"),
     path("gauss/", views.gauss, name="gauss"),
     path("gauss-jordan/", views.gauss_jordan, name="gauss_jordan"),
     path("homogeneo/", views.homogeneo, name="homogeneo"),
+    path("archivo/", views.matriz_archivo, name="matriz_archivo"),
     # Métodos numéricos (incorporación inicial)
     path("metodos/", views.metodos_index, name="metodos_index"),
     path("metodos/cerrados/", views.metodos_cerrados, name="metodos_cerrados"),
@@ -23,7 +26,10 @@ urlpatterns = [
     path("metodos/abiertos/", views.metodos_abiertos, name="metodos_abiertos"),
     path("metodos/abiertos/newton-raphson/", views.newton_raphson, name="newton_raphson"),
     path("metodos/abiertos/secante/", views.secante, name="secante"),
+    path("metodos/sistemas/", views.sistemas_iterativos, name="sistemas_iterativos"),
     # Cálculo: límites
     path("calculo/limite/", views.limite, name="limite"),
     path("calculo/derivadas/", views.derivadas, name="derivadas"),
+    # Perfilado (Prometheus)
+    path("metricas/", views.metricas, name="metricas"),
 ]
\ No newline at end of file
@@ -1,14 +1,39 @@
-from django.shortcuts import render
-from django.http import HttpRequest
+from django.shortcuts import render as _render
+from django.http import Http404, HttpRequest, HttpResponse, StreamingHttpResponse, FileResponse, JsonResponse
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from .context_processors import version_paginas
 from .logic import utilidades as u
 from .logic import operaciones as op
 from .logic.metodos import biseccion as biseccion_algo, regula_falsi as regula_falsi_algo, newton_raphson as newton_raphson_algo, secante as secante_algo, ErrorBiseccion, _crear_evaluador
-from sympy import sympify, symbols, limit as sympy_limit, oo, sin, cos, tan, asin, acos, atan, exp, log, sqrt, Abs
+from .logic import metodos
+from .logic import simbolico
+from .logic import disco
+from .logic import archivos
+from .logic import leontief as leontief_logic
+from .logic import compuestas as compuestas_logic
+from .logic import perfil
+from .logic import admision
+from .logic import compilador
+from .logic.graficas import muestrear_funcion
 import json
+from fractions import Fraction
+from functools import wraps
+import hashlib
 import logging
+import tempfile
+import uuid
 
 logger = logging.getLogger(__name__)
 
+# Las plantillas se renderizan dentro de la fase "plantilla" del perfil
+render = perfil.medir("plantilla")(_render)
+
 def friendly_error(exc: Exception) -> str:
     """Devuelve un mensaje comprensible para el usuario final sin detalles internos.
 
@@ -39,6 +64,38 @@ def friendly_error(exc: Exception) -> str:
     # Fallback genérico
     return 'No fue posible completar el cálculo. Verifica los valores ingresados o ajusta la función.'
 
+def _pagina_cacheada(vista):
+    """GET de páginas sin formulario ni datos por usuario: el HTML se guarda en
+    la caché (settings.ALGEBRA_CACHE_PAGINAS segundos, clave con la versión de
+    plantillas y código) y se sirve con el ETag de su contenido, así las
+    peticiones condicionales reciben 304 y las repetidas no pasan por el motor
+    de plantillas. No se envía Last-Modified: ninguna fecha de archivo refleja
+    todo lo que cambia el HTML."""
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        segundos = getattr(settings, "ALGEBRA_CACHE_PAGINAS", 0)
+        if request.method not in ("GET", "HEAD") or not segundos:
+            return vista(request, *args, **kwargs)
+        version = version_paginas()
+        clave = f"algebra:pagina:{vista.__name__}:{version}"
+        pagina = cache.get(clave)
+        if pagina is None:
+            resp = vista(request, *args, **kwargs)
+            if resp.status_code != 200 or resp.streaming:
+                return resp
+            pagina = {
+                "contenido": resp.content,
+                "tipo": resp["Content-Type"],
+                "etag": quote_etag(hashlib.sha1(resp.content).hexdigest()),
+            }
+            cache.set(clave, pagina, segundos)
+        resp = HttpResponse(pagina["contenido"], content_type=pagina["tipo"])
+        resp["ETag"] = pagina["etag"]
+        patch_cache_control(resp, no_cache=True)
+        return get_conditional_response(request, etag=pagina["etag"], response=resp)
+    return envoltura
+
+@_pagina_cacheada
 def index(request: HttpRequest):
     # Definición estructurada de operaciones con matrices para la cuadrícula
     operations_matrices = [
@@ -84,6 +141,13 @@ def index(request: HttpRequest):
             "icon": "inv",
             "style": "mul",
         },
+        {
+            "name": "potencia",
+            "title": "Potencia",
+            "desc": "Calcula A^k con pocos productos elevando al cuadrado (cadenas de Markov, recurrencias).",
+            "icon": "times",
+            "style": "mul",
+        },
         {
             "name": "leontief",
             "title": "Modelo de Leontief",
@@ -91,20 +155,31 @@ def index(request: HttpRequest):
             "icon": "inv",
             "style": "mul",
         },
+        {
+            "name": "matriz_archivo",
+            "title": "Matrices desde archivo",
+            "desc": "Sube matrices grandes (CSV, .npy, MatrixMarket) y calcula en coma flotante sobre disco.",
+            "icon": "det",
+            "style": "mul",
+        },
     ]
     # Se usan directamente en una sola cuadrícula 3×2 (orden preservado)
     ctx = {"operations_matrices": operations_matrices}
     return render(request, "algebra/index.html", ctx)
 
+@perfil.medir("parseo")
 def _parse_matriz_simple(texto: str):
-    matriz = []
+    filas = []
+    celdas = 0
     for linea in (texto or "").strip().splitlines():
         if not linea.strip():
             continue
-        fila = []
-        for token in linea.strip().split():
-            fila.append(u.crear_fraccion_desde_cadena(token))
-        matriz.append(fila)
+        filas.append(linea.strip().split())
+        celdas += len(filas[-1])
+        admision.validar_leidas(celdas)
+    # Cada texto distinto se convierte una sola vez (en paralelo si hay muchas expresiones)
+    valores = archivos.convertir_celdas(t for fila in filas for t in fila)
+    matriz = [[archivos.valor_celda(valores, t) for t in fila] for fila in filas]
     # Validación rectangular
     if matriz:
         ancho = len(matriz[0])
@@ -112,25 +187,76 @@ def _parse_matriz_simple(texto: str):
             raise ValueError("Todas las filas deben tener la misma cantidad de columnas.")
     return matriz
 
+@perfil.medir("parseo")
 def _parse_matriz_aumentada(texto: str):
-    M = []
+    filas = []
+    celdas = 0
+    error = None
     for linea in (texto or "").strip().splitlines():
         if not linea.strip():
             continue
         if "|" not in linea:
-            raise ValueError("Cada fila debe contener '|' para separar A y b, ej: 1 2 | 5")
+            error = ValueError("Cada fila debe contener '|' para separar A y b, ej: 1 2 | 5")
+            break
         izq, der = linea.split("|", 1)
-        A_vals = [u.crear_fraccion_desde_cadena(t) for t in izq.strip().split()]
-        b_vals = [u.crear_fraccion_desde_cadena(t) for t in der.strip().split()]
-        if len(b_vals) != 1:
-            raise ValueError("El término independiente b debe ser una sola columna.")
+        filas.append((izq.strip().split(), der.strip().split()))
+        celdas += len(filas[-1][0]) + len(filas[-1][1])
+        admision.validar_leidas(celdas)
+        if len(filas[-1][1]) != 1:
+            error = ValueError("El término independiente b debe ser una sola columna.")
+            break
+    # Los errores de celdas de filas anteriores se informan antes que el de estructura
+    valores = archivos.convertir_celdas(t for izq, der in filas for t in izq + der)
+    M = []
+    for izq, der in filas:
+        A_vals = [archivos.valor_celda(valores, t) for t in izq]
+        b_vals = [archivos.valor_celda(valores, t) for t in der]
         M.append(A_vals + b_vals)
+    if error:
+        raise error
     # Validación rectangular
     ancho = len(M[0])
     if any(len(f) != ancho for f in M):
         raise ValueError("Todas las filas deben tener la misma cantidad de columnas.")
     return M
 
+@perfil.medir("parseo")
+def _leer_matriz(request: HttpRequest, campo: str, aumentada: bool = False):
+    """Matriz del campo `campo`: desde el archivo subido en `<campo>_archivo`
+    (CSV, XLSX o MatrixMarket) o, si no hay, desde el texto del formulario.
+    En archivos de sistemas la última columna es el término independiente b."""
+    archivo = request.FILES.get(campo + "_archivo")
+    if archivo is not None:
+        M = archivos.leer_archivo(archivo.name, archivo)
+        if aumentada and len(M[0]) < 2:
+            raise ValueError("La matriz aumentada necesita al menos una columna para A y otra para b.")
+        return M
+    if aumentada:
+        return _parse_matriz_aumentada(request.POST.get(campo))
+    return _parse_matriz_simple(request.POST.get(campo))
+
+def _exportar(request: HttpRequest, nombre: str, M, pasos=None, text_fn=None):
+    """Si el formulario pidió exportar, devuelve la descarga del resultado (y de
+    los pasos en CSV/XLSX); en caso contrario None."""
+    formato = (request.POST.get("exportar") or "").lower()
+    if not formato:
+        return None
+    tf = text_fn or u.texto_fraccion
+    if formato == "csv":
+        resp = StreamingHttpResponse(archivos.lineas_csv(M, pasos, tf), content_type="text/csv; charset=utf-8")
+    elif formato == "mtx":
+        resp = StreamingHttpResponse(archivos.lineas_matrix_market(M), content_type="text/plain; charset=utf-8")
+    elif formato == "xlsx":
+        destino = tempfile.TemporaryFile()
+        archivos.escribir_xlsx(destino, M, pasos, tf)
+        destino.seek(0)
+        return FileResponse(destino, as_attachment=True, filename=f"{nombre}.xlsx",
+                            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+    else:
+        raise ValueError("Formato de exportación no soportado.")
+    resp["Content-Disposition"] = f'attachment; filename="{nombre}.{formato}"'
+    return resp
+
 def _make_text_fn(fmt: str, prec: int):
     fmt = (fmt or 'frac').lower()
     if fmt not in ("frac", "dec", "auto"):
@@ -143,6 +269,7 @@ def _make_text_fn(fmt: str, prec: int):
     p = max(0, min(p, 12))
     return (lambda a: u.texto_numero(a, modo=fmt, decimales=p))
 
+@perfil.medir("formato")
 def _render_matriz(M, text_fn=None):
     tf = text_fn or u.texto_fraccion
     out = []
@@ -156,6 +283,20 @@ def _render_matriz(M, text_fn=None):
         out.append(row)
     return out
 
+def _admitir(ctx, operacion, M, pasos=False, m=None, k=None):
+    """Control de admisión (ver logic/admision.py) antes de calcular sobre M.
+
+    Devuelve la decisión {'pasos', 'flotante', ...}; si la petición se degradó
+    deja el aviso en ctx['message']. Lanza ErrorAdmision si se rechaza.
+    """
+    if not M or not M[0]:
+        return {"pasos": pasos, "flotante": False, "aviso": None, "costo": 0}
+    admision.validar_celdas(M)
+    decision = admision.admitir(operacion, len(M), len(M[0]) if m is None else m, k, pasos, bits=u.bits_matriz(M))
+    if decision["aviso"]:
+        ctx["message"] = decision["aviso"]
+    return decision
+
 def _is_symbol_token(tok: str) -> bool:
     t = (tok or "").strip()
     if not t:
@@ -185,9 +326,14 @@ def suma(request: HttpRequest):
             fmt = request.POST.get("result_format")
             prec = request.POST.get("precision") or 6
             text_fn = _make_text_fn(fmt, prec)
-            A = _parse_matriz_simple(request.POST.get("matrizA"))
-            B = _parse_matriz_simple(request.POST.get("matrizB"))
+            A = _leer_matriz(request, "matrizA")
+            B = _leer_matriz(request, "matrizB")
+            _admitir(ctx, "suma", A)
+            admision.validar_celdas(B)
             C = op.sumar_matrices(A, B)
+            descarga = _exportar(request, "suma", C, text_fn=text_fn)
+            if descarga:
+                return descarga
             ctx["resultado"] = _render_matriz(C, text_fn)
             if A:
                 ctx["dims"] = {"A": f"{len(A)}×{len(A[0])}", "B": f"{len(B)}×{len(B[0])}", "C": f"{len(C)}×{len(C[0])}"}
@@ -206,8 +352,8 @@ def multiplicacion(request: HttpRequest):
             prec = request.POST.get("precision") or 6
             text_fn = _make_text_fn(fmt, prec)
             rawA = request.POST.get("matrizA")
-            rawB = request.POST.get("matrizB")
-            A = _parse_matriz_simple(rawA)
+            rawB = "" if request.FILES.get("matrizB_archivo") else request.POST.get("matrizB")
+            A = _leer_matriz(request, "matrizA")
             # Detectar si B es vector simbólico (todas las filas no vacías con un símbolo)
             alpha_count = 0
             non_empty = 0
@@ -226,6 +372,7 @@ def multiplicacion(request: HttpRequest):
             want_steps = bool(request.POST.get("show_steps"))
             if es_vector_simbolico:
                 v = _parse_vector_simbolico(rawB)
+                want_steps = _admitir(ctx, "multiplicacion", A, want_steps, k=1)["pasos"]
                 # Validaciones
                 if len(A) == 0:
                     raise ValueError("La matriz A no puede ser vacía.")
@@ -247,9 +394,14 @@ def multiplicacion(request: HttpRequest):
                         "C": f"{len(A)}×1"
                     }
             else:
-                B = _parse_matriz_simple(rawB)
+                B = _leer_matriz(request, "matrizB")
+                admision.validar_celdas(B)
+                want_steps = _admitir(ctx, "multiplicacion", A, want_steps, k=len(B[0]) if B else None)["pasos"]
                 if want_steps:
                     C, pasos = op.multiplicar_matrices(A, B, registrar_pasos=True, text_fn=text_fn)
+                    descarga = _exportar(request, "multiplicacion", C, pasos, text_fn)
+                    if descarga:
+                        return descarga
                     ctx["resultado"] = _render_matriz(C, text_fn)
                     ctx["pasos"] = [
                         {"operacion": p.get("operacion"), "matriz": _render_matriz(p.get("matriz"), text_fn)}
@@ -257,6 +409,9 @@ def multiplicacion(request: HttpRequest):
                     ]
                 else:
                     C = op.multiplicar_matrices(A, B)
+                    descarga = _exportar(request, "multiplicacion", C, text_fn=text_fn)
+                    if descarga:
+                        return descarga
                     ctx["resultado"] = _render_matriz(C, text_fn)
                 if A and B:
                     ctx["dims"] = {
@@ -279,11 +434,14 @@ def escalar(request: HttpRequest):
             fmt = request.POST.get("result_format")
             prec = request.POST.get("precision") or 6
             text_fn = _make_text_fn(fmt, prec)
-            A = _parse_matriz_simple(request.POST.get("matrizA"))
+            A = _leer_matriz(request, "matrizA")
             c_txt = (request.POST.get("escalar") or "0").strip()
             c = u.crear_fraccion_desde_cadena(c_txt)
-            want_steps = bool(request.POST.get("show_steps"))
+            want_steps = _admitir(ctx, "escalar", A, bool(request.POST.get("show_steps")))["pasos"]
             C, pasos = op.multiplicar_escalar_matriz(c, A, registrar_pasos=want_steps, text_fn=text_fn)
+            descarga = _exportar(request, "escalar", C, pasos if want_steps else None, text_fn)
+            if descarga:
+                return descarga
             ctx["resultado"] = _render_matriz(C, text_fn)
             if want_steps and pasos:
                 ctx["pasos"] = [
@@ -300,6 +458,46 @@ def escalar(request: HttpRequest):
             ctx["error"] = friendly_error(e)
     return render(request, "algebra/escalar.html", ctx)
 
+def potencia(request: HttpRequest):
+    """Potencia de una matriz cuadrada: A^k por exponenciación binaria."""
+    ctx = {}
+    if request.method == "POST":
+        try:
+            fmt = request.POST.get("result_format")
+            prec = request.POST.get("precision") or 6
+            text_fn = _make_text_fn(fmt, prec)
+            A = _leer_matriz(request, "matrizA")
+            k_txt = (request.POST.get("exponente") or "").strip()
+            ctx["k"] = k_txt
+            try:
+                k = int(k_txt)
+            except ValueError:
+                raise ValueError("El exponente k debe ser un entero.")
+            if k > 0:
+                # Antes de admitir: un resultado que no se puede mostrar no se calcula
+                op.validar_tamano_potencia(A, k)
+            want_steps = _admitir(ctx, "potencia", A, bool(request.POST.get("show_steps")), k=k)["pasos"]
+            R = op.potencia_matriz(A, k, registrar_pasos=want_steps, text_fn=text_fn)
+            pasos = None
+            if want_steps:
+                R, pasos = R
+            descarga = _exportar(request, "potencia", R, pasos, text_fn)
+            if descarga:
+                return descarga
+            ctx["resultado"] = _render_matriz(R, text_fn)
+            if pasos:
+                ctx["pasos"] = [
+                    {"operacion": p.get("operacion"), "matriz": _render_matriz(p.get("matriz"), text_fn)}
+                    for p in pasos
+                ]
+            ctx["dims"] = {"A": f"{len(A)}×{len(A[0])}"}
+            ctx["result_format"] = (fmt or 'frac')
+            ctx["precision"] = int(prec)
+        except Exception as e:
+            logger.exception("Error en vista potencia")
+            ctx["error"] = friendly_error(e)
+    return render(request, "algebra/potencia.html", ctx)
+
 def gauss(request: HttpRequest):
     ctx = {}
     if request.method == "POST":
@@ -333,10 +531,13 @@ def gauss(request: HttpRequest):
                 except Exception:
                     pass
             else:
-                M = _parse_matriz_aumentada(request.POST.get("matrizAug"))
-            want_steps = bool(request.POST.get("show_steps"))
+                M = _leer_matriz(request, "matrizAug", aumentada=True)
+            want_steps = _admitir(ctx, "gauss", M, bool(request.POST.get("show_steps")))["pasos"]
             info = op.gauss_info(M, registrar_pasos=want_steps, text_fn=text_fn)
             R = info["matriz"]
+            descarga = _exportar(request, "gauss", R, info.get("pasos"), text_fn)
+            if descarga:
+                return descarga
             ctx["resultado"] = _render_matriz(R, text_fn)
             ctx["analisis"] = info.get("analisis")
             ctx["pivotes"] = info.get("pivotes")
@@ -388,10 +589,13 @@ def gauss_jordan(request: HttpRequest):
                 except Exception:
                     pass
             else:
-                M = _parse_matriz_aumentada(request.POST.get("matrizAug"))
-            want_steps = bool(request.POST.get("show_steps"))
+                M = _leer_matriz(request, "matrizAug", aumentada=True)
+            want_steps = _admitir(ctx, "gauss_jordan", M, bool(request.POST.get("show_steps")))["pasos"]
             info = op.gauss_jordan_info(M, registrar_pasos=want_steps, text_fn=text_fn)
             R = info["matriz"]
+            descarga = _exportar(request, "gauss_jordan", R, info.get("pasos"), text_fn)
+            if descarga:
+                return descarga
             ctx["resultado"] = _render_matriz(R, text_fn)
             ctx["analisis"] = info.get("analisis")
             ctx["pivotes"] = info.get("pivotes")
@@ -445,9 +649,12 @@ def homogeneo(request: HttpRequest):
                 except Exception:
                     pass
             else:
-                A = _parse_matriz_simple(request.POST.get("matrizA"))
-            want_steps = bool(request.POST.get("show_steps"))
+                A = _leer_matriz(request, "matrizA")
+            want_steps = _admitir(ctx, "homogeneo", A, bool(request.POST.get("show_steps")))["pasos"]
             info = op.gauss_jordan_homogeneo_info(A, registrar_pasos=want_steps, text_fn=text_fn)
+            descarga = _exportar(request, "homogeneo", info["matriz"], info.get("pasos"), text_fn)
+            if descarga:
+                return descarga
             ctx["resultado"] = _render_matriz(info["matriz"], text_fn)
             ctx["analisis"] = info["analisis"]
             if want_steps and "pasos" in info:
@@ -472,10 +679,13 @@ def transposicion(request: HttpRequest):
             fmt = request.POST.get("result_format")
             prec = request.POST.get("precision") or 6
             text_fn = _make_text_fn(fmt, prec)
-            A = _parse_matriz_simple(request.POST.get("matrizA"))
-            want_steps = bool(request.POST.get("show_steps"))
+            A = _leer_matriz(request, "matrizA")
+            want_steps = _admitir(ctx, "transposicion", A, bool(request.POST.get("show_steps")))["pasos"]
             if want_steps:
                 AT, pasos = op.transponer_matriz(A, registrar_pasos=True, text_fn=text_fn)
+                descarga = _exportar(request, "transpuesta", AT, pasos, text_fn)
+                if descarga:
+                    return descarga
                 ctx["resultado"] = _render_matriz(AT, text_fn)
                 ctx["pasos"] = [
                     {"operacion": p.get("operacion"), "matriz": _render_matriz(p.get("matriz"), text_fn)}
@@ -483,6 +693,9 @@ def transposicion(request: HttpRequest):
                 ]
             else:
                 AT = op.transponer_matriz(A)
+                descarga = _exportar(request, "transpuesta", AT, text_fn=text_fn)
+                if descarga:
+                    return descarga
                 ctx["resultado"] = _render_matriz(AT, text_fn)
             if A:
                 ctx["dims"] = {"A": f"{len(A)}×{len(A[0])}", "AT": f"{len(AT)}×{len(AT[0])}"}
@@ -501,7 +714,7 @@ def inversa(request: HttpRequest):
             fmt = request.POST.get("result_format")
             prec = request.POST.get("precision") or 6
             text_fn = _make_text_fn(fmt, prec)
-            A = _parse_matriz_simple(request.POST.get("matrizA"))
+            A = _leer_matriz(request, "matrizA")
             # Validación básica: cuadrada
             if not A or len(A) == 0:
                 raise ValueError("La matriz A no puede ser vacía.")
@@ -510,14 +723,19 @@ def inversa(request: HttpRequest):
             if len(A) != len(A[0]):
                 info = {"invertible": False, "razon": "A no es cuadrada"}
                 ctx["no_invertible"] = "A no es cuadrada (no tiene inversa)."
-            want_steps = bool(request.POST.get("show_steps"))
+            want_steps = _admitir(ctx, "inversa", A, bool(request.POST.get("show_steps")))["pasos"]
+            diagnostico = bool(request.POST.get("diagnostico"))
             if want_steps:
-                info, pasos = op.inversa_matriz(A, registrar_pasos=True, text_fn=text_fn)
+                info, pasos = op.inversa_matriz(A, registrar_pasos=True, text_fn=text_fn, diagnostico=diagnostico)
             else:
-                info = op.inversa_matriz(A, registrar_pasos=False, text_fn=text_fn)
+                info = op.inversa_matriz(A, registrar_pasos=False, text_fn=text_fn, diagnostico=diagnostico)
                 pasos = None
+            ctx["diagnostico"] = info.get("diagnostico")
             if info.get("invertible"):
                 inv = info.get("inversa")
+                descarga = _exportar(request, "inversa", inv, pasos, text_fn)
+                if descarga:
+                    return descarga
                 ctx["resultado"] = _render_matriz(inv, text_fn)
                 estado = "INVERTIBLE"
                 singular = False
@@ -551,12 +769,12 @@ def determinante(request: HttpRequest):
             fmt = request.POST.get("result_format")
             prec = request.POST.get("precision") or 6
             text_fn = _make_text_fn(fmt, prec)
-            A = _parse_matriz_simple(request.POST.get("matrizA"))
+            A = _leer_matriz(request, "matrizA")
             if not A or len(A) == 0:
                 raise ValueError("La matriz A no puede ser vacía.")
             if len(A) != len(A[0]):
                 raise ValueError("A debe ser cuadrada para calcular |A|.")
-            want_steps = bool(request.POST.get("show_steps"))
+            want_steps = _admitir(ctx, "determinante", A, bool(request.POST.get("show_steps")))["pasos"]
             if want_steps:
                 det, pasos = op.determinante_matriz(A, registrar_pasos=True, text_fn=text_fn)
             else:
@@ -617,8 +835,8 @@ def cramer(request: HttpRequest):
                 except Exception:
                   pass
             else:
-                A = _parse_matriz_simple(request.POST.get("matrizA"))
-                b = _parse_matriz_simple(request.POST.get("vectorb"))
+                A = _leer_matriz(request, "matrizA")
+                b = _leer_matriz(request, "vectorb")
             if not A or not b:
                 raise ValueError("Debes ingresar A y b.")
             if len(b[0]) != 1:
@@ -627,7 +845,7 @@ def cramer(request: HttpRequest):
                 raise ValueError("A debe ser cuadrada (n×n).")
             if len(b) != len(A):
                 raise ValueError("El tamaño de b debe coincidir con n (filas de A).")
-            want_steps = bool(request.POST.get("show_steps"))
+            want_steps = _admitir(ctx, "cramer", A, bool(request.POST.get("show_steps")))["pasos"]
             if want_steps:
                 info, pasos = op.cramer_resolver(A, b, registrar_pasos=True, text_fn=text_fn)
             else:
@@ -664,11 +882,13 @@ def cramer(request: HttpRequest):
     return render(request, "algebra/cramer.html", ctx)
 
 def leontief(request: HttpRequest):
-    """Modelo de Leontief: X = (I − A)^{-1} · Y
+    """Modelo de Leontief: (I − A) · X = Y
 
     - A debe ser n×n (cuadrada)
-    - Y debe ser n×1 (vector columna)
-    - Si (I−A) no es invertible, se muestra mensaje.
+    - Y debe tener n filas; cada columna es un escenario de demanda final
+    - metodo 'exacto' factoriza (I − A) una vez y resuelve todas las columnas;
+      'neumann' y 'gauss_seidel' iteran en coma flotante (exigen sumas por
+      columnas de A < 1).
     """
     ctx = {}
     if request.method == "POST":
@@ -676,78 +896,45 @@ def leontief(request: HttpRequest):
             fmt = request.POST.get("result_format")
             prec = request.POST.get("precision") or 6
             text_fn = _make_text_fn(fmt, prec)
-            A = _parse_matriz_simple(request.POST.get("matrizA"))
-            Y = _parse_matriz_simple(request.POST.get("vectorY"))
-            if not A or not Y:
-                raise ValueError("Debes ingresar la matriz A y el vector Y.")
-            n = len(A)
-            # Validaciones
-            if any(len(f) != len(A[0]) for f in A):
-                raise ValueError("Todas las filas de A deben tener la misma cantidad de columnas.")
-            if len(A) != len(A[0]):
-                raise ValueError("A debe ser cuadrada (n×n).")
-            if len(Y[0]) != 1:
-                raise ValueError("Y debe ser un vector columna (n×1).")
-            if len(Y) != n:
-                raise ValueError("El tamaño de Y debe coincidir con n (filas de A).")
-
-            want_steps = bool(request.POST.get("show_steps"))
-
-            # Construir I y (I − A)
-            I = []
-            i = 0
-            while i < n:
-                fila = []
-                j = 0
-                while j < n:
-                    fila.append([1,1] if i == j else [0,1])
-                    j += 1
-                I.append(fila)
-                i += 1
-            # (I − A)
-            IA = []
-            i = 0
-            while i < n:
-                fila = []
-                j = 0
-                while j < n:
-                    # (1 if i==j else 0) - A[i][j]
-                    base = [1,1] if i == j else [0,1]
-                    fila.append(u.restar_fracciones(base, A[i][j]))
-                    j += 1
-                IA.append(fila)
-                i += 1
-
-            # Inversa de (I − A)
-            info = op.inversa_matriz(IA, registrar_pasos=want_steps, text_fn=text_fn)
-            if isinstance(info, tuple):
-                info, pasos = info
+            A = _leer_matriz(request, "matrizA")
+            Y = _leer_matriz(request, "vectorY")
+            metodo = request.POST.get("metodo") or "exacto"
+            admision.validar_celdas(Y)
+            if metodo == "exacto":
+                decision = _admitir(ctx, "leontief", A, bool(request.POST.get("show_steps")),
+                                    m=len(A) + (len(Y[0]) if Y else 0))
+                if decision["flotante"]:
+                    metodo = "gauss_seidel"
+                want_steps = decision["pasos"]
             else:
-                pasos = None
-            if not info.get("invertible"):
-                raise ValueError(info.get("razon", "(I − A) no es invertible."))
-            IA_inv = info.get("inversa")
-
-            # X = (I − A)^{-1} · Y
-            X, pasos_mul = op.multiplicar_matrices(IA_inv, Y, registrar_pasos=want_steps, text_fn=text_fn)
+                want_steps = False
+            ctx["metodo"] = metodo
 
-            ctx["resultado"] = _render_matriz(X, text_fn)
-            ctx["dims"] = {"A": f"{n}×{n}", "Y": f"{len(Y)}×1", "X": f"{len(X)}×{len(X[0])}"}
-
-            if want_steps:
-                ctx["pasos"] = []
-                # Paso conceptual
-                ctx["pasos"].append({
-                    "operacion": "Modelo de Leontief: X = (I − A)^{-1} · Y",
-                    "matriz": _render_matriz(X, text_fn)
-                })
-                # Pasos de inversa
+            if metodo == "exacto":
+                info = leontief_logic.resolver_leontief(A, Y, registrar_pasos=want_steps, text_fn=text_fn)
+                if isinstance(info, tuple):
+                    info, pasos = info
+                else:
+                    pasos = None
+                X = info["X"]
+                ctx["resultado"] = _render_matriz(X, text_fn)
+                ctx["sumas_columnas"] = [text_fn(s) for s in info["sumas_columnas"]]
                 if pasos:
-                    ctx["pasos"].extend([{"operacion": p.get("operacion"), "matriz": _render_matriz(p.get("matriz"), text_fn)} for p in pasos])
-                # Pasos de multiplicación
-                if pasos_mul:
-                    ctx["pasos"].extend([{"operacion": p.get("operacion"), "matriz": _render_matriz(p.get("matriz"), text_fn)} for p in pasos_mul])
-
+                    ctx["pasos"] = [
+                        {"operacion": p.get("operacion"), "matriz": _render_matriz(p.get("matriz"), text_fn)}
+                        for p in pasos
+                    ]
+            else:
+                info = leontief_logic.resolver_iterativo(A, Y, metodo=metodo)
+                X = info["X"]
+                d = int(prec)
+                ctx["resultado"] = [[f"{x:.{d}f}" for x in fila] for fila in X]
+                ctx["sumas_columnas"] = [f"{s:.{d}f}" for s in info["sumas_columnas"]]
+                ctx["iteraciones"] = info["iteraciones"]
+                ctx["convergio"] = info["convergio"]
+                ctx["cota_error"] = f"{info['cota_error']:.3e}"
+            ctx["productiva"] = info["productiva"]
+            ctx["dims"] = {"A": f"{len(A)}×{len(A)}", "Y": f"{len(Y)}×{len(Y[0])}", "X": f"{len(X)}×{len(X[0])}"}
             ctx["result_format"] = (fmt or 'frac')
             ctx["precision"] = int(prec)
         except Exception as e:
@@ -755,9 +942,69 @@ def leontief(request: HttpRequest):
             ctx["error"] = friendly_error(e)
     return render(request, "algebra/leontief.html", ctx)
 
+@csrf_exempt
+@require_POST
+def leontief_escenarios(request: HttpRequest):
+    """Endpoint JSON: muchos escenarios de demanda final para una misma A.
+
+    Entrada (JSON o formulario con matrizA/vectorY, texto o archivo):
+      {"A": [[...], ...], "Y": [[...], ...], "result_format": "frac", "precision": 6}
+    Y tiene n filas y una columna por escenario. En peticiones posteriores se
+    puede enviar {"clave": ..., "Y": ...} sin A mientras la factorización siga
+    en caché.
+    Salida: {"clave", "n", "escenarios", "X", "multiplicadores", "reutilizada"}.
+    """
+    try:
+        if (request.content_type or "").startswith("application/json"):
+            try:
+                datos = json.loads(request.body or b"{}")
+            except ValueError:
+                raise ValueError("El cuerpo no es JSON válido.")
+            if not isinstance(datos, dict):
+                raise ValueError("El cuerpo JSON debe ser un objeto.")
+            A = archivos.leer_filas(datos["A"]) if datos.get("A") is not None else None
+            if datos.get("Y") is None:
+                raise ValueError("Debes enviar Y (una columna por escenario).")
+            Y = archivos.leer_filas(datos["Y"])
+            clave = datos.get("clave")
+        else:
+            datos = request.POST
+            A = _leer_matriz(request, "matrizA") if (request.POST.get("matrizA") or request.FILES.get("matrizA_archivo")) else None
+            Y = _leer_matriz(request, "vectorY")
+            clave = request.POST.get("clave")
+        text_fn = _make_text_fn(datos.get("result_format"), datos.get("precision") or 6)
+
+        admision.validar_celdas(Y)
+        if A is not None:
+            _admitir({}, "leontief", A, m=len(A) + (len(Y[0]) if Y else 0))
+            clave = leontief_logic.clave_matriz(A)
+        elif not clave:
+            raise ValueError("Debes enviar la matriz A o la clave de una factorización anterior.")
+        F = cache.get("algebra:leontief:" + clave)
+        if F is None and A is None:
+            raise ValueError("La factorización de esa clave ya no está en caché; envía la matriz A.")
+        info = leontief_logic.resolver_escenarios(A, Y, factorizacion=F)
+        if not info["reutilizada"]:
+            cache.set("algebra:leontief:" + clave, info["factorizacion"], leontief_logic.CACHE_SEGUNDOS)
+        X = info["X"]
+        return JsonResponse({
+            "clave": clave,
+            "n": len(X),
+            "escenarios": len(X[0]),
+            "X": _render_matriz(X, text_fn),
+            "multiplicadores": [text_fn(m) for m in info["multiplicadores"]],
+            "reutilizada": info["reutilizada"],
+        })
+    except Exception as e:
+        logger.exception("Error en endpoint leontief_escenarios")
+        return JsonResponse({"error": friendly_error(e)}, status=400)
+
 def compuestas(request: HttpRequest):
-    """Vista base para operaciones compuestas.
-    De momento solo muestra el formulario de entrada; la lógica de composición se añadirá gradualmente.
+    """Operaciones compuestas: aplica la secuencia del formulario a A o B.
+
+    La secuencia se compila a un DAG con reescrituras algebraicas y
+    subexpresiones comunes; sólo se ejecutan (y muestran) las operaciones que
+    quedan en el plan.
     """
     ctx = {}
     if request.method == "POST":
@@ -774,189 +1021,25 @@ def compuestas(request: HttpRequest):
             except Exception:
                 raise ValueError("Secuencia inválida (JSON)")
 
-            A = _parse_matriz_simple(request.POST.get("matrizA"))
-            B = _parse_matriz_simple(request.POST.get("matrizB"))
+            A = _leer_matriz(request, "matrizA")
+            B = _leer_matriz(request, "matrizB")
             ctx["dims"] = {}
             if A: ctx["dims"]["A"] = f"{len(A)}×{len(A[0])}"
             if B: ctx["dims"]["B"] = f"{len(B)}×{len(B[0])}"
 
-            # Selección de fuente inicial
-            if src == "B":
-                M = B
+            # La secuencia se compila a un plan optimizado (ver logic/compuestas.py)
+            plan = compuestas_logic.construir_plan(seq, A, B, fuente=src)
+            admision.validar_celdas(A)
+            admision.validar_celdas(B)
+            fuente = max(A or [[]], B or [[]], key=len)
+            show_steps = _admitir(ctx, "compuestas", fuente, show_steps, k=compuestas_logic.productos_equivalentes(plan))["pasos"]
+            if show_steps:
+                M, pasos = compuestas_logic.ejecutar_plan(plan, registrar_pasos=True, text_fn=text_fn)
+                pasos_viz = [{"operacion": p.get("operacion"), "matriz": _render_matriz(p.get("matriz"), text_fn)} for p in pasos]
             else:
-                M = A
-            if not M:
-                raise ValueError("La matriz fuente seleccionada está vacía.")
-
-            pasos_viz = []
-            # Aplicar secuencia básica
-            for step in (seq or []):
-                stype = (step.get("type") or "").lower()
-                params = step.get("params") or {}
-                if stype == "transpose":
-                    if show_steps:
-                        M, p = op.transponer_matriz(M, registrar_pasos=True, text_fn=text_fn)
-                        pasos_viz.extend([{"operacion": s.get("operacion"), "matriz": _render_matriz(s.get("matriz"), text_fn)} for s in p])
-                    else:
-                        M = op.transponer_matriz(M)
-                elif stype == "scale":
-                    c_txt = (params.get("c") or "0").strip()
-                    c = u.crear_fraccion_desde_cadena(c_txt)
-                    if show_steps:
-                        M, p = op.multiplicar_escalar_matriz(c, M, registrar_pasos=True, text_fn=text_fn)
-                        pasos_viz.extend([{"operacion": s.get("operacion"), "matriz": _render_matriz(s.get("matriz"), text_fn)} for s in p])
-                    else:
-                        M = op.multiplicar_escalar_matriz(c, M)
-                elif stype == "mulb":
-                    if not B:
-                        raise ValueError("No hay matriz B para multiplicar (M·B).")
-                    if show_steps:
-                        M, p = op.multiplicar_matrices(M, B, registrar_pasos=True, text_fn=text_fn)
-                        pasos_viz.extend([{"operacion": s.get("operacion"), "matriz": _render_matriz(s.get("matriz"), text_fn)} for s in p])
-                    else:
-                        M = op.multiplicar_matrices(M, B)
-                elif stype == "sumb":
-                    if not B:
-                        raise ValueError("No hay matriz B para sumar (M+B).")
-                    # Suma directa; sin pasos detallados para no generar ruido redundante
-                    M = op.sumar_matrices(M, B)
-                elif stype == "sumbesc":
-                    if not B:
-                        raise ValueError("No hay matriz B para sumar (M + b·B).")
-                    b_txt = (params.get("b") or "0").strip()
-                    b = u.crear_fraccion_desde_cadena(b_txt)
-                    MB = op.multiplicar_escalar_matriz(b, B)
-                    M = op.sumar_matrices(M, MB)
-                elif stype == "lincomb" or stype == "combinacion" or stype == "abcomb":
-                    if not A or not B:
-                        raise ValueError("Se requieren A y B para a·A + b·B.")
-                    a_txt = (params.get("a") or "0").strip()
-                    b_txt = (params.get("b") or "0").strip()
-                    a = u.crear_fraccion_desde_cadena(a_txt)
-                    b = u.crear_fraccion_desde_cadena(b_txt)
-                    if show_steps:
-                        MA, pA = op.multiplicar_escalar_matriz(a, A, registrar_pasos=True, text_fn=text_fn)
-                        pasos_viz.extend([
-                            {"operacion": s.get("operacion"), "matriz": _render_matriz(s.get("matriz"), text_fn)} for s in (pA or [])
-                        ])
-                        MB, pB = op.multiplicar_escalar_matriz(b, B, registrar_pasos=True, text_fn=text_fn)
-                        pasos_viz.extend([
-                            {"operacion": s.get("operacion"), "matriz": _render_matriz(s.get("matriz"), text_fn)} for s in (pB or [])
-                        ])
-                        Mtmp = op.sumar_matrices(MA, MB)
-                        pasos_viz.append({
-                            "operacion": f"Sumamos {text_fn(a)}·A + {text_fn(b)}·B",
-                            "matriz": _render_matriz(Mtmp, text_fn)
-                        })
-                        M = Mtmp
-                    else:
-                        MA = op.multiplicar_escalar_matriz(a, A)
-                        MB = op.multiplicar_escalar_matriz(b, B)
-                        M = op.sumar_matrices(MA, MB)
-                elif stype == "inverse":
-                    info = op.inversa_matriz(M, registrar_pasos=show_steps, text_fn=text_fn)
-                    if isinstance(info, tuple):
-                        info, p = info
-                        pasos_viz.extend([{"operacion": s.get("operacion"), "matriz": _render_matriz(s.get("matriz"), text_fn)} for s in p])
-                    if not info.get("invertible"):
-                        raise ValueError(info.get("razon", "La matriz no es invertible."))
-                    M = info.get("inversa")
-                elif stype == "scaleother":
-                    # Escalar la matriz que NO es la fuente actual
-                    c_txt = (params.get("c") or "0").strip()
-                    c = u.crear_fraccion_desde_cadena(c_txt)
-                    if src == "A":
-                        if not B:
-                            raise ValueError("No hay matriz B para escalar.")
-                        if show_steps:
-                            B, pB = op.multiplicar_escalar_matriz(c, B, registrar_pasos=True, text_fn=text_fn)
-                            pasos_viz.extend([{"operacion": s.get("operacion"), "matriz": _render_matriz(s.get("matriz"), text_fn)} for s in (pB or [])])
-                        else:
-                            B = op.multiplicar_escalar_matriz(c, B)
-                        pasos_viz.append({"operacion": f"B ← {text_fn(c)}·B", "matriz": _render_matriz(M, text_fn)})
-                    else:
-                        if not A:
-                            raise ValueError("No hay matriz A para escalar.")
-                        if show_steps:
-                            A, pA = op.multiplicar_escalar_matriz(c, A, registrar_pasos=True, text_fn=text_fn)
-                            pasos_viz.extend([{"operacion": s.get("operacion"), "matriz": _render_matriz(s.get("matriz"), text_fn)} for s in (pA or [])])
-                        else:
-                            A = op.multiplicar_escalar_matriz(c, A)
-                        pasos_viz.append({"operacion": f"A ← {text_fn(c)}·A", "matriz": _render_matriz(M, text_fn)})
-                elif stype == "transposeother":
-                    # Operar sobre la matriz que NO es la fuente actual
-                    if src == "A":
-                        if not B:
-                            raise ValueError("No hay matriz B para transponer.")
-                        Bt = op.transponer_matriz(B)
-                        B = Bt
-                        pasos_viz.append({"operacion": "B ← Bᵀ", "matriz": _render_matriz(M, text_fn)})
-                    else:
-                        if not A:
-                            raise ValueError("No hay matriz A para transponer.")
-                        At = op.transponer_matriz(A)
-                        A = At
-                        pasos_viz.append({"operacion": "A ← Aᵀ", "matriz": _render_matriz(M, text_fn)})
-                elif stype == "inverseother":
-                    # Invertir la matriz que NO es la fuente actual (debe ser cuadrada e invertible)
-                    if src == "A":
-                        if not B:
-                            raise ValueError("No hay matriz B para invertir.")
-                        infoB = op.inversa_matriz(B, registrar_pasos=False, text_fn=text_fn)
-                        if not infoB.get("invertible"):
-                            raise ValueError(infoB.get("razon", "B no es invertible."))
-                        B = infoB.get("inversa")
-                        pasos_viz.append({"operacion": "B ← B^{-1}", "matriz": _render_matriz(M, text_fn)})
-                    else:
-                        if not A:
-                            raise ValueError("No hay matriz A para invertir.")
-                        infoA = op.inversa_matriz(A, registrar_pasos=False, text_fn=text_fn)
-                        if not infoA.get("invertible"):
-                            raise ValueError(infoA.get("razon", "A no es invertible."))
-                        A = infoA.get("inversa")
-                        pasos_viz.append({"operacion": "A ← A^{-1}", "matriz": _render_matriz(M, text_fn)})
-                elif stype == "sumi":
-                    # Sumar con Identidad: requiere matriz cuadrada
-                    if not M or len(M) == 0:
-                        raise ValueError("La matriz fuente está vacía.")
-                    n_rows = len(M); n_cols = len(M[0])
-                    if n_rows != n_cols:
-                        raise ValueError("Para sumar con I, la matriz debe ser cuadrada (n×n).")
-                    # Construir I y sumar
-                    I = []
-                    i = 0
-                    while i < n_rows:
-                        fila = []
-                        j = 0
-                        while j < n_cols:
-                            fila.append([1,1] if i == j else [0,1])
-                            j += 1
-                        I.append(fila)
-                        i += 1
-                    M = op.sumar_matrices(M, I)
-                    if show_steps:
-                        pasos_viz.append({
-                            "operacion": "Sumamos la identidad: M ← M + I",
-                            "matriz": _render_matriz(M, text_fn)
-                        })
-                elif stype == "checkli":
-                    # Verificar independencia lineal de columnas de M usando sistema homogéneo M x = 0
-                    if not M or len(M) == 0:
-                        raise ValueError("La matriz fuente está vacía.")
-                    try:
-                        infoLI = op.gauss_jordan_homogeneo_info(M, registrar_pasos=False, text_fn=text_fn)
-                        anal = infoLI.get("analisis", {})
-                        esLI = bool(anal.get("independencia", False))
-                        detalle = "Vectores columna LI (independientes)" if esLI else "Vectores columna LD (dependientes)"
-                        pasos_viz.append({
-                            "operacion": f"Verificación de independencia lineal: {detalle}",
-                            "matriz": _render_matriz(infoLI.get("matriz"), text_fn)
-                        })
-                    except Exception as _e:
-                        raise ValueError("No se pudo verificar independencia lineal para la matriz dada.")
-                else:
-                    # Ignorar tipos desconocidos (por ahora)
-                    continue
+                M = compuestas_logic.ejecutar_plan(plan)
+                pasos_viz = []
+            ctx["plan"] = {"pedidas": plan.pedidas, "ejecutadas": plan.ejecutadas, "reescrituras": plan.reescrituras}
 
             # Render final
             ctx["resultado"] = _render_matriz(M, text_fn)
@@ -971,11 +1054,76 @@ def compuestas(request: HttpRequest):
     return render(request, "algebra/compuestas.html", ctx)
 
 
+# Esquina de las matrices grandes que se muestra en pantalla
+_VISTA_ARCHIVO = 12
+
+
+def matriz_archivo(request: HttpRequest):
+    """Vista para matrices grandes subidas como archivo (CSV, .npy, MatrixMarket).
+
+    Las matrices se guardan en disco con memoria mapeada y se operan en coma
+    flotante sin convertirlas a listas de fracciones (ver logic/disco.py).
+    """
+    ctx = {"operacion": "determinante"}
+    if request.method == "POST":
+        operacion = request.POST.get("operacion") or "determinante"
+        ctx["operacion"] = operacion
+        abiertas = []
+        try:
+            archivo_a = request.FILES.get("archivoA")
+            if archivo_a is None:
+                raise ValueError("Sube un archivo para la matriz A.")
+            A = disco.leer_archivo(archivo_a.name, archivo_a)
+            abiertas.append(A)
+            ctx["dims"] = {"A": f"{A.filas}×{A.columnas}"}
+            if operacion == "determinante":
+                admision.admitir_costo(disco.costo(operacion, A))
+                info = disco.determinante_disco(A)
+                ctx["det_str"] = format(info["det"], ".10g")
+                if info["log10_abs"] is not None:
+                    ctx["log10_abs"] = format(info["log10_abs"], ".6f")
+                ctx["es_cero"] = info["signo"] == 0
+            elif operacion == "gauss":
+                admision.admitir_costo(disco.costo(operacion, A))
+                info = disco.gauss_disco(A)
+                ctx["solucion"] = info["solucion"]
+                ctx["rango"] = info["rango"]
+                if "x" in info:
+                    ctx["vector"] = [
+                        {"nombre": f"x{i+1}", "valor": format(v, ".10g")}
+                        for i, v in enumerate(info["x"][:_VISTA_ARCHIVO * _VISTA_ARCHIVO])
+                    ]
+            elif operacion == "multiplicacion":
+                archivo_b = request.FILES.get("archivoB")
+                if archivo_b is None:
+                    raise ValueError("Sube un archivo para la matriz B.")
+                B = disco.leer_archivo(archivo_b.name, archivo_b)
+                abiertas.append(B)
+                ctx["dims"]["B"] = f"{B.filas}×{B.columnas}"
+                admision.admitir_costo(disco.costo(operacion, A, B))
+                C = disco.multiplicar_disco(A, B)
+                abiertas.append(C)
+                ctx["dims"]["C"] = f"{C.filas}×{C.columnas}"
+                ctx["resultado"] = [[format(v, ".6g") for v in fila] for fila in C.vista(_VISTA_ARCHIVO, _VISTA_ARCHIVO)]
+                ctx["recortado"] = C.filas > _VISTA_ARCHIVO or C.columnas > _VISTA_ARCHIVO
+            else:
+                raise ValueError("Operación no soportada.")
+        except Exception as e:
+            logger.exception("Error en vista matriz_archivo")
+            ctx["error"] = friendly_error(e)
+        finally:
+            for M in abiertas:
+                M.cerrar()
+    return render(request, "algebra/archivo.html", ctx)
+
+
+@_pagina_cacheada
 def metodos_index(request: HttpRequest):
     """Página índice del módulo Métodos numéricos (entrada al submódulos)."""
     return render(request, "algebra/metodos_index.html")
 
 
+@_pagina_cacheada
 def metodos_cerrados(request: HttpRequest):
     """Página para la subclase 'Métodos cerrados' (lista de métodos)."""
     ctx = {
@@ -988,6 +1136,7 @@ def metodos_cerrados(request: HttpRequest):
     return render(request, "algebra/metodos_cerrados.html", ctx)
 
 
+@_pagina_cacheada
 def metodos_abiertos(request: HttpRequest):
     """Página para la subclase 'Métodos abiertos' (lista de métodos)."""
     ctx = {
@@ -1000,6 +1149,92 @@ def metodos_abiertos(request: HttpRequest):
     return render(request, "algebra/metodos_abiertos.html", ctx)
 
 
+# Tabla de iteraciones de los métodos para sistemas: filas por página, tiempo
+# que se conserva el registro para paginarlo y componentes de x mostradas
+_FILAS_PAGINA = 50
+_REGISTRO_SEGUNDOS = 600
+_VISTA_SOLUCION = 200
+
+
+def _pagina_iteraciones(ctx, filas, pagina):
+    pag = Paginator(filas, _FILAS_PAGINA).get_page(pagina)
+    ctx["iteraciones"] = pag.object_list
+    ctx["pagina"] = pag
+
+
+def sistemas_iterativos(request: HttpRequest):
+    """Sistemas A x = b por Jacobi, Gauss-Seidel, SOR o gradiente conjugado.
+
+    La tabla de iteraciones se guarda en caché y se pagina con
+    ?registro=<clave>&pagina=<n>. Los archivos MatrixMarket n×(n+1) se leen
+    directamente en forma dispersa.
+    """
+    ctx = {"metodo": "jacobi", "precondicionador": "ninguno"}
+    registro = request.GET.get("registro")
+    if request.method == "GET" and registro:
+        guardado = cache.get("algebra:iterativo:" + registro)
+        if guardado is None:
+            ctx["error"] = "El registro de iteraciones expiró; vuelve a resolver el sistema."
+        else:
+            ctx.update(guardado["resumen"])
+            ctx["registro"] = registro
+            _pagina_iteraciones(ctx, guardado["filas"], request.GET.get("pagina"))
+        return render(request, "algebra/sistemas_iterativos.html", ctx)
+    if request.method == "POST":
+        metodo = request.POST.get("metodo") or "jacobi"
+        precondicionador = request.POST.get("precondicionador") or "ninguno"
+        tol_txt = (request.POST.get("tol") or "").strip()
+        maxit_txt = (request.POST.get("maxit") or "").strip()
+        omega_txt = (request.POST.get("omega") or "").strip()
+        ctx.update({"metodo": metodo, "precondicionador": precondicionador,
+                    "tol_input": tol_txt, "maxit_input": maxit_txt, "omega_input": omega_txt})
+        try:
+            tol = _parse_number(tol_txt, default=1e-8)
+            if tol is None or tol <= 0:
+                raise ValueError("Tolerancia inválida; debe ser un número positivo.")
+            try:
+                maxit = int(maxit_txt) if maxit_txt else 1000
+                omega = _parse_number(omega_txt, default=1.0)
+            except Exception:
+                raise ValueError("Max iteraciones debe ser entero y ω un número.")
+            archivo = request.FILES.get("matrizAug_archivo")
+            if archivo is not None and archivo.name.lower().endswith((".mtx", ".mm")):
+                A, b = metodos.sistema_desde_matrix_market(archivo)
+            else:
+                M = _leer_matriz(request, "matrizAug", aumentada=True)
+                A = metodos.matriz_dispersa([fila[:-1] for fila in M])
+                b = [fila[-1] for fila in M]
+            admision.admitir_costo(metodos.costo_iterativo(A, maxit), "La resolución iterativa")
+            res = metodos.resolver_iterativo(A, b, metodo=metodo, tol=tol, maxit=maxit,
+                                             omega=omega, precondicionador=precondicionador)
+            x = res["x"]
+            resumen = {
+                "metodo": metodo,
+                "precondicionador": precondicionador,
+                "n": len(x),
+                "convergio": res["convergio"],
+                "conteo_iter": res["conteo_iter"],
+                "residuo": format(res["residuo"], ".3e"),
+                "solucion": [{"nombre": f"x{i+1}", "valor": format(v, ".10g")} for i, v in enumerate(x[:_VISTA_SOLUCION])],
+                "recortado": len(x) > _VISTA_SOLUCION,
+                "advertencias": res["warnings"],
+            }
+            filas = [
+                {"i": it["i"], "residuo": format(it["residuo"], ".3e"), "err": format(it["err"], ".3e"),
+                 "x": ", ".join(format(v, ".8f") for v in it["x"])}
+                for it in res["iteraciones"]
+            ]
+            registro = uuid.uuid4().hex
+            cache.set("algebra:iterativo:" + registro, {"resumen": resumen, "filas": filas}, _REGISTRO_SEGUNDOS)
+            ctx.update(resumen)
+            ctx["registro"] = registro
+            _pagina_iteraciones(ctx, filas, 1)
+        except Exception as e:
+            logger.exception("Error en vista sistemas_iterativos")
+            ctx["error"] = friendly_error(e)
+    return render(request, "algebra/sistemas_iterativos.html", ctx)
+
+
 def limite(request: HttpRequest):
     """Calcular límite usando sympy.limit.
 
@@ -1014,6 +1249,7 @@ def limite(request: HttpRequest):
     direction_used = None
     if request.method == 'POST':
         try:
+            sp = simbolico.sympy()
             raw = (request.POST.get('expr') or request.POST.get('latex') or '').strip()
             # Variable fija: 'x'
             varname = 'x'
@@ -1024,39 +1260,41 @@ def limite(request: HttpRequest):
             expr_used = raw
             point_used = point
             direction_used = direction
+            admision.admitir_expresion(point)
 
             # map point to sympy symbol/value
             if point.lower() in ('oo', 'infty', 'infinito', 'inf', '∞'):
-                a = oo
+                a = sp.oo
             elif point.lower() in ('-oo', '-infty', '-inf'):
-                a = -oo
+                a = -sp.oo
             else:
                 # try numeric
                 try:
-                    a = sympify(point)
+                    a = sp.sympify(point)
                 except Exception:
-                    a = sympify('0')
+                    a = sp.sympify('0')
 
             # Prepare locals allowing common math functions
             local_dict = {
-                'sin': sin, 'cos': cos, 'tan': tan,
-                'asin': asin, 'acos': acos, 'atan': atan,
-                'exp': exp, 'log': log, 'sqrt': sqrt,
-                'abs': Abs, 'pi': sympify('pi'), 'e': sympify('E')
+                'sin': sp.sin, 'cos': sp.cos, 'tan': sp.tan,
+                'asin': sp.asin, 'acos': sp.acos, 'atan': sp.atan,
+                'exp': sp.exp, 'log': sp.log, 'sqrt': sp.sqrt,
+                'abs': sp.Abs, 'pi': sp.sympify('pi'), 'e': sp.sympify('E')
             }
 
             if not raw:
                 raise ValueError('Debes introducir una expresión.')
+            admision.admitir_expresion(raw)
 
             # Sympify expression
             try:
-                expr_sym = sympify(raw, locals=local_dict)
+                expr_sym = sp.sympify(raw, locals=local_dict)
             except Exception:
                 # try raw latex-ish fallback: remove LaTeX backslashes and try
                 fallback = raw.replace('\\', '').replace('^', '**')
-                expr_sym = sympify(fallback, locals=local_dict)
+                expr_sym = sp.sympify(fallback, locals=local_dict)
 
-            x = symbols(varname)
+            x = sp.symbols(varname)
 
             pasos = []
             if show_steps:
@@ -1080,16 +1318,16 @@ def limite(request: HttpRequest):
                     pass
                 # Paso 4: serie (si es punto finito y no infinito)
                 try:
-                    if a not in (oo, -oo):
+                    if a not in (sp.oo, -sp.oo):
                         ser = expr_sym.series(x, a, 3)
                         pasos.append({"operacion": "Expansión en serie (orden 3)", "detalle": str(ser)})
                 except Exception:
                     pass
 
             if direction in ('+', '-'):
-                res = sympy_limit(expr_sym, x, a, dir=direction)
+                res = sp.limit(expr_sym, x, a, dir=direction)
             else:
-                res = sympy_limit(expr_sym, x, a)
+                res = sp.limit(expr_sym, x, a)
 
             resultado = str(res)
             ctx['resultado'] = resultado
@@ -1113,28 +1351,31 @@ def derivadas(request: HttpRequest):
     ctx = {}
     if request.method == 'POST':
         try:
+            sp = simbolico.sympy()
             raw = (request.POST.get('expr') or request.POST.get('latex') or '').strip()
             point = (request.POST.get('point') or '').strip()
             show_steps = bool(request.POST.get('show_steps'))
 
             if not raw:
                 raise ValueError('Debes introducir una expresión.')
+            admision.admitir_expresion(raw)
+            admision.admitir_expresion(point)
 
             # mismos locales que en limite
             local_dict = {
-                'sin': sin, 'cos': cos, 'tan': tan,
-                'asin': asin, 'acos': acos, 'atan': atan,
-                'exp': exp, 'log': log, 'sqrt': sqrt,
-                'abs': Abs, 'pi': sympify('pi'), 'e': sympify('E')
+                'sin': sp.sin, 'cos': sp.cos, 'tan': sp.tan,
+                'asin': sp.asin, 'acos': sp.acos, 'atan': sp.atan,
+                'exp': sp.exp, 'log': sp.log, 'sqrt': sp.sqrt,
+                'abs': sp.Abs, 'pi': sp.sympify('pi'), 'e': sp.sympify('E')
             }
 
             try:
-                expr_sym = sympify(raw, locals=local_dict)
+                expr_sym = sp.sympify(raw, locals=local_dict)
             except Exception:
                 fallback = raw.replace('\\', '').replace('^', '**')
-                expr_sym = sympify(fallback, locals=local_dict)
+                expr_sym = sp.sympify(fallback, locals=local_dict)
 
-            x = symbols('x')
+            x = sp.symbols('x')
             pasos = []
             if show_steps:
                 try:
@@ -1165,13 +1406,13 @@ def derivadas(request: HttpRequest):
             if point:
                 try:
                     if point.lower() in ('oo', 'infty', 'infinito', 'inf', '∞'):
-                        val = oo
+                        val = sp.oo
                     elif point.lower() in ('-oo', '-infty', '-inf'):
-                        val = -oo
+                        val = -sp.oo
                     else:
-                        val = sympify(point)
+                        val = sp.sympify(point)
                     # evitar sustituir infinito en la evaluación directa
-                    if val in (oo, -oo):
+                    if val in (sp.oo, -sp.oo):
                         eval_result = deriv.limit(x, val)
                     else:
                         eval_result = deriv.subs(x, val)
@@ -1193,246 +1434,241 @@ def derivadas(request: HttpRequest):
     return render(request, 'algebra/derivadas.html', ctx)
 
 
-def biseccion(request: HttpRequest):
-    """Página para el Método de bisección.
-
-    Soporta GET (muestra formulario) y POST (ejecuta algoritmo y muestra tabla de iteraciones).
+# ---------------------------------------------------------------------------
+# Métodos de búsqueda de raíces (bisección, regla falsa, Newton y secante)
+#
+# Las cuatro vistas comparten el mismo flujo: leer y validar entradas, compilar
+# f(x) una sola vez, ejecutar el algoritmo con ese evaluador, formatear la tabla
+# de iteraciones en bloque y generar la gráfica con el mismo evaluador.
+# ---------------------------------------------------------------------------
+
+# Fracciones unicode de un solo carácter que algunos teclados insertan ('½' -> '1/2')
+_FRACCIONES_VULGARES = {
+    '\u00BC': '1/4', '\u00BD': '1/2', '\u00BE': '3/4',
+    '\u2150': '1/7', '\u2151': '1/9', '\u2152': '1/10',
+    '\u2153': '1/3', '\u2154': '2/3', '\u2155': '1/5', '\u2156': '2/5', '\u2157': '3/5', '\u2158': '4/5',
+    '\u2159': '1/6', '\u215A': '5/6', '\u215B': '1/8', '\u215C': '3/8', '\u215D': '5/8', '\u215E': '7/8'
+}
+_TABLA_FRACCIONES_VULGARES = str.maketrans(_FRACCIONES_VULGARES)
+# Caracteres unicode que rompen el parseo numérico
+_TABLA_NUMEROS = str.maketrans({
+    '\u2212': '-',  # signo menos
+    '\u2060': '',   # word joiner
+    '\u2009': '',   # espacio fino
+    '\u00A0': '',   # espacio no separable
+})
+
+
+def _parse_number(txt, default=None):
+    """Convierte la entrada de un campo numérico a float.
+
+    Acepta '0.5', '1e-4', '1/2', '½' y expresiones aritméticas simples ('2^-3').
+    Devuelve `default` si el campo está vacío; lanza excepción si no es un número.
     """
-    ctx = {"title": "Método de bisección"}
-    if request.method == 'POST':
-        func_txt = (request.POST.get('function') or '').strip()
-        a_txt = (request.POST.get('a') or '').strip()
-        b_txt = (request.POST.get('b') or '').strip()
-        tol_txt = (request.POST.get('tol') or '').strip()
-        maxit_txt = (request.POST.get('maxit') or '').strip()
-
-        # Helper to ensure numeric parsing accepts simple fractions like '1/2'
-        from fractions import Fraction
-        def _replace_vulgar_fraction_chars(s: str) -> str:
-            # Map common single-character unicode vulgar fractions to 'a/b'
-            vf_map = {
-                '\u00BC': '1/4', '\u00BD': '1/2', '\u00BE': '3/4',
-                '\u2150': '1/7', '\u2151': '1/9', '\u2152': '1/10',
-                '\u2153': '1/3', '\u2154': '2/3', '\u2155': '1/5', '\u2156': '2/5', '\u2157': '3/5', '\u2158': '4/5',
-                '\u2159': '1/6', '\u215A': '5/6', '\u215B': '1/8', '\u215C': '3/8', '\u215D': '5/8', '\u215E': '7/8'
-            }
-            out = []
-            for ch in s:
-                if ch in vf_map:
-                    out.append(vf_map[ch])
-                else:
-                    out.append(ch)
-            return ''.join(out)
-
-        def parse_number(txt, default=None):
-            if txt is None or str(txt).strip() == '':
-                return default
-            s = str(txt).strip()
-            # Normalize common unicode characters that break parsing
-            s = s.replace('\u2212', '-')  # minus sign
-            s = s.replace('\u2060', '')   # word joiner
-            s = s.replace('\u2009', '')   # thin space
-            s = s.replace('\u00A0', '')   # non-breaking space
-            # Replace single-char vulgar fractions like '½' -> '1/2'
-            s = _replace_vulgar_fraction_chars(s)
-            # Try straightforward float conversion first (handles '0.5', '1e-4')
-            try:
-                return float(s)
-            except Exception:
-                try:
-                    # Accept forms like '1/2'
-                    return float(Fraction(s))
-                except Exception:
-                    # As last resort, try evaluating simple numeric expression safely
-                    try:
-                        # allow scientific notation and basic arithmetic; convert ^ to **
-                        s2 = s.replace('^', '**')
-                        return float(eval(s2, {'__builtins__': None}, {}))
-                    except Exception:
-                        raise
-
-        # Parse numeric inputs with validations
+    if txt is None or str(txt).strip() == '':
+        return default
+    s = str(txt).strip().translate(_TABLA_NUMEROS).translate(_TABLA_FRACCIONES_VULGARES)
+    try:
+        return float(s)
+    except Exception:
         try:
-            a = parse_number(a_txt)
-            b = parse_number(b_txt)
-            if a is None or b is None:
-                raise ValueError('a o b vacío')
+            return float(Fraction(s))
         except Exception:
-            ctx['error'] = 'Parámetros numéricos inválidos: a y b deben ser números (aceptamos 0.5 o 1/2).'
-            # preserve user inputs so template shows them
-            ctx['function'] = func_txt
-            ctx['a_input'] = a_txt
-            ctx['b_input'] = b_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/biseccion.html', ctx)
+            # Último recurso: expresión numérica simple (^ como potencia), con el
+            # compilador seguro en lugar de eval
+            return compilador.evaluar_constante(s.replace('^', '**'))
+
+
+def _formatear_iteraciones(iteraciones, columnas, decimales, textos=()):
+    """Formatea la tabla de iteraciones en un solo recorrido.
 
+    `columnas` son las claves numéricas a mostrar con `decimales` decimales
+    (None -> ''), `textos` las que se copian tal cual. Se usa punto decimal
+    siempre, sin depender de los filtros de plantilla ni de la localización.
+    """
+    patron = '{:.%df}' % decimales
+    a_texto = patron.format
+
+    def celda(v):
+        if v is None:
+            return ''
         try:
-            tol = parse_number(tol_txt, default=1e-6)
-            if tol is None or tol <= 0:
-                raise ValueError()
+            return a_texto(float(v))
         except Exception:
-            ctx['error'] = 'Tolerancia inválida; debe ser un número positivo.'
-            ctx['function'] = func_txt
-            ctx['a_input'] = a_txt
-            ctx['b_input'] = b_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/biseccion.html', ctx)
+            return ''
+
+    return [
+        dict(
+            [('i', it.get('i', 0))]
+            + [(k, celda(it.get(k))) for k in columnas]
+            + [(k, it.get(k, '')) for k in textos]
+        )
+        for it in iteraciones
+    ]
 
+
+def _ventana_grafica(p, q):
+    """Ventana de muestreo 2.5 veces más amplia que [p, q] e incluyendo x=0."""
+    aa = float(min(p, q))
+    bb = float(max(p, q))
+    span = bb - aa
+    if span <= 0:
+        span = 2.0
+    center = (aa + bb) / 2.0
+    scale = 2.5  # factor para ampliar la ventana respecto al intervalo
+    x1 = center - span * scale
+    x2 = center + span * scale
+    # Asegurar que 0 esté dentro de la ventana para ver el eje Y
+    return min(x1, 0.0), max(x2, 0.0)
+
+
+def _evaluar_o_none(f, x):
+    try:
+        return float(f(float(x)))
+    except Exception:
+        return None
+
+
+def _metodo_raices(request, ctx, plantilla, puntos, mensaje_puntos, algoritmo, formatear, grafica):
+    """Flujo común de las vistas de búsqueda de raíces.
+
+    - `puntos`: nombres de los campos iniciales del formulario (('a', 'b'), ('x0',), ...).
+    - `mensaje_puntos`: error a mostrar si alguno no es numérico.
+    - `algoritmo(func_txt, *valores, tol=, maxit=, evaluador=)`: función de metodos.py.
+    - `formatear(resultado, valores, f)`: devuelve la lista de filas para la tabla.
+    - `grafica(resultado, valores, f)`: devuelve (p, q, extras) con el intervalo de
+      referencia para la ventana y las claves adicionales del JSON de la gráfica.
+    """
+    func_txt = (request.POST.get('function') or '').strip()
+    puntos_txt = [(request.POST.get(p) or '').strip() for p in puntos]
+    tol_txt = (request.POST.get('tol') or '').strip()
+    maxit_txt = (request.POST.get('maxit') or '').strip()
+
+    # Conservar lo que escribió el usuario tanto si hay error como si no
+    ctx['function'] = func_txt
+    for p, txt in zip(puntos, puntos_txt):
+        ctx[f'{p}_input'] = txt
+    ctx['tol_input'] = tol_txt
+    ctx['maxit_input'] = maxit_txt
+
+    try:
+        valores = [_parse_number(txt) for txt in puntos_txt]
+        if any(v is None for v in valores):
+            raise ValueError('punto inicial vacío')
+    except Exception:
+        ctx['error'] = mensaje_puntos
+        return render(request, plantilla, ctx)
+
+    try:
+        tol = _parse_number(tol_txt, default=1e-6)
+        if tol is None or tol <= 0:
+            raise ValueError()
+    except Exception:
+        ctx['error'] = 'Tolerancia inválida; debe ser un número positivo.'
+        return render(request, plantilla, ctx)
+
+    try:
+        maxit = int(maxit_txt) if maxit_txt != '' else 100
+        if maxit <= 0:
+            raise ValueError()
+    except Exception:
+        ctx['error'] = 'Max iteraciones inválido; debe ser entero y mayor que 0.'
+        return render(request, plantilla, ctx)
+
+    # Cada iteración evalúa f (y f' en Newton) sobre el árbol de la expresión
+    try:
+        nodos = admision.admitir_expresion(func_txt)
+        admision.admitir_costo(2 * nodos * min(maxit, metodos.MAXIT_MAXIMO), "La búsqueda de la raíz")
+    except admision.ErrorAdmision as e:
+        ctx['error'] = str(e)
+        return render(request, plantilla, ctx)
+
+    # Compilar f(x) una única vez; si falla, el algoritmo lo intenta por su cuenta
+    # y reporta el error con su propio mensaje.
+    try:
+        f = _crear_evaluador(func_txt)
+    except ErrorBiseccion:
+        f = None
+
+    try:
+        resultado = algoritmo(func_txt, *valores, tol=tol, maxit=maxit, evaluador=f)
+    except ErrorBiseccion as be:
+        ctx['error'] = str(be)
+        return render(request, plantilla, ctx)
+    except Exception as e:
+        logger.exception("Error inesperado en método %s", algoritmo.__name__)
+        ctx['error'] = friendly_error(e)
+        return render(request, plantilla, ctx)
+
+    ctx['iteraciones'] = formatear(resultado, valores, f)
+    ctx['convergio'] = resultado.get('convergio', False)
+    ctx['conteo_iter'] = resultado.get('conteo_iter', 0)
+    # Resumen también formateado con punto decimal
+    raiz_val = resultado.get('raiz')
+    err_val = resultado.get('estimacion_error')
+    f_en_raiz_val = resultado.get('f_en_raiz')
+    ctx['raiz'] = format(float(raiz_val), '.8f') if raiz_val is not None else ''
+    ctx['estimacion_error'] = format(float(err_val), '.8f') if err_val is not None else ''
+    ctx['f_en_raiz'] = format(float(f_en_raiz_val), '.10f') if f_en_raiz_val is not None else ''
+    # Mostrar advertencias (por ejemplo, f'(x)≈0) como mensaje informativo
+    warns = resultado.get('warnings') or []
+    if isinstance(warns, list) and warns:
+        ctx['message'] = ' '.join(str(w) for w in warns)
+
+    # Gráfica con Plotly reutilizando el mismo evaluador
+    if f is not None:
         try:
-            maxit = int(maxit_txt) if maxit_txt != '' else 100
-            if maxit <= 0:
-                raise ValueError()
+            p, q, extras = grafica(resultado, valores, f)
+            x1, x2 = _ventana_grafica(p, q)
+            # Muestreo adaptativo: refina cerca de raíces, curvas y polos con presupuesto fijo
+            xs, ys = muestrear_funcion(f, x1, x2)
+            datos = {'xs': xs, 'ys': ys}
+            datos.update(extras)
+            ctx['plot'] = json.dumps(datos)
         except Exception:
-            ctx['error'] = 'Max iteraciones inválido; debe ser entero y mayor que 0.'
-            ctx['function'] = func_txt
-            ctx['a_input'] = a_txt
-            ctx['b_input'] = b_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/biseccion.html', ctx)
-
-        # Ejecutar el algoritmo extraído y manejar errores específicos
-        try:
-            resultado = biseccion_algo(func_txt, a, b, tol=tol, maxit=maxit)
-        except ErrorBiseccion as be:
-            ctx['error'] = str(be)
-            # preserve inputs
-            ctx['function'] = func_txt
-            ctx['a_input'] = a_txt
-            ctx['b_input'] = b_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/biseccion.html', ctx)
-        except Exception as e:
-            logger.exception("Error inesperado en método biseccion")
-            ctx['error'] = friendly_error(e)
-            ctx['function'] = func_txt
-            ctx['a_input'] = a_txt
-            ctx['b_input'] = b_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/biseccion.html', ctx)
-
-        # Formatear los números a cadenas usando punto decimal (.) y
-        # reordenar columnas tal como se solicita. Esto evita el uso de
-        # filtros de plantilla que podrían aplicar coma según la localización.
-        raw_iters = resultado.get('iteraciones', [])
-        iteraciones_formateadas = []
-        for it in raw_iters:
-            # asegurar que las claves numéricas existen y convertir a float
-            a_val = float(it.get('a', 0))
-            b_val = float(it.get('b', 0))
-            c_val = float(it.get('c', 0))
-            fa_val = float(it.get('fa', 0))
-            fb_val = float(it.get('fb', 0))
-            fc_val = float(it.get('fc', 0))
-            iteraciones_formateadas.append({
-                'i': it.get('i', 0),
-                'a': format(a_val, '.6f'),
-                'b': format(b_val, '.6f'),
-                'c': format(c_val, '.6f'),
-                'fa': format(fa_val, '.6f'),
-                'fb': format(fb_val, '.6f'),
-                'fc': format(fc_val, '.6f'),
-                'actualizacion': it.get('actualizacion', '')
-            })
-
-        ctx['iteraciones'] = iteraciones_formateadas
-        # Si no hay iteraciones detalladas pero el método indica convergencia
-        # (por ejemplo raíz exacta en extremo), construir una fila mínima para
-        # que la UI muestre la tabla en lugar de solo el resumen/gráfica.
-        if not iteraciones_formateadas and resultado.get('convergio'):
-            try:
-                a_val = float(a)
-                b_val = float(b)
-                raiz_val = resultado.get('raiz')
-                c_val = float(raiz_val) if raiz_val is not None else (a_val + b_val) / 2.0
-                f = _crear_evaluador(func_txt)
-                fa_val = float(f(a_val)) if a_val is not None else 0.0
-                fb_val = float(f(b_val)) if b_val is not None else 0.0
-                fc_val = float(f(c_val)) if c_val is not None else 0.0
-                ctx['iteraciones'] = [{
-                    'i': 0,
-                    'a': format(a_val, '.6f'),
-                    'b': format(b_val, '.6f'),
-                    'c': format(c_val, '.6f'),
-                    'fa': format(fa_val, '.6f'),
-                    'fb': format(fb_val, '.6f'),
-                    'fc': format(fc_val, '.6f'),
-                    'actualizacion': 'resultado directo'
-                }]
-            except Exception:
-                # no bloquear la vista por un fallo al intentar construir la fila
-                pass
-        ctx['convergio'] = resultado.get('convergio', False)
-        ctx['conteo_iter'] = resultado.get('conteo_iter', 0)
-        # Resumen también formateado con punto decimal
-        raiz_val = resultado.get('raiz')
-        estim_err_val = resultado.get('estimacion_error')
-        f_en_raiz_val = resultado.get('f_en_raiz')
-        ctx['raiz'] = format(float(raiz_val), '.8f') if raiz_val is not None else ''
-        ctx['estimacion_error'] = format(float(estim_err_val), '.8f') if estim_err_val is not None else ''
-        ctx['f_en_raiz'] = format(float(f_en_raiz_val), '.10f') if f_en_raiz_val is not None else ''
-        ctx['function'] = func_txt
-        ctx['a_input'] = a_txt
-        ctx['b_input'] = b_txt
-        ctx['tol_input'] = tol_txt
-        ctx['maxit_input'] = maxit_txt
-
-        # Generar datos para la gráfica con Plotly: muestreamos f(x) en una ventana amplia
+            # Si algo falla en la generación de la gráfica, no romper la vista
+            pass
+
+    return render(request, plantilla, ctx)
+
+
+def _formatear_cerrado(resultado, valores, f):
+    filas = _formatear_iteraciones(resultado.get('iteraciones', []), ('a', 'b', 'c', 'fa', 'fb', 'fc'), 6, ('actualizacion',))
+    # Si no hay iteraciones detalladas pero el método indica convergencia
+    # (por ejemplo raíz exacta en extremo), construir una fila mínima para
+    # que la UI muestre la tabla en lugar de solo el resumen/gráfica.
+    if not filas and resultado.get('convergio') and f is not None:
         try:
-            f = _crear_evaluador(func_txt)
-            N = 401
-            xs = []
-            ys = []
-            # Definir una ventana de muestreo más amplia que [a,b] e incluyendo x=0
-            aa = float(min(a, b))
-            bb = float(max(a, b))
-            span = bb - aa
-            if span <= 0:
-                span = 2.0
-                aa -= 1.0
-                bb += 1.0
-            center = (aa + bb) / 2.0
-            scale = 2.5  # factor para ampliar la ventana respecto al intervalo
-            x1 = center - span * scale
-            x2 = center + span * scale
-            # Asegurar que 0 esté dentro de la ventana para ver el eje Y
-            x1 = min(x1, 0.0)
-            x2 = max(x2, 0.0)
-            for i in range(N):
-                t = i / (N - 1)
-                x = x1 + (x2 - x1) * t
-                try:
-                    y = float(f(x))
-                except Exception:
-                    y = None  # Plotly corta la línea si hay None
-                xs.append(x)
-                ys.append(y)
-            fa = None
-            fb = None
-            try: fa = float(f(float(a)))
-            except Exception: fa = None
-            try: fb = float(f(float(b)))
-            except Exception: fb = None
-            import json as _json
-            ctx['plot'] = _json.dumps({
-                'xs': xs,
-                'ys': ys,
-                'a': float(a),
-                'b': float(b),
-                'fa': fa,
-                'fb': fb
-            })
+            a_val, b_val = float(valores[0]), float(valores[1])
+            raiz_val = resultado.get('raiz')
+            c_val = float(raiz_val) if raiz_val is not None else (a_val + b_val) / 2.0
+            fila = {'i': 0, 'a': a_val, 'b': b_val, 'c': c_val,
+                    'fa': f(a_val), 'fb': f(b_val), 'fc': f(c_val),
+                    'actualizacion': 'resultado directo'}
+            filas = _formatear_iteraciones([fila], ('a', 'b', 'c', 'fa', 'fb', 'fc'), 6, ('actualizacion',))
         except Exception:
-            # Si algo falla en la generación de la gráfica, ignoramos silenciosamente para no romper la vista
+            # no bloquear la vista por un fallo al intentar construir la fila
             pass
+    return filas
 
-        return render(request, 'algebra/biseccion.html', ctx)
 
-    # GET
+def _grafica_cerrado(resultado, valores, f):
+    a, b = valores
+    return a, b, {'a': float(a), 'b': float(b), 'fa': _evaluar_o_none(f, a), 'fb': _evaluar_o_none(f, b)}
+
+
+def biseccion(request: HttpRequest):
+    """Página para el Método de bisección.
+
+    Soporta GET (muestra formulario) y POST (ejecuta algoritmo y muestra tabla de iteraciones).
+    """
+    ctx = {"title": "Método de bisección"}
+    if request.method == 'POST':
+        return _metodo_raices(
+            request, ctx, 'algebra/biseccion.html', ('a', 'b'),
+            'Parámetros numéricos inválidos: a y b deben ser números (aceptamos 0.5 o 1/2).',
+            biseccion_algo, _formatear_cerrado, _grafica_cerrado,
+        )
     return render(request, 'algebra/biseccion.html', ctx)
 
 
@@ -1442,574 +1678,65 @@ def regula_falsi(request: HttpRequest):
     """
     ctx = {"title": "Método de Regla Falsa (Regula Falsi)"}
     if request.method == 'POST':
-        # Reuse the same parsing/validation logic as biseccion to avoid duplication
-        func_txt = (request.POST.get('function') or '').strip()
-        a_txt = (request.POST.get('a') or '').strip()
-        b_txt = (request.POST.get('b') or '').strip()
-        tol_txt = (request.POST.get('tol') or '').strip()
-        maxit_txt = (request.POST.get('maxit') or '').strip()
-
-        from fractions import Fraction
-        def _replace_vulgar_fraction_chars(s: str) -> str:
-            vf_map = {
-                '\u00BC': '1/4', '\u00BD': '1/2', '\u00BE': '3/4',
-                '\u2150': '1/7', '\u2151': '1/9', '\u2152': '1/10',
-                '\u2153': '1/3', '\u2154': '2/3', '\u2155': '1/5', '\u2156': '2/5', '\u2157': '3/5', '\u2158': '4/5',
-                '\u2159': '1/6', '\u215A': '5/6', '\u215B': '1/8', '\u215C': '3/8', '\u215D': '5/8', '\u215E': '7/8'
-            }
-            out = []
-            for ch in s:
-                if ch in vf_map:
-                    out.append(vf_map[ch])
-                else:
-                    out.append(ch)
-            return ''.join(out)
-
-        def parse_number(txt, default=None):
-            if txt is None or str(txt).strip() == '':
-                return default
-            s = str(txt).strip()
-            s = s.replace('\u2212', '-')
-            s = s.replace('\u2060', '')
-            s = s.replace('\u2009', '')
-            s = s.replace('\u00A0', '')
-            s = _replace_vulgar_fraction_chars(s)
-            try:
-                return float(s)
-            except Exception:
-                try:
-                    return float(Fraction(s))
-                except Exception:
-                    try:
-                        s2 = s.replace('^', '**')
-                        return float(eval(s2, {'__builtins__': None}, {}))
-                    except Exception:
-                        raise
-
-        try:
-            a = parse_number(a_txt)
-            b = parse_number(b_txt)
-            if a is None or b is None:
-                raise ValueError('a o b vacío')
-        except Exception:
-            ctx['error'] = 'Parámetros numéricos inválidos: a y b deben ser números (aceptamos 0.5 o 1/2).'
-            ctx['function'] = func_txt
-            ctx['a_input'] = a_txt
-            ctx['b_input'] = b_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/biseccion.html', ctx)
-
-        try:
-            tol = parse_number(tol_txt, default=1e-6)
-            if tol is None or tol <= 0:
-                raise ValueError()
-        except Exception:
-            ctx['error'] = 'Tolerancia inválida; debe ser un número positivo.'
-            ctx['function'] = func_txt
-            ctx['a_input'] = a_txt
-            ctx['b_input'] = b_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/biseccion.html', ctx)
+        return _metodo_raices(
+            request, ctx, 'algebra/biseccion.html', ('a', 'b'),
+            'Parámetros numéricos inválidos: a y b deben ser números (aceptamos 0.5 o 1/2).',
+            regula_falsi_algo, _formatear_cerrado, _grafica_cerrado,
+        )
+    return render(request, 'algebra/biseccion.html', ctx)
 
-        try:
-            maxit = int(maxit_txt) if maxit_txt != '' else 100
-            if maxit <= 0:
-                raise ValueError()
-        except Exception:
-            ctx['error'] = 'Max iteraciones inválido; debe ser entero y mayor que 0.'
-            ctx['function'] = func_txt
-            ctx['a_input'] = a_txt
-            ctx['b_input'] = b_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/biseccion.html', ctx)
 
-        try:
-            resultado = regula_falsi_algo(func_txt, a, b, tol=tol, maxit=maxit)
-        except ErrorBiseccion as be:
-            ctx['error'] = str(be)
-            ctx['function'] = func_txt
-            ctx['a_input'] = a_txt
-            ctx['b_input'] = b_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/biseccion.html', ctx)
-        except Exception as e:
-            logger.exception("Error inesperado en método regula_falsi")
-            ctx['error'] = friendly_error(e)
-            ctx['function'] = func_txt
-            ctx['a_input'] = a_txt
-            ctx['b_input'] = b_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/biseccion.html', ctx)
-
-        # Reuse the same post-processing as the bisection view to format results & plot
-        raw_iters = resultado.get('iteraciones', [])
-        iteraciones_formateadas = []
-        for it in raw_iters:
-            a_val = float(it.get('a', 0))
-            b_val = float(it.get('b', 0))
-            c_val = float(it.get('c', 0))
-            fa_val = float(it.get('fa', 0))
-            fb_val = float(it.get('fb', 0))
-            fc_val = float(it.get('fc', 0))
-            iteraciones_formateadas.append({
-                'i': it.get('i', 0),
-                'a': format(a_val, '.6f'),
-                'b': format(b_val, '.6f'),
-                'c': format(c_val, '.6f'),
-                'fa': format(fa_val, '.6f'),
-                'fb': format(fb_val, '.6f'),
-                'fc': format(fc_val, '.6f'),
-                'actualizacion': it.get('actualizacion', '')
-            })
-
-        ctx['iteraciones'] = iteraciones_formateadas
-        if not iteraciones_formateadas and resultado.get('convergio'):
-            try:
-                a_val = float(a)
-                b_val = float(b)
-                raiz_val = resultado.get('raiz')
-                c_val = float(raiz_val) if raiz_val is not None else (a_val + b_val) / 2.0
-                f = _crear_evaluador(func_txt)
-                fa_val = float(f(a_val)) if a_val is not None else 0.0
-                fb_val = float(f(b_val)) if b_val is not None else 0.0
-                fc_val = float(f(c_val)) if c_val is not None else 0.0
-                ctx['iteraciones'] = [{
-                    'i': 0,
-                    'a': format(a_val, '.6f'),
-                    'b': format(b_val, '.6f'),
-                    'c': format(c_val, '.6f'),
-                    'fa': format(fa_val, '.6f'),
-                    'fb': format(fb_val, '.6f'),
-                    'fc': format(fc_val, '.6f'),
-                    'actualizacion': 'resultado directo'
-                }]
-            except Exception:
-                pass
-
-        ctx['convergio'] = resultado.get('convergio', False)
-        ctx['conteo_iter'] = resultado.get('conteo_iter', 0)
-        raiz_val = resultado.get('raiz')
-        estim_err_val = resultado.get('estimacion_error')
-        f_en_raiz_val = resultado.get('f_en_raiz')
-        ctx['raiz'] = format(float(raiz_val), '.8f') if raiz_val is not None else ''
-        ctx['estimacion_error'] = format(float(estim_err_val), '.8f') if estim_err_val is not None else ''
-        ctx['f_en_raiz'] = format(float(f_en_raiz_val), '.10f') if f_en_raiz_val is not None else ''
-        ctx['function'] = func_txt
-        ctx['a_input'] = a_txt
-        ctx['b_input'] = b_txt
-        ctx['tol_input'] = tol_txt
-        ctx['maxit_input'] = maxit_txt
-
-        try:
-            f = _crear_evaluador(func_txt)
-            N = 401
-            xs = []
-            ys = []
-            aa = float(min(a, b))
-            bb = float(max(a, b))
-            span = bb - aa
-            if span <= 0:
-                span = 2.0
-                aa -= 1.0
-                bb += 1.0
-            center = (aa + bb) / 2.0
-            scale = 2.5
-            x1 = center - span * scale
-            x2 = center + span * scale
-            x1 = min(x1, 0.0)
-            x2 = max(x2, 0.0)
-            for i in range(N):
-                t = i / (N - 1)
-                x = x1 + (x2 - x1) * t
-                try:
-                    y = float(f(x))
-                except Exception:
-                    y = None
-                xs.append(x)
-                ys.append(y)
-            fa = None
-            fb = None
-            try: fa = float(f(float(a)))
-            except Exception: fa = None
-            try: fb = float(f(float(b)))
-            except Exception: fb = None
-            import json as _json
-            ctx['plot'] = _json.dumps({
-                'xs': xs,
-                'ys': ys,
-                'a': float(a),
-                'b': float(b),
-                'fa': fa,
-                'fb': fb
-            })
-        except Exception:
-            pass
+def _formatear_newton(resultado, valores, f):
+    return _formatear_iteraciones(resultado.get('iteraciones', []), ('x', 'x_next', 'fx', 'dfx', 'err'), 8)
 
-        return render(request, 'algebra/biseccion.html', ctx)
 
-    # GET
-    return render(request, 'algebra/biseccion.html', ctx)
+def _grafica_newton(resultado, valores, f):
+    # Ventana centrada en x0 y la raíz estimada
+    x0 = float(valores[0])
+    raiz_val = resultado.get('raiz')
+    try:
+        xr = float(raiz_val)
+    except Exception:
+        xr = x0
+    return x0, xr, {'x0': x0, 'xr': float(raiz_val) if raiz_val is not None else None}
 
 
 def newton_raphson(request: HttpRequest):
     """Vista para el método de Newton–Raphson (método abierto)."""
     ctx = {"title": "Método de Newton–Raphson"}
     if request.method == 'POST':
-        func_txt = (request.POST.get('function') or '').strip()
-        x0_txt = (request.POST.get('x0') or '').strip()
-        tol_txt = (request.POST.get('tol') or '').strip()
-        maxit_txt = (request.POST.get('maxit') or '').strip()
-
-        from fractions import Fraction
-        def _replace_vulgar_fraction_chars(s: str) -> str:
-            vf_map = {
-                '\u00BC': '1/4', '\u00BD': '1/2', '\u00BE': '3/4',
-                '\u2150': '1/7', '\u2151': '1/9', '\u2152': '1/10',
-                '\u2153': '1/3', '\u2154': '2/3', '\u2155': '1/5', '\u2156': '2/5', '\u2157': '3/5', '\u2158': '4/5',
-                '\u2159': '1/6', '\u215A': '5/6', '\u215B': '1/8', '\u215C': '3/8', '\u215D': '5/8', '\u215E': '7/8'
-            }
-            return ''.join(vf_map.get(ch, ch) for ch in s)
-
-        def parse_number(txt, default=None):
-            if txt is None or str(txt).strip() == '':
-                return default
-            s = str(txt).strip()
-            s = s.replace('\u2212', '-')
-            s = s.replace('\u2060', '')
-            s = s.replace('\u2009', '')
-            s = s.replace('\u00A0', '')
-            s = _replace_vulgar_fraction_chars(s)
-            try:
-                return float(s)
-            except Exception:
-                try:
-                    return float(Fraction(s))
-                except Exception:
-                    try:
-                        s2 = s.replace('^', '**')
-                        return float(eval(s2, {'__builtins__': None}, {}))
-                    except Exception:
-                        raise
-
-        try:
-            x0 = parse_number(x0_txt)
-            if x0 is None:
-                raise ValueError('x0 vacío')
-        except Exception:
-            ctx['error'] = 'Parámetros numéricos inválidos: x0 debe ser un número (aceptamos 0.5 o 1/2).'
-            ctx['function'] = func_txt
-            ctx['x0_input'] = x0_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/newton_raphson.html', ctx)
-
-        try:
-            tol = parse_number(tol_txt, default=1e-6)
-            if tol is None or tol <= 0:
-                raise ValueError()
-        except Exception:
-            ctx['error'] = 'Tolerancia inválida; debe ser un número positivo.'
-            ctx['function'] = func_txt
-            ctx['x0_input'] = x0_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/newton_raphson.html', ctx)
+        return _metodo_raices(
+            request, ctx, 'algebra/newton_raphson.html', ('x0',),
+            'Parámetros numéricos inválidos: x0 debe ser un número (aceptamos 0.5 o 1/2).',
+            newton_raphson_algo, _formatear_newton, _grafica_newton,
+        )
+    return render(request, 'algebra/newton_raphson.html', ctx)
 
-        try:
-            maxit = int(maxit_txt) if maxit_txt != '' else 100
-            if maxit <= 0:
-                raise ValueError()
-        except Exception:
-            ctx['error'] = 'Max iteraciones inválido; debe ser entero y mayor que 0.'
-            ctx['function'] = func_txt
-            ctx['x0_input'] = x0_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/newton_raphson.html', ctx)
 
-        try:
-            resultado = newton_raphson_algo(func_txt, x0, tol=tol, maxit=maxit)
-        except ErrorBiseccion as be:
-            ctx['error'] = str(be)
-            ctx['function'] = func_txt
-            ctx['x0_input'] = x0_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/newton_raphson.html', ctx)
-        except Exception as e:
-            logger.exception("Error inesperado en método newton_raphson")
-            ctx['error'] = friendly_error(e)
-            ctx['function'] = func_txt
-            ctx['x0_input'] = x0_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/newton_raphson.html', ctx)
-
-        # Formatear iteraciones
-        raw_iters = resultado.get('iteraciones', [])
-        it_out = []
-        for it in raw_iters:
-            def _fmt(v, nd='8'):
-                try:
-                    return format(float(v), f'.{nd}f')
-                except Exception:
-                    return ''
-            it_out.append({
-                'i': it.get('i', 0),
-                'x': _fmt(it.get('x', 0.0), '8'),
-                'x_next': _fmt(it.get('x_next', 0.0), '8') if it.get('x_next') is not None else '',
-                'fx': _fmt(it.get('fx', 0.0), '8'),
-                'dfx': _fmt(it.get('dfx', 0.0), '8'),
-                'err': _fmt(it.get('err', None), '8') if it.get('err') is not None else ''
-            })
-        ctx['iteraciones'] = it_out
-
-        ctx['convergio'] = resultado.get('convergio', False)
-        ctx['conteo_iter'] = resultado.get('conteo_iter', 0)
-        raiz_val = resultado.get('raiz')
-        err_val = resultado.get('estimacion_error')
-        f_en_raiz_val = resultado.get('f_en_raiz')
-        ctx['raiz'] = format(float(raiz_val), '.8f') if raiz_val is not None else ''
-        ctx['estimacion_error'] = format(float(err_val), '.8f') if err_val is not None else ''
-        ctx['f_en_raiz'] = format(float(f_en_raiz_val), '.10f') if f_en_raiz_val is not None else ''
-        # Mostrar advertencias (por ejemplo, f'(x)≈0) como mensaje informativo
-        try:
-            warns = resultado.get('warnings') or []
-            if isinstance(warns, list) and len(warns) > 0:
-                ctx['message'] = ' '.join(str(w) for w in warns)
-        except Exception:
-            pass
-        ctx['function'] = func_txt
-        ctx['x0_input'] = x0_txt
-        ctx['tol_input'] = tol_txt
-        ctx['maxit_input'] = maxit_txt
-
-        # Gráfica alrededor de x0 y la raíz estimada
-        try:
-            f = _crear_evaluador(func_txt)
-            N = 401
-            xs = []
-            ys = []
-            # Ventana centrada en x0 y raíz, algo amplia
-            try:
-                xr = float(raiz_val)
-            except Exception:
-                xr = float(x0)
-            center = (float(x0) + xr) / 2.0
-            span = abs(xr - float(x0))
-            if span <= 0:
-                span = 2.0
-            scale = 2.5
-            x1 = center - span * scale
-            x2 = center + span * scale
-            x1 = min(x1, 0.0)
-            x2 = max(x2, 0.0)
-            for i in range(N):
-                t = i / (N - 1)
-                x = x1 + (x2 - x1) * t
-                try:
-                    y = float(f(x))
-                except Exception:
-                    y = None
-                xs.append(x)
-                ys.append(y)
-            import json as _json
-            ctx['plot'] = _json.dumps({'xs': xs, 'ys': ys, 'x0': float(x0), 'xr': float(raiz_val) if raiz_val is not None else None})
-        except Exception:
-            pass
+def _formatear_secante(resultado, valores, f):
+    return _formatear_iteraciones(resultado.get('iteraciones') or [], ('x_prev', 'x', 'x_next', 'f_prev', 'f', 'err'), 8)
 
-        return render(request, 'algebra/newton_raphson.html', ctx)
 
-    return render(request, 'algebra/newton_raphson.html', ctx)
+def _grafica_secante(resultado, valores, f):
+    # Los dos puntos iniciales y la función alrededor
+    x0, x1 = valores
+    return x0, x1, {'x0': float(x0), 'x1': float(x1), 'f0': _evaluar_o_none(f, x0), 'f1': _evaluar_o_none(f, x1)}
 
 
 def secante(request: HttpRequest):
     """Vista para el método de la secante (métodos abiertos)."""
     ctx = {"title": "Método de la secante"}
     if request.method == 'POST':
-        func_txt = (request.POST.get('function') or '').strip()
-        x0_txt = (request.POST.get('x0') or '').strip()
-        x1_txt = (request.POST.get('x1') or '').strip()
-        tol_txt = (request.POST.get('tol') or '').strip()
-        maxit_txt = (request.POST.get('maxit') or '').strip()
-
-        from fractions import Fraction
-        def _replace_vulgar_fraction_chars(s: str) -> str:
-            vf_map = {
-                '\u00BC': '1/4', '\u00BD': '1/2', '\u00BE': '3/4',
-                '\u2150': '1/7', '\u2151': '1/9', '\u2152': '1/10',
-                '\u2153': '1/3', '\u2154': '2/3', '\u2155': '1/5', '\u2156': '2/5', '\u2157': '3/5', '\u2158': '4/5',
-                '\u2159': '1/6', '\u215A': '5/6', '\u215B': '1/8', '\u215C': '3/8', '\u215D': '5/8', '\u215E': '7/8'
-            }
-            return ''.join(vf_map.get(ch, ch) for ch in s)
-
-        def parse_number(txt, default=None):
-            if txt is None or str(txt).strip() == '':
-                return default
-            s = str(txt).strip()
-            s = s.replace('\u2212', '-')
-            s = s.replace('\u2060', '')
-            s = s.replace('\u2009', '')
-            s = s.replace('\u00A0', '')
-            s = _replace_vulgar_fraction_chars(s)
-            try:
-                return float(s)
-            except Exception:
-                try:
-                    return float(Fraction(s))
-                except Exception:
-                    try:
-                        s2 = s.replace('^', '**')
-                        return float(eval(s2, {'__builtins__': None}, {}))
-                    except Exception:
-                        raise
-
-        # Parse inputs
-        try:
-            x0 = parse_number(x0_txt)
-            x1 = parse_number(x1_txt)
-            if x0 is None or x1 is None:
-                raise ValueError('x0/x1 vacíos')
-        except Exception:
-            ctx['error'] = 'Parámetros numéricos inválidos: x0 y x1 deben ser números (aceptamos 0.5 o 1/2).'
-            ctx['function'] = func_txt
-            ctx['x0_input'] = x0_txt
-            ctx['x1_input'] = x1_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/secante.html', ctx)
-
-        try:
-            tol = parse_number(tol_txt, default=1e-6)
-            if tol is None or tol <= 0:
-                raise ValueError()
-        except Exception:
-            ctx['error'] = 'Tolerancia inválida; debe ser un número positivo.'
-            ctx['function'] = func_txt
-            ctx['x0_input'] = x0_txt
-            ctx['x1_input'] = x1_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/secante.html', ctx)
-
-        try:
-            maxit = int(maxit_txt) if maxit_txt != '' else 100
-            if maxit <= 0:
-                raise ValueError()
-        except Exception:
-            ctx['error'] = 'Max iteraciones inválido; debe ser entero y mayor que 0.'
-            ctx['function'] = func_txt
-            ctx['x0_input'] = x0_txt
-            ctx['x1_input'] = x1_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/secante.html', ctx)
-
-        # Ejecutar algoritmo
-        try:
-            resultado = secante_algo(func_txt, x0, x1, tol=tol, maxit=maxit)
-        except ErrorBiseccion as be:
-            ctx['error'] = str(be)
-            ctx['function'] = func_txt
-            ctx['x0_input'] = x0_txt
-            ctx['x1_input'] = x1_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/secante.html', ctx)
-        except Exception as e:
-            logger.exception("Error inesperado en método secante")
-            ctx['error'] = friendly_error(e)
-            ctx['function'] = func_txt
-            ctx['x0_input'] = x0_txt
-            ctx['x1_input'] = x1_txt
-            ctx['tol_input'] = tol_txt
-            ctx['maxit_input'] = maxit_txt
-            return render(request, 'algebra/secante.html', ctx)
-
-        # Formatear iteraciones
-        it_out = []
-        for it in (resultado.get('iteraciones') or []):
-            def _fmt(v, nd='8'):
-                try:
-                    return format(float(v), f'.{nd}f')
-                except Exception:
-                    return ''
-            it_out.append({
-                'i': it.get('i', 0),
-                'x_prev': _fmt(it.get('x_prev', 0.0), '8'),
-                'x': _fmt(it.get('x', 0.0), '8'),
-                'x_next': _fmt(it.get('x_next', 0.0), '8') if it.get('x_next') is not None else '',
-                'f_prev': _fmt(it.get('f_prev', 0.0), '8'),
-                'f': _fmt(it.get('f', 0.0), '8'),
-                'err': _fmt(it.get('err', None), '8') if it.get('err') is not None else ''
-            })
-        ctx['iteraciones'] = it_out
-
-        ctx['convergio'] = resultado.get('convergio', False)
-        ctx['conteo_iter'] = resultado.get('conteo_iter', 0)
-        raiz_val = resultado.get('raiz')
-        err_val = resultado.get('estimacion_error')
-        f_en_raiz_val = resultado.get('f_en_raiz')
-        ctx['raiz'] = format(float(raiz_val), '.8f') if raiz_val is not None else ''
-        ctx['estimacion_error'] = format(float(err_val), '.8f') if err_val is not None else ''
-        ctx['f_en_raiz'] = format(float(f_en_raiz_val), '.10f') if f_en_raiz_val is not None else ''
-        try:
-            warns = resultado.get('warnings') or []
-            if isinstance(warns, list) and len(warns) > 0:
-                ctx['message'] = ' '.join(str(w) for w in warns)
-        except Exception:
-            pass
-        ctx['function'] = func_txt
-        ctx['x0_input'] = x0_txt
-        ctx['x1_input'] = x1_txt
-        ctx['tol_input'] = tol_txt
-        ctx['maxit_input'] = maxit_txt
-
-        # Gráfica con los dos puntos iniciales y la función alrededor
-        try:
-            f = _crear_evaluador(func_txt)
-            N = 401
-            xs = []
-            ys = []
-            aa = float(min(x0, x1))
-            bb = float(max(x0, x1))
-            span = bb - aa
-            if span <= 0:
-                span = 2.0
-                aa -= 1.0
-                bb += 1.0
-            center = (aa + bb) / 2.0
-            scale = 2.5
-            x1s = center - span * scale
-            x2s = center + span * scale
-            x1s = min(x1s, 0.0)
-            x2s = max(x2s, 0.0)
-            for i in range(N):
-                t = i / (N - 1)
-                xv = x1s + (x2s - x1s) * t
-                try:
-                    yv = float(f(xv))
-                except Exception:
-                    yv = None
-                xs.append(xv)
-                ys.append(yv)
-            f0 = None; f1 = None
-            try: f0 = float(f(float(x0)))
-            except Exception: f0 = None
-            try: f1 = float(f(float(x1)))
-            except Exception: f1 = None
-            import json as _json
-            ctx['plot'] = _json.dumps({
-                'xs': xs, 'ys': ys, 'x0': float(x0), 'x1': float(x1), 'f0': f0, 'f1': f1
-            })
-        except Exception:
-            pass
+        return _metodo_raices(
+            request, ctx, 'algebra/secante.html', ('x0', 'x1'),
+            'Parámetros numéricos inválidos: x0 y x1 deben ser números (aceptamos 0.5 o 1/2).',
+            secante_algo, _formatear_secante, _grafica_secante,
+        )
+    return render(request, 'algebra/secante.html', ctx)
 
-        return render(request, 'algebra/secante.html', ctx)
 
-    return render(request, 'algebra/secante.html', ctx)
+def metricas(request: HttpRequest):
+    """Métricas de perfilado del proceso en formato de texto de Prometheus."""
+    if request.META.get("REMOTE_ADDR") not in getattr(settings, "ALGEBRA_METRICAS_IPS", ()):
+        raise Http404
+    return HttpResponse(perfil.texto_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
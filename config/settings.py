@@ -43,6 +43,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'algebra.middleware.EstaticosMiddleware',
+    'algebra.middleware.PerfilMiddleware',
+    'algebra.middleware.AdmisionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -64,6 +67,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "algebra.context_processors.cache_paginas",
             ],
         },
     },
@@ -121,6 +125,89 @@ STATIC_URL = "static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]   # (/static/algebra/styles.css)
 STATIC_ROOT = BASE_DIR / "staticfiles"     # solo para producción
 
+# En producción collectstatic pone huellas en los nombres (app.<hash>.js),
+# escribe variantes .gz (y .br si brotli está instalado) y, con
+# ALGEBRA_MINIFICAR_JS, minifica algebra/*.js; EstaticosMiddleware sirve
+# STATIC_ROOT con caché de un año para los nombres con huella y
+# ALGEBRA_ESTATICOS_MAX_AGE segundos para el resto (ver algebra/estaticos.py).
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage" if DEBUG
+        else "algebra.estaticos.AlmacenamientoEstatico",
+    },
+}
+ALGEBRA_SERVIR_ESTATICOS = not DEBUG
+ALGEBRA_MINIFICAR_JS = False
+ALGEBRA_ESTATICOS_MAX_AGE = 60
+
+# Precalentamiento de SymPy al arrancar cada worker (ver algebra/apps.py).
+# Desactivado por defecto para que manage.py y los tests no lo paguen.
+ALGEBRA_PRECALENTAR = False
+
+# Procesos para el determinante/inversa multimodular (matrices desde 30×30, sin
+# pasos). Con 0 o 1 se usa siempre la eliminación de Bareiss en el proceso actual.
+ALGEBRA_PROCESOS_MODULAR = 0
+
+# Procesos para repartir las actualizaciones de filas de Gauss-Jordan (sistemas
+# desde 100 filas, sin pasos). Con 0 o 1 la eliminación es secuencial.
+# Los trabajadores de estos tres ajustes se crean con forkserver (nunca fork),
+# así que se pueden activar con servidores WSGI de varios hilos.
+ALGEBRA_PROCESOS_GAUSS = 0
+
+# Procesos para convertir en paralelo las celdas con expresiones (sqrt, sin, pi…)
+# de matrices pegadas grandes (desde 500 expresiones distintas). 0: secuencial.
+ALGEBRA_PROCESOS_PARSEO = 0
+
+# Segundos que se guarda (en la caché de Django) la factorización de I − A del
+# endpoint leontief/escenarios/, indexada por la huella de A.
+ALGEBRA_LEONTIEF_CACHE_SEGUNDOS = 3600
+
+# Perfilado por petición (algebra.middleware.PerfilMiddleware): tiempos de
+# parseo, cálculo, formato y plantilla en la cabecera Server-Timing, panel con
+# DEBUG y métricas en /metricas/. ALGEBRA_PERFIL_CONTAR cuenta además las
+# llamadas a mcd/simplificar_fraccion, las fracciones creadas y el mayor tamaño
+# en bits de los coeficientes (cuesta una comprobación por llamada).
+# La cabecera Server-Timing expone los tiempos internos a cualquier cliente:
+# sólo se envía con ALGEBRA_PERFIL_CABECERA. /metricas/ responde 404 salvo a
+# las IP de ALGEBRA_METRICAS_IPS (lista vacía: endpoint desactivado).
+ALGEBRA_PERFIL = True
+ALGEBRA_PERFIL_CONTAR = DEBUG
+ALGEBRA_PERFIL_CABECERA = DEBUG
+ALGEBRA_METRICAS_IPS = ['127.0.0.1', '::1']
+
+# Segundos que se guardan en caché las páginas sin formulario (inicio y
+# métodos, con el ETag del contenido para responder 304) y el fragmento de la
+# cabecera de navegación. 0 desactiva ambas cachés (útil al editar plantillas).
+ALGEBRA_CACHE_PAGINAS = 0 if DEBUG else 3600
+
+# Control de admisión (algebra/logic/admision.py): coste estimado en operaciones
+# de fracción a partir de dimensiones, pasos y tamaño de los coeficientes. Por
+# encima de costo_maximo se rechaza (o, en Leontief, se pasa a coma flotante);
+# si los pasos lo hacen superar costo_maximo_pasos se omiten; por encima de
+# costo_directo la petición espera uno de concurrencia_pesada turnos como mucho
+# espera_cola segundos. Las expresiones simbólicas (límites, derivadas) se
+# limitan por nodos y por exponente. Basta indicar las claves que cambian.
+ALGEBRA_ADMISION = {
+    "celdas_maximas": 250_000,
+    "costo_directo": 5_000_000,
+    "costo_maximo": 200_000_000,
+    "costo_maximo_pasos": 50_000_000,
+    "concurrencia_pesada": 2,
+    "espera_cola": 30,
+    "nodos_expresion": 2_000,
+    "exponente_expresion": 1_000,
+}
+
+# Límites de las matrices subidas a matriz_archivo/ (algebra/logic/disco.py):
+# entradas por matriz, comprobadas antes de reservar el archivo temporal, y
+# lado máximo de determinante/Gauss/multiplicación con y sin NumPy.
+ALGEBRA_DISCO = {
+    "celdas_maximas": 4_000_000,
+    "dimension_numpy": 2000,
+    "dimension_python": 300,
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,81 @@
+"""Cuenta llamadas a mcd y mide tiempos del núcleo de fracciones.
+
+Compara la acumulación encadenada (simplificar tras cada suma/producto) con
+la acumulación diferida (una sola simplificación por entrada) en productos
+punto, multiplicación de matrices con pasos y Gauss-Jordan.
+
+Uso: python scripts/bench_fracciones.py [n]
+"""
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from algebra.logic import utilidades as u
+from algebra.logic import operaciones as op
+
+_llamadas = [0]
+_mcd_original = u.mcd
+
+
+def _mcd_contado(a, b):
+    _llamadas[0] += 1
+    return _mcd_original(a, b)
+
+
+u.mcd = _mcd_contado
+
+
+def medir(nombre, fn):
+    _llamadas[0] = 0
+    t = time.perf_counter()
+    resultado = fn()
+    dt = time.perf_counter() - t
+    print(f"{nombre:<42} {_llamadas[0]:>10} mcd  {dt * 1000:>9.1f} ms")
+    return resultado
+
+
+def matriz(n, semilla):
+    rnd = random.Random(semilla)
+    return [[u.simplificar_fraccion(rnd.randint(-9, 9), rnd.randint(1, 6)) for _ in range(n)] for _ in range(n)]
+
+
+def producto_encadenado(A, B):
+    n = len(A)
+    C = []
+    for i in range(n):
+        fila = []
+        for j in range(n):
+            acc = [0, 1]
+            for k in range(n):
+                acc = u.sumar_fracciones(acc, u.multiplicar_fracciones(A[i][k], B[k][j]))
+            fila.append(acc)
+        C.append(fila)
+    return C
+
+
+def producto_diferido(A, B):
+    columnas = [[B[k][j] for k in range(len(B))] for j in range(len(B[0]))]
+    return [[u.producto_punto(fila, col) for col in columnas] for fila in A]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    A = matriz(n, 1)
+    B = matriz(n, 2)
+    print(f"n = {n}")
+    c1 = medir("producto punto encadenado", lambda: producto_encadenado(A, B))
+    c2 = medir("producto punto diferido", lambda: producto_diferido(A, B))
+    c3 = medir("multiplicar_matrices (con pasos)", lambda: op.multiplicar_matrices(A, B, registrar_pasos=True)[0])
+    c4 = medir("multiplicar_matrices (sin pasos)", lambda: op.multiplicar_matrices(A, B))
+    assert c1 == c2 == c3 == c4, "los resultados normalizados deben coincidir"
+    aumentada = [fila + [u.simplificar_fraccion(i + 1, 1)] for i, fila in enumerate(A)]
+    medir("gauss_jordan", lambda: op.gauss_jordan(op.copiar_matriz(aumentada)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Mide el parseo de celdas de matrices pegadas en los formularios.
+
+Genera pegados realistas (enteros con signo, decimales, fracciones, notación
+científica y algunas expresiones) y compara crear_fraccion_desde_cadena con
+el evaluador de expresiones completo (_evaluar_expresion_a_fraccion), que era
+el camino de todos los números negativos antes del clasificador por regex.
+
+Uso: python scripts/bench_parseo.py [n]
+"""
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from algebra.logic import utilidades as u
+
+
+def celda(rnd, expresiones):
+    r = rnd.random()
+    if r < expresiones:
+        return rnd.choice(["sqrt(2)", "2*sin(1)", "-1/3 + 2^2", "(1+1/2)/3", "√(3)/2"])
+    r = rnd.random()
+    if r < 0.45:
+        return str(rnd.randint(-99, 99))
+    if r < 0.7:
+        return f"{rnd.uniform(-100, 100):.3f}"
+    if r < 0.9:
+        return f"{rnd.randint(-20, 20)}/{rnd.randint(1, 12)}"
+    return f"{rnd.uniform(-9, 9):.2f}e{rnd.randint(-4, 4)}"
+
+
+def pegado(n, semilla, expresiones):
+    rnd = random.Random(semilla)
+    return [[celda(rnd, expresiones) for _ in range(n)] for _ in range(n)]
+
+
+def medir(nombre, fn, celdas):
+    t = time.perf_counter()
+    resultado = [fn(c) for c in celdas]
+    dt = time.perf_counter() - t
+    print(f"{nombre:<40} {dt * 1000:>9.1f} ms  {dt * 1e6 / len(celdas):>7.2f} µs/celda")
+    return resultado
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    for expresiones in (0.0, 0.05):
+        celdas = [c for fila in pegado(n, 1, expresiones) for c in fila]
+        print(f"n = {n}×{n}, expresiones = {expresiones:.0%}")
+        rapido = medir("crear_fraccion_desde_cadena", u.crear_fraccion_desde_cadena, celdas)
+        # El evaluador no entiende la notación científica: sólo se compara el resto
+        sin_exp = [c for c in celdas if "e" not in c.replace("sqrt", "")]
+        medir("evaluador completo (sin 1e3)", u._evaluar_expresion_a_fraccion, sin_exp)
+        assert all(isinstance(x, list) and len(x) == 2 for x in rapido)
+
+
+if __name__ == '__main__':
+    main()
@@ -1598,6 +1598,7 @@
         if(t === 'mulb') return `Multiplicar por B (${src}·B)`;
         if(t === 'inverse') return `Inversa (${src}^{-1})`;
         if(t === 'inverseother') { const other = src==='B' ? 'A' : 'B'; return `Inversa de ${other}`; }
+        if(t === 'power') return `Potencia (${src}^k)`;
         if(t === 'sumi') return `Sumar con Identidad (${src}+I)`;
         if(t === 'checkli') return `Verificar independencia lineal (${src})`;
         return type;
@@ -1614,6 +1615,7 @@
         const pSO = palette?.querySelector('[data-type="scaleOther"]'); if(pSO) pSO.textContent = typeToLabel('scaleOther', src);
         const pTO = palette?.querySelector('[data-type="transposeOther"]'); if(pTO) pTO.textContent = typeToLabel('transposeOther', src);
         const pIO = palette?.querySelector('[data-type="inverseOther"]'); if(pIO) pIO.textContent = typeToLabel('inverseOther', src);
+      const pPow = palette?.querySelector('[data-type="power"]'); if(pPow) pPow.textContent = typeToLabel('power', src);
       const pSumI = palette?.querySelector('[data-type="sumI"]'); if(pSumI) pSumI.textContent = typeToLabel('sumI', src);
       const pChk = palette?.querySelector('[data-type="checkLI"]'); if(pChk) pChk.textContent = typeToLabel('checkLI', src);
         // Actualiza etiquetas de ítems ya añadidos
@@ -1686,6 +1688,10 @@
           label.textContent = typeToLabel('inverse', currentSrc());
         } else if(type.toLowerCase() === 'inverseother'){
           label.textContent = typeToLabel('inverseOther', currentSrc());
+        } else if(type === 'power'){
+          label.textContent = typeToLabel('power', currentSrc());
+          const p = document.createElement('input'); p.type='text'; p.placeholder='k (ej. 50)'; p.setAttribute('data-param','k'); paramInput=p;
+          ctrlWrap.appendChild(p);
         } else if(type === 'sumI'){
           label.textContent = typeToLabel('sumI', currentSrc());
         } else if(type === 'checkLI'){